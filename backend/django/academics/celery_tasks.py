@@ -407,4 +407,15 @@ def cleanup_tokens_task(grace_days: int = 1) -> dict:
         "cleanup_tokens_task completed",
         extra={"deleted": deleted, "cutoff": cutoff.isoformat(), "grace_days": grace_days},
     )
-    return {"deleted": deleted, "cutoff": cutoff.isoformat()}
\ No newline at end of file
+    return {"deleted": deleted, "cutoff": cutoff.isoformat()}
+
+@shared_task(soft_time_limit=1800)
+def bulk_import_task(job_id: str) -> None:
+    """
+    Stage, validate and upsert one bulk CSV / Excel import.
+    Enqueued by BulkImportService.enqueue(); progress is published to Redis
+    (import:progress:{job_id}) and the outcome stored on the ImportJob.
+    """
+    from .services.bulk_import_service import BulkImportService
+
+    BulkImportService.run(job_id)
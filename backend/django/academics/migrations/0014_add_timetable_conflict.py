@@ -0,0 +1,81 @@
+"""
+Migration: Add TimetableConflict — per-variant conflicts written by the
+FastAPI saga at persist time, so conflict summaries are indexed GROUP BY
+counts instead of re-detection over timetable_data on every request.
+Manually written to avoid picking up unrelated pending model changes.
+"""
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academics", "0013_add_student_org_active_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimetableConflict",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("variant", models.CharField(max_length=20)),
+                ("conflict_type", models.CharField(max_length=30)),
+                (
+                    "severity",
+                    models.CharField(
+                        choices=[
+                            ("critical", "Critical"),
+                            ("high", "High"),
+                            ("medium", "Medium"),
+                            ("low", "Low"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("entity_type", models.CharField(max_length=10)),
+                ("entity_id", models.CharField(max_length=100)),
+                ("day", models.IntegerField(blank=True, null=True)),
+                ("time_slot_id", models.CharField(blank=True, max_length=50, null=True)),
+                ("course_ids", models.JSONField(default=list)),
+                ("affected_count", models.IntegerField(default=1)),
+                ("message", models.TextField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "generation_job",
+                    models.ForeignKey(
+                        db_column="job_id",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="conflicts",
+                        to="academics.generationjob",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "timetable_conflicts",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        fields=["generation_job", "variant", "severity"],
+                        name="idx_conflict_job_sev",
+                    ),
+                    models.Index(
+                        fields=["generation_job", "variant", "conflict_type"],
+                        name="idx_conflict_job_type",
+                    ),
+                    models.Index(
+                        fields=["generation_job", "variant", "entity_type", "entity_id"],
+                        name="idx_conflict_job_entity",
+                    ),
+                ],
+            },
+        ),
+    ]
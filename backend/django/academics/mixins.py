@@ -14,6 +14,7 @@ Enterprise caching features:
 
 import logging
 
+from core.cache_invalidation import schedule_invalidation
 from core.cache_service import CacheService
 from django.db import transaction
 from rest_framework import status, viewsets
@@ -80,9 +81,10 @@ class SmartCachedViewSet(viewsets.ModelViewSet):
 
     # -- Invalidation ---------------------------------------------------------
     def invalidate_model_cache(self):
+        # Coalesced with the write's own post_save into one bump at commit
         model_name = self.queryset.model.__name__
-        CacheService.invalidate_model_cache(model_name, organization_id=self._org_id())
-        logger.info("Invalidated cache for %s", model_name)
+        schedule_invalidation(model_name, self._org_id())
+        logger.info("Scheduled cache invalidation for %s", model_name)
 
     # -- List -----------------------------------------------------------------
     def list(self, request, *args, **kwargs):
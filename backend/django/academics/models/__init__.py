@@ -8,8 +8,9 @@ This package splits the original 793-line models.py god file into:
 - faculty.py (130 lines) - Faculty
 - student.py (150 lines) - Student, Batch
 - room.py (70 lines) - Room (Classroom, Lab)
-- timetable.py (140 lines) - TimeSlot, GenerationJob, Timetable, TimetableSlot
+- timetable.py (140 lines) - TimeSlot, GenerationJob, TimetableConflict, Timetable, TimetableSlot
 - user.py (48 lines) - User
+- data_import.py - ImportJob
 
 All imports preserved for backward compatibility.
 """
@@ -56,6 +57,7 @@ from .room import (
 from .timetable import (
     TimeSlot,
     GenerationJob,
+    TimetableConflict,
     Timetable,
     TimetableSlot,
 )
@@ -66,6 +68,9 @@ from .user import User, UserSession
 # Timetable configuration model
 from .timetable_config import TimetableConfiguration
 
+# Bulk import model
+from .data_import import ImportJob
+
 # Export all models for backward compatibility
 __all__ = [
     # Base
@@ -93,6 +98,7 @@ __all__ = [
     # Timetable
     'TimeSlot',
     'GenerationJob',
+    'TimetableConflict',
     'Timetable',
     'TimetableSlot',
     # User
@@ -100,4 +106,6 @@ __all__ = [
     'UserSession',
     # Config
     'TimetableConfiguration',
+    # Import
+    'ImportJob',
 ]
@@ -0,0 +1,62 @@
+"""
+ImportJob model: bulk CSV / Excel imports of students, courses, faculty
+and enrollments (see academics/services/bulk_import_service.py)
+"""
+
+import uuid
+from django.conf import settings
+from django.db import models
+from .base import Organization
+
+
+class ImportJob(models.Model):
+    """One uploaded file: staged, validated and upserted in the background"""
+
+    ENTITY_CHOICES = [
+        ("students", "Students"),
+        ("courses", "Courses"),
+        ("faculty", "Faculty"),
+        ("enrollments", "Enrollments"),
+    ]
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("completed", "Completed"),
+        ("invalid", "Invalid"),      # row-level errors, nothing written
+        ("failed", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    organization = models.ForeignKey(
+        Organization, on_delete=models.CASCADE, related_name="import_jobs", db_column='org_id'
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="import_jobs",
+    )
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    file_name = models.CharField(max_length=255)
+    dry_run = models.BooleanField(default=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+
+    total_rows = models.IntegerField(default=0)
+    inserted_count = models.IntegerField(default=0)
+    updated_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    # First IMPORT_MAX_REPORTED_ERRORS of {"row", "column", "message"}
+    errors = models.JSONField(default=list, blank=True)
+    error_message = models.TextField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "import_jobs"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["organization", "-created_at"], name="idx_import_org_created"),
+        ]
+
+    def __str__(self):
+        return f"{self.entity} import {self.file_name} ({self.status})"
@@ -104,6 +104,49 @@ class GenerationJob(models.Model):
         ]
 
 
+class TimetableConflict(models.Model):
+    """
+    One conflict in a generated variant, detected once when FastAPI persists
+    the job (core.services.conflict_index) and read by the conflict views.
+    """
+
+    generation_job = models.ForeignKey(
+        GenerationJob, on_delete=models.CASCADE, related_name="conflicts", db_column="job_id"
+    )
+    # "final" or the variant's 1-based id, as in the FastAPI result index
+    variant = models.CharField(max_length=20)
+    conflict_type = models.CharField(max_length=30)
+    severity = models.CharField(
+        max_length=10,
+        choices=[
+            ("critical", "Critical"),
+            ("high", "High"),
+            ("medium", "Medium"),
+            ("low", "Low"),
+        ],
+    )
+    entity_type = models.CharField(max_length=10)  # faculty, room, student, course
+    entity_id = models.CharField(max_length=100)
+    day = models.IntegerField(null=True, blank=True)
+    time_slot_id = models.CharField(max_length=50, null=True, blank=True)
+    course_ids = models.JSONField(default=list)
+    affected_count = models.IntegerField(default=1)
+    message = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "timetable_conflicts"
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["generation_job", "variant", "severity"], name="idx_conflict_job_sev"),
+            models.Index(fields=["generation_job", "variant", "conflict_type"], name="idx_conflict_job_type"),
+            models.Index(
+                fields=["generation_job", "variant", "entity_type", "entity_id"],
+                name="idx_conflict_job_entity",
+            ),
+        ]
+
+
 class Timetable(models.Model):
     """Generated timetable"""
 
@@ -3,6 +3,9 @@ Django Services - Business Logic Layer
 """
 from .department_view_service import DepartmentViewService
 from .conflict_service import ConflictDetectionService
+from .published_timetable_service import PublishedTimetableService
+from .student_schedule_service import StudentScheduleService
+from .bulk_import_service import BulkImportService
 from .generation_job_service import (
     resolve_time_config,
     create_generation_job,
@@ -12,6 +15,9 @@ from .generation_job_service import (
 __all__ = [
     'DepartmentViewService',
     'ConflictDetectionService',
+    'PublishedTimetableService',
+    'StudentScheduleService',
+    'BulkImportService',
     'resolve_time_config',
     'create_generation_job',
     'enqueue_job_background',
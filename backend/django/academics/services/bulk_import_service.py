@@ -0,0 +1,792 @@
+"""
+Bulk Import Service - CSV / Excel imports of students, courses, faculty and
+enrollments without per-row ORM saves
+
+Going through DRF serializers meant one INSERT, one post_save and one cache
+invalidation per row; a 20k-student file took minutes.  An import here is
+a background job (Celery, thread fallback) that runs one transaction:
+
+  1. Stage    rows are streamed with COPY into a TEMP table of text columns
+              (ON COMMIT DROP), so malformed values never abort the load
+  2. Validate set-based INSERT ... SELECTs into a TEMP error table: required
+              / type / length / choice checks in one UNION ALL, then
+              department / program / student / offering lookups (unknown or
+              ambiguous codes), duplicate keys within the file and capacity
+              bounds (enrollment vs offering max_capacity, course size vs
+              largest room).  Any error -> row-level report, rollback,
+              nothing written
+  3. Upsert   LOCK TABLE, one UPDATE ... FROM stage for existing natural
+              keys and one INSERT ... SELECT WHERE NOT EXISTS for new ones
+  4. Caches   one schedule_invalidation() per model, flushed on commit as a
+              single version bump (core.cache_invalidation)
+
+Live progress is kept in Redis (import:progress:{job_id}); the outcome and
+the first IMPORT_MAX_REPORTED_ERRORS errors are stored on the ImportJob.
+"""
+import csv
+import datetime
+import io
+import logging
+import threading
+import uuid
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.cache_invalidation import schedule_invalidation
+
+from ..models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+_TRUE = ("true", "t", "yes", "y", "1")
+_FALSE = ("false", "f", "no", "n", "0")
+_DATE_RE = r"^[0-9]{4}-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])$"
+_EMAIL_RE = r"^[^@[:space:]]+@[^@[:space:]]+\.[^@[:space:]]+$"
+_COPY_BATCH = 1000       # rows serialised per COPY read
+_PROGRESS_EVERY = 5000   # rows between progress updates while staging
+
+
+class ImportField(NamedTuple):
+    """One file column.  stored=False columns only feed lookups."""
+    name: str
+    kind: str = "text"                      # text | int | date | bool | email | choice
+    required: bool = False
+    max_length: Optional[int] = None
+    choices: Tuple[str, ...] = ()           # all upper- or all lower-case
+    bounds: Optional[Tuple[int, int]] = None
+    default: Optional[str] = None           # SQL used on INSERT when blank
+    stored: bool = True
+
+
+class Lookup(NamedTuple):
+    """Resolve file codes to a foreign key; source yields id + the key columns."""
+    target: str
+    keys: Tuple[str, ...]
+    source: str
+    label: str
+
+
+class ImportSpec(NamedTuple):
+    entity: str
+    table: str
+    pk: str
+    models: Tuple[str, ...]                 # model names for cache invalidation
+    key: Tuple[str, ...]                    # natural key (file columns or lookup targets)
+    fields: Tuple[ImportField, ...]
+    lookups: Tuple[Lookup, ...] = ()
+    checks: Tuple[Tuple[Tuple[str, ...], str, str], ...] = ()   # (columns, condition, message)
+    set_checks: Tuple[Tuple[Tuple[str, ...], str], ...] = ()    # (columns, SELECT row_no, col, message)
+    insert_defaults: Tuple[Tuple[str, str], ...] = ()
+    after_upsert: Tuple[str, ...] = ()
+
+
+_DEPARTMENT = Lookup(
+    "dept_id", ("dept_code",),
+    "SELECT dept_id AS id, dept_code FROM departments WHERE org_id = %(org)s",
+    "department",
+)
+_TIMESTAMPS = (("created_at", "now()"), ("updated_at", "now()"))
+
+SPECS: Dict[str, ImportSpec] = {
+    "students": ImportSpec(
+        entity="students", table="students", pk="student_id", models=("Student",),
+        key=("enrollment_number",),
+        fields=(
+            ImportField("enrollment_number", required=True, max_length=50),
+            ImportField("roll_number", max_length=30),
+            ImportField("username", max_length=50, default="s.enrollment_number"),
+            ImportField("email", "email", required=True, max_length=254),
+            ImportField("first_name", required=True, max_length=100),
+            ImportField("middle_name", max_length=100),
+            ImportField("last_name", required=True, max_length=100),
+            ImportField("gender", "choice", choices=("MALE", "FEMALE", "OTHER")),
+            ImportField("date_of_birth", "date", required=True),
+            ImportField("phone_number", max_length=20),
+            ImportField("admission_year", "int", required=True, bounds=(1950, 2100)),
+            ImportField("admission_date", "date", required=True),
+            ImportField("current_semester", "int", bounds=(1, 16)),
+            ImportField("current_year", "int", bounds=(1, 8)),
+            ImportField("academic_status", "choice", choices=(
+                "ACTIVE", "ON_LEAVE", "GRADUATED", "DROPPED_OUT", "RUSTICATED", "TRANSFERRED",
+            )),
+            ImportField("is_active", "bool", default="true"),
+            ImportField("dept_code", required=True, stored=False),
+            ImportField("program_code", required=True, stored=False),
+        ),
+        lookups=(
+            _DEPARTMENT,
+            Lookup(
+                "program_id", ("program_code",),
+                "SELECT program_id AS id, program_code FROM programs WHERE org_id = %(org)s",
+                "program",
+            ),
+        ),
+        insert_defaults=_TIMESTAMPS,
+    ),
+    "courses": ImportSpec(
+        entity="courses", table="courses", pk="course_id", models=("Course",),
+        key=("course_code",),
+        fields=(
+            ImportField("course_code", required=True, max_length=50),
+            ImportField("course_name", required=True, max_length=200),
+            ImportField("course_short_name", max_length=100),
+            ImportField("course_type", max_length=50),
+            ImportField("course_level", max_length=50),
+            ImportField("credits", "int", required=True, bounds=(0, 40)),
+            ImportField("lecture_hours_per_week", "int", bounds=(0, 40)),
+            ImportField("tutorial_hours_per_week", "int", bounds=(0, 40)),
+            ImportField("practical_hours_per_week", "int", bounds=(0, 40)),
+            ImportField("room_type_required", max_length=50),
+            ImportField("min_room_capacity", "int", bounds=(1, 5000)),
+            ImportField("max_enrollment", "int", bounds=(1, 10000)),
+            ImportField("min_enrollment", "int", bounds=(0, 10000)),
+            ImportField("offered_in_odd_semester", "bool"),
+            ImportField("offered_in_even_semester", "bool"),
+            ImportField("is_active", "bool", default="true"),
+            ImportField("dept_code", required=True, stored=False),
+        ),
+        lookups=(_DEPARTMENT,),
+        checks=(
+            (("min_enrollment", "max_enrollment"),
+             "{min_enrollment} > {max_enrollment}",
+             "min_enrollment exceeds max_enrollment"),
+            (("min_room_capacity",),
+             "{min_room_capacity} > (SELECT max(seating_capacity) FROM rooms"
+             " WHERE org_id = %(org)s AND is_active)",
+             "min_room_capacity exceeds the largest active room"),
+        ),
+        insert_defaults=_TIMESTAMPS,
+    ),
+    "faculty": ImportSpec(
+        entity="faculty", table="faculty", pk="faculty_id", models=("Faculty",),
+        key=("faculty_code",),
+        fields=(
+            ImportField("faculty_code", required=True, max_length=30),
+            ImportField("username", max_length=50),
+            ImportField("email", "email", required=True, max_length=254),
+            ImportField("first_name", required=True, max_length=100),
+            ImportField("middle_name", max_length=100),
+            ImportField("last_name", required=True, max_length=100),
+            ImportField("title", max_length=20),
+            ImportField("gender", "choice", choices=("MALE", "FEMALE", "OTHER")),
+            ImportField("designation", "choice", required=True, choices=(
+                "professor", "associate_professor", "assistant_professor", "lecturer",
+                "visiting_professor", "adjunct_professor", "emeritus_professor", "guest_lecturer",
+            )),
+            ImportField("specialization", required=True, max_length=200),
+            ImportField("employment_type", max_length=50),
+            ImportField("highest_qualification", max_length=100),
+            ImportField("phone_number", max_length=20),
+            ImportField("date_of_joining", "date"),
+            ImportField("max_credits_per_semester", "int", bounds=(0, 60)),
+            ImportField("max_hours_per_week", "int", bounds=(1, 60), default="18"),
+            ImportField("can_teach_cross_department", "bool", default="false"),
+            ImportField("is_active", "bool", default="true"),
+            ImportField("dept_code", required=True, stored=False),
+        ),
+        lookups=(_DEPARTMENT,),
+        insert_defaults=(
+            ("is_hod", "false"), ("is_dean", "false"), ("is_proctor", "false"),
+            ("can_approve_timetable", "false"), *_TIMESTAMPS,
+        ),
+    ),
+    "enrollments": ImportSpec(
+        entity="enrollments", table="course_enrollments", pk="enrollment_id",
+        models=("CourseEnrollment", "CourseOffering"),
+        key=("student_id", "offering_id"),
+        fields=(
+            ImportField("enrollment_number", required=True, stored=False),
+            ImportField("course_code", required=True, stored=False),
+            ImportField("academic_year", required=True, stored=False),
+            ImportField("semester_type", required=True, stored=False),
+            ImportField("enrollment_status", max_length=50, default="'ENROLLED'"),
+            ImportField("is_active", "bool", default="true"),
+        ),
+        lookups=(
+            Lookup(
+                "student_id", ("enrollment_number",),
+                "SELECT student_id AS id, enrollment_number FROM students WHERE org_id = %(org)s",
+                "student",
+            ),
+            Lookup(
+                "offering_id", ("course_code", "academic_year", "semester_type"),
+                "SELECT o.offering_id AS id, c.course_code, o.academic_year, o.semester_type"
+                " FROM course_offerings o JOIN courses c ON c.course_id = o.course_id"
+                " WHERE o.org_id = %(org)s AND o.is_active",
+                "course offering",
+            ),
+        ),
+        set_checks=(
+            # New active enrollments, numbered per offering in file order,
+            # must fit in max_capacity on top of the active ones already there
+            ((), """
+            SELECT n.row_no, 'course_code',
+                   'Offering is full (' || o.max_capacity || ' seats)'
+            FROM (
+                SELECT s.row_no, s.offering_id::uuid AS offering_id,
+                       row_number() OVER (PARTITION BY s.offering_id ORDER BY s.row_no) AS k
+                FROM import_stage s
+                WHERE s.offering_id IS NOT NULL AND s.student_id IS NOT NULL
+                  AND {active}
+                  AND NOT EXISTS (
+                      SELECT 1 FROM course_enrollments e
+                      WHERE e.student_id = s.student_id::uuid
+                        AND e.offering_id = s.offering_id::uuid AND e.is_active
+                  )
+            ) n
+            JOIN course_offerings o ON o.offering_id = n.offering_id
+            LEFT JOIN (
+                SELECT offering_id, count(*) AS c FROM course_enrollments
+                WHERE is_active AND offering_id IN (
+                    SELECT offering_id::uuid FROM import_stage WHERE offering_id IS NOT NULL
+                )
+                GROUP BY offering_id
+            ) e ON e.offering_id = n.offering_id
+            WHERE o.max_capacity IS NOT NULL AND COALESCE(e.c, 0) + n.k > o.max_capacity
+            """),
+        ),
+        insert_defaults=(("enrollment_date", "current_date"), *_TIMESTAMPS),
+        after_upsert=(
+            """
+            UPDATE course_offerings o SET total_enrolled = c.n, updated_at = now()
+            FROM (
+                SELECT offering_id, count(*) FILTER (WHERE is_active) AS n
+                FROM course_enrollments
+                WHERE offering_id IN (SELECT offering_id::uuid FROM import_stage)
+                GROUP BY offering_id
+            ) c
+            WHERE o.offering_id = c.offering_id
+            """,
+        ),
+    ),
+}
+
+
+class ImportFileError(Exception):
+    """File-level problem (format, size, headers) reported on the job."""
+
+
+class _Invalid(Exception):
+    """Validation found row-level errors; raised to roll the transaction back."""
+
+    def __init__(self, total: int, errors: List[dict], total_rows: int = 0):
+        super().__init__(f"{total} validation errors")
+        self.total = total
+        self.errors = errors
+        self.total_rows = total_rows
+
+
+# ---------------------------------------------------------------------------
+# SQL builders
+# ---------------------------------------------------------------------------
+def _lit(text: str) -> str:
+    return "'" + text.replace("'", "''").replace("%", "%%") + "'"
+
+
+def _typed(field: ImportField, alias: str = "s") -> str:
+    """Cast of a staged text column; NULL when blank or malformed (never raises)."""
+    col = f"{alias}.{field.name}"
+    if field.kind == "int":
+        return f"(CASE WHEN {col} ~ '^-?[0-9]{{1,9}}$' THEN {col}::integer END)"
+    if field.kind == "date":
+        # The regex alone admits 2023-02-30 or 0000-01-01, whose ::date cast
+        # raises and aborts the whole statement; CASE branches evaluate in
+        # order, so the calendar check only sees text the regex has vetted.
+        year = f"substr({col}, 1, 4)::integer"
+        month = f"substr({col}, 6, 2)::integer"
+        day = f"substr({col}, 9, 2)::integer"
+        leap = f"({year} %% 4 = 0 AND ({year} %% 100 <> 0 OR {year} %% 400 = 0))"
+        last_day = (
+            f"CASE WHEN {month} = 2 THEN CASE WHEN {leap} THEN 29 ELSE 28 END"
+            f" WHEN {month} IN (4, 6, 9, 11) THEN 30 ELSE 31 END"
+        )
+        return (
+            f"(CASE WHEN {col} !~ '{_DATE_RE}' THEN NULL"
+            f" WHEN {year} > 0 AND {day} <= {last_day} THEN {col}::date END)"
+        )
+    if field.kind == "bool":
+        true = ", ".join(map(_lit, _TRUE))
+        false = ", ".join(map(_lit, _FALSE))
+        return (
+            f"(CASE WHEN lower({col}) IN ({true}) THEN true"
+            f" WHEN lower({col}) IN ({false}) THEN false END)"
+        )
+    if field.kind == "choice":
+        return f"{_case_fn(field)}({col})"
+    return col
+
+
+def _case_fn(field: ImportField) -> str:
+    return "upper" if field.choices[0].isupper() else "lower"
+
+
+def _field_checks(spec: ImportSpec, present: List[str]) -> List[str]:
+    """SELECT row_no, column, message per field rule (one UNION ALL)."""
+    selects = []
+
+    def add(field, condition, message):
+        selects.append(
+            f"SELECT s.row_no, {_lit(field.name)}, {message} FROM import_stage s WHERE {condition}"
+        )
+
+    for field in spec.fields:
+        if field.name not in present:
+            continue
+        col = f"s.{field.name}"
+        if field.required:
+            add(field, f"{col} IS NULL", _lit(f"{field.name} is required"))
+        if field.kind in ("int", "date", "bool"):
+            expected = {"int": "an integer", "date": "a date (YYYY-MM-DD)", "bool": "true or false"}
+            add(
+                field, f"{col} IS NOT NULL AND {_typed(field)} IS NULL",
+                f"{_lit(field.name + ' must be ' + expected[field.kind] + ', got ')} || {col}",
+            )
+        if field.kind == "email":
+            add(field, f"{col} !~ '{_EMAIL_RE}'", f"{_lit('Invalid email ')} || {col}")
+        if field.kind == "choice":
+            allowed = ", ".join(map(_lit, field.choices))
+            add(
+                field, f"{_typed(field)} NOT IN ({allowed})",
+                _lit(f"{field.name} must be one of {', '.join(field.choices)}"),
+            )
+        if field.max_length:
+            add(
+                field, f"length({col}) > {field.max_length}",
+                _lit(f"{field.name} exceeds {field.max_length} characters"),
+            )
+        if field.bounds:
+            lo, hi = field.bounds
+            add(
+                field, f"{_typed(field)} NOT BETWEEN {lo} AND {hi}",
+                _lit(f"{field.name} must be between {lo} and {hi}"),
+            )
+    return selects
+
+
+def _lookup_sql(lookup: Lookup) -> Tuple[str, str]:
+    """(error SELECT, resolving UPDATE) for one lookup."""
+    keys = ", ".join(lookup.keys)
+    agg = (
+        f"WITH agg AS (SELECT {keys}, count(*) AS n, min(id::text) AS id"
+        f" FROM ({lookup.source}) src GROUP BY {keys})"
+    )
+    join = " AND ".join(f"a.{k} = s.{k}" for k in lookup.keys)
+    filled = " AND ".join(f"s.{k} IS NOT NULL" for k in lookup.keys)
+    shown = " || ' / ' || ".join(f"s.{k}" for k in lookup.keys)
+    errors = (
+        f"{agg} SELECT s.row_no, {_lit('+'.join(lookup.keys))},"
+        f" CASE WHEN a.n IS NULL THEN {_lit('Unknown ' + lookup.label + ' ')}"
+        f" ELSE {_lit('Ambiguous ' + lookup.label + ' ')} END || {shown}"
+        f" FROM import_stage s LEFT JOIN agg a ON {join}"
+        f" WHERE {filled} AND (a.n IS NULL OR a.n > 1)"
+    )
+    resolve = (
+        f"{agg} UPDATE import_stage s SET {lookup.target} = a.id"
+        f" FROM agg a WHERE {join} AND a.n = 1"
+    )
+    return errors, resolve
+
+
+def _key_expr(spec: ImportSpec, name: str) -> str:
+    if any(lookup.target == name for lookup in spec.lookups):
+        return f"s.{name}::uuid"
+    return f"s.{name}"
+
+
+def _match(spec: ImportSpec) -> str:
+    """Existing row t with the staged row's natural key."""
+    keys = " AND ".join(f"t.{k} = {_key_expr(spec, k)}" for k in spec.key)
+    return f"t.org_id = %(org)s AND {keys}"
+
+
+def _duplicate_sql(spec: ImportSpec) -> str:
+    keys = ", ".join(f"s.{k}" for k in spec.key)
+    filled = " AND ".join(f"s.{k} IS NOT NULL" for k in spec.key)
+    label = "+".join(
+        next(("+".join(lookup.keys) for lookup in spec.lookups if lookup.target == k), k)
+        for k in spec.key
+    )
+    return (
+        f"SELECT d.row_no, {_lit(label)}, {_lit('Duplicate of row ')} || d.first_row"
+        f" FROM (SELECT s.row_no, first_value(s.row_no) OVER w AS first_row,"
+        f" row_number() OVER w AS k FROM import_stage s WHERE {filled}"
+        f" WINDOW w AS (PARTITION BY {keys} ORDER BY s.row_no)) d WHERE d.k > 1"
+    )
+
+
+def _upsert_sql(spec: ImportSpec, present: List[str]) -> Tuple[str, str]:
+    """(UPDATE existing, INSERT new) for the staged rows."""
+    stored = [f for f in spec.fields if f.stored and f.name in present and f.name not in spec.key]
+    targets = [l.target for l in spec.lookups if l.target not in spec.key]
+
+    sets = [f"{f.name} = COALESCE({_typed(f)}, t.{f.name})" for f in stored]
+    sets += [f"{t} = s.{t}::uuid" for t in targets]
+    sets.append("updated_at = now()")
+    update = (
+        f"UPDATE {spec.table} t SET {', '.join(sets)}"
+        f" FROM import_stage s WHERE {_match(spec)}"
+    )
+
+    columns, values = [spec.pk, "org_id"], ["s.new_id::uuid", "%(org)s::uuid"]
+    for name in spec.key:
+        columns.append(name)
+        values.append(_key_expr(spec, name))
+    for field in spec.fields:
+        if not field.stored or field.name in spec.key:
+            continue
+        if field.name in present:
+            expr = _typed(field)
+            value = f"COALESCE({expr}, {field.default})" if field.default else expr
+        elif field.default:
+            value = field.default
+        else:
+            continue
+        columns.append(field.name)
+        values.append(value)
+    for target in targets:
+        columns.append(target)
+        values.append(f"s.{target}::uuid")
+    for column, default in spec.insert_defaults:
+        columns.append(column)
+        values.append(default)
+    insert = (
+        f"INSERT INTO {spec.table} ({', '.join(columns)})"
+        f" SELECT {', '.join(values)} FROM import_stage s"
+        f" WHERE NOT EXISTS (SELECT 1 FROM {spec.table} t WHERE {_match(spec)})"
+    )
+    return update, insert
+
+
+# ---------------------------------------------------------------------------
+# File reading
+# ---------------------------------------------------------------------------
+def _cell(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime.datetime):
+        return value.date().isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    text = str(value).strip()
+    return text or None
+
+
+def _read_rows(data: bytes, file_name: str) -> Tuple[List[str], Iterator[tuple], int]:
+    """(normalised header, iterator of raw rows, estimated row count) for .csv / .xlsx."""
+    name = file_name.lower()
+    if name.endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+
+        try:
+            sheet = load_workbook(io.BytesIO(data), read_only=True, data_only=True).active
+        except Exception as exc:
+            raise ImportFileError(f"Unreadable Excel file: {exc}")
+        rows = sheet.iter_rows(values_only=True)
+        estimate = (sheet.max_row or 0) - 1
+    elif name.endswith((".csv", ".txt")):
+        try:
+            text = data.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            text = data.decode("cp1252", errors="replace")  # Excel "CSV" on Windows
+        rows = csv.reader(io.StringIO(text))
+        estimate = text.count("\n")
+    else:
+        raise ImportFileError("Unsupported file type; upload .csv or .xlsx")
+    header = next(rows, None)
+    if not header:
+        raise ImportFileError("File is empty")
+    return [(_cell(h) or "").lower().replace(" ", "_") for h in header], rows, max(estimate, 1)
+
+
+class _CopyStream:
+    """File-like source for cursor.copy_expert that reports staging progress."""
+
+    def __init__(self, rows: Iterator[list], on_progress):
+        self._rows = rows
+        self._on_progress = on_progress
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._pending = ""
+        self.count = 0
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._pending) < size:
+            batch = 0
+            for row in self._rows:
+                self._writer.writerow(row)
+                self.count += 1
+                batch += 1
+                if self.count % _PROGRESS_EVERY == 0:
+                    self._on_progress(self.count)
+                if batch == _COPY_BATCH:
+                    break
+            if not batch:
+                break
+            self._pending += self._buffer.getvalue()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        if size < 0:
+            size = len(self._pending)
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+def _file_key(job_id) -> str:
+    return f"import:file:{job_id}"
+
+
+def _progress_key(job_id) -> str:
+    return f"import:progress:{job_id}"
+
+
+class BulkImportService:
+    """Create, run and report bulk import jobs"""
+
+    @staticmethod
+    def create_job(organization_id, user, entity: str, upload, dry_run: bool = False) -> ImportJob:
+        """
+        Park the uploaded file in Redis and record a pending ImportJob.
+        Raises ImportFileError for an unknown entity or an oversized file.
+        """
+        if entity not in SPECS:
+            raise ImportFileError(f"entity must be one of {', '.join(SPECS)}")
+        if upload.size > settings.IMPORT_MAX_FILE_BYTES:
+            raise ImportFileError(
+                f"File exceeds {settings.IMPORT_MAX_FILE_BYTES // (1024 * 1024)} MB"
+            )
+        job = ImportJob.objects.create(
+            organization_id=organization_id,
+            created_by=user if getattr(user, "pk", None) else None,
+            entity=entity,
+            file_name=upload.name[:255],
+            dry_run=dry_run,
+        )
+        cache.set(_file_key(job.id), upload.read(), settings.IMPORT_UPLOAD_TTL)
+        BulkImportService._progress(job.id, "queued", 0)
+        return job
+
+    @staticmethod
+    def enqueue(job: ImportJob) -> None:
+        """
+        Run the job on Celery once the request's transaction has committed
+        (the worker must see the ImportJob row); in-process daemon thread
+        when Celery is down.
+        """
+        transaction.on_commit(lambda: BulkImportService._dispatch(job))
+
+    @staticmethod
+    def _dispatch(job: ImportJob) -> None:
+        try:
+            from academics.celery_tasks import bulk_import_task
+
+            bulk_import_task.delay(str(job.id))
+        except Exception as celery_err:
+            logger.warning(
+                "Celery unavailable -- running import in a background thread",
+                extra={"error": str(celery_err), "job_id": str(job.id)},
+            )
+            threading.Thread(
+                target=BulkImportService._run_in_thread,
+                args=(str(job.id),),
+                daemon=True,
+                name=f"import-{job.id}",
+            ).start()
+
+    @staticmethod
+    def _run_in_thread(job_id: str) -> None:
+        try:
+            BulkImportService.run(job_id)
+        finally:
+            connection.close()  # this thread's own connection
+
+    @staticmethod
+    def progress(job_id) -> Optional[dict]:
+        return cache.get(_progress_key(job_id))
+
+    @staticmethod
+    def _progress(job_id, stage: str, percent: int, **extra) -> None:
+        cache.set(
+            _progress_key(job_id),
+            {"stage": stage, "percent": percent, **extra},
+            settings.IMPORT_UPLOAD_TTL,
+        )
+
+    @staticmethod
+    def describe(job: ImportJob) -> dict:
+        return {
+            "job_id": str(job.id),
+            "entity": job.entity,
+            "file_name": job.file_name,
+            "dry_run": job.dry_run,
+            "status": job.status,
+            "total_rows": job.total_rows,
+            "inserted": job.inserted_count,
+            "updated": job.updated_count,
+            "error_count": job.error_count,
+            "errors": job.errors,
+            "error_message": job.error_message,
+            "progress": BulkImportService.progress(job.id),
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        }
+
+    @staticmethod
+    def run(job_id: str) -> None:
+        """Execute a pending job end to end; outcome is written to the ImportJob."""
+        job = ImportJob.objects.get(id=job_id)
+        ImportJob.objects.filter(id=job.id).update(status="running")
+        data = cache.get(_file_key(job.id))
+        fields = {"completed_at": None}
+        try:
+            if data is None:
+                raise ImportFileError("Uploaded file expired before the import ran")
+            result = BulkImportService._execute(job, data)
+            fields.update(status="completed", **result)
+            BulkImportService._progress(job.id, "completed", 100, **result)
+        except _Invalid as invalid:
+            fields.update(
+                status="invalid", total_rows=invalid.total_rows,
+                error_count=invalid.total, errors=invalid.errors,
+            )
+            BulkImportService._progress(job.id, "invalid", 100, error_count=invalid.total)
+        except ImportFileError as exc:
+            fields.update(status="failed", error_message=str(exc))
+            BulkImportService._progress(job.id, "failed", 100)
+        except Exception as exc:
+            logger.exception("Bulk import failed", extra={"job_id": str(job.id)})
+            fields.update(status="failed", error_message=str(exc))
+            BulkImportService._progress(job.id, "failed", 100)
+        finally:
+            cache.delete(_file_key(job.id))
+        fields["completed_at"] = timezone.now()
+        ImportJob.objects.filter(id=job.id).update(**fields)
+        logger.info(
+            "Bulk import finished",
+            extra={"job_id": str(job.id), "entity": job.entity, "status": fields["status"]},
+        )
+
+    @staticmethod
+    def _execute(job: ImportJob, data: bytes) -> dict:
+        spec = SPECS[job.entity]
+        header, rows, estimate = _read_rows(data, job.file_name)
+        known = {f.name for f in spec.fields}
+        present = [name for name in dict.fromkeys(header) if name in known]
+        missing = [f.name for f in spec.fields if f.required and f.name not in present]
+        if missing:
+            raise _Invalid(len(missing), [
+                {"row": 1, "column": name, "message": f"Missing required column {name}"}
+                for name in missing
+            ])
+        positions = [header.index(name) for name in present]
+        targets = [lookup.target for lookup in spec.lookups]
+        params = {"org": str(job.organization_id)}
+
+        def staged() -> Iterator[list]:
+            count = 0
+            for row_no, row in enumerate(rows, start=2):
+                values = [_cell(row[i]) if i < len(row) else None for i in positions]
+                if not any(values):
+                    continue
+                count += 1
+                if count > settings.IMPORT_MAX_ROWS:
+                    raise ImportFileError(f"File exceeds {settings.IMPORT_MAX_ROWS} rows")
+                yield [row_no, str(uuid.uuid4()), *values, *([None] * len(targets))]
+
+        def on_staged(count: int) -> None:
+            BulkImportService._progress(
+                job.id, "staging", 5 + min(40, count * 40 // estimate), rows=count,
+            )
+
+        BulkImportService._progress(job.id, "staging", 5)
+        with transaction.atomic(), connection.cursor() as cursor:
+            # 1. Stage
+            columns = ["row_no", "new_id", *present, *targets]
+            cursor.execute(
+                "CREATE TEMP TABLE import_stage (row_no integer, new_id text, "
+                + ", ".join(f"{c} text" for c in columns[2:])
+                + ") ON COMMIT DROP"
+            )
+            cursor.execute(
+                "CREATE TEMP TABLE import_errors (row_no integer, col text, message text) ON COMMIT DROP"
+            )
+            stream = _CopyStream(staged(), on_staged)
+            cursor.copy_expert(
+                f"COPY import_stage ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", stream
+            )
+            total = stream.count
+            if not total:
+                raise ImportFileError("File has no data rows")
+            cursor.execute("ANALYZE import_stage")
+
+            # 2. Validate
+            BulkImportService._progress(job.id, "validating", 50, total_rows=total)
+            selects = _field_checks(spec, present)
+            typed = {f.name: _typed(f) for f in spec.fields if f.name in present}
+            for cols, condition, message in spec.checks:
+                if all(c in present for c in cols):
+                    selects.append(
+                        f"SELECT s.row_no, {_lit(cols[0])}, {_lit(message)}"
+                        f" FROM import_stage s WHERE {condition.format(**typed)}"
+                    )
+            cursor.execute("INSERT INTO import_errors " + " UNION ALL ".join(selects), params)
+            for lookup in spec.lookups:
+                errors_sql, resolve_sql = _lookup_sql(lookup)
+                cursor.execute("INSERT INTO import_errors " + errors_sql, params)
+                cursor.execute(resolve_sql, params)
+            cursor.execute("INSERT INTO import_errors " + _duplicate_sql(spec), params)
+            active = typed.get("is_active", "NULL")
+            for cols, sql in spec.set_checks:
+                if all(c in present for c in cols):
+                    cursor.execute(
+                        "INSERT INTO import_errors "
+                        + sql.format(active=f"COALESCE({active}, true)"),
+                        params,
+                    )
+            cursor.execute("SELECT count(*) FROM import_errors")
+            error_total = cursor.fetchone()[0]
+            if error_total:
+                cursor.execute(
+                    "SELECT row_no, col, message FROM import_errors ORDER BY row_no, col LIMIT %s",
+                    [settings.IMPORT_MAX_REPORTED_ERRORS],
+                )
+                raise _Invalid(error_total, [
+                    {"row": r, "column": c, "message": m} for r, c, m in cursor.fetchall()
+                ], total)
+
+            # 3. Upsert
+            BulkImportService._progress(job.id, "importing", 70, total_rows=total)
+            if job.dry_run:
+                cursor.execute(
+                    f"SELECT count(*) FROM import_stage s WHERE EXISTS"
+                    f" (SELECT 1 FROM {spec.table} t WHERE {_match(spec)})",
+                    params,
+                )
+                existing = cursor.fetchone()[0]
+                transaction.set_rollback(True)
+                return {"total_rows": total, "inserted_count": total - existing, "updated_count": existing}
+
+            update_sql, insert_sql = _upsert_sql(spec, present)
+            cursor.execute(f"LOCK TABLE {spec.table} IN SHARE ROW EXCLUSIVE MODE")
+            cursor.execute(update_sql, params)
+            updated = cursor.rowcount
+            cursor.execute(insert_sql, params)
+            inserted = cursor.rowcount
+            for sql in spec.after_upsert:
+                cursor.execute(sql, params)
+
+            # 4. One coalesced cache bump per model, on commit
+            for model_name in spec.models:
+                schedule_invalidation(model_name, job.organization_id, saves=inserted + updated)
+
+        return {"total_rows": total, "inserted_count": inserted, "updated_count": updated}
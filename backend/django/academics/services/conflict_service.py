@@ -1,10 +1,21 @@
 """
 Conflict Detection Service
 Detects and categorizes timetable conflicts with severity levels
+
+Jobs persisted by the FastAPI saga carry an indexed conflict table
+(timetable_conflicts, one row per conflict with severity and entity keys,
+covering student clashes, capacity, room type and sessions per day) and a
+timetable_data['conflict_index'] marker; the indexed_* methods read it with
+paginated queries and GROUP BY counts.  detect_conflicts remains the
+fallback for older jobs.
 """
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from collections import defaultdict
 
+from django.db.models import Count
+
+from ..models import GenerationJob, TimetableConflict
+
 
 class ConflictSeverity:
     """Conflict severity levels"""
@@ -21,6 +32,19 @@ class ConflictType:
     STUDENT = "student_conflict"
     CAPACITY = "capacity_violation"
     FEATURE = "feature_mismatch"
+    ROOM_TYPE = "room_type_mismatch"
+    DAILY_LOAD = "max_sessions_per_day"
+
+
+_INDEXED_SUGGESTIONS = {
+    ConflictType.FACULTY: 'Reschedule one class to different time slot',
+    ConflictType.ROOM: 'Assign one class to different room',
+    ConflictType.STUDENT: 'Move one class to a slot the student is free',
+    ConflictType.CAPACITY: 'Assign a larger room',
+    ConflictType.FEATURE: 'Assign a room with the required features',
+    ConflictType.ROOM_TYPE: 'Assign a room of the required type',
+    ConflictType.DAILY_LOAD: 'Move a session to another day',
+}
 
 
 class ConflictDetectionService:
@@ -124,3 +148,98 @@ class ConflictDetectionService:
             suggestions.append("Allow student to take course later")
         
         return suggestions
+
+    # ------------------------------------------------------------------
+    # Indexed conflicts (written at persist time)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def index_marker(job_id) -> Optional[Dict]:
+        """{variant: conflict count} when the job's conflicts are indexed, else None."""
+        marker = (
+            GenerationJob.objects.filter(id=job_id)
+            .values_list('timetable_data__conflict_index', flat=True)
+            .first()
+        )
+        return marker if isinstance(marker, dict) else None
+
+    @staticmethod
+    def indexed_variant(variant_index: int) -> str:
+        """Index variant name of the 0-based variant position used by the views."""
+        return str(int(variant_index) + 1)
+
+    @staticmethod
+    def _as_conflict(row: TimetableConflict) -> Dict:
+        """Indexed row in the detect_conflicts dict shape, plus entity keys."""
+        conflict = {
+            'type': row.conflict_type,
+            'severity': row.severity,
+            'day': row.day,
+            'time_slot': row.time_slot_id,
+            'courses': row.course_ids,
+            'message': row.message,
+            'suggestion': _INDEXED_SUGGESTIONS.get(row.conflict_type, ''),
+            'entity_type': row.entity_type,
+            'entity_id': row.entity_id,
+            'affected_count': row.affected_count,
+        }
+        if row.entity_type in ('faculty', 'room'):
+            conflict[row.entity_type] = row.entity_id
+        return conflict
+
+    @staticmethod
+    def indexed_conflicts(
+        job_id,
+        variant: str,
+        offset: int = 0,
+        limit: int = 100,
+        severity: Optional[str] = None,
+        conflict_type: Optional[str] = None,
+    ) -> Tuple[List[Dict], Dict]:
+        """One page of a variant's indexed conflicts and its aggregated summary."""
+        rows = TimetableConflict.objects.filter(generation_job_id=job_id, variant=variant)
+        summary = ConflictDetectionService._summary(
+            rows.values('severity', 'conflict_type').annotate(n=Count('id')).order_by()
+        )
+        if severity:
+            rows = rows.filter(severity=severity)
+        if conflict_type:
+            rows = rows.filter(conflict_type=conflict_type)
+        page = [
+            ConflictDetectionService._as_conflict(row)
+            for row in rows.order_by('id')[offset:offset + limit]
+        ]
+        return page, summary
+
+    @staticmethod
+    def indexed_variant_summaries(job_id) -> Dict[str, Dict]:
+        """{variant: summary} from one GROUP BY over the job's conflict rows."""
+        grouped = defaultdict(list)
+        for row in (
+            TimetableConflict.objects.filter(generation_job_id=job_id)
+            .values('variant', 'severity', 'conflict_type')
+            .annotate(n=Count('id'))
+            .order_by()
+        ):
+            grouped[row['variant']].append(row)
+        return {variant: ConflictDetectionService._summary(rows) for variant, rows in grouped.items()}
+
+    @staticmethod
+    def _summary(counts) -> Dict:
+        """categorize_conflicts-style counts from (severity, conflict_type, n) rows."""
+        summary = {
+            'by_type': {},
+            'by_severity': {},
+            'total': 0,
+            ConflictSeverity.CRITICAL: 0,
+            ConflictSeverity.HIGH: 0,
+            ConflictSeverity.MEDIUM: 0,
+            ConflictSeverity.LOW: 0,
+        }
+        for row in counts:
+            n = row['n']
+            summary['total'] += n
+            summary[row['severity']] = summary.get(row['severity'], 0) + n
+            summary['by_type'][row['conflict_type']] = summary['by_type'].get(row['conflict_type'], 0) + n
+            summary['by_severity'][row['severity']] = summary['by_severity'].get(row['severity'], 0) + n
+        return summary
@@ -0,0 +1,67 @@
+"""
+Published Timetable Service - Resolve and query an organisation's live timetable
+Reads FastAPI's persist-time indexes for the approved job / selected variant
+"""
+import logging
+from typing import Optional, Tuple
+
+import requests
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from ..models import GenerationJob
+
+logger = logging.getLogger(__name__)
+
+FINAL_VARIANT = "final"
+
+
+class PublishedTimetableService:
+    """Which generated result is live, and queries against its indexes"""
+
+    @staticmethod
+    def resolve(organization_id) -> Optional[Tuple[str, str]]:
+        """
+        (job_id, variant) of the organisation's latest approved timetable.
+        The selected variant id "{job_id}-variant-N" maps to index variant
+        "N"; without a selection the final timetable is used.
+        """
+        row = (
+            GenerationJob.objects
+            .filter(organization_id=organization_id, status="approved")
+            .order_by("-created_at")
+            .values_list("id", "timetable_data__selected_variant")
+            .first()
+        )
+        if row is None:
+            return None
+        job_id, selected = str(row[0]), row[1]
+        variant = FINAL_VARIANT
+        if selected and str(selected).startswith(f"{job_id}-variant-"):
+            variant = str(selected).rsplit("-", 1)[1]
+        return job_id, variant
+
+    @staticmethod
+    def owns(organization_id, job_id) -> bool:
+        """Whether `job_id` is a generation job of the organisation (False for malformed ids)."""
+        try:
+            return GenerationJob.objects.filter(id=job_id, organization_id=organization_id).exists()
+        except (ValueError, ValidationError):
+            return False
+
+    @staticmethod
+    def query(job_id: str, path: str, params: Optional[dict] = None, body: Optional[dict] = None):
+        """
+        GET (or POST when `body` is given) FastAPI /api/timetables/{job_id}/{path}.
+        Returns (status_code, json payload).
+        """
+        url = f"{settings.FASTAPI_URL}/api/timetables/{job_id}/{path}"
+        if body is not None:
+            resp = requests.post(url, json=body, timeout=5)
+        else:
+            resp = requests.get(url, params=params, timeout=5)
+        try:
+            payload = resp.json()
+        except ValueError:
+            payload = {"detail": resp.text}
+        return resp.status_code, payload
@@ -0,0 +1,127 @@
+"""
+Student Schedule Service - Read student weeks from the persist-time index
+Uses the Redis student index written by the FastAPI saga
+
+The FastAPI worker stores, per generation job and variant,
+  result:job:{job_id}:students:{variant}  HASH student_id → packed uint32 offsets
+  result:job:{job_id}:entries:{variant}   HASH offset → entry JSON
+(see FastAPI core.services.student_index).  A student's week is one HMGET
+of offsets plus one HMGET of those entries, however many departments their
+electives span; a section is the same two reads for all of its students.
+
+get_weeks returns the raw index entries; get_student_week maps them onto
+TimetableSlotSerializer's field names so callers that fall back to the
+database return the same row shape either way.
+"""
+import json
+import logging
+import ssl as ssl_module
+import sys
+from array import array
+from typing import Dict, List, Optional
+
+import redis
+from django.conf import settings
+
+from ..models import TimeSlot
+from .published_timetable_service import PublishedTimetableService
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[redis.Redis] = None
+
+
+def _get_redis_client() -> redis.Redis:
+    """Shared bytes-mode client (the offset arrays are binary)."""
+    global _client
+    if _client is None:
+        kwargs = {"socket_timeout": 3, "socket_connect_timeout": 3}
+        if settings.REDIS_URL.startswith("rediss://"):
+            kwargs["ssl_cert_reqs"] = ssl_module.CERT_NONE
+        _client = redis.from_url(settings.REDIS_URL, **kwargs)
+    return _client
+
+
+_DAY_CODES = [code for code, _label in TimeSlot.DAY_CHOICES]
+
+
+def _as_slot_row(entry: dict) -> dict:
+    """An index entry under TimetableSlotSerializer's field names (no slot row: id / timetable None)."""
+    day = entry.get("day")
+    if isinstance(day, int) and 0 <= day < len(_DAY_CODES):
+        day = _DAY_CODES[day]
+    return {
+        "id": None,
+        "timetable": None,
+        "day": day,
+        "start_time": entry.get("start_time"),
+        "end_time": entry.get("end_time"),
+        "subject": entry.get("course_id"),
+        "faculty": entry.get("faculty_id"),
+        "classroom": entry.get("room_id"),
+        "subject_name": entry.get("subject_name"),
+        "faculty_name": entry.get("faculty_name"),
+        "classroom_number": entry.get("room_code"),
+    }
+
+
+def _unpack(raw: bytes) -> array:
+    offsets = array("I")
+    offsets.frombytes(raw)
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    return offsets
+
+
+class StudentScheduleService:
+    """Published-timetable lookups for individual students and whole sections"""
+
+    @staticmethod
+    def get_weeks(job_id: str, variant: str, student_ids: List[str]) -> Optional[Dict[str, List[dict]]]:
+        """
+        {student_id: entries}, in persist order, for any number of students.
+        Returns None when the job has no student index (expired / older
+        result), so the caller can fall back to the database.
+        """
+        client = _get_redis_client()
+        s_key = f"result:job:{job_id}:students:{variant}"
+        pipe = client.pipeline(transaction=False)
+        pipe.exists(s_key)
+        pipe.hmget(s_key, list(student_ids) or ["_count"])
+        indexed, raw_offsets = pipe.execute()
+        if not indexed:
+            return None
+
+        per_student = {
+            sid: _unpack(raw) if raw else array("I")
+            for sid, raw in zip(student_ids, raw_offsets)
+        }
+        wanted = sorted(set().union(*per_student.values())) if per_student else []
+        if not wanted:
+            return {sid: [] for sid in student_ids}
+        rows = client.hmget(f"result:job:{job_id}:entries:{variant}", wanted)
+        by_offset = {
+            offset: json.loads(row) for offset, row in zip(wanted, rows) if row is not None
+        }
+        return {
+            sid: [by_offset[o] for o in offsets if o in by_offset]
+            for sid, offsets in per_student.items()
+        }
+
+    @staticmethod
+    def get_student_week(organization_id, student_id: str) -> Optional[List[dict]]:
+        """
+        One student's published week as TimetableSlotSerializer-shaped rows,
+        or None when no index is available.
+        """
+        published = PublishedTimetableService.resolve(organization_id)
+        if published is None:
+            return None
+        try:
+            weeks = StudentScheduleService.get_weeks(*published, [str(student_id)])
+        except redis.RedisError as exc:
+            logger.warning("Student index unavailable: %s", exc)
+            return None
+        if weeks is None:
+            return None
+        return [_as_slot_row(entry) for entry in weeks.get(str(student_id), [])]
@@ -2,8 +2,11 @@
 
 Architecture (write-through invalidation pattern):
   1. Admin saves Course/Faculty/Room/Student via Django → signal fires
-  2. Signal deletes the affected Redis cache keys immediately
-  3. FastAPI reads Redis → MISS → re-fetches from DB → writes to Redis
+  2. Signal records (model, org) with core.cache_invalidation; on commit the
+     whole transaction's changes bump the FastAPI data-cache namespaces in
+     one pipeline (no per-save SCAN / DELETE)
+  3. FastAPI builds keys under the new namespace → MISS → re-fetches from
+     DB → writes to Redis
   4. Subsequent generation jobs read from Redis (instant, ~1ms)
 
 Critical bug fixed: previously `invalidate_cache(org_name)` was called, but
@@ -12,6 +15,7 @@ signals were never read.  Now we use `instance.organization.pk` (the UUID).
 """
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from core.cache_invalidation import register_flush_hook, schedule_invalidation
 from .models import Course, CourseOffering, Faculty, Room, Student
 import redis
 import os
@@ -35,64 +39,47 @@ except Exception as _exc:
     logger.warning("[SIGNAL] Redis unavailable — cache invalidation disabled: %s", _exc)
 
 
-def _delete_org_cache(org_id: str) -> None:
-    """Delete all FastAPI data-cache keys for one organisation.
+# FastAPI CacheManager resources derived from each model.  Courses embed
+# enrolled student ids and faculty assignments, so those writes reach them.
+_RESOURCES_BY_MODEL = {
+    "course": ("courses",),
+    "courseoffering": ("courses",),
+    "courseenrollment": ("courses",),
+    "student": ("students", "courses"),
+    "faculty": ("faculty", "courses"),
+    "room": ("rooms",),
+}
+_NAMESPACE_TTL = 86400 * 30  # outlives every CacheManager TTL
 
-    Called whenever any timetable-relevant record changes.  Uses Redis SCAN
-    (not KEYS) to avoid blocking the server on large key spaces.
 
-    Cache key format used by FastAPI CacheManager:
-        {resource_type}:{org_id}[:{extra_params}]
-    e.g.  courses:abc-uuid:semester:1
-          faculty:abc-uuid
-          rooms:abc-uuid
-          students:abc-uuid
-     Also bumps the version key so fetch_courses() detects the invalidation:
-          ttdata:version:{org_id}:{semester}
+def _bump_data_namespaces(batch) -> int:
+    """Flush hook: bump FastAPI data-cache namespaces for changed resources.
+
+    CacheManager keys embed ``ttdata:ns:{org_id}:{resource}`` (see
+    utils/cache_manager.py), so one INCR per (org, resource) makes every
+    cached variant of that resource unreachable — no SCAN, no DELETE; old
+    values expire by TTL.  All bumps of a transaction share one pipeline.
     """
     if not _redis_client:
-        return
-
-    import time
-
-    try:
-        # Patterns for every cache type FastAPI stores per org
-        patterns = [
-            f"courses:{org_id}:*",
-            f"faculty:{org_id}*",
-            f"rooms:{org_id}*",
-            f"students:{org_id}*",
-            f"config:{org_id}*",
-            f"departments:{org_id}*",
-        ]
-
-        deleted = 0
-        for pattern in patterns:
-            keys = list(_redis_client.scan_iter(match=pattern, count=100))
-            if keys:
-                _redis_client.delete(*keys)
-                deleted += len(keys)
-
-        # Bump version key so fetch_courses() version-check sees the change
-        new_version = str(int(time.time()))
-        for semester in (1, 2):
-            _redis_client.setex(
-                f"ttdata:version:{org_id}:{semester}",
-                86400,
-                new_version,
-            )
-
-        logger.info(
-            "[SIGNAL] Cache invalidated",
-            extra={"org_id": org_id, "keys_deleted": deleted, "new_version": new_version},
-        )
-
-    except Exception as exc:
-        # Never let a cache error break the Django save operation
-        logger.warning(
-            "[SIGNAL] Cache invalidation error (non-fatal)",
-            extra={"org_id": org_id, "error": str(exc)},
-        )
+        return 0
+    keys = {
+        f"ttdata:ns:{org_id}:{resource}"
+        for org_id, models in batch.items() if org_id
+        for model_name in models
+        for resource in _RESOURCES_BY_MODEL.get(model_name, ())
+    }
+    if not keys:
+        return 0
+    pipe = _redis_client.pipeline(transaction=False)
+    for key in sorted(keys):
+        pipe.incr(key)
+        pipe.expire(key, _NAMESPACE_TTL)
+    pipe.execute()
+    logger.info("[SIGNAL] Data-cache namespaces bumped", extra={"namespaces": len(keys)})
+    return 1
+
+
+register_flush_hook(_bump_data_namespaces)
 
 
 def _extract_org_id(instance) -> str | None:
@@ -121,19 +108,19 @@ def _extract_org_id(instance) -> str | None:
 @receiver([post_save, post_delete], sender=Faculty)
 @receiver([post_save, post_delete], sender=Room)
 def invalidate_on_data_change(sender, instance, **kwargs):
-    """Invalidate Redis timetable-data cache when any relevant record changes.
+    """Schedule timetable-data cache invalidation when a relevant record changes.
 
     Fires on every save/delete for Course, CourseOffering, Student, Faculty,
-    Room.  Extracts the org_id UUID and deletes the corresponding Redis keys.
-    FastAPI will re-fetch from DB on the next generation request.
+    Room.  Only records (model, org_id); the namespace bumps, dashboard
+    stats drop and L1 broadcast happen once when the transaction commits
+    (core.cache_invalidation), however many rows it wrote.
     """
     org_id = _extract_org_id(instance)
     if org_id:
-        _delete_org_cache(org_id)
+        schedule_invalidation(sender.__name__, org_id)
     else:
         logger.warning(
             "[SIGNAL] org_id not found for %s pk=%s — skipping cache invalidation",
             sender.__name__,
             getattr(instance, 'pk', '?'),
         )
-
@@ -39,6 +39,9 @@ from .views import (
     get_department_timetable,
     get_faculty_timetable,
     get_student_timetable,
+    get_free_rooms,
+    get_free_slots,
+    get_common_free_slots,
     # Progress / SSE
     get_progress,
     stream_progress,
@@ -53,6 +56,9 @@ from .views import (
     # Conflict & config
     ConflictViewSet,
     TimetableConfigurationViewSet,
+    # Bulk import
+    import_jobs,
+    import_job_detail,
 )
 
 router = DefaultRouter()
@@ -89,6 +95,13 @@ urlpatterns = [
     ),
     path("timetable/faculty/me/", get_faculty_timetable, name="faculty-timetable"),
     path("timetable/student/me/", get_student_timetable, name="student-timetable"),
+    path("timetable/free-rooms/", get_free_rooms, name="free-rooms"),
+    path(
+        "timetable/free-slots/<str:kind>/<str:entity_id>/",
+        get_free_slots,
+        name="free-slots",
+    ),
+    path("timetable/common-free-slots/", get_common_free_slots, name="common-free-slots"),
     path("timetable/callback/", fastapi_callback, name="fastapi-callback"),
     # Progress tracking endpoints (Enterprise SSE pattern)
     path("generation/progress/<str:job_id>/", get_progress, name="generation-progress"),
@@ -114,6 +127,9 @@ urlpatterns = [
     path("auth/sessions/<str:jti>/", revoke_session_view, name="session-revoke"),
     # Dashboard stats
     path("dashboard/stats/", dashboard_stats, name="dashboard-stats"),
+    # Bulk CSV / Excel import
+    path("imports/", import_jobs, name="import-jobs"),
+    path("imports/<uuid:job_id>/", import_job_detail, name="import-job-detail"),
     # PERFORMANCE: Ultra-fast endpoints
     path("fast/jobs/", fast_generation_jobs, name="fast-jobs"),
     path("fast/faculty/", fast_faculty, name="fast-faculty"),
@@ -21,6 +21,7 @@ Sub-modules by responsibility:
   fast_views.py           - ultra-fast cached list endpoints
   conflict_views.py       - ConflictViewSet
   timetable_config_views.py - TimetableConfigurationViewSet
+  import_views.py         - bulk CSV / Excel import jobs
 """
 
 # ── Auth ─────────────────────────────────────────────────────────────────────
@@ -72,6 +73,9 @@ from .timetable_views import (
     get_department_timetable,
     get_faculty_timetable,
     get_student_timetable,
+    get_free_rooms,
+    get_free_slots,
+    get_common_free_slots,
 )
 
 # ── Progress / SSE ────────────────────────────────────────────────────────────
@@ -93,6 +97,9 @@ from .conflict_views import ConflictViewSet
 # ── Timetable configuration ───────────────────────────────────────────────────
 from .timetable_config_views import TimetableConfigurationViewSet
 
+# ── Bulk import ───────────────────────────────────────────────────────────────
+from .import_views import import_jobs, import_job_detail
+
 __all__ = [
     # Auth
     'login_view', 'logout_view', 'current_user_view', 'refresh_token_view',
@@ -109,6 +116,7 @@ __all__ = [
     'GenerationJobViewSet', 'TimetableWorkflowViewSet', 'TimetableVariantViewSet',
     # Timetable display
     'fastapi_callback', 'get_department_timetable', 'get_faculty_timetable', 'get_student_timetable',
+    'get_free_rooms', 'get_free_slots', 'get_common_free_slots',
     # Progress
     'get_progress', 'stream_progress', 'health_check',
     # Fast endpoints
@@ -118,4 +126,6 @@ __all__ = [
     'ConflictViewSet',
     # Config
     'TimetableConfigurationViewSet',
+    # Import
+    'import_jobs', 'import_job_detail',
 ]
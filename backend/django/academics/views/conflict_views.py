@@ -22,13 +22,33 @@ class ConflictViewSet(viewsets.ViewSet):
     
     @action(detail=False, methods=['get'])
     def detect(self, request):
-        """Detect conflicts in timetable"""
+        """
+        Detect conflicts in timetable.  Indexed jobs return one page
+        (?page, ?page_size, ?severity, ?type) of persist-time conflicts;
+        older jobs are re-detected from timetable_data.
+        """
         job_id = request.query_params.get('job_id')
         variant_id = request.query_params.get('variant_id', 0)
         
         if not job_id:
             return Response({'error': 'job_id required'}, status=status.HTTP_400_BAD_REQUEST)
         
+        try:
+            variant_id = int(variant_id)
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', 100)), 1), 500)
+        except (TypeError, ValueError):
+            return Response({'error': 'variant_id, page and page_size must be integers'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        severity = request.query_params.get('severity') or None
+        conflict_type = request.query_params.get('type') or None
+
+        marker = ConflictDetectionService.index_marker(job_id)
+        if marker is not None:
+            return self._detect_indexed(
+                request, job_id, variant_id, marker, page, page_size, severity, conflict_type,
+            )
+
         cache_key = f'conflicts_{job_id}_{variant_id}'
         cached = cache.get(cache_key)
         if cached:
@@ -38,10 +58,10 @@ class ConflictViewSet(viewsets.ViewSet):
             job = GenerationJob.objects.get(id=job_id)
             variants = (job.timetable_data or {}).get('variants', [])
             
-            if not variants or int(variant_id) >= len(variants):
+            if not variants or variant_id >= len(variants):
                 return Response({'error': 'Variant not found'}, status=status.HTTP_404_NOT_FOUND)
             
-            variant = variants[int(variant_id)]
+            variant = variants[variant_id]
             entries = variant.get('timetable_entries', [])
             
             # Detect conflicts
@@ -50,20 +70,61 @@ class ConflictViewSet(viewsets.ViewSet):
             
             result = {
                 'job_id': str(job_id),
-                'variant_id': int(variant_id),
+                'variant_id': variant_id,
                 'conflicts': conflicts[:100],
                 'summary': categorized,
                 'total_entries': len(entries),
+                'source': 'detected',
             }
             cache.set(cache_key, result, 600)  # 10 min
 
             # Acknowledged indices are user-session state — not cached with result
-            acknowledged = self._get_acknowledged(str(job_id), int(variant_id))
+            acknowledged = self._get_acknowledged(str(job_id), variant_id)
             response_data = {**result, 'acknowledged_indices': acknowledged}
             return Response(response_data)
             
         except GenerationJob.DoesNotExist:
             return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    def _detect_indexed(self, request, job_id, variant_id, marker, page, page_size,
+                        severity, conflict_type):
+        """detect() over the persist-time conflict index: one page plus counts."""
+        variant = ConflictDetectionService.indexed_variant(variant_id)
+        if variant not in marker:
+            return Response({'error': 'Variant not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        cache_key = (
+            f'conflicts_{job_id}_{variant_id}_p{page}_{page_size}'
+            f'_{severity or "all"}_{conflict_type or "all"}'
+        )
+        result = cache.get(cache_key)
+        if not result:
+            conflicts, summary = ConflictDetectionService.indexed_conflicts(
+                job_id, variant,
+                offset=(page - 1) * page_size, limit=page_size,
+                severity=severity, conflict_type=conflict_type,
+            )
+            total_entries = (
+                GenerationJob.objects.filter(id=job_id)
+                .values_list(
+                    f'timetable_data__variants__{variant_id}__statistics__total_classes', flat=True,
+                )
+                .first()
+            )
+            result = {
+                'job_id': str(job_id),
+                'variant_id': variant_id,
+                'conflicts': conflicts,
+                'summary': summary,
+                'total_entries': total_entries or 0,
+                'page': page,
+                'page_size': page_size,
+                'source': 'index',
+            }
+            cache.set(cache_key, result, 600)  # 10 min
+
+        acknowledged = self._get_acknowledged(str(job_id), variant_id)
+        return Response({**result, 'acknowledged_indices': acknowledged})
     
     @action(detail=False, methods=['get'])
     def summary(self, request):
@@ -78,6 +139,26 @@ class ConflictViewSet(viewsets.ViewSet):
         if cached:
             return Response(cached)
         
+        marker = ConflictDetectionService.index_marker(job_id)
+        if marker is not None:
+            counts = ConflictDetectionService.indexed_variant_summaries(job_id)
+            summaries = []
+            # Variants are 1-based in the index; "final" is not a variant
+            for idx in range(sum(1 for v in marker if v.isdigit())):
+                categorized = counts.get(ConflictDetectionService.indexed_variant(idx), {})
+                summaries.append({
+                    'variant_id': idx,
+                    'total_conflicts': categorized.get('total', 0),
+                    'critical': categorized.get('critical', 0),
+                    'high': categorized.get('high', 0),
+                    'medium': categorized.get('medium', 0),
+                    'low': categorized.get('low', 0),
+                    'by_type': categorized.get('by_type', {}),
+                })
+            result = {'job_id': str(job_id), 'variants': summaries, 'source': 'index'}
+            cache.set(cache_key, result, 600)
+            return Response(result)
+
         try:
             job = GenerationJob.objects.get(id=job_id)
             variants = (job.timetable_data or {}).get('variants', [])
@@ -3,17 +3,16 @@ Dashboard views: Stats, student profile, faculty profile
 User-specific dashboard data and course information
 
 Caching strategy:
-  L1 — process-local dict (microseconds, survives Redis outages)
+  L1 — process-local LRU (microseconds, survives Redis outages)
   L2 — Redis via CacheService (cross-process, cross-worker)
   L3 — PostgreSQL (authoritative)
   TTL = 5 min at every layer.
 """
 
 import logging
-import time
-from typing import Any
 
 from core.cache_service import CacheService
+from core.l1_cache import get_l1_cache
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -25,25 +24,14 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 # L1 — Process-local in-memory cache
 # ---------------------------------------------------------------------------
-# Completely independent of Redis.  On a cold start (or Render free-tier spin-up)
-# the first request hits L3; every subsequent request within _L1_TTL seconds
-# returns in <1 ms without any network I/O.
-# Key format: "dashboard_stats:<org_id>"  Value: (payload_dict, expire_at)
+# Completely independent of Redis reads.  On a cold start (or Render free-tier
+# spin-up) the first request hits L3; every subsequent request within the TTL
+# returns in <1 ms without any network I/O.  Bounded LRU + TTL, entries tagged
+# with the org id so academics.signals drops them in every worker when the
+# org's data changes (core.l1_cache).
+# Key format: "dashboard_stats:<org_id>"
 # ---------------------------------------------------------------------------
-_L1_STORE: dict[str, tuple[Any, float]] = {}
-_L1_TTL = 300  # seconds (5 min — same as Redis TTL)
-
-
-def _l1_get(key: str) -> Any:
-    entry = _L1_STORE.get(key)
-    if entry and time.monotonic() < entry[1]:
-        return entry[0]
-    _L1_STORE.pop(key, None)  # evict expired entry
-    return None
-
-
-def _l1_set(key: str, value: Any) -> None:
-    _L1_STORE[key] = (value, time.monotonic() + _L1_TTL)
+_L1 = get_l1_cache("dashboard_stats", ttl=300)  # 5 min — same as Redis TTL
 
 
 @api_view(["GET"])
@@ -58,7 +46,7 @@ def dashboard_stats(request):
     redis_key = CacheService.generate_cache_key("stats", "dashboard", org_id=str(org_pk))
 
     # ── L1: process-local (fastest, no network) ────────────────────────────
-    l1_hit = _l1_get(l1_key)
+    l1_hit = _L1.get(l1_key)
     if l1_hit is not None:
         resp = Response(l1_hit)
         resp["X-Cache"] = "L1-HIT"
@@ -68,7 +56,7 @@ def dashboard_stats(request):
     try:
         redis_hit = CacheService.get(redis_key)
         if redis_hit is not None:
-            _l1_set(l1_key, redis_hit)  # warm L1
+            _L1.set(l1_key, redis_hit, tags=[str(org_pk)])  # warm L1
             resp = Response(redis_hit)
             resp["X-Cache"] = "L2-HIT"
             return resp
@@ -102,7 +90,7 @@ def dashboard_stats(request):
         }
 
         # Write to both L1 and L2
-        _l1_set(l1_key, payload)
+        _L1.set(l1_key, payload, tags=[str(org_pk)])
         try:
             CacheService.set(redis_key, payload, timeout=300)
         except Exception:
@@ -115,9 +103,9 @@ def dashboard_stats(request):
     except Exception as exc:
         logger.warning("dashboard_stats DB query failed: %s", exc)
         # Return whatever is in L1 even if expired, beats returning zeros
-        stale = _L1_STORE.get(l1_key)
-        if stale:
-            resp = Response(stale[0])
+        stale = _L1.get(l1_key, allow_stale=True)
+        if stale is not None:
+            resp = Response(stale)
             resp["X-Cache"] = "L1-STALE"
             return resp
         return Response({
@@ -31,8 +31,10 @@ class FacultyViewSet(DataSyncMixin, PerformanceMetricsMixin, SmartCachedViewSet)
         """Faculty timetable \u2014 cached per faculty-id."""
         from core.cache_service import CacheService
         faculty = self.get_object()
-        cache_key = CacheService.generate_cache_key(
-            "timetable", "faculty", faculty_id=str(faculty.pk)
+        # TimetableSlot / Timetable versions are bumped on commit of any write
+        cache_key = CacheService.versioned_generate_cache_key(
+            "timetable", "timetableslot", view="faculty", faculty_id=str(faculty.pk),
+            timetable_ver=CacheService.get_model_version("timetable"),
         )
 
         def _fetch():
@@ -0,0 +1,104 @@
+"""
+Bulk Import API Views
+Upload CSV / Excel files of students, courses, faculty or enrollments
+
+POST /api/imports/            multipart: file, entity, dry_run → 202 + job
+GET  /api/imports/            recent import jobs of the organisation
+GET  /api/imports/{job_id}/   status, live progress and row-level errors
+
+The work runs in the background (academics.services.bulk_import_service).
+"""
+import logging
+
+from rest_framework import status
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import ImportJob
+from ..services.bulk_import_service import SPECS, BulkImportService, ImportFileError
+
+logger = logging.getLogger(__name__)
+
+_IMPORT_ROLES = ("super_admin", "org_admin")
+
+
+def _forbidden():
+    return Response(
+        {"success": False, "error": "Only administrators can import data"},
+        status=status.HTTP_403_FORBIDDEN,
+    )
+
+
+@api_view(["GET", "POST"])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser, FormParser])
+def import_jobs(request):
+    """
+    GET:  the organisation's 20 most recent imports
+    POST: queue an import; ?dry_run=true (or form field) validates only.
+          Columns per entity are listed in the 400 response for a bad entity.
+    """
+    if request.user.role not in _IMPORT_ROLES:
+        return _forbidden()
+    org_id = request.user.organization_id
+
+    if request.method == "GET":
+        jobs = ImportJob.objects.filter(organization_id=org_id)[:20]
+        return Response({
+            "success": True,
+            "jobs": [BulkImportService.describe(job) for job in jobs],
+        })
+
+    upload = request.FILES.get("file")
+    entity = request.data.get("entity")
+    if upload is None:
+        return Response(
+            {"success": False, "error": "file required"}, status=status.HTTP_400_BAD_REQUEST
+        )
+    if entity not in SPECS:
+        return Response(
+            {
+                "success": False,
+                "error": f"entity must be one of {', '.join(SPECS)}",
+                "columns": {
+                    name: [
+                        {"name": f.name, "required": f.required, "type": f.kind}
+                        for f in spec.fields
+                    ]
+                    for name, spec in SPECS.items()
+                },
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    dry_run = str(
+        request.data.get("dry_run", request.query_params.get("dry_run", ""))
+    ).lower() in ("1", "true", "yes")
+
+    try:
+        job = BulkImportService.create_job(org_id, request.user, entity, upload, dry_run=dry_run)
+    except ImportFileError as exc:
+        return Response({"success": False, "error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    BulkImportService.enqueue(job)
+    logger.info(
+        "Bulk import queued",
+        extra={"job_id": str(job.id), "entity": entity, "file_name": job.file_name, "dry_run": dry_run},
+    )
+    return Response(
+        {"success": True, **BulkImportService.describe(job)}, status=status.HTTP_202_ACCEPTED
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def import_job_detail(request, job_id):
+    """Status, live progress and row-level errors of one import"""
+    if request.user.role not in _IMPORT_ROLES:
+        return _forbidden()
+    job = ImportJob.objects.filter(id=job_id, organization_id=request.user.organization_id).first()
+    if job is None:
+        return Response(
+            {"success": False, "error": "Import not found"}, status=status.HTTP_404_NOT_FOUND
+        )
+    return Response({"success": True, **BulkImportService.describe(job)})
@@ -22,7 +22,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ..models import GenerationJob
-from ..services import DepartmentViewService
+from ..services import DepartmentViewService, PublishedTimetableService
 from core.rbac import CanViewTimetable, DepartmentAccessPermission, has_department_access
 
 logger = logging.getLogger(__name__)
@@ -184,6 +184,12 @@ class TimetableVariantViewSet(viewsets.ViewSet):
           a               — variant id  (e.g. "{job_id}-variant-1")
           b               — variant id  (e.g. "{job_id}-variant-2")
           department_id   — optional; "all" or a dept UUID
+          page, page_size — pagination of changed sessions (default 1, 200)
+          include_shared  — "false" to omit shared_slots (default true)
+
+        Served from the diff FastAPI precomputes at persist time when
+        available (adds changes / per_department / faculty_load_changes);
+        otherwise both entry lists are extracted and diffed here.
 
         Returns:
           shared_slots    — entries present and identical in both A and B
@@ -204,13 +210,30 @@ class TimetableVariantViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        try:
+            page = max(int(request.query_params.get("page", 1)), 1)
+            page_size = min(max(int(request.query_params.get("page_size", 200)), 1), 1000)
+        except ValueError:
+            return Response(
+                {"error": "page and page_size must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        include_shared = request.query_params.get("include_shared", "true").lower() != "false"
+
         cache_key = (
-            f"variant_compare_{var_a_id}_{var_b_id}_{dept_id}"
+            f"variant_compare_{var_a_id}_{var_b_id}_{dept_id}_{page}_{page_size}_{int(include_shared)}"
         )
         cached = cache.get(cache_key)
         if cached:
             return Response(cached)
 
+        precomputed = self._precomputed_diff(
+            job_id, var_a_id, var_b_id, dept_id, page, page_size, include_shared
+        )
+        if precomputed is not None:
+            cache.set(cache_key, precomputed, 300)
+            return Response(precomputed)
+
         raw_a = self._fetch_variant_entries(job_id, var_a_id)
         raw_b = self._fetch_variant_entries(job_id, var_b_id)
 
@@ -232,9 +255,71 @@ class TimetableVariantViewSet(viewsets.ViewSet):
         return Response(result)
 
     # ------------------------------------------------------------------
-    # Diff helper
+    # Diff helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _index_variant(job_id: str, variant_id: str) -> str:
+        """Map "{job_id}-variant-N" to FastAPI's index variant "N" ("final" passes through)."""
+        prefix = f"{job_id}-variant-"
+        return variant_id[len(prefix):] if variant_id.startswith(prefix) else variant_id
+
+    def _precomputed_diff(
+        self, job_id, var_a_id, var_b_id, dept_id, page, page_size, include_shared
+    ) -> dict | None:
+        """
+        Compare response built from the diff FastAPI stored at persist time
+        (lookup + pagination, no JSONB extraction).  None when the job has
+        no precomputed diffs, so the caller diffs the entry lists instead.
+        """
+        try:
+            code, payload = PublishedTimetableService.query(job_id, "diff", params={
+                "a": self._index_variant(job_id, var_a_id),
+                "b": self._index_variant(job_id, var_b_id),
+                "department_id": dept_id,
+                "page": page,
+                "page_size": page_size,
+                "include_shared": str(include_shared).lower(),
+            })
+        except Exception as exc:
+            logger.warning(
+                "Precomputed variant diff unavailable",
+                extra={"job_id": job_id, "error": str(exc)},
+            )
+            return None
+        if code != 200:
+            return None
+
+        changes = payload.get("changes", [])
+        only_in_a = self._convert_timetable_entries([c["entry_a"] for c in changes if c.get("entry_a")])
+        only_in_b = self._convert_timetable_entries([c["entry_b"] for c in changes if c.get("entry_b")])
+        shared = self._convert_timetable_entries(payload.get("shared_entries", []))
+        summary = payload.get("summary", {})
+        total = payload.get("total_changes", 0)
+        return {
+            "shared_slots": shared,
+            "only_in_a": only_in_a,
+            "only_in_b": only_in_b,
+            "conflicts_a": [e for e in only_in_a + shared if e.get("has_conflict")],
+            "conflicts_b": [e for e in only_in_b + shared if e.get("has_conflict")],
+            "summary": {
+                "identical": summary.get("unchanged", len(shared)),
+                "diff_a": total,
+                "diff_b": total,
+                "conflicts_a": 0,
+                "conflicts_b": 0,
+                "moved": summary.get("moved", 0),
+                "room_changes": summary.get("room_changes", 0),
+            },
+            "changes": changes,
+            "per_department": summary.get("per_department", {}),
+            "faculty_load_changes": summary.get("faculty_load_changes", []),
+            "page": payload.get("page", page),
+            "page_size": payload.get("page_size", page_size),
+            "total_changes": total,
+            "source": "precomputed",
+        }
+
     def _entry_key(self, entry: dict) -> str:
         """Canonical identity key for deduplication in diff."""
         return "|".join([
@@ -1,11 +1,13 @@
 """
 Timetable Viewing API - RBAC-based timetable access
-HOD, Faculty, and Student views
+HOD, Faculty, and Student views; room availability over the published timetable
 
 Caching:
   - department timetable : 3 min  (cache_key scoped to dept_id)
   - faculty timetable    : 3 min  (cache_key scoped to faculty pk)
-  - student timetable    : 3 min  (cache_key scoped to student pk + semester)
+  - student timetable    : 3 min  (cache_key scoped to student pk + semester);
+                           served from the persist-time student index when
+                           the published job has one
   All views emit X-Cache: HIT|MISS headers.
 """
 import logging
@@ -18,12 +20,25 @@ from rest_framework.response import Response
 
 from ..models import Department, TimetableSlot
 from ..serializers import TimetableSlotSerializer
+from ..services import PublishedTimetableService, StudentScheduleService
 
 logger = logging.getLogger(__name__)
 
 _TIMETABLE_TTL = 180   # 3 minutes — timetables can be regenerated mid-day
 
 
+def _timetable_cache_key(view: str, **params) -> str:
+    """
+    Key embedding the TimetableSlot and Timetable versions: any committed
+    slot or timetable write bumps them (core.cache_invalidation), so stale
+    entries become unreachable instead of being deleted.
+    """
+    return CacheService.versioned_generate_cache_key(
+        "timetable", "timetableslot", view=view,
+        timetable_ver=CacheService.get_model_version("timetable"), **params,
+    )
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def get_department_timetable(request, dept_id):
@@ -63,9 +78,7 @@ def get_department_timetable(request, dept_id):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-    cache_key = CacheService.generate_cache_key(
-        "timetable", "department", dept_id=str(dept_id)
-    )
+    cache_key = _timetable_cache_key("department", dept_id=str(dept_id))
 
     def _fetch():
         department = Department.objects.get(dept_id=dept_id)
@@ -131,9 +144,7 @@ def get_faculty_timetable(request):
             status=status.HTTP_404_NOT_FOUND,
         )
 
-    cache_key = CacheService.generate_cache_key(
-        "timetable", "faculty", faculty_pk=str(faculty_profile.pk)
-    )
+    cache_key = _timetable_cache_key("faculty", faculty_pk=str(faculty_profile.pk))
 
     def _fetch():
         slots = (
@@ -199,8 +210,8 @@ def get_student_timetable(request):
             status=status.HTTP_404_NOT_FOUND,
         )
 
-    cache_key = CacheService.generate_cache_key(
-        "timetable", "student",
+    cache_key = _timetable_cache_key(
+        "student",
         student_pk=str(student.pk),
         semester=str(student.current_semester),
     )
@@ -215,15 +226,24 @@ def get_student_timetable(request):
             except Batch.DoesNotExist:
                 pass
 
-        slots = []
-        if batch:
-            slots = (
-                TimetableSlot.objects.filter(
-                    batch=batch, timetable__is_active=True
-                )
-                .select_related("subject", "faculty", "classroom", "timetable")
-                .order_by("day", "start_time")
-            )
+        # Persist-time student index first: one lookup covers electives in
+        # every department; the batch query is the fallback.
+        indexed = StudentScheduleService.get_student_week(
+            student.organization_id, student.student_id
+        )
+        if indexed is not None:
+            source, slots = "student_index", indexed
+        else:
+            source, slots = "database", []
+            if batch:
+                slots = TimetableSlotSerializer(
+                    TimetableSlot.objects.filter(
+                        batch=batch, timetable__is_active=True
+                    )
+                    .select_related("subject", "faculty", "classroom", "timetable")
+                    .order_by("day", "start_time"),
+                    many=True,
+                ).data
 
         return {
             "success": True,
@@ -236,7 +256,8 @@ def get_student_timetable(request):
                 "department":   student.department.dept_name if student.department else "N/A",
             },
             "total_classes": len(slots),
-            "slots": TimetableSlotSerializer(slots, many=True).data,
+            "source": source,
+            "slots": slots,
         }
 
     try:
@@ -254,6 +275,101 @@ def get_student_timetable(request):
         )
 
 
+_ROOM_FINDER_ROLES = ("super_admin", "org_admin", "hod", "faculty")
+
+
+def _published_or_requested(request):
+    """
+    (job_id, variant) from job_id / variant params, else the published
+    timetable; None when neither resolves to a job of the user's organisation.
+    """
+    source = request.data if request.method == "POST" else request.query_params
+    job_id = source.get("job_id")
+    if job_id:
+        if not PublishedTimetableService.owns(request.user.organization_id, job_id):
+            return None
+        return str(job_id), str(source.get("variant") or "final")
+    return PublishedTimetableService.resolve(request.user.organization_id)
+
+
+def _proxy_occupancy(request, path, params=None, body=None):
+    if request.user.role not in _ROOM_FINDER_ROLES:
+        return Response(
+            {"success": False, "error": "Only staff can search room availability"},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    target = _published_or_requested(request)
+    if target is None:
+        return Response(
+            {"success": False, "error": "No published timetable"},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    job_id, variant = target
+    try:
+        if body is not None:
+            code, payload = PublishedTimetableService.query(
+                job_id, path, body={**body, "variant": variant}
+            )
+        else:
+            code, payload = PublishedTimetableService.query(
+                job_id, path, params={**(params or {}), "variant": variant}
+            )
+    except Exception as e:
+        logger.error("Occupancy query failed for job %s: %s", job_id, e)
+        return Response(
+            {"success": False, "error": "Room availability service unavailable"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    if code != 200:
+        return Response(
+            {"success": False, "error": payload.get("detail", "Lookup failed")},
+            status=code,
+        )
+    return Response({"success": True, **payload})
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def get_free_rooms(request):
+    """
+    Rooms free in one slot of the published timetable (or ?job_id=&variant=)
+    GET /api/timetable/free-rooms/?day=1&period=3&room_type=lab&min_capacity=40&features=projector
+
+    Answered from FastAPI's persist-time room × slot occupancy bitmaps.
+    """
+    params = {
+        key: request.query_params[key]
+        for key in ("slot_id", "day", "period", "room_type", "min_capacity", "features")
+        if key in request.query_params
+    }
+    return _proxy_occupancy(request, "free-rooms", params=params)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def get_free_slots(request, kind, entity_id):
+    """
+    Slots in which a room, faculty member or student is free
+    GET /api/timetable/free-slots/{room|faculty|student}/{id}/
+    """
+    return _proxy_occupancy(request, f"free-slots/{kind}/{entity_id}")
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def get_common_free_slots(request):
+    """
+    Slots in which every listed faculty member / student / room is free
+    POST /api/timetable/common-free-slots/
+    Body: {"faculty_ids": [...], "student_ids": [...], "room_ids": [...]}
+    """
+    body = {
+        key: list(request.data.get(key) or [])
+        for key in ("faculty_ids", "student_ids", "room_ids")
+    }
+    return _proxy_occupancy(request, "common-free-slots", body=body)
+
+
 
 @api_view(["POST"])
 def fastapi_callback(request):
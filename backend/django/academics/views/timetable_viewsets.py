@@ -32,8 +32,10 @@ class TimetableViewSet(SmartCachedViewSet):
         """Timetable slots — cached per timetable-id."""
         from core.cache_service import CacheService
         timetable = self.get_object()
-        cache_key = CacheService.generate_cache_key(
-            "slots", "timetable", timetable_id=str(timetable.pk)
+        # TimetableSlot / Timetable versions are bumped on commit of any write
+        cache_key = CacheService.versioned_generate_cache_key(
+            "slots", "timetableslot", timetable_id=str(timetable.pk),
+            timetable_ver=CacheService.get_model_version("timetable"),
         )
 
         def _fetch():
@@ -0,0 +1,142 @@
+"""
+Transaction-coalesced cache invalidation
+========================================
+Every post_save / post_delete used to invalidate on the spot: a version
+INCR plus SCAN-based pattern deletes per save, so importing 5 000 students
+meant thousands of keyspace scans.  Now a save only records
+(model, organisation) in a per-thread batch; the batch is flushed once
+when the surrounding transaction commits (transaction.on_commit), however
+many rows it touched.  Rolled-back transactions flush nothing of their
+own; leftovers ride along with the next flush (over-invalidation is safe).
+
+A flush costs a fixed number of round-trips:
+  1 pipeline  -> CacheService model version counters (INCR + EXPIRE)
+                 and the orgs' dashboard stats keys
+  1 publish   -> L1 invalidation for the orgs (core.l1_cache)
+  + 1 per registered flush hook (e.g. academics.signals bumps the FastAPI
+    data-cache namespaces in one pipeline)
+
+Nothing is deleted: keys embed the versions, so stale entries become
+unreachable and age out by TTL.  Totals are reported by
+invalidation_stats() and logged per flush.
+
+Usage:
+    schedule_invalidation("Student", org_id)     # from signals / bulk paths
+    register_flush_hook(fn)                      # fn({org_id: {model names}}) -> round-trips
+
+Model names are lower-cased, as in CacheService version keys.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+FlushHook = Callable[[Dict[Optional[str], Set[str]]], int]
+
+_local = threading.local()
+_hooks: List[FlushHook] = []
+_stats_lock = threading.Lock()
+_stats = {"flushes": 0, "saves_coalesced": 0, "round_trips": 0, "errors": 0}
+
+
+def register_flush_hook(hook: FlushHook) -> None:
+    """Run hook(batch) on every flush; it returns the round-trips it made."""
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def schedule_invalidation(model_name: str, organization_id: Optional[str] = None, saves: int = 1) -> None:
+    """
+    Record that model_name changed for the organisation (None = global).
+    Flushed when the current transaction commits, or at once in autocommit.
+    """
+    batch = getattr(_local, "batch", None)
+    if batch is None:
+        batch = _local.batch = {}
+        _local.saves = 0
+    org = str(organization_id) if organization_id else None
+    batch.setdefault(org, set()).add(model_name.lower())
+    _local.saves += saves
+    # Registered per call: a callback registered inside a rolled-back
+    # savepoint is discarded, one from the outer block still fires.  Later
+    # callbacks find the batch drained and return immediately.
+    transaction.on_commit(flush_invalidations)
+
+
+def flush_invalidations() -> Optional[Dict[str, int]]:
+    """Apply this thread's pending invalidations; returns the flush report."""
+    batch = getattr(_local, "batch", None)
+    if not batch:
+        return None
+    saves = _local.saves
+    _local.batch, _local.saves = None, 0
+
+    round_trips = 0
+    errors = 0
+    try:
+        round_trips += _bump_model_versions(batch)
+    except Exception as exc:
+        errors += 1
+        logger.warning("Cache version bump failed (non-fatal): %s", exc)
+    orgs = [org for org in batch if org]
+    if orgs:
+        from core.l1_cache import invalidate_l1
+
+        invalidate_l1(tags=orgs)
+        round_trips += 1
+    for hook in list(_hooks):
+        try:
+            round_trips += hook(batch)
+        except Exception as exc:
+            errors += 1
+            logger.warning("Cache invalidation hook %s failed (non-fatal): %s", hook.__name__, exc)
+
+    report = {
+        "saves": saves,
+        "organizations": len(batch),
+        "models": len(set().union(*batch.values())),
+        "round_trips": round_trips,
+    }
+    with _stats_lock:
+        _stats["flushes"] += 1
+        _stats["saves_coalesced"] += saves
+        _stats["round_trips"] += round_trips
+        _stats["errors"] += errors
+    logger.info("Cache invalidation flushed", extra=report)
+    return report
+
+
+def invalidation_stats() -> Dict[str, int]:
+    """Process totals: flushes, saves coalesced into them, Redis round-trips."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _bump_model_versions(batch: Dict[Optional[str], Set[str]]) -> int:
+    """INCR every (model, org) version counter in one pipeline; drop dashboard stats.
+
+    SET NX 1 first: a missing counter reads as version 1, so a bare INCR
+    to 1 would not invalidate anything (bump_model_version sets 2).
+    """
+    from django.core.cache import cache
+    from django_redis import get_redis_connection
+
+    from core.cache_service import CacheService
+
+    pipe = get_redis_connection("default").pipeline(transaction=False)
+    for org, models in batch.items():
+        for model_name in sorted(models):
+            key = cache.make_key(CacheService._ver_key(model_name, org))
+            pipe.set(key, 1, nx=True)
+            pipe.incr(key)
+            pipe.expire(key, CacheService._VER_TTL)
+        if org:
+            pipe.delete(cache.make_key(
+                CacheService.generate_cache_key(CacheService.PREFIX_STATS, "dashboard", org_id=org)
+            ))
+    pipe.execute()
+    return 1
@@ -512,10 +512,15 @@ def _auto_invalidate(sender, instance, **kwargs):
     """
     Signal handler: invalidate cache for any model that changes.
     Pattern: Facebook / Meta automatic cache invalidation on entity write.
+
+    The version bump is deferred to transaction commit and coalesced with
+    every other write of the transaction (core.cache_invalidation).
     """
+    from core.cache_invalidation import schedule_invalidation
+
     model_name = sender.__name__
     org_id = str(instance.organization_id) if hasattr(instance, "organization_id") else None
-    CacheService.invalidate_model_cache(model_name, organization_id=org_id)
+    schedule_invalidation(model_name, org_id)
 
 
 def register_cache_invalidation(model_class: type) -> None:
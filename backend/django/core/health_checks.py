@@ -126,7 +126,7 @@ def metrics(request):
 
     User = get_user_model()
 
-    metrics_data = {
+    metrics_data = [
         "# HELP total_users Total number of users",
         "# TYPE total_users gauge",
         f"total_users {User.objects.count()}",
@@ -143,7 +143,7 @@ def metrics(request):
         "# TYPE total_departments gauge",
         f"total_departments {Department.objects.count()}",
         "",
-    }
+    ]
 
     # Cache metrics
     try:
@@ -164,4 +164,36 @@ def metrics(request):
     except Exception:
         pass
 
+    # Process-local L1 caches (this worker only)
+    from core.l1_cache import l1_stats
+
+    for counter in ("hits", "misses", "stale_hits", "evictions", "expirations", "invalidations"):
+        metrics_data.extend([
+            f"# HELP l1_cache_{counter} L1 cache {counter.replace('_', ' ')} (this worker)",
+            f"# TYPE l1_cache_{counter} counter",
+            *(
+                f'l1_cache_{counter}{{cache="{name}"}} {stats[counter]}'
+                for name, stats in l1_stats().items()
+            ),
+            "",
+        ])
+    for gauge in ("entries", "bytes"):
+        metrics_data.extend([
+            f"# HELP l1_cache_{gauge} L1 cache {gauge} held (this worker)",
+            f"# TYPE l1_cache_{gauge} gauge",
+            *(f'l1_cache_{gauge}{{cache="{name}"}} {stats[gauge]}' for name, stats in l1_stats().items()),
+            "",
+        ])
+
+    # Commit-time cache invalidation (this worker only)
+    from core.cache_invalidation import invalidation_stats
+
+    for counter, value in invalidation_stats().items():
+        metrics_data.extend([
+            f"# HELP cache_invalidation_{counter} Coalesced invalidation {counter.replace('_', ' ')} (this worker)",
+            f"# TYPE cache_invalidation_{counter} counter",
+            f"cache_invalidation_{counter} {value}",
+            "",
+        ])
+
     return JsonResponse("\n".join(metrics_data), content_type="text/plain", safe=False)
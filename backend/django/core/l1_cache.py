@@ -0,0 +1,299 @@
+"""
+Process-local L1 cache with cross-worker invalidation
+=====================================================
+Each gunicorn worker keeps its own L1 in front of Redis (L2).  A plain dict
+grows without bound and keeps serving data another worker has just
+changed, so views that opt in get a named L1Cache instead:
+
+  - LRU + TTL          -> bounded by entry count and by estimated bytes
+                          (pickled size per entry); least recently used
+                          entries go first, expired ones are served only
+                          as explicit stale fallbacks
+  - Tags               -> entries carry tags (e.g. the org id) so one
+                          message drops every entry of an organisation
+  - Pub/sub fan-out    -> invalidate_l1() applies locally and PUBLISHes on
+                          settings.L1_CACHE_CHANNEL; a daemon listener in
+                          every worker applies it within milliseconds.
+                          After a listener reconnect every L1 is cleared,
+                          since messages may have been missed.
+  - Counters           -> hits / misses / stale hits / evictions /
+                          expirations / invalidations per cache (l1_stats())
+
+Usage:
+    _L1 = get_l1_cache("dashboard_stats", ttl=300)
+    payload = _L1.get(key)
+    _L1.set(key, payload, tags=[org_id])
+    invalidate_l1(tag=org_id)            # every worker, every opted-in cache
+    invalidate_l1(tags=org_ids)          # several tags, one message
+"""
+
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class L1Cache:
+    """Thread-safe LRU + TTL cache bounded by entries and estimated bytes."""
+
+    def __init__(self, name: str, ttl: int, max_entries: int, max_bytes: int) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (value, expire_at, size, tags); order = recency (oldest first)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _size_of(value: Any) -> int:
+        try:
+            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return 1024  # unpicklable: charge a nominal size
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def get(self, key: str, default: Any = None, allow_stale: bool = False) -> Any:
+        """Live value for key; with allow_stale, an expired one still held."""
+        _ensure_listener()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if time.monotonic() < entry[1]:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if allow_stale:
+                self.stale_hits += 1
+                return entry[0]
+            # Expired entries stay (as stale fallbacks) until LRU pressure
+            # or invalidation removes them.
+            self.misses += 1
+            return default
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Iterable[str] = ()) -> bool:
+        """Store value; False when it alone exceeds max_bytes."""
+        size = self._size_of(value)
+        if size > self.max_bytes:
+            return False
+        expire_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (value, expire_at, size, frozenset(map(str, tags)))
+            self._bytes += size
+            now = time.monotonic()
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                old_key, old = next(iter(self._entries.items()))
+                self._drop(old_key)
+                if old[1] <= now:
+                    self.expirations += 1
+                else:
+                    self.evictions += 1
+        return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+                self.invalidations += 1
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Drop every entry carrying tag; returns how many."""
+        with self._lock:
+            doomed = [k for k, entry in self._entries.items() if tag in entry[3]]
+            for key in doomed:
+                self._drop(key)
+            self.invalidations += len(doomed)
+        return len(doomed)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            self.invalidations += count
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# -------------------------------------------------------------------------
+# REGISTRY
+# -------------------------------------------------------------------------
+_registry: Dict[str, L1Cache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_l1_cache(
+    name: str,
+    ttl: int = 300,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> L1Cache:
+    """
+    Named process-local cache (created once).  The invalidation listener
+    starts on first use, so importing modules that declare caches before a
+    fork does not start threads in the parent.
+    """
+    with _registry_lock:
+        l1 = _registry.get(name)
+        if l1 is None:
+            l1 = _registry[name] = L1Cache(
+                name,
+                ttl,
+                max_entries or settings.L1_CACHE_MAX_ENTRIES,
+                max_bytes or settings.L1_CACHE_MAX_BYTES,
+            )
+    return l1
+
+
+def l1_stats() -> Dict[str, Dict[str, Any]]:
+    """Counters of every L1 cache in this worker, keyed by cache name."""
+    with _registry_lock:
+        caches = list(_registry.values())
+    return {l1.name: l1.stats() for l1 in caches}
+
+
+def _apply(cache: Optional[str], tags: Iterable[str], keys: Iterable[str]) -> int:
+    with _registry_lock:
+        targets = [l1 for name, l1 in _registry.items() if cache in (None, name)]
+    tags, keys = list(tags), list(keys)
+    dropped = 0
+    for l1 in targets:
+        for tag in tags:
+            dropped += l1.invalidate_tag(tag)
+        for key in keys:
+            l1.delete(key)
+        if not tags and not keys:
+            dropped += l1.clear()
+    return dropped
+
+
+# -------------------------------------------------------------------------
+# PUB/SUB INVALIDATION
+# -------------------------------------------------------------------------
+_ORIGIN = uuid.uuid4().hex
+_listener_pid: Optional[int] = None
+_publisher = None
+
+
+def _redis():
+    import redis
+
+    kwargs: Dict[str, Any] = {"socket_connect_timeout": 3, "health_check_interval": 30}
+    if settings.REDIS_URL.startswith("rediss://"):
+        import ssl
+
+        kwargs["ssl_cert_reqs"] = ssl.CERT_NONE
+    return redis.from_url(settings.REDIS_URL, **kwargs)
+
+
+def _origin() -> str:
+    """This process's publisher id; messages it published are applied already.
+
+    Includes the pid: workers forked from a preloaded parent share _ORIGIN.
+    """
+    return f"{_ORIGIN}:{os.getpid()}"
+
+
+def invalidate_l1(
+    tag: Optional[str] = None,
+    keys: Iterable[str] = (),
+    cache: Optional[str] = None,
+    tags: Iterable[str] = (),
+) -> int:
+    """
+    Drop entries by tag(s) and/or key (all entries when none are given) in
+    one cache or all of them, here and in every other worker, with a single
+    PUBLISH.  Returns the number dropped locally; publishing failures are
+    logged, not raised.
+    """
+    global _publisher
+    keys = list(keys)
+    tags = [str(t) for t in tags] + ([str(tag)] if tag is not None else [])
+    dropped = _apply(cache, tags, keys)
+    try:
+        if _publisher is None:
+            _publisher = _redis()
+        _publisher.publish(
+            settings.L1_CACHE_CHANNEL,
+            json.dumps({"origin": _origin(), "cache": cache, "tags": tags, "keys": keys}),
+        )
+    except Exception as exc:
+        logger.warning("L1 invalidation publish failed: %s", exc)
+    return dropped
+
+
+def _listen() -> None:
+    backoff = 0.5
+    reconnect = False
+    while True:
+        try:
+            pubsub = _redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(settings.L1_CACHE_CHANNEL)
+            if reconnect:
+                # Anything published while we were disconnected is lost
+                _apply(None, (), ())
+            reconnect = True
+            backoff = 0.5
+            for message in pubsub.listen():
+                try:
+                    data = json.loads(message["data"])
+                except (TypeError, ValueError):
+                    continue
+                if data.get("origin") == _origin():
+                    continue
+                _apply(data.get("cache"), data.get("tags") or (), data.get("keys") or ())
+        except Exception as exc:
+            logger.warning("L1 invalidation listener reconnecting: %s", exc)
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+
+def _ensure_listener() -> None:
+    """Start the listener thread once per process (after a fork, again)."""
+    global _listener_pid
+    if _listener_pid == os.getpid() or not getattr(settings, "L1_CACHE_PUBSUB", True):
+        return
+    with _registry_lock:
+        if _listener_pid == os.getpid():
+            return
+        _listener_pid = os.getpid()
+    threading.Thread(target=_listen, name="l1-invalidation", daemon=True).start()
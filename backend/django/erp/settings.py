@@ -419,6 +419,19 @@ CACHE_TTL_LONG      = 900         # 15 min – stable lists (courses, rooms)
 CACHE_TTL_VERY_LONG = 3_600       # 1 hr   – near-static (buildings, schools)
 CACHE_TTL_ETERNAL   = 86_400      # 24 hr  – config / lookup tables
 
+# ── Process-local L1 caches (core/l1_cache.py) ─────────────────────────────
+#   Bounded per cache; invalidations fan out to every worker over pub/sub.
+L1_CACHE_MAX_ENTRIES = int(os.getenv("L1_CACHE_MAX_ENTRIES", "1024"))
+L1_CACHE_MAX_BYTES   = int(os.getenv("L1_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+L1_CACHE_CHANNEL     = "sih28:l1:invalidate"
+L1_CACHE_PUBSUB      = os.getenv("L1_CACHE_PUBSUB", "true").lower() == "true"
+
+# ── Bulk CSV / Excel import (academics/services/bulk_import_service.py) ─────
+IMPORT_MAX_FILE_BYTES       = int(os.getenv("IMPORT_MAX_FILE_BYTES", str(20 * 1024 * 1024)))
+IMPORT_MAX_ROWS             = int(os.getenv("IMPORT_MAX_ROWS", "100000"))
+IMPORT_MAX_REPORTED_ERRORS  = 1000        # row-level errors kept on the job
+IMPORT_UPLOAD_TTL           = 3_600       # uploaded file parked in Redis until the worker runs
+
 # FastAPI AI Service URL
 FASTAPI_URL = os.getenv("FASTAPI_URL", "http://localhost:8001")
 
@@ -0,0 +1,93 @@
+"""
+Bulk import — date validation against PostgreSQL.
+
+Impossible calendar dates (2023-02-30, 0000-01-01) pass a YYYY-MM-DD
+pattern check, and a bare ``::date`` cast on them aborts the validation
+INSERT.  They must come back as row-level errors on an "invalid" job.
+"""
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+
+from academics.models import Department, Faculty, ImportJob, Organization, School
+from academics.services.bulk_import_service import SPECS, BulkImportService, _typed
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+HEADER = "faculty_code,email,first_name,last_name,designation,specialization,dept_code,date_of_joining\n"
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture
+def department():
+    org = Organization.objects.create(org_code="IMPT", org_name="Import Test University")
+    school = School.objects.create(organization=org, school_code="ENG", school_name="Engineering")
+    return Department.objects.create(
+        organization=org, school=school, dept_code="CSE", dept_name="Computer Science"
+    )
+
+
+def _import(department, rows: str) -> ImportJob:
+    upload = SimpleUploadedFile("faculty.csv", (HEADER + rows).encode())
+    job = BulkImportService.create_job(department.organization_id, None, "faculty", upload)
+    BulkImportService.run(job.id)
+    job.refresh_from_db()
+    return job
+
+
+def _faculty_row(code: str, joined: str) -> str:
+    return f"{code},{code.lower()}@example.edu,Ada,Lovelace,professor,Algorithms,CSE,{joined}\n"
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2024-02-29", "2024-02-29"),
+        ("2000-02-29", "2000-02-29"),
+        ("2023-12-31", "2023-12-31"),
+        ("2023-02-29", None),
+        ("1900-02-29", None),
+        ("2023-02-30", None),
+        ("2023-04-31", None),
+        ("0000-01-01", None),
+        ("2023-13-01", None),
+        ("31/12/2023", None),
+    ],
+)
+def test_typed_date_is_null_for_impossible_dates(value, expected):
+    field = next(f for f in SPECS["faculty"].fields if f.name == "date_of_joining")
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {_typed(field)}::text FROM (SELECT %(value)s::text AS date_of_joining) s",
+            {"value": value},
+        )
+        assert cursor.fetchone()[0] == expected
+
+
+def test_impossible_date_is_reported_with_its_row(department):
+    job = _import(
+        department,
+        _faculty_row("F001", "2020-07-01") + _faculty_row("F002", "2023-02-30"),
+    )
+
+    assert job.status == "invalid"
+    assert job.error_message is None
+    assert job.errors == [{
+        "row": 3,
+        "column": "date_of_joining",
+        "message": "date_of_joining must be a date (YYYY-MM-DD), got 2023-02-30",
+    }]
+    assert not Faculty.objects.filter(organization=department.organization).exists()
+
+
+def test_leap_day_is_imported(department):
+    job = _import(department, _faculty_row("F003", "2024-02-29"))
+
+    assert job.status == "completed", job.error_message or job.errors
+    assert job.inserted_count == 1
+    faculty = Faculty.objects.get(organization=department.organization, faculty_code="F003")
+    assert faculty.date_of_joining.isoformat() == "2024-02-29"
@@ -0,0 +1,72 @@
+"""
+Room finder — tenant scoping of ?job_id= overrides.
+
+The free-room / free-slot endpoints accept an explicit job_id so staff can
+query a draft; a job of another organisation must not be proxied.
+"""
+from unittest import mock
+
+import pytest
+from rest_framework.test import APIClient
+
+from academics.models import GenerationJob, Organization, User
+from academics.services import PublishedTimetableService
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    locmem = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    settings.CACHES = {"default": locmem, "session": locmem}
+
+
+@pytest.fixture
+def orgs():
+    return (
+        Organization.objects.create(org_code="OWN", org_name="Own University"),
+        Organization.objects.create(org_code="OTHER", org_name="Other University"),
+    )
+
+
+@pytest.fixture
+def client(orgs):
+    user = User.objects.create_user(
+        username="hod", password="x", organization=orgs[0], role="hod"
+    )
+    api = APIClient()
+    api.force_authenticate(user)
+    return api
+
+
+def _free_rooms(client, job):
+    with mock.patch.object(
+        PublishedTimetableService, "query", return_value=(200, {"rooms": [], "total": 0})
+    ) as query:
+        response = client.get("/api/timetable/free-rooms/", {"job_id": str(job.id), "day": 0, "period": 1})
+    return response, query
+
+
+def test_job_of_own_organisation_is_proxied(client, orgs):
+    job = GenerationJob.objects.create(organization=orgs[0], status="completed")
+    response, query = _free_rooms(client, job)
+
+    assert response.status_code == 200
+    query.assert_called_once()
+    assert query.call_args.args[0] == str(job.id)
+
+
+def test_job_of_another_organisation_is_not_proxied(client, orgs):
+    job = GenerationJob.objects.create(organization=orgs[1], status="approved")
+    response, query = _free_rooms(client, job)
+
+    assert response.status_code == 404
+    query.assert_not_called()
+
+
+def test_malformed_job_id_is_not_found(client):
+    with mock.patch.object(PublishedTimetableService, "query") as query:
+        response = client.get("/api/timetable/free-rooms/", {"job_id": "not-a-uuid", "day": 0, "period": 1})
+
+    assert response.status_code == 404
+    query.assert_not_called()
@@ -0,0 +1,46 @@
+"""
+StudentScheduleService — index rows share TimetableSlotSerializer's schema.
+
+get_student_timetable returns index rows when the persist-time student
+index is available and serializer rows otherwise; clients must see one
+row shape either way.
+"""
+from unittest import mock
+
+from academics.serializers import TimetableSlotSerializer
+from academics.services import StudentScheduleService
+
+ENTRY = {
+    "course_id": "c1", "course_code": "CS101", "subject_name": "Algorithms",
+    "faculty_id": "f1", "faculty_name": "Ada Lovelace",
+    "room_id": "r1", "room_code": "LH-1",
+    "time_slot_id": "7", "day": 2, "start_time": "10:00", "end_time": "11:00",
+    "session_number": 0, "department_id": "d1",
+}
+
+
+def _week(entries):
+    with mock.patch(
+        "academics.services.student_schedule_service.PublishedTimetableService.resolve",
+        return_value=("job", "final"),
+    ), mock.patch.object(StudentScheduleService, "get_weeks", return_value={"s1": entries}):
+        return StudentScheduleService.get_student_week("org", "s1")
+
+
+def test_index_rows_use_serializer_field_names():
+    (row,) = _week([ENTRY])
+
+    assert set(row) == set(TimetableSlotSerializer().get_fields())
+    assert row["day"] == "wednesday"
+    assert (row["subject"], row["faculty"], row["classroom"]) == ("c1", "f1", "r1")
+    assert (row["subject_name"], row["faculty_name"], row["classroom_number"]) == (
+        "Algorithms", "Ada Lovelace", "LH-1",
+    )
+
+
+def test_unpublished_week_is_none():
+    with mock.patch(
+        "academics.services.student_schedule_service.PublishedTimetableService.resolve",
+        return_value=None,
+    ):
+        assert StudentScheduleService.get_student_week("org", "s1") is None
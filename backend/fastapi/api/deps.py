@@ -74,6 +74,20 @@ async def get_generation_service(
     return GenerationService(redis, hardware_profile)
 
 
+async def get_conflict_resolution_service(
+    request: Request,
+    redis: redis.Redis = Depends(get_redis_client),
+):
+    """
+    Get the worker's live edit-validation service.  One instance per app so
+    its in-memory variant occupancy indexes survive across requests.
+    """
+    if getattr(request.app.state, "conflict_resolution_service", None) is None:
+        from core.services.conflict_resolution_service import ConflictResolutionService
+        request.app.state.conflict_resolution_service = ConflictResolutionService(redis)
+    return request.app.state.conflict_resolution_service
+
+
 # ==================== Database Client Dependencies ====================
 
 async def get_django_client(redis: redis.Redis = Depends(get_redis_client)):
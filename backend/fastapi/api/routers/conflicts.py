@@ -1,143 +1,94 @@
 """
 Conflict Resolution Router
-Handles timetable conflict detection and resolution
+Live conflict checks for manual timetable edits (drag-and-drop)
+
+Sessions are addressed by their offset in the variant's result index
+(result:job:{job_id}:entries:{variant}); see
+core.services.conflict_resolution_service.
 """
 from fastapi import APIRouter, HTTPException, Depends
+from pydantic import BaseModel
+from typing import Optional
 import logging
 
-from api.deps import get_django_client
+from api.deps import get_conflict_resolution_service
 
 router = APIRouter(prefix="/api/conflicts", tags=["conflicts"])
 logger = logging.getLogger(__name__)
 
 
-@router.get("/detect")
-async def detect_conflicts(timetable_id: str, client = Depends(get_django_client)):
-    """
-    Detect all conflicts in timetable.
-    
-    Args:
-        timetable_id: Timetable identifier
-        
-    Returns:
-        List of detected conflicts with details
-    """
-    try:
-        from services.conflict_resolution_service import ConflictResolutionService
-        
-        # Fetch timetable data
-        timetable = await client.fetch_timetable(timetable_id)
-        courses = await client.fetch_all_courses(timetable_id)
-        rooms = await client.fetch_all_rooms(timetable_id)
-        time_slots = await client.fetch_all_time_slots(timetable_id)
-        faculty = await client.fetch_all_faculty(timetable_id)
-        
-        # Detect conflicts
-        service = ConflictResolutionService(timetable, courses, rooms, time_slots, faculty)
-        conflicts = service.detect_all_conflicts()
-        
-        await client.close()
-        
-        return {
-            "conflicts": [c.dict() for c in conflicts],
-            "total": len(conflicts),
-            "timetable_id": timetable_id
-        }
-        
-    except Exception as e:
-        logger.error(f"Conflict detection error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+class EditRequest(BaseModel):
+    """A move (slot_id and/or room_id) or a swap with another session"""
+    offset: int
+    slot_id: Optional[str] = None
+    room_id: Optional[str] = None
+    swap_with: Optional[int] = None
+    alternatives: int = 5
+    force: bool = False
+
 
+@router.get("/{job_id}/{variant}")
+async def detect_conflicts(job_id: str, variant: str, service=Depends(get_conflict_resolution_service)):
+    """Current hard clashes of a variant, including edits applied so far."""
+    conflicts = _edit_call(service.detect, job_id, variant)
+    return {
+        "job_id": job_id,
+        "variant": variant,
+        "conflicts": conflicts,
+        "total": len(conflicts),
+    }
 
-@router.post("/resolve")
-async def resolve_conflicts(
-    timetable_id: str,
-    auto_resolve: bool = True,
-    client = Depends(get_django_client)
+
+@router.post("/{job_id}/{variant}/validate")
+async def validate_edit(
+    job_id: str,
+    variant: str,
+    request: EditRequest,
+    service=Depends(get_conflict_resolution_service),
 ):
     """
-    Resolve conflicts automatically with hierarchical approach.
-    
-    Args:
-        timetable_id: Timetable identifier
-        auto_resolve: Whether to automatically resolve conflicts
-        
-    Returns:
-        Resolution results with statistics
+    Conflicts a proposed move or swap would cause, plus clash-free
+    alternative (slot, room) pairs from the session's valid domain.
     """
-    try:
-        from services.conflict_resolution_service import ConflictResolutionService
-        
-        # Fetch timetable data
-        timetable = await client.fetch_timetable(timetable_id)
-        courses = await client.fetch_all_courses(timetable_id)
-        rooms = await client.fetch_all_rooms(timetable_id)
-        time_slots = await client.fetch_all_time_slots(timetable_id)
-        faculty = await client.fetch_all_faculty(timetable_id)
-        
-        service = ConflictResolutionService(timetable, courses, rooms, time_slots, faculty)
-        
-        if auto_resolve:
-            results = service.resolve_all_conflicts()
-        else:
-            conflicts = service.detect_all_conflicts()
-            results = {
-                'total': len(conflicts),
-                'resolved': 0,
-                'manual_review': len(conflicts)
-            }
-        
-        await client.close()
-        
-        return results
-        
-    except Exception as e:
-        logger.error(f"Conflict resolution error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return _edit_call(
+        service.validate, job_id, variant, request.offset,
+        slot_id=request.slot_id, room_id=request.room_id,
+        swap_with=request.swap_with, alternatives=request.alternatives,
+    )
 
 
-@router.post("/resolve/{conflict_id}")
-async def resolve_single_conflict(
-    conflict_id: str,
-    timetable_id: str,
-    client = Depends(get_django_client)
+@router.post("/{job_id}/{variant}/apply")
+async def apply_edit(
+    job_id: str,
+    variant: str,
+    request: EditRequest,
+    service=Depends(get_conflict_resolution_service),
 ):
     """
-    Resolve single conflict with hierarchical approach.
-    
-    Args:
-        conflict_id: Conflict identifier
-        timetable_id: Timetable identifier
-        
-    Returns:
-        Resolution result for specific conflict
+    Re-validate and apply a move or swap.  Edits with hard conflicts are
+    refused (applied=false) unless force is set.
     """
+    return _edit_call(
+        service.apply, job_id, variant, request.offset,
+        slot_id=request.slot_id, room_id=request.room_id,
+        swap_with=request.swap_with, force=request.force,
+        alternatives=request.alternatives,
+    )
+
+
+def _edit_call(call, job_id: str, variant: str, *args, **kwargs):
+    """Run a live-edit operation; 404 when the variant has no persist-time index."""
+    from core.services.conflict_resolution_service import EditRejected
+
     try:
-        from services.conflict_resolution_service import ConflictResolutionService
-        
-        # Fetch timetable data
-        timetable = await client.fetch_timetable(timetable_id)
-        courses = await client.fetch_all_courses(timetable_id)
-        rooms = await client.fetch_all_rooms(timetable_id)
-        time_slots = await client.fetch_all_time_slots(timetable_id)
-        faculty = await client.fetch_all_faculty(timetable_id)
-        
-        service = ConflictResolutionService(timetable, courses, rooms, time_slots, faculty)
-        conflicts = service.detect_all_conflicts()
-        
-        # Find specific conflict
-        conflict = next((c for c in conflicts if c.conflict_id == conflict_id), None)
-        if not conflict:
-            raise HTTPException(status_code=404, detail="Conflict not found")
-        
-        result = service.resolve_conflict(conflict)
-        
-        await client.close()
-        
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Single conflict resolution error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        result = call(job_id, variant, *args, **kwargs)
+    except EditRejected as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except TimeoutError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except Exception as exc:
+        logger.error(f"[CONFLICTS] Live edit failed for job {job_id} variant {variant}: {exc}")
+        raise HTTPException(status_code=500, detail="Failed to process edit")
+    if result is None:
+        raise HTTPException(status_code=404, detail="Timetable index not found or expired")
+    return result
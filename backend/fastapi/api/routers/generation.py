@@ -263,63 +263,383 @@ async def cancel_generation(
 async def get_department_timetable(
     job_id: str,
     dept_id: str,
+    variant: str = "final",
     redis=Depends(get_redis_client),
 ):
     """
     Return the timetable filtered to a single department's perspective.
 
-    Reads the persisted solution from Redis, then applies build_department_view()
-    to return only entries whose course belongs to dept_id.
+    Served from the per-variant entry index written at persist time
+    (core.services.result_index): only the department's entries are read.
+    Results persisted before the index existed fall back to one pass over
+    the stored entries.
 
     Args:
         job_id:  Generation job identifier
         dept_id: Department UUID to filter to
+        variant: "final" (default) or a variant_id
 
     Returns:
         List of timetable entries for the specified department.
     """
-    import json
+    entries = _indexed_view(redis, job_id, variant, "department", dept_id)
+    return {
+        "job_id": job_id,
+        "dept_id": dept_id,
+        "variant": variant,
+        "entries": entries,
+        "total": len(entries),
+    }
 
-    result_key = f"result:job:{job_id}"
-    raw = redis.get(result_key)
-    if not raw:
-        raise HTTPException(status_code=404, detail="Job result not found or expired")
+
+@router.get("/timetables/{job_id}/faculty/{faculty_id}")
+async def get_faculty_timetable(
+    job_id: str,
+    faculty_id: str,
+    variant: str = "final",
+    redis=Depends(get_redis_client),
+):
+    """Return one faculty member's entries (see get_department_timetable)."""
+    entries = _indexed_view(redis, job_id, variant, "faculty", faculty_id)
+    return {
+        "job_id": job_id,
+        "faculty_id": faculty_id,
+        "variant": variant,
+        "entries": entries,
+        "total": len(entries),
+    }
+
+
+@router.get("/timetables/{job_id}/room/{room_id}")
+async def get_room_timetable(
+    job_id: str,
+    room_id: str,
+    variant: str = "final",
+    redis=Depends(get_redis_client),
+):
+    """Return one room's entries (see get_department_timetable)."""
+    entries = _indexed_view(redis, job_id, variant, "room", room_id)
+    return {
+        "job_id": job_id,
+        "room_id": room_id,
+        "variant": variant,
+        "entries": entries,
+        "total": len(entries),
+    }
+
+
+class StudentScheduleRequest(BaseModel):
+    """Batched student schedule lookup (e.g. a whole section)"""
+    student_ids: List[str]
+    variant: str = "final"
+
+
+@router.get("/timetables/{job_id}/student/{student_id}")
+async def get_student_timetable(
+    job_id: str,
+    student_id: str,
+    variant: str = "final",
+    redis=Depends(get_redis_client),
+):
+    """
+    Return one student's week across every course they attend, from the
+    student index written at persist time (core.services.student_index).
+    """
+    weeks = _student_weeks(redis, job_id, variant, [student_id])
+    entries = weeks.get(student_id, [])
+    return {
+        "job_id": job_id,
+        "student_id": student_id,
+        "variant": variant,
+        "entries": entries,
+        "total": len(entries),
+    }
+
+
+@router.post("/timetables/{job_id}/students")
+async def get_students_timetables(
+    job_id: str,
+    request: StudentScheduleRequest,
+    redis=Depends(get_redis_client),
+):
+    """Return the weeks of many students (a section) in two index reads."""
+    student_ids = list(dict.fromkeys(request.student_ids))
+    weeks = _student_weeks(redis, job_id, request.variant, student_ids)
+    return {
+        "job_id": job_id,
+        "variant": request.variant,
+        "students": weeks,
+        "total_students": len(weeks),
+    }
+
+
+def _student_weeks(redis, job_id: str, variant: str, student_ids: List[str]) -> Dict[str, list]:
+    """Student weeks from the student index; 404 when the result has none."""
+    from core.services.student_index import fetch_student_entries
 
     try:
-        result_data = json.loads(raw) if isinstance(raw, (str, bytes)) else raw
-    except (json.JSONDecodeError, TypeError) as exc:
-        logger.error(f"[DEPT-VIEW] Failed to parse result for job {job_id}: {exc}")
-        raise HTTPException(status_code=500, detail="Failed to parse stored result")
+        weeks = fetch_student_entries(redis, job_id, variant, student_ids)
+    except Exception as exc:
+        logger.error(f"[RESULT-VIEW] Student index read failed for job {job_id}: {exc}")
+        raise HTTPException(status_code=500, detail="Failed to read student index")
+    if weeks is None:
+        raise HTTPException(status_code=404, detail="Student index not found or expired")
+    return weeks
 
-    # Reconstruct solution dict from stored timetable entries
-    entries = result_data.get("timetable", [])
-    if not entries:
-        return {"job_id": job_id, "dept_id": dept_id, "entries": []}
-
-    # Filter to dept_id entries directly from persisted entries
-    # (build_department_view requires Course objects; here we filter stored dicts)
-    dept_entries = [
-        e for e in entries
-        if e.get("department_id") == dept_id
-        # Courses serialized without department_id fall through to course_id match
-        or _extract_dept_from_course_id(e.get("course_id", ""), result_data) == dept_id
-    ]
 
+@router.get("/timetables/{job_id}/free-rooms")
+async def get_free_rooms(
+    job_id: str,
+    slot_id: Optional[str] = None,
+    day: Optional[int] = None,
+    period: Optional[int] = None,
+    room_type: Optional[str] = None,
+    min_capacity: int = 0,
+    features: Optional[str] = None,
+    variant: str = "final",
+    redis=Depends(get_redis_client),
+):
+    """
+    Rooms free in one slot (slot_id, or day + period), filtered by type,
+    minimum capacity and comma-separated required features.  Answered from
+    the occupancy bitmaps written at persist time (core.services.occupancy_index).
+    """
+    from core.services.occupancy_index import free_rooms
+
+    if slot_id is None and (day is None or period is None):
+        raise HTTPException(status_code=400, detail="slot_id or day and period required")
+    wanted = [f.strip() for f in (features or "").split(",") if f.strip()]
+    try:
+        rooms = _occupancy_call(
+            free_rooms, redis, job_id, variant, slot_id=slot_id, day=day, period=period,
+            room_type=room_type, min_capacity=min_capacity, features=wanted,
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Time slot not found")
     return {
         "job_id": job_id,
-        "dept_id": dept_id,
-        "entries": dept_entries,
-        "total": len(dept_entries),
+        "variant": variant,
+        "slot_id": slot_id,
+        "day": day,
+        "period": period,
+        "rooms": rooms,
+        "total": len(rooms),
     }
 
 
-def _extract_dept_from_course_id(course_id: str, result_data: dict) -> str:
+@router.get("/timetables/{job_id}/free-slots/{kind}/{entity_id}")
+async def get_free_slots(
+    job_id: str,
+    kind: str,
+    entity_id: str,
+    variant: str = "final",
+    redis=Depends(get_redis_client),
+):
+    """Slots in which one room, faculty member or student is free."""
+    from core.services.occupancy_index import OCCUPANCY_KINDS, free_slots
+
+    if kind not in OCCUPANCY_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {', '.join(OCCUPANCY_KINDS)}")
+    slots = _occupancy_call(free_slots, redis, job_id, variant, kind, entity_id)
+    return {
+        "job_id": job_id,
+        "variant": variant,
+        kind + "_id": entity_id,
+        "slots": slots,
+        "total": len(slots),
+    }
+
+
+class CommonFreeSlotsRequest(BaseModel):
+    """Entities that must all be free (e.g. a committee or a section)"""
+    faculty_ids: List[str] = []
+    student_ids: List[str] = []
+    room_ids: List[str] = []
+    variant: str = "final"
+
+
+@router.post("/timetables/{job_id}/common-free-slots")
+async def get_common_free_slots(
+    job_id: str,
+    request: CommonFreeSlotsRequest,
+    redis=Depends(get_redis_client),
+):
+    """Slots in which every listed faculty member, student and room is free."""
+    from core.services.occupancy_index import common_free_slots
+
+    slots = _occupancy_call(
+        common_free_slots, redis, job_id, request.variant,
+        faculty_ids=request.faculty_ids, student_ids=request.student_ids,
+        room_ids=request.room_ids,
+    )
+    return {
+        "job_id": job_id,
+        "variant": request.variant,
+        "slots": slots,
+        "total": len(slots),
+    }
+
+
+def _occupancy_call(query, redis, job_id: str, variant: str, *args, **kwargs) -> list:
     """
-    Attempt to resolve department_id for a course from the stored metadata.
-    Returns empty string if not resolvable (safe — entry will be excluded).
+    Run an occupancy-index query.  The bitmaps expire with the other result
+    keys, so a miss rebuilds them from generation_jobs.timetable_data and
+    retries; 404 only when the job has no persisted catalogue or variant.
     """
-    for entry in result_data.get("timetable", []):
-        if entry.get("course_id") == course_id:
-            return entry.get("department_id", "")
-    return ""
+    from core.services.occupancy_index import rebuild_occupancy_index
+
+    try:
+        result = query(redis, job_id, variant, *args, **kwargs)
+        if result is None and rebuild_occupancy_index(
+            redis, job_id, variant, _load_timetable_data(job_id), 3600 * 24,
+        ):
+            logger.info(f"[RESULT-VIEW] Rebuilt occupancy index for job {job_id} ({variant})")
+            result = query(redis, job_id, variant, *args, **kwargs)
+    except KeyError:
+        raise
+    except Exception as exc:
+        logger.error(f"[RESULT-VIEW] Occupancy index read failed for job {job_id}: {exc}")
+        raise HTTPException(status_code=500, detail="Failed to read occupancy index")
+    if result is None:
+        raise HTTPException(status_code=404, detail="Occupancy index not found or expired")
+    return result
+
+
+def _load_timetable_data(job_id: str) -> Optional[dict]:
+    """generation_jobs.timetable_data for one job (None when absent)."""
+    import json
+    from utils.django_client import _get_db_pool, _get_healthy_conn
+
+    try:
+        uuid.UUID(str(job_id))
+    except ValueError:
+        return None
+    _pool = _get_db_pool()
+    _conn = _get_healthy_conn(_pool)
+    try:
+        with _conn.cursor() as cur:
+            cur.execute(
+                "SELECT timetable_data FROM generation_jobs WHERE id = %s",
+                (str(job_id),),
+            )
+            row = cur.fetchone()
+        _conn.rollback()
+    finally:
+        _pool.putconn(_conn)
+    if not row or not row[0]:
+        return None
+    return row[0] if isinstance(row[0], dict) else json.loads(row[0])
+
+
+@router.get("/timetables/{job_id}/diff")
+async def get_variant_diff(
+    job_id: str,
+    a: str,
+    b: str,
+    department_id: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 200,
+    include_shared: bool = False,
+    redis=Depends(get_redis_client),
+):
+    """
+    Precomputed diff of two variants ("final" or variant ids): summary
+    (moved sessions, room changes, faculty-load changes, per-department
+    counts) plus one page of changed sessions (core.services.variant_diff).
+    """
+    from core.services.variant_diff import fetch_variant_diff
+
+    return _diff_call(
+        fetch_variant_diff, redis, job_id, a, b, department_id=department_id,
+        page=page, page_size=page_size, include_shared=include_shared,
+    )
+
+
+class SnapshotDiffRequest(BaseModel):
+    """Entries of a timetable snapshot (course_id, session_number, time_slot_id, room_id)"""
+    variant: str = "final"
+    entries: List[Dict]
+    department_id: Optional[str] = None
+    page: int = 1
+    page_size: int = 200
+
+
+@router.post("/timetables/{job_id}/diff/snapshot")
+async def get_snapshot_diff(
+    job_id: str,
+    request: SnapshotDiffRequest,
+    redis=Depends(get_redis_client),
+):
+    """Diff a stored variant against an arbitrary snapshot of entries."""
+    from core.services.variant_diff import diff_snapshot
+
+    return _diff_call(
+        diff_snapshot, redis, job_id, request.variant, request.entries,
+        department_id=request.department_id, page=request.page,
+        page_size=request.page_size,
+    )
+
+
+def _diff_call(query, redis, job_id: str, *args, **kwargs) -> dict:
+    """Run a variant-diff query; 404 when diffs or a variant are missing."""
+    try:
+        result = query(redis, job_id, *args, **kwargs)
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=f"Variant {exc.args[0]} not found")
+    except Exception as exc:
+        logger.error(f"[RESULT-VIEW] Variant diff failed for job {job_id}: {exc}")
+        raise HTTPException(status_code=500, detail="Failed to read variant diffs")
+    if result is None:
+        raise HTTPException(status_code=404, detail="Variant diffs not found or expired")
+    return {"job_id": job_id, **result}
+
+
+def _indexed_view(redis, job_id: str, variant: str, dimension: str, value: str) -> list:
+    """
+    Entries of one variant matching dimension == value, from the result index;
+    falls back to scanning a legacy result document when no index exists.
+    """
+    import json
+    from core.services.result_index import INDEX_DIMENSIONS, fetch_indexed_entries
+
+    try:
+        entries = fetch_indexed_entries(redis, job_id, variant, dimension, value)
+    except Exception as exc:
+        logger.error(f"[RESULT-VIEW] Index read failed for job {job_id}: {exc}")
+        raise HTTPException(status_code=500, detail="Failed to read result index")
+    if entries is not None:
+        return entries
+
+    raw = redis.get(f"result:job:{job_id}")
+    if not raw:
+        raise HTTPException(status_code=404, detail="Job result not found or expired")
+    try:
+        result_data = json.loads(raw) if isinstance(raw, (str, bytes)) else raw
+    except (json.JSONDecodeError, TypeError) as exc:
+        logger.error(f"[RESULT-VIEW] Failed to parse result for job {job_id}: {exc}")
+        raise HTTPException(status_code=500, detail="Failed to parse stored result")
+
+    # Legacy documents kept entries as a list under "timetable"; current
+    # summaries carry no entries at all (they live in the index / DB).
+    stored = result_data.get("timetable", [])
+    if variant != "final" or not isinstance(stored, list):
+        return []
+    field = INDEX_DIMENSIONS[dimension]
+    if dimension != "department":
+        return [e for e in stored if str(e.get(field, "")) == value]
+    # Courses serialized without department_id resolve via a sibling entry
+    course_dept = _course_departments(stored)
+    return [
+        e for e in stored
+        if (e.get("department_id") or course_dept.get(e.get("course_id", ""), "")) == value
+    ]
+
 
+def _course_departments(entries: list) -> dict:
+    """course_id → department_id from the first entry that carries one."""
+    course_dept: dict = {}
+    for entry in entries:
+        dept = entry.get("department_id")
+        if dept:
+            course_dept.setdefault(entry.get("course_id", ""), dept)
+    return course_dept
@@ -17,6 +17,10 @@ class Settings:
 
     # Redis Configuration (shared with Django)
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Per-variant Redis entry index backing the department/faculty/room views
+    RESULT_INDEX_ENABLED: bool = os.getenv("RESULT_INDEX_ENABLED", "true").lower() == "true"
+    # Variants whose live-edit occupancy index a worker keeps in memory
+    LIVE_CONFLICT_MAX_VARIANTS: int = int(os.getenv("LIVE_CONFLICT_MAX_VARIANTS", "16"))
 
     # Django Backend API Configuration
     DJANGO_API_BASE_URL: str = os.getenv("DJANGO_API_BASE_URL", "http://localhost:8000")
@@ -49,6 +53,11 @@ class Settings:
     # Stage 2A: CP-SAT Solver (OPTIMIZED for base hardware)
     CPSAT_TIMEOUT_SECONDS: int = 30  # Reduced from 60s (50% faster)
     CPSAT_NUM_WORKERS: int = 1  # Auto-adjusted by hardware detector
+    # Adaptive budgets: global CP-SAT deadline per job (0 = no deadline) and
+    # where per-strategy outcome history is persisted between jobs.
+    CPSAT_JOB_BUDGET_SECONDS: int = int(os.getenv("CPSAT_JOB_BUDGET_SECONDS", "1800"))
+    CPSAT_MIN_STRATEGY_TIMEOUT: float = 3.0
+    CPSAT_BUDGET_HISTORY_PATH: str = str(backend_dir / "fastapi" / "data" / "cpsat_budget_history.json")
 
     # Stage 2B: Genetic Algorithm (OPTIMIZED for base hardware)
     GA_POPULATION_SIZE: int = 20  # Increased from 15 — more seed diversity
@@ -57,6 +66,17 @@ class Settings:
     GA_CROSSOVER_RATE: float = 0.8
     GA_ELITISM_RATE: float = 0.20  # Keep more good solutions
     GA_TOURNAMENT_SIZE: int = 3  # Smaller tournament for speed
+    # Stage-level wall-clock budget shared by all GA variants (0 = unbounded);
+    # time a variant leaves unused rolls over to the later ones.
+    GA_TIME_BUDGET_SECONDS: float = float(os.getenv("GA_TIME_BUDGET_SECONDS", "90"))
+
+    # Stage 2C: CP-SAT large neighbourhood search from the merged solution
+    # (engine.cpsat.lns), run alongside the GA as an extra variant.
+    LNS_ENABLED: bool = os.getenv("LNS_ENABLED", "true").lower() == "true"
+    LNS_TIME_BUDGET_SECONDS: float = float(os.getenv("LNS_TIME_BUDGET_SECONDS", "30"))
+    LNS_NEIGHBORHOOD_SESSIONS: int = 60  # sessions freed per neighbourhood
+    LNS_SUBPROBLEM_TIMEOUT: float = 5.0  # CP-SAT limit per neighbourhood
+    LNS_PARALLEL_NEIGHBORHOODS: int = 2  # non-touching neighbourhoods per batch
 
     # Soft Constraint Weights (must sum to 1.0)
     WEIGHT_FACULTY_PREFERENCE: float = 0.20  # Faculty preferred time slots
@@ -72,12 +92,19 @@ class Settings:
     RL_EPSILON: float = 0.10  # More exploitation, less exploration
     RL_MAX_ITERATIONS: int = 250  # Reduced from 500 (50% faster)
     RL_CONVERGENCE_THRESHOLD: float = 0.05  # Less strict convergence (faster)
+    # Q-policy swap refinement on the indexed schedule state (before repair)
+    RL_REFINE_TIME_BUDGET_SECONDS: float = float(os.getenv("RL_REFINE_TIME_BUDGET_SECONDS", "5"))
+    RL_MAX_DECISIONS: int = 5000
     Q_TABLE_PATH: str = str(backend_dir / "fastapi" / "q_table.pkl")
+    # Post-merge conflict repair (min-conflicts / Kempe chains), seconds
+    # shared by the final solution and every GA variant; 0 disables it.
+    REPAIR_TIME_BUDGET_SECONDS: float = float(os.getenv("REPAIR_TIME_BUDGET_SECONDS", "20"))
     
     # Optimization Features (NEW)
     ENABLE_EARLY_TERMINATION: bool = True
-    QUALITY_THRESHOLD: float = 0.80  # Stop at 80% optimal
+    QUALITY_THRESHOLD: float = 0.10  # Stop once best fitness is 10% above the CP-SAT seed's
     NO_IMPROVEMENT_LIMIT: int = 8  # Stop after 8 generations without improvement
+    GA_MIN_GENERATIONS: int = 5  # Neither early stop fires before this many generations
     ENABLE_CONSTRAINT_CACHE: bool = True
     CACHE_SIZE: int = 1000  # LRU cache size
     USE_GREEDY_INITIAL: bool = True
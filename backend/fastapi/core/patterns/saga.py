@@ -134,10 +134,25 @@ def _solve_cluster_worker(
     student_course_index,
     total_clusters: int,
     num_workers: int,
+    budget_seconds: Optional[float] = None,
+    worker_grant=None,
+    room_index=None,
+    slot_masks=None,
 ):
     """
     Run one CP-SAT cluster inside a subprocess.
-    Returns (cluster_id, solution_or_None, error_msg_or_None).
+    Returns (cluster_id, solution_or_None, error_msg_or_None, strategy_outcomes,
+    unsat_cores).
+
+    ``budget_seconds`` is this cluster's slice of the job deadline, computed by
+    the parent; the subprocess allocator treats it as its own deadline.
+    ``strategy_outcomes`` is handed back so the parent's history learns from
+    attempts made in the subprocess.  ``worker_grant`` (cluster_scheduler)
+    marks the start time and lets the parent raise num_search_workers once
+    the pool queue has drained.  ``unsat_cores`` are the infeasible course
+    subsets the solver diagnosed, for the job result.  ``room_index`` is the
+    parent's per-job RoomIndex (pickled once per task instead of rebuilt);
+    ``slot_masks`` likewise for the per-job SlotMasks.
     """
     import logging as _logging
     # Bootstrap logging inside the ProcessPoolExecutor subprocess.
@@ -148,8 +163,11 @@ def _solve_cluster_worker(
         from core.logging_config import setup_logging
         setup_logging()
     _logger = _logging.getLogger(__name__)
+    if worker_grant is not None:
+        worker_grant.mark_started()
     try:
         from engine.cpsat.solver import AdaptiveCPSATSolver
+        from engine.cpsat.budget import AdaptiveBudgetAllocator
         solver = AdaptiveCPSATSolver(
             courses=cluster,
             rooms=rooms,
@@ -159,13 +177,17 @@ def _solve_cluster_worker(
             total_clusters=total_clusters,
             student_course_index=student_course_index,
             num_workers=num_workers,  # OPT1: controlled thread budget per cluster
+            budget_allocator=AdaptiveBudgetAllocator(job_budget_seconds=budget_seconds),
+            worker_grant=worker_grant,
+            room_index=room_index,
+            slot_masks=slot_masks,
             # redis_client intentionally omitted — not picklable
         )
         solution = solver.solve_cluster(cluster)
-        return (cluster_id, solution, None)
+        return (cluster_id, solution, None, solver.strategy_outcomes, solver.unsat_cores)
     except Exception as exc:  # noqa: BLE001
         import traceback
-        return (cluster_id, None, f"{exc}\n{traceback.format_exc()}")
+        return (cluster_id, None, f"{exc}\n{traceback.format_exc()}", [], [])
 
 
 class TimetableGenerationSaga:
@@ -322,6 +344,9 @@ class TimetableGenerationSaga:
                 optimized_solution = await self._stage2b_ga(
                     job_id, data, initial_solution, token, tracker
                 )
+                optimized_solution = await self._stage2c_lns(
+                    job_id, data, initial_solution, optimized_solution, token, tracker
+                )
                 self.stage_completed['ga'] = True
                 if tracker:
                     tracker.complete_stage()
@@ -429,7 +454,8 @@ class TimetableGenerationSaga:
             
             if is_partial_success:
                 logger.info(f"[SAGA] PARTIAL_SUCCESS: CP-SAT completed, refinement cancelled")
-                # Keep the CP-SAT solution (feasible but not optimized)
+                # Keep the best solution so far: GA best-so-far when the GA
+                # made progress, else the CP-SAT solution (feasible, unoptimized)
                 await self._compensate(job_id, is_cancelled=True)
                 return {
                     'success': True,
@@ -437,7 +463,10 @@ class TimetableGenerationSaga:
                     'job_id': job_id,
                     'state': 'partial_success',
                     'completed_stages': list(k for k, v in self.stage_completed.items() if v),
-                    'solution': self.job_data.get('cpsat_solution', {}),
+                    'solution': (
+                        self.job_data.get('ga_solution')
+                        or self.job_data.get('cpsat_solution', {})
+                    ),
                     'reason': f'Cancelled during {e.reason.value if e.reason else "unknown"}',
                     'message': 'Basic solution generated, optimization cancelled'
                 }
@@ -531,6 +560,14 @@ class TimetableGenerationSaga:
                 len(enrollments),
             )
 
+            # Faculty availability / preference masks + org lunch blocks,
+            # built once and shared by every CP-SAT solver and the GA.
+            from engine.cpsat.slot_masks import SlotMasks
+            slot_masks = SlotMasks(faculty, time_slots, time_config)
+            # Room catalog index shared by every solver and the repair stage.
+            from engine.cpsat.room_index import RoomIndex
+            room_index = RoomIndex(rooms)
+
             return {
                 'courses': courses,
                 'rooms': rooms,
@@ -540,6 +577,8 @@ class TimetableGenerationSaga:
                 'enrollments': enrollments,
                 'organization_id': org_id,
                 'semester': semester,
+                'slot_masks': slot_masks,
+                'room_index': room_index,
             }
 
         except Exception as exc:
@@ -589,6 +628,8 @@ class TimetableGenerationSaga:
             clusters_dict = clusterer.cluster_courses(data['courses'])
             clusters = list(clusters_dict.values())
             _elapsed = _t.perf_counter() - _t0
+            # Cut weight = student/faculty coupling no cluster model constrains
+            self.job_data['cluster_partition'] = clusterer.last_partition_report
 
             sizes = sorted(len(c) for c in clusters)
             logger.info(
@@ -664,6 +705,8 @@ class TimetableGenerationSaga:
         dept_buckets: Dict,
         registry,
         token: CancellationToken,
+        budget_allocator=None,
+        room_index=None,
     ) -> List:
         """Phase 2: solve each department's courses using CommittedAwareSolver.
 
@@ -703,6 +746,10 @@ class TimetableGenerationSaga:
                 committed_registry=registry,
                 job_id=job_id,
                 redis_client=self.redis_client,
+                budget_allocator=budget_allocator,
+                unsat_cores=self.job_data.setdefault('cpsat_unsat_cores', []),
+                room_index=room_index,
+                slot_masks=data.get("slot_masks"),
             )
             registry.commit_solution(result.solution, dept_courses)
             dept_results.append(result)
@@ -743,7 +790,10 @@ class TimetableGenerationSaga:
         from engine.cpsat.committed_registry import CommittedResourceRegistry
         from engine.cpsat.cross_dept_solver import solve_cross_dept_timetable
         from engine.cpsat.timetable_merger import merge_timetables
+        from engine.cpsat.budget import AdaptiveBudgetAllocator
+        from engine.cpsat.room_index import RoomIndex
         from core.services.course_partitioner import CoursePartitioner
+        from config import settings as _settings
         import time as _t
 
         courses = data.get("courses", [])
@@ -760,6 +810,15 @@ class TimetableGenerationSaga:
         )
         try:
             registry = CommittedResourceRegistry()
+            # One allocator per job: owns the global CP-SAT deadline and splits
+            # it across every dept / cross-dept cluster by predicted difficulty.
+            budget_allocator = AdaptiveBudgetAllocator(
+                job_budget_seconds=_settings.CPSAT_JOB_BUDGET_SECONDS or None,
+                min_timeout=_settings.CPSAT_MIN_STRATEGY_TIMEOUT,
+            )
+            budget_allocator.expect_sessions(sum(max(c.duration, 1) for c in courses))
+            # Room catalog index shared by every dept / cross-dept solver.
+            room_index = data.get("room_index") or RoomIndex(data["rooms"])
             _tp1 = _t.perf_counter()
             partition = CoursePartitioner().partition(courses)
             logger.info(
@@ -782,7 +841,9 @@ class TimetableGenerationSaga:
             token.check_or_raise("before_dept_phase")
             _tp2 = _t.perf_counter()
             dept_results = await self._run_dept_phase(
-                job_id, data, partition.dept_buckets, registry, token
+                job_id, data, partition.dept_buckets, registry, token,
+                budget_allocator=budget_allocator,
+                room_index=room_index,
             )
             logger.info(
                 "[SAGA-CPSAT] PHASE 2 done  elapsed=%.2fs  dept_results=%d"
@@ -811,7 +872,12 @@ class TimetableGenerationSaga:
                 committed_registry=registry,
                 job_id=job_id,
                 redis_client=self.redis_client,
+                budget_allocator=budget_allocator,
+                unsat_cores=self.job_data.setdefault('cpsat_unsat_cores', []),
+                room_index=room_index,
+                slot_masks=data.get("slot_masks"),
             )
+            budget_allocator.history.save()
             logger.info(
                 "[SAGA-CPSAT] PHASE 3 done  elapsed=%.2fs  cross_assignments=%d",
                 _t.perf_counter() - _tp3, len(cross_solution),
@@ -826,6 +892,7 @@ class TimetableGenerationSaga:
             _tp4 = _t.perf_counter()
             merged = merge_timetables(dept_results, cross_solution, courses)
             self.job_data["registry"] = registry
+            self.job_data["cpsat_solution"] = merged
             logger.info(
                 "[SAGA-CPSAT] PHASE 4 done  elapsed=%.2fs  merged_assignments=%d",
                 _t.perf_counter() - _tp4, len(merged),
@@ -861,6 +928,9 @@ class TimetableGenerationSaga:
         """
         from engine.cpsat.solver import AdaptiveCPSATSolver
         from engine.cpsat.constraints import build_student_course_index
+        from engine.cpsat.budget import AdaptiveBudgetAllocator, get_shared_history
+        from engine.cpsat.room_index import RoomIndex
+        from config import settings as _settings
 
         if not clusters:
             logger.warning("[SAGA] No clusters to solve - returning empty solution")
@@ -879,6 +949,23 @@ class TimetableGenerationSaga:
         total_clusters_count = len(clusters)
         completed_count = 0
 
+        # Adaptive budgets: sequential path shares one job-scoped allocator;
+        # the process pool gets per-cluster slices of the same deadline.
+        _job_budget = _settings.CPSAT_JOB_BUDGET_SECONDS or None
+        budget_allocator = AdaptiveBudgetAllocator(
+            job_budget_seconds=_job_budget,
+            min_timeout=_settings.CPSAT_MIN_STRATEGY_TIMEOUT,
+        )
+        _cluster_sessions = [sum(max(c.duration, 1) for c in cl) for cl in clusters]
+        _total_sessions = max(sum(_cluster_sessions), 1)
+        budget_allocator.expect_sessions(_total_sessions)
+        _history = get_shared_history()
+        room_index = data.get('room_index') or RoomIndex(data['rooms'])
+        # Legacy re-solves every course, so cores from a failed partitioned
+        # attempt no longer apply.
+        _unsat_cores: List[Dict] = []
+        self.job_data['cpsat_unsat_cores'] = _unsat_cores
+
         # -----------------------------------------------------------------
         # OPT1: Parallel cluster execution via ProcessPoolExecutor
         #
@@ -911,30 +998,79 @@ class TimetableGenerationSaga:
             )
 
         if use_parallel:
+            from engine.cpsat.cluster_scheduler import (
+                WorkerGrant,
+                WorkerGrantBoard,
+                estimate_cluster_difficulty,
+                lpt_order,
+            )
+            # LPT: submit the hardest clusters first so a large cluster never
+            # starts last and stretches the makespan on its own.  A Manager
+            # dict lets the parent hand idle cores to the stragglers once the
+            # queue drains; without it scheduling is still LPT, just unboosted.
+            _difficulties = [
+                estimate_cluster_difficulty(cl, student_course_index) for cl in clusters
+            ]
+            _order = lpt_order(_difficulties)
+            _manager = None
+            _shared = None
+            try:
+                import multiprocessing as _mp
+                _manager = _mp.Manager()
+                _shared = _manager.dict()
+            except Exception as mgr_exc:
+                logger.warning(
+                    f"[SAGA-PARALLEL] Grant manager unavailable ({mgr_exc}) — "
+                    f"LPT order without idle-core boosting"
+                )
+            board = WorkerGrantBoard(
+                _shared, _difficulties, physical_cores, workers_per_cluster
+            )
             try:
                 loop = asyncio.get_running_loop()
                 with ProcessPoolExecutor(max_workers=parallel_clusters) as executor:
-                    # Submit all clusters at once; results come back as they finish.
-                    tasks = [
-                        loop.run_in_executor(
+                    # Submit all clusters at once, hardest first; the executor
+                    # hands them out FIFO and results come back as they finish.
+                    tasks = []
+                    for _rank, cluster_id in enumerate(_order):
+                        board.submitted(cluster_id, _rank)
+                        tasks.append(loop.run_in_executor(
                             executor,
                             _solve_cluster_worker,
                             cluster_id,
-                            cluster,
+                            clusters[cluster_id],
                             data['rooms'],
                             data['time_slots'],
                             data['faculty'],
                             student_course_index,
                             total_clusters_count,
                             workers_per_cluster,
-                        )
-                        for cluster_id, cluster in enumerate(clusters)
-                    ]
+                            # Session-weighted slice of the deadline; clusters
+                            # run parallel_clusters-wide so each lane gets more.
+                            (
+                                _job_budget * parallel_clusters
+                                * _cluster_sessions[cluster_id] / _total_sessions
+                                if _job_budget else None
+                            ),
+                            WorkerGrant(_shared, cluster_id) if _shared is not None else None,
+                            room_index,
+                            data.get('slot_masks'),
+                        ))
 
                     for coro in asyncio.as_completed(tasks):
                         try:
-                            result_cid, cluster_solution, error_msg = await coro
+                            (
+                                result_cid, cluster_solution, error_msg, outcomes, cores,
+                            ) = await coro
                             completed_count += 1
+                            _unsat_cores.extend(cores)
+                            for _feat, _name, _status, _secs in outcomes:
+                                _history.record(_name, _feat.bucket(), _status, _secs)
+                            board.finished(
+                                result_cid,
+                                'error' if error_msg else ('solved' if cluster_solution else 'fallback'),
+                            )
+                            board.rebalance()
 
                             if error_msg:
                                 logger.error(
@@ -1011,6 +1147,15 @@ class TimetableGenerationSaga:
                 use_parallel = False
                 solution = {}
                 completed_count = 0
+                _unsat_cores.clear()
+            finally:
+                if board.timelines:
+                    self._publish_cluster_timelines(job_id, board)
+                if _manager is not None:
+                    try:
+                        _manager.shutdown()
+                    except Exception:
+                        pass
 
         if not use_parallel:
             # Sequential fallback (original logic, preserved exactly)
@@ -1032,6 +1177,10 @@ class TimetableGenerationSaga:
                     cluster_id=cluster_id,
                     total_clusters=total_clusters_count,
                     student_course_index=student_course_index,  # OPT2
+                    budget_allocator=budget_allocator,
+                    unsat_cores=_unsat_cores,
+                    room_index=room_index,
+                    slot_masks=data.get('slot_masks'),
                 )
 
                 cluster_solution = solver.solve_cluster(cluster)
@@ -1059,11 +1208,44 @@ class TimetableGenerationSaga:
                                 _GREEDY_FALLBACK_SENTINEL, _fb_room
                             )
 
+        _history.save()
         logger.info(f"[SAGA] CP-SAT complete: {len(solution)} assignments")
         # Store for PARTIAL_SUCCESS recovery (Google/Meta pattern)
         self.job_data['cpsat_solution'] = solution
         return solution
     
+    def _publish_cluster_timelines(self, job_id: str, board) -> None:
+        """
+        Publish per-cluster start/finish timelines of the parallel CP-SAT pool.
+
+        Kept in job_data for the result payload and mirrored to Redis
+        (``cpsat:timeline:job:{job_id}``) so operators can inspect makespan,
+        LPT order and idle-core grants while or after the job runs.
+        """
+        import json
+        timelines = board.export()
+        summary = {
+            'makespan_s': board.makespan(),
+            'clusters': len(timelines),
+            'timelines': timelines,
+        }
+        self.job_data['cluster_timelines'] = summary
+        logger.info(
+            "[SAGA-PARALLEL] Cluster pool makespan=%.2fs  clusters=%d",
+            summary['makespan_s'], len(timelines),
+        )
+        if not self.redis_client:
+            return
+        try:
+            self.redis_client.setex(
+                f"cpsat:timeline:job:{job_id}", 3600 * 24, json.dumps(summary)
+            )
+        except Exception as exc:
+            logger.warning(
+                "[SAGA-PARALLEL] Timeline publish failed (non-fatal)",
+                extra={"job_id": job_id, "error": str(exc)},
+            )
+
     async def _stage2b_ga(
         self, job_id: str, data: Dict, initial_solution: Dict,
         token: CancellationToken, tracker=None
@@ -1114,6 +1296,14 @@ class TimetableGenerationSaga:
         _ga_gens = _ga_settings.GA_GENERATIONS
         _ga_total_ticks = NUM_VARIANTS * _ga_gens  # total generation ticks across all variants
         _ga_ticks_done = 0  # running counter for smooth progress 75%->90%
+        _ga_cpu_seconds = 0.0  # process CPU time, for the LNS comparison
+        # Anytime GA: one wall-clock budget for the whole stage, split over the
+        # variants still to run, plus stagnation / quality early termination.
+        _ga_deadline = (
+            _t.perf_counter() + _ga_settings.GA_TIME_BUDGET_SECONDS
+            if _ga_settings.GA_TIME_BUDGET_SECONDS > 0 else None
+        )
+        _early = _ga_settings.ENABLE_EARLY_TERMINATION
 
         logger.info(
             "[SAGA-GA] Starting GA  job_id=%s  variants=%d  pop=%d  gens=%d"
@@ -1131,6 +1321,18 @@ class TimetableGenerationSaga:
             # The per-generation callback below drops it further to <0.5 s.
             # ----------------------------------------------------------------
             token.check_or_raise(f"ga_variant_{variant_idx}")
+            _variant_budget = None
+            if _ga_deadline is not None:
+                _remaining = _ga_deadline - _t.perf_counter()
+                if _remaining <= 0:
+                    logger.warning(
+                        "[SAGA-GA] Stage budget exhausted -- skipping variants %d-%d"
+                        "  job_id=%s",
+                        variant_idx + 1, NUM_VARIANTS, job_id,
+                    )
+                    break
+                _variant_budget = _remaining / (NUM_VARIANTS - variant_idx)
+            optimizer = None
             try:
                 # Use a different random seed per variant for diversity
                 config = VARIANT_CONFIGS[variant_idx]
@@ -1170,8 +1372,9 @@ class TimetableGenerationSaga:
                         _token.check_or_raise(f"ga_variant_{_vidx}_gen_{gen}")
                     if _tracker is None:
                         return
-                    # Map ticks into the GA stage's 75-90% window
-                    ga_start, ga_end = 75.0, 90.0
+                    # Map ticks into the GA stage's 75-90% window (75-85% when
+                    # the LNS stage takes the last 5 points).
+                    ga_start, ga_end = 75.0, (85.0 if _ga_settings.LNS_ENABLED else 90.0)
                     fraction = min(_ref[0] / max(_total, 1), 1.0)
                     overall = ga_start + fraction * (ga_end - ga_start)
                     try:
@@ -1195,10 +1398,18 @@ class TimetableGenerationSaga:
                     population_size=_ga_pop,
                     generations=_ga_gens,
                     fitness_weights=config['weights'],
-                    progress_callback=_ga_progress_callback
+                    progress_callback=_ga_progress_callback,
+                    slot_masks=data.get('slot_masks'),
+                    room_index=data.get('room_index'),
+                    no_improvement_limit=_ga_settings.NO_IMPROVEMENT_LIMIT if _early else None,
+                    quality_threshold=_ga_settings.QUALITY_THRESHOLD if _early else None,
+                    time_budget=_variant_budget,
+                    min_generations=_ga_settings.GA_MIN_GENERATIONS,
                 )
 
+                _cpu0 = _t.process_time()
                 optimized = optimizer.optimize()
+                _ga_cpu_seconds += _t.process_time() - _cpu0
                 fitness = optimizer.fitness(optimized)
 
                 variant_record = {
@@ -1208,6 +1419,8 @@ class TimetableGenerationSaga:
                     'solution': optimized,
                     'label': config['label'],
                     'weights': config['weights'],
+                    'generations_run': optimizer.generations_run,
+                    'stop_reason': optimizer.stop_reason,
                 }
                 variants.append(variant_record)
 
@@ -1215,17 +1428,27 @@ class TimetableGenerationSaga:
                     best_fitness = fitness
                     best_solution = optimized
 
-                # Advance the shared tick counter for the next variant
-                _ga_ticks_done = _ticks_ref[0]
+                # Advance the shared tick counter for the next variant (a full
+                # variant's worth even if it stopped early, so progress stays
+                # aligned with the 75-90% window)
+                _ga_ticks_done = max(_ticks_ref[0], (variant_idx + 1) * _ga_gens)
 
                 logger.info(
                     "[SAGA-GA] Variant %d/%d DONE  fitness=%.4f  seed=%d"
-                    "  label=%s  new_best=%s  job_id=%s",
+                    "  label=%s  new_best=%s  generations=%d  stop=%s  job_id=%s",
                     variant_idx + 1, NUM_VARIANTS, fitness, variant_seed,
-                    config['label'], fitness >= best_fitness, job_id,
+                    config['label'], fitness >= best_fitness,
+                    optimizer.generations_run, optimizer.stop_reason, job_id,
                 )
 
             except CancellationError:
+                # Anytime: keep the best genome found so far (this variant's
+                # partial run included) so a cancelled job persists the
+                # GA-improved solution rather than the raw CP-SAT one.
+                if optimizer is not None and optimizer.best_fitness > best_fitness:
+                    best_solution = optimizer.best_solution
+                self.job_data['variants'] = variants
+                self.job_data['ga_solution'] = best_solution
                 # Enterprise pattern: cooperative cancellation MUST propagate.
                 # Without this guard the outer ``except Exception`` below swallows
                 # CancellationError (it inherits from Exception), preventing saga's
@@ -1239,6 +1462,7 @@ class TimetableGenerationSaga:
         # Store all variants for the variants API endpoint and admin UI
         self.job_data['variants'] = variants
         self.job_data['ga_solution'] = best_solution
+        self.job_data['ga_cpu_seconds'] = _ga_cpu_seconds
 
         logger.info(
             "[SAGA-GA] GA complete  job_id=%s  variants=%d  best_fitness=%.4f",
@@ -1246,6 +1470,104 @@ class TimetableGenerationSaga:
         )
         return best_solution
     
+    async def _stage2c_lns(
+        self, job_id: str, data: Dict, initial_solution: Dict, ga_solution: Dict,
+        token: CancellationToken, tracker=None
+    ) -> Dict:
+        """
+        Stage 2C: CP-SAT large neighbourhood search from the merged solution.
+
+        Runs alongside the GA within LNS_TIME_BUDGET_SECONDS: the result is
+        added as an extra variant and replaces the GA solution when it scores
+        higher under default fitness weights.  Fitness gain per CPU-second of
+        GA and LNS is recorded in job_data['optimizer_efficiency'].
+        """
+        from engine.cpsat.lns import LNSOptimizer
+        from engine.ga.fitness import evaluate_fitness_simple
+        from config import settings as _settings
+        import os
+
+        budget = _settings.LNS_TIME_BUDGET_SECONDS
+        if not _settings.LNS_ENABLED or budget <= 0 or not initial_solution:
+            return ga_solution
+        token.check_or_raise("lns")
+
+        def _fitness(solution: Dict) -> float:
+            return evaluate_fitness_simple(
+                solution, data['courses'], data['faculty'], data['time_slots'],
+                data['rooms'], slot_masks=data.get('slot_masks'),
+            )
+
+        def _lns_progress(fraction: float, report: Dict) -> None:
+            token.check_or_raise("lns_batch")
+            if tracker is None:
+                return
+            try:
+                tracker.update(
+                    stage='ga_optimization',
+                    stage_progress=round(fraction * 100, 1),
+                    overall_progress=round(85.0 + 5.0 * fraction, 2),
+                    meta={'phase': 'lns', **report},
+                )
+            except Exception:
+                pass  # Non-fatal
+
+        parallel = max(1, min(_settings.LNS_PARALLEL_NEIGHBORHOODS, os.cpu_count() or 1))
+        try:
+            optimizer = LNSOptimizer(
+                courses=data['courses'],
+                rooms=data['rooms'],
+                time_slots=data['time_slots'],
+                room_index=data.get('room_index'),
+                slot_masks=data.get('slot_masks'),
+                max_sessions=_settings.LNS_NEIGHBORHOOD_SESSIONS,
+                parallel=parallel,
+                subproblem_timeout=_settings.LNS_SUBPROBLEM_TIMEOUT,
+            )
+            lns_solution = optimizer.optimize(
+                initial_solution, budget, progress_callback=_lns_progress,
+            )
+        except CancellationError:
+            raise
+        except Exception as e:
+            logger.error("[SAGA-LNS] LNS stage failed: %s - keeping GA solution", e)
+            return ga_solution
+
+        f_initial = _fitness(initial_solution)
+        f_ga = _fitness(ga_solution)
+        f_lns = _fitness(lns_solution)
+        ga_cpu = self.job_data.get('ga_cpu_seconds', 0.0)
+        lns_cpu = optimizer.report.get('cpu_s', 0.0)
+        self.job_data['optimizer_efficiency'] = {
+            'fitness_initial': round(f_initial, 4),
+            'ga': {
+                'fitness': round(f_ga, 4),
+                'cpu_s': round(ga_cpu, 3),
+                'gain_per_cpu_s': round((f_ga - f_initial) / ga_cpu, 4) if ga_cpu else 0.0,
+            },
+            'lns': {
+                'fitness': round(f_lns, 4),
+                'cpu_s': lns_cpu,
+                'gain_per_cpu_s': round((f_lns - f_initial) / lns_cpu, 4) if lns_cpu else 0.0,
+                'report': optimizer.report,
+            },
+        }
+        logger.info(
+            "[SAGA-LNS] LNS complete  job_id=%s  efficiency=%s",
+            job_id, self.job_data['optimizer_efficiency'],
+        )
+
+        variants = self.job_data.setdefault('variants', [])
+        variants.append({
+            'variant_id': len(variants) + 1,
+            'seed': None,
+            'fitness': round(f_lns, 4),
+            'solution': lns_solution,
+            'label': 'LNS-Improved',
+            'weights': None,
+        })
+        return lns_solution if f_lns > f_ga else ga_solution
+
     async def _stage3_rl(self, job_id: str, data: Dict, solution: Dict, token: CancellationToken, tracker=None) -> Dict:
         """
         Stage 3: RL conflict refinement (frozen policy, optional)
@@ -1290,24 +1612,92 @@ class TimetableGenerationSaga:
                     len(rl.q_table), rl.epsilon,
                 )
 
-            # Apply RL refinement (local swaps only, no global repair)
-            # NOTE: refine_solution is not yet implemented; RL stage is a pass-through.
-            refined = solution  # TODO: Implement rl.refine_solution(solution)
+            # Policy-guided local swaps on the indexed schedule state, then
+            # min-conflicts repair for whatever clashes the swaps leave.
+            from config import settings as _rl_settings
+            _last_check = [0.0]
+
+            def _should_stop() -> bool:
+                now = _t.perf_counter()
+                if now - _last_check[0] < 0.25:
+                    return False
+                _last_check[0] = now
+                return token.is_cancelled()
+
+            refined = solution
+            if _rl_settings.RL_REFINE_TIME_BUDGET_SECONDS > 0:
+                refined = rl.refine_solution(
+                    solution,
+                    room_index=data.get('room_index'),
+                    slot_masks=data.get('slot_masks'),
+                    max_decisions=_rl_settings.RL_MAX_DECISIONS,
+                    time_budget=_rl_settings.RL_REFINE_TIME_BUDGET_SECONDS,
+                    should_stop=_should_stop,
+                )
+                self.job_data['rl_refinement'] = rl.refine_report
+                token.check_or_raise("rl_refinement")
+            refined = self._repair_conflicts(data, refined, token)
             logger.info(
                 "[SAGA-RL] RL refinement complete  elapsed=%.2fs"
-                "  assignments_in=%d  assignments_out=%d  note=pass-through",
+                "  assignments_in=%d  assignments_out=%d  rl=%s  repair=%s",
                 _t.perf_counter() - _t0,
                 len(solution),
                 len(refined),
+                self.job_data.get('rl_refinement'),
+                self.job_data.get('conflict_repair', {}).get('final'),
             )
             return refined
 
+        except CancellationError:
+            raise
         except Exception as e:
             logger.error("[SAGA-RL] RL stage failed: %s - using GA solution", e)
             import traceback
             logger.error(traceback.format_exc())
             return solution
     
+    def _repair_conflicts(self, data: Dict, solution: Dict, token: CancellationToken) -> Dict:
+        """
+        Min-conflicts / Kempe-chain repair of faculty, room and student clashes
+        on the final solution and every GA variant (engine.cpsat.conflict_repair).
+        REPAIR_TIME_BUDGET_SECONDS is split evenly across the solutions; the
+        search checks cancellation between moves (throttled Redis GET).
+        """
+        from engine.cpsat.conflict_repair import ConflictRepairer
+        from config import settings as _settings
+        import time as _t
+
+        budget = _settings.REPAIR_TIME_BUDGET_SECONDS
+        if budget <= 0:
+            return solution
+        variants = self.job_data.get('variants', [])
+        per_solution = budget / (1 + len(variants))
+        repairer = ConflictRepairer(
+            data['courses'], data['rooms'], data['time_slots'],
+            room_index=data.get('room_index'),
+            slot_masks=data.get('slot_masks'),
+        )
+        _last_check = [0.0]
+
+        def _should_stop() -> bool:
+            now = _t.perf_counter()
+            if now - _last_check[0] < 0.25:
+                return False
+            _last_check[0] = now
+            return token.is_cancelled()
+
+        repaired = repairer.repair(solution, per_solution, _should_stop)
+        reports = {'final': repairer.report}
+        token.check_or_raise("conflict_repair")
+        for variant in variants:
+            variant['solution'] = repairer.repair(
+                variant['solution'], per_solution, _should_stop,
+            )
+            reports[f"variant_{variant['variant_id']}"] = repairer.report
+            token.check_or_raise(f"conflict_repair_variant_{variant['variant_id']}")
+        self.job_data['conflict_repair'] = reports
+        return repaired
+
     async def _persist_results(
         self,
         job_id: str,
@@ -1379,6 +1769,7 @@ class TimetableGenerationSaga:
                 'course_id': course_id,
                 'course_code': getattr(course, 'course_code', ''),
                 'course_name': getattr(course, 'course_name', ''),
+                'department_id': getattr(course, 'department_id', ''),
                 'faculty_id': getattr(course, 'faculty_id', ''),
                 'room_id': room_id,
                 'room_code': getattr(room, 'room_code', ''),
@@ -1474,6 +1865,9 @@ class TimetableGenerationSaga:
                 _fac_id = getattr(course, 'faculty_id', '')
                 _fac    = data.get('faculty', {}).get(_fac_id)
                 v_entries.append({
+                    'course_id':    c_id,
+                    'session_number': _sess,
+                    'department_id': getattr(course, 'department_id', ''),
                     'course_code':  getattr(course, 'course_code', ''),
                     'subject_name': getattr(course, 'course_name', ''),
                     'faculty_id':   _fac_id,
@@ -1520,6 +1914,16 @@ class TimetableGenerationSaga:
             'total_courses': len(courses_by_id),
             'variants_count': len(enriched_variants),
             'variants': enriched_variants,
+            # Course subsets CP-SAT proved jointly infeasible (then relaxed)
+            'cpsat_unsat_cores': self.job_data.get('cpsat_unsat_cores', []),
+            # Stage-1 partition quality (cut weight between clusters)
+            'cluster_partition': self.job_data.get('cluster_partition', {}),
+            # Q-policy swap refinement report (final solution)
+            'rl_refinement': self.job_data.get('rl_refinement', {}),
+            # Post-merge clash repair report per solution
+            'conflict_repair': self.job_data.get('conflict_repair', {}),
+            # GA vs LNS fitness gain per CPU-second
+            'optimizer_efficiency': self.job_data.get('optimizer_efficiency', {}),
             'generated_at': datetime.now(timezone.utc).isoformat(),
         }
 
@@ -1576,6 +1980,111 @@ class TimetableGenerationSaga:
             except Exception as redis_err:
                 logger.error(f"[SAGA-PERSIST] Redis store failed: {redis_err}")
 
+            # Per-variant entry index for department / faculty / room / day
+            # views (core.services.result_index).  Entries are stored one hash
+            # field each, without student_ids, so a view fetches only its rows;
+            # the student index (core.services.student_index) maps each
+            # student to the offsets of the entries they attend, and the
+            # occupancy index (core.services.occupancy_index) keeps room /
+            # faculty / student busy-slot bitmaps for free-room queries.
+            # Course domains back live edit validation.
+            from config import settings as _persist_settings
+            if _persist_settings.RESULT_INDEX_ENABLED:
+                from core.services.result_index import FINAL_VARIANT
+                _slots_list = data.get('time_slots', [])
+                _rooms_list = data.get('rooms', [])
+                _ttl = 3600 * 24  # same TTL as result:job:{job_id}
+                # Persisted with the entries so expired bitmaps can be rebuilt
+                # from the DB (occupancy_index.rebuild_occupancy_index)
+                from core.services.occupancy_index import occupancy_catalogue
+                result_payload['occupancy_catalogue'] = occupancy_catalogue(_slots_list, _rooms_list)
+                try:
+                    from core.services.result_index import store_result_index
+                    from core.services.student_index import store_student_index
+                    from core.services.occupancy_index import store_occupancy_index
+                    _students_of = {
+                        cid: getattr(c, 'student_ids', None) or []
+                        for cid, c in courses_by_id.items()
+                    }
+                    store_result_index(
+                        self.redis_client, job_id, FINAL_VARIANT,
+                        [
+                            {k: v2 for k, v2 in e.items() if k != 'student_ids'}
+                            for e in timetable_entries
+                        ],
+                        _ttl,
+                    )
+                    store_student_index(
+                        self.redis_client, job_id, FINAL_VARIANT,
+                        timetable_entries, _students_of, _ttl,
+                    )
+                    store_occupancy_index(
+                        self.redis_client, job_id, FINAL_VARIANT, timetable_entries,
+                        _slots_list, _rooms_list, _students_of, _ttl,
+                    )
+                    for ev in enriched_variants:
+                        store_result_index(
+                            self.redis_client, job_id, str(ev['variant_id']),
+                            ev['timetable_entries'], _ttl,
+                        )
+                        store_student_index(
+                            self.redis_client, job_id, str(ev['variant_id']),
+                            ev['timetable_entries'], _students_of, _ttl,
+                        )
+                        store_occupancy_index(
+                            self.redis_client, job_id, str(ev['variant_id']),
+                            ev['timetable_entries'], _slots_list, _rooms_list,
+                            _students_of, _ttl,
+                        )
+                    # Valid (slot, room) domains for live edit validation
+                    # (core.services.conflict_resolution_service)
+                    from core.services.conflict_resolution_service import store_edit_domains
+                    from engine.cpsat.room_index import RoomIndex
+                    store_edit_domains(
+                        self.redis_client, job_id, list(courses_by_id.values()), _slots_list,
+                        data.get('room_index') or RoomIndex(_rooms_list),
+                        data.get('slot_masks'), _ttl,
+                    )
+                    logger.info(
+                        f"[SAGA-PERSIST] Indexed {1 + len(enriched_variants)} result views in Redis"
+                    )
+                except Exception as index_err:
+                    logger.error(f"[SAGA-PERSIST] Result index store failed: {index_err}")
+
+                # Pairwise variant diffs for Django's compare view
+                # (core.services.variant_diff), computed once here.
+                try:
+                    from core.services.variant_diff import store_variant_diffs
+                    _pairs = store_variant_diffs(
+                        self.redis_client, job_id,
+                        {
+                            FINAL_VARIANT: timetable_entries,
+                            **{str(ev['variant_id']): ev['timetable_entries'] for ev in enriched_variants},
+                        },
+                        _slots_list, _ttl,
+                    )
+                    logger.info(f"[SAGA-PERSIST] Stored {_pairs} precomputed variant diffs")
+                except Exception as diff_err:
+                    logger.error(f"[SAGA-PERSIST] Variant diff store failed: {diff_err}")
+
+        # Conflict rows per variant (core.services.conflict_index), written
+        # to timetable_conflicts in the Step 3 transaction so Django's
+        # conflict views read indexed rows instead of re-detecting.
+        conflicts_by_variant: Dict[str, list] = {}
+        try:
+            from core.services.conflict_index import detect_variant_conflicts
+            from core.services.result_index import FINAL_VARIANT as _FINAL
+            conflicts_by_variant[_FINAL] = detect_variant_conflicts(
+                timetable_entries, courses_by_id, rooms_by_id,
+            )
+            for ev in enriched_variants:
+                conflicts_by_variant[str(ev['variant_id'])] = detect_variant_conflicts(
+                    ev['timetable_entries'], courses_by_id, rooms_by_id,
+                )
+        except Exception as detect_err:
+            logger.error(f"[SAGA-PERSIST] Conflict detection failed: {detect_err}")
+            conflicts_by_variant = {}
+
         # ------------------------------------------------------------------
         # Step 3: Write back to Django's generation_jobs table
         #
@@ -1601,6 +2110,22 @@ class TimetableGenerationSaga:
             db_conn.autocommit = False
 
             with db_conn.cursor() as cur:
+                if conflicts_by_variant:
+                    # A failed conflict insert must not lose the timetable:
+                    # roll back to the savepoint and persist without the
+                    # marker, so Django falls back to live detection.
+                    from core.services.conflict_index import store_conflicts
+                    cur.execute("SAVEPOINT conflict_index")
+                    try:
+                        _rows = store_conflicts(cur, job_id, conflicts_by_variant)
+                        cur.execute("RELEASE SAVEPOINT conflict_index")
+                        result_payload['conflict_index'] = {
+                            variant: len(rows) for variant, rows in conflicts_by_variant.items()
+                        }
+                        logger.info(f"[SAGA-PERSIST] Indexed {_rows} conflicts")
+                    except Exception as conflict_err:
+                        cur.execute("ROLLBACK TO SAVEPOINT conflict_index")
+                        logger.error(f"[SAGA-PERSIST] Conflict index store failed: {conflict_err}")
                 timetable_json = json.dumps(result_payload, default=str)
                 cur.execute(
                     """
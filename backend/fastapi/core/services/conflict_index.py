@@ -0,0 +1,188 @@
+"""
+Conflict Index — conflicts detected once per variant at persist time.
+
+Django's conflict endpoints used to load the whole timetable_data document
+and re-detect faculty / room clashes (keyed by display names, no student
+check) on every request.  The saga now detects, per variant and for the
+final timetable:
+
+  faculty_conflict      faculty in two sessions in one slot        critical
+  room_conflict         room holding two sessions in one slot      critical
+  student_conflict      student enrolled in two sessions in a slot critical
+  capacity_violation    enrolment above room capacity              high / medium
+  room_type_mismatch    room type other than the course requires   medium
+  feature_mismatch      room lacks a required feature              low
+  max_sessions_per_day  course over MAX_SESSIONS_PER_DAY on a day  medium
+
+and writes one row per conflict to Django's timetable_conflicts table (with
+entity type / id keys and severity, indexed per job + variant) inside the
+same transaction as the generation_jobs update.  Summary endpoints then
+read grouped counts.
+
+Design: pure detection over entry dicts plus one writer taking a DB-API
+cursor; entries must carry course_id, faculty_id, room_id, time_slot_id and
+day.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, List, Mapping
+
+from engine.cpsat.constraints import MAX_SESSIONS_PER_DAY
+
+logger = logging.getLogger(__name__)
+
+CRITICAL, HIGH, MEDIUM, LOW = 'critical', 'high', 'medium', 'low'
+CAPACITY_HIGH_RATIO = 1.1  # overflow beyond 10% of capacity is high severity
+
+
+def _row(conflict_type, severity, entity_type, entity_id, day, slot, course_ids, affected, message):
+    return {
+        'conflict_type': conflict_type,
+        'severity': severity,
+        'entity_type': entity_type,
+        'entity_id': str(entity_id),
+        'day': day,
+        'time_slot_id': None if slot is None else str(slot),
+        'course_ids': sorted(set(course_ids)),
+        'affected_count': affected,
+        'message': message,
+    }
+
+
+def detect_variant_conflicts(
+    entries: List[dict],
+    courses_by_id: Mapping,
+    rooms_by_id: Mapping,
+    max_sessions_per_day: int = MAX_SESSIONS_PER_DAY,
+) -> List[dict]:
+    """All conflict rows of one variant's entries, hard conflicts first."""
+    by_faculty = defaultdict(list)   # (faculty, slot) → course ids
+    by_room = defaultdict(list)      # (room, slot)    → course ids
+    by_student = defaultdict(list)   # (student, slot) → course ids
+    per_day = defaultdict(int)       # (course, day)   → sessions
+    slot_day: Dict[str, int] = {}
+    rows: List[dict] = []
+
+    for entry in entries:
+        course_id = entry.get('course_id')
+        slot = str(entry.get('time_slot_id'))
+        day = entry.get('day')
+        slot_day[slot] = day
+        course = courses_by_id.get(course_id)
+        room = rooms_by_id.get(entry.get('room_id'))
+        if entry.get('faculty_id'):
+            by_faculty[(entry['faculty_id'], slot)].append(course_id)
+        if entry.get('room_id'):
+            by_room[(entry['room_id'], slot)].append(course_id)
+        per_day[(course_id, day)] += 1
+        if course is None:
+            continue
+        students = list(dict.fromkeys(getattr(course, 'student_ids', None) or []))
+        for sid in students:
+            by_student[(sid, slot)].append(course_id)
+        if room is None:
+            continue
+
+        enrolled = len(students) or getattr(course, 'enrolled_students', 0)
+        if enrolled > room.capacity:
+            rows.append(_row(
+                'capacity_violation',
+                HIGH if enrolled > room.capacity * CAPACITY_HIGH_RATIO else MEDIUM,
+                'room', room.room_id, day, slot, [course_id], enrolled - room.capacity,
+                f"{getattr(course, 'course_code', course_id)}: {enrolled} students in "
+                f"{room.room_code} (capacity {room.capacity})",
+            ))
+        required = (getattr(course, 'room_type_required', None) or 'CLASSROOM').upper()
+        if (room.room_type or '').upper() != required:
+            rows.append(_row(
+                'room_type_mismatch', MEDIUM, 'room', room.room_id, day, slot, [course_id], 1,
+                f"{getattr(course, 'course_code', course_id)} needs a {required.lower()}, "
+                f"got {room.room_code} ({room.room_type})",
+            ))
+        missing = [
+            f for f in getattr(course, 'required_features', None) or []
+            if not (isinstance(f, str) and f.startswith('fixed_slot:'))
+            and f not in (room.features or [])
+        ]
+        if missing:
+            rows.append(_row(
+                'feature_mismatch', LOW, 'room', room.room_id, day, slot, [course_id], len(missing),
+                f"{room.room_code} lacks {', '.join(missing)} for "
+                f"{getattr(course, 'course_code', course_id)}",
+            ))
+
+    def codes(course_ids):
+        return ', '.join(
+            getattr(courses_by_id.get(c), 'course_code', None) or str(c)
+            for c in dict.fromkeys(course_ids)
+        )
+
+    hard: List[dict] = []
+    for (fid, slot), course_ids in by_faculty.items():
+        if len(course_ids) > 1:
+            hard.append(_row(
+                'faculty_conflict', CRITICAL, 'faculty', fid, slot_day[slot], slot,
+                course_ids, len(course_ids),
+                f"Faculty assigned to {len(course_ids)} classes simultaneously ({codes(course_ids)})",
+            ))
+    for (rid, slot), course_ids in by_room.items():
+        if len(course_ids) > 1:
+            hard.append(_row(
+                'room_conflict', CRITICAL, 'room', rid, slot_day[slot], slot,
+                course_ids, len(course_ids),
+                f"Room double-booked with {len(course_ids)} classes ({codes(course_ids)})",
+            ))
+    for (sid, slot), course_ids in by_student.items():
+        if len(course_ids) > 1:
+            hard.append(_row(
+                'student_conflict', CRITICAL, 'student', sid, slot_day[slot], slot,
+                course_ids, len(course_ids),
+                f"Student enrolled in {len(course_ids)} classes simultaneously ({codes(course_ids)})",
+            ))
+    for (course_id, day), sessions in per_day.items():
+        if sessions > max_sessions_per_day:
+            rows.append(_row(
+                'max_sessions_per_day', MEDIUM, 'course', course_id, day, None,
+                [course_id], sessions - max_sessions_per_day,
+                f"{codes([course_id])}: {sessions} sessions on one day (max {max_sessions_per_day})",
+            ))
+    return hard + rows
+
+
+def store_conflicts(cursor, job_id: str, conflicts_by_variant: Dict[str, List[dict]]) -> int:
+    """
+    Replace the job's rows in timetable_conflicts for the variants given
+    (caller owns the transaction); returns the number of rows written.
+    """
+    from psycopg2.extras import execute_values
+
+    cursor.execute(
+        "DELETE FROM timetable_conflicts WHERE job_id = %s AND variant = ANY(%s)",
+        (job_id, list(conflicts_by_variant)),
+    )
+    values = [
+        (
+            job_id, variant, row['conflict_type'], row['severity'], row['entity_type'],
+            row['entity_id'], row['day'], row['time_slot_id'], json.dumps(row['course_ids']),
+            row['affected_count'], row['message'],
+        )
+        for variant, rows in conflicts_by_variant.items()
+        for row in rows
+    ]
+    if values:
+        execute_values(
+            cursor,
+            """
+            INSERT INTO timetable_conflicts (
+                job_id, variant, conflict_type, severity, entity_type, entity_id,
+                day, time_slot_id, course_ids, affected_count, message, created_at
+            ) VALUES %s
+            """,
+            values,
+            template="(%s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s, %s, now())",
+            page_size=1000,
+        )
+    return len(values)
@@ -0,0 +1,651 @@
+"""
+Conflict Resolution Service — live conflict checks for manual timetable edits.
+
+Drag-and-drop editing needs every proposed move or swap validated before it
+is applied.  Each worker keeps, per (job, variant), an in-memory
+VariantOccupancy loaded once from the persist-time indexes:
+
+  result:job:{job_id}:entries:{variant}    entries (core.services.result_index)
+  result:job:{job_id}:occupancy:{variant}  slot / room catalogue
+                                           (core.services.occupancy_index)
+  result:job:{job_id}:domains              HASH course_id → valid domain JSON
+                                           {faculty_id, students, enrolled,
+                                           room_type, features, slots, rooms}
+                                           written by store_edit_domains
+
+holding (faculty, slot), (room, slot), (student, slot) and (course, day) →
+entry offsets.  A proposal is checked in O(affected entities) — the moved
+session's faculty, room and students — and, when it clashes, alternative
+(slot, room) pairs are drawn from the session's valid domain (the slots and
+best-fit rooms CP-SAT offered it).
+
+Applies run under a per-variant Redis lock: re-validate, then write the
+edit through to Django's DB in one transaction (persist_edit: the moved
+entries in generation_jobs.timetable_data and the variant's re-detected
+timetable_conflicts rows), so it outlives the 24h Redis indexes.  Then
+rewrite the entry and its index fields (result_index.update_indexed_entry),
+update occupancy bitmaps (occupancy_index.move_session) and the compare
+view's assignment arrays (variant_diff.update_assignment), then INCR
+
+  result:job:{job_id}:edits:{variant}      edit version
+
+Other workers compare their loaded version with that counter (one GET per
+request) and reload when another worker has applied an edit.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from types import SimpleNamespace
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from config import settings
+from core.services.conflict_index import (
+    CAPACITY_HIGH_RATIO, CRITICAL, HIGH, LOW, MEDIUM, detect_variant_conflicts, store_conflicts,
+)
+from core.services.occupancy_index import move_session, occupancy_key
+from core.services.result_index import FINAL_VARIANT, entries_key, update_indexed_entry
+from core.services.variant_diff import update_assignment
+from engine.cpsat.constraints import MAX_SESSIONS_PER_DAY
+
+logger = logging.getLogger(__name__)
+
+DOMAIN_ROOMS = 24           # best-fit rooms kept per course domain
+EDIT_LOCK_TIMEOUT = 5       # seconds an apply may hold the variant lock
+EDIT_LOCK_WAIT = 2          # seconds to wait for another worker's apply
+# Entry fields an edit changes; merged into the persisted entry so fields
+# only the DB copy carries (student_ids) survive
+PLACEMENT_FIELDS = ('time_slot_id', 'day', 'day_of_week', 'start_time', 'end_time', 'room_id', 'room_code')
+
+
+def domains_key(job_id: str) -> str:
+    return f"result:job:{job_id}:domains"
+
+
+def edits_key(job_id: str, variant: str) -> str:
+    return f"result:job:{job_id}:edits:{variant}"
+
+
+def store_edit_domains(
+    redis_client,
+    job_id: str,
+    courses: Sequence,
+    time_slots: Sequence,
+    room_index,
+    slot_masks,
+    ttl_seconds: int,
+) -> int:
+    """Write each course's valid (slots, rooms) domain and attendees; returns the course count."""
+    from engine.cpsat.domains import candidate_rooms, candidate_slots, enrolment
+
+    slot_ids = [str(ts.slot_id) for ts in time_slots]
+    domains = {}
+    for course in courses:
+        domains[course.course_id] = json.dumps({
+            'faculty_id': getattr(course, 'faculty_id', '') or '',
+            'students': list(dict.fromkeys(getattr(course, 'student_ids', None) or [])),
+            'enrolled': enrolment(course),
+            'room_type': (getattr(course, 'room_type_required', None) or 'CLASSROOM').upper(),
+            'features': [
+                f for f in getattr(course, 'required_features', None) or []
+                if not (isinstance(f, str) and f.startswith('fixed_slot:'))
+            ],
+            'slots': candidate_slots(course, slot_ids, slot_masks),
+            'rooms': [r.room_id for r in candidate_rooms(course, room_index)[:DOMAIN_ROOMS]],
+        })
+    d_key = domains_key(job_id)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(d_key)
+    if domains:
+        pipe.hset(d_key, mapping=domains)
+        pipe.expire(d_key, ttl_seconds)
+    pipe.execute()
+    return len(domains)
+
+
+def persist_edit(
+    job_id: str,
+    variant: str,
+    placed: Mapping[int, dict],
+    conflicts: List[dict],
+) -> int:
+    """
+    Write moved entries ({offset: entry}) into generation_jobs.timetable_data
+    and replace the variant's timetable_conflicts rows, in one transaction.
+    Offsets address the variant's timetable_entries list, as in the result
+    index.  Returns the number of entries written.
+    """
+    from utils.django_client import _get_db_pool, _get_healthy_conn
+
+    _pool = _get_db_pool()
+    _conn = _get_healthy_conn(_pool)
+    _conn.autocommit = False
+    try:
+        with _conn.cursor() as cur:
+            if variant == FINAL_VARIANT:
+                base = ['timetable_entries']
+            else:
+                cur.execute(
+                    """
+                    SELECT v.pos - 1
+                    FROM generation_jobs g,
+                         jsonb_array_elements(g.timetable_data->'variants') WITH ORDINALITY AS v(val, pos)
+                    WHERE g.id = %s AND v.val->>'variant_id' = %s
+                    """,
+                    (job_id, variant),
+                )
+                row = cur.fetchone()
+                if row is None:
+                    raise EditRejected(f"Variant {variant} is not persisted for job {job_id}")
+                base = ['variants', str(row[0]), 'timetable_entries']
+            written = 0
+            for offset, entry in placed.items():
+                path = base + [str(offset)]
+                cur.execute(
+                    """
+                    UPDATE generation_jobs
+                    SET timetable_data = jsonb_set(
+                            timetable_data, %s::text[],
+                            (timetable_data #> %s::text[]) || %s::jsonb
+                        ),
+                        updated_at = now()
+                    WHERE id = %s AND timetable_data #> %s::text[] IS NOT NULL
+                    """,
+                    (path, path, json.dumps({k: entry[k] for k in PLACEMENT_FIELDS if k in entry}),
+                     job_id, path),
+                )
+                written += cur.rowcount
+            if written != len(placed):
+                raise EditRejected(f"Sessions of variant {variant} are not persisted for job {job_id}")
+            store_conflicts(cur, job_id, {variant: conflicts})
+            # Keep the per-variant count marker Django reads (no-op when absent)
+            cur.execute(
+                """
+                UPDATE generation_jobs
+                SET timetable_data = jsonb_set(timetable_data, %s::text[], to_jsonb(%s::int))
+                WHERE id = %s AND timetable_data ? 'conflict_index'
+                """,
+                (['conflict_index', variant], len(conflicts), job_id),
+            )
+        _conn.commit()
+        return written
+    except Exception:
+        try:
+            _conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        try:
+            _conn.autocommit = True
+        except Exception:
+            pass
+        _pool.putconn(_conn)
+
+
+class EditRejected(Exception):
+    """A proposed edit names an unknown session, slot or room."""
+
+
+class VariantOccupancy:
+    """In-memory occupancy of one variant; callers hold `lock` around use."""
+
+    def __init__(
+        self,
+        entries: Dict[int, dict],
+        slots: List[dict],
+        rooms: List[dict],
+        domains: Mapping[str, dict],
+        version: int,
+        max_sessions_per_day: int = MAX_SESSIONS_PER_DAY,
+    ) -> None:
+        self.entries = entries
+        self.slots = {s['slot_id']: s for s in slots}
+        self.slot_order = {s['slot_id']: i for i, s in enumerate(slots)}
+        self.rooms = {r['room_id']: r for r in rooms}
+        self.domains = domains
+        self.version = version
+        self.max_sessions_per_day = max_sessions_per_day
+        self.lock = threading.RLock()
+        self.faculty_at: Dict[Tuple[str, str], set] = defaultdict(set)
+        self.room_at: Dict[Tuple[str, str], set] = defaultdict(set)
+        self.student_at: Dict[Tuple[str, str], set] = defaultdict(set)
+        self.course_day: Dict[Tuple[str, int], set] = defaultdict(set)
+        for offset, entry in entries.items():
+            self._add(offset, entry)
+
+    def students_of(self, entry: dict) -> List[str]:
+        students = entry.get('student_ids')
+        if students is None:
+            students = self.domains.get(entry.get('course_id'), {}).get('students', ())
+        return [str(s) for s in students]
+
+    def _add(self, offset: int, entry: dict) -> None:
+        slot = str(entry.get('time_slot_id'))
+        if entry.get('faculty_id'):
+            self.faculty_at[(entry['faculty_id'], slot)].add(offset)
+        if entry.get('room_id'):
+            self.room_at[(entry['room_id'], slot)].add(offset)
+        for sid in self.students_of(entry):
+            self.student_at[(sid, slot)].add(offset)
+        self.course_day[(entry.get('course_id'), entry.get('day'))].add(offset)
+
+    def _remove(self, offset: int, entry: dict) -> None:
+        slot = str(entry.get('time_slot_id'))
+        keys = [
+            (self.faculty_at, (entry.get('faculty_id'), slot)),
+            (self.room_at, (entry.get('room_id'), slot)),
+            (self.course_day, (entry.get('course_id'), entry.get('day'))),
+            *((self.student_at, (sid, slot)) for sid in self.students_of(entry)),
+        ]
+        for table, key in keys:
+            held = table.get(key)
+            if held is not None:
+                held.discard(offset)
+                if not held:
+                    del table[key]
+
+    def placed(self, offset: int, slot_id: str, room_id: str) -> dict:
+        """Entry `offset` as it would read in (slot_id, room_id)."""
+        slot, room = self.slots.get(str(slot_id)), self.rooms.get(str(room_id))
+        if offset not in self.entries:
+            raise EditRejected(f"Unknown session offset {offset}")
+        if slot is None:
+            raise EditRejected(f"Unknown time slot {slot_id}")
+        if room is None:
+            raise EditRejected(f"Unknown room {room_id}")
+        entry = dict(self.entries[offset])
+        entry.update({
+            'time_slot_id': slot['slot_id'],
+            'day': slot['day'],
+            'start_time': slot['start_time'],
+            'end_time': slot['end_time'],
+            'room_id': room['room_id'],
+            'room_code': room['room_code'],
+        })
+        if 'day_of_week' in entry and slot.get('day_of_week'):
+            entry['day_of_week'] = slot['day_of_week']
+        return entry
+
+    # ------------------------------------------------------------------
+    # Checks
+    # ------------------------------------------------------------------
+
+    def course_ids_of(self, offsets) -> List[str]:
+        return sorted({self.entries[o].get('course_id') for o in offsets})
+
+    def clashes(self, offset: int, entry: dict) -> List[dict]:
+        """Conflicts of `entry` (as entry `offset`) against every other entry."""
+        slot = str(entry.get('time_slot_id'))
+        course_id = entry.get('course_id')
+        domain = self.domains.get(course_id, {})
+        conflicts: List[dict] = []
+
+        def hard(conflict_type, entity_type, entity_id, others, message, **extra):
+            conflicts.append({
+                'type': conflict_type, 'severity': CRITICAL,
+                'entity_type': entity_type, 'entity_id': entity_id,
+                'offsets': sorted(others), 'course_ids': self.course_ids_of(others),
+                'message': message, **extra,
+            })
+
+        others = self.faculty_at.get((entry.get('faculty_id'), slot), set()) - {offset}
+        if entry.get('faculty_id') and others:
+            hard('faculty_conflict', 'faculty', entry['faculty_id'], others,
+                 "Faculty already teaching in this slot")
+        others = self.room_at.get((entry.get('room_id'), slot), set()) - {offset}
+        if others:
+            hard('room_conflict', 'room', entry['room_id'], others,
+                 "Room already booked in this slot")
+        clashed, clash_offsets = [], set()
+        for sid in self.students_of(entry):
+            busy = self.student_at.get((sid, slot), set()) - {offset}
+            if busy:
+                clashed.append(sid)
+                clash_offsets |= busy
+        if clashed:
+            hard('student_conflict', 'student', clashed[0], clash_offsets,
+                 f"{len(clashed)} student(s) already in class in this slot",
+                 student_ids=clashed, affected_count=len(clashed))
+
+        def soft(conflict_type, severity, message):
+            conflicts.append({'type': conflict_type, 'severity': severity, 'message': message})
+
+        if domain.get('slots') and slot not in domain['slots']:
+            soft('slot_unavailable', HIGH, "Slot outside the session's allowed slots")
+        room = self.rooms.get(entry.get('room_id'))
+        if room is not None and domain:
+            enrolled = domain.get('enrolled', 0)
+            if enrolled > (room['capacity'] or 0):
+                soft('capacity_violation',
+                     HIGH if enrolled > (room['capacity'] or 0) * CAPACITY_HIGH_RATIO else MEDIUM,
+                     f"{enrolled} students in {room['room_code']} (capacity {room['capacity']})")
+            if str(room['room_type']).upper() != domain.get('room_type', 'CLASSROOM'):
+                soft('room_type_mismatch', MEDIUM,
+                     f"Needs a {domain.get('room_type', 'CLASSROOM').lower()}, "
+                     f"got {room['room_code']} ({room['room_type']})")
+            missing = [f for f in domain.get('features', []) if f not in room['features']]
+            if missing:
+                soft('feature_mismatch', LOW, f"{room['room_code']} lacks {', '.join(missing)}")
+        same_day = self.course_day.get((course_id, entry.get('day')), set()) - {offset}
+        if len(same_day) + 1 > self.max_sessions_per_day:
+            soft('max_sessions_per_day', MEDIUM,
+                 f"{len(same_day) + 1} sessions on one day (max {self.max_sessions_per_day})")
+        return conflicts
+
+    def trial(self, placements: Mapping[int, Tuple[str, str]]) -> Dict[int, List[dict]]:
+        """
+        Conflicts of every placed session with all placements applied
+        together (a move is one placement, a swap two); state is restored.
+        """
+        moved = {o: self.placed(o, slot, room) for o, (slot, room) in placements.items()}
+        originals = {o: self.entries[o] for o in moved}
+        for o, entry in originals.items():
+            self._remove(o, entry)
+        for o, entry in moved.items():
+            self.entries[o] = entry
+            self._add(o, entry)
+        try:
+            return {o: self.clashes(o, entry) for o, entry in moved.items()}
+        finally:
+            for o, entry in moved.items():
+                self._remove(o, entry)
+            for o, entry in originals.items():
+                self.entries[o] = entry
+                self._add(o, entry)
+
+    def relocate(self, placements: Mapping[int, Tuple[str, str]]) -> Dict[int, Tuple[dict, dict]]:
+        """Apply placements in memory; returns {offset: (old entry, new entry)}."""
+        moved = {o: self.placed(o, slot, room) for o, (slot, room) in placements.items()}
+        changes = {o: (self.entries[o], entry) for o, entry in moved.items()}
+        for o, (old, _new) in changes.items():
+            self._remove(o, old)
+        for o, (_old, new) in changes.items():
+            self.entries[o] = new
+            self._add(o, new)
+        return changes
+
+    def conflict_rows(self, changed: Mapping[int, dict]) -> List[dict]:
+        """All conflict rows of the variant with `changed` entries in place (conflict_index format)."""
+        entries = {**self.entries, **changed}
+        codes: Dict[str, str] = {}
+        for entry in entries.values():
+            codes.setdefault(entry.get('course_id'), entry.get('course_code'))
+        courses = {
+            cid: SimpleNamespace(
+                course_code=codes.get(cid) or cid,
+                student_ids=domain.get('students') or [],
+                enrolled_students=domain.get('enrolled') or 0,
+                room_type_required=domain.get('room_type'),
+                required_features=domain.get('features') or [],
+            )
+            for cid, domain in self.domains.items()
+        }
+        rooms = {rid: SimpleNamespace(**room) for rid, room in self.rooms.items()}
+        return detect_variant_conflicts(
+            [entries[o] for o in sorted(entries)], courses, rooms, self.max_sessions_per_day,
+        )
+
+    def alternatives(self, offset: int, limit: int = 5, near_slot: Optional[str] = None) -> List[dict]:
+        """
+        Clash-free (slot, room) pairs from the session's valid domain, one
+        per slot with its best-fit free room, nearest `near_slot` first.
+        """
+        entry = self.entries[offset]
+        domain = self.domains.get(entry.get('course_id'), {})
+        students = self.students_of(entry)
+        faculty_id = entry.get('faculty_id')
+        slot_ids = [s for s in (domain.get('slots') or self.slot_order) if s in self.slots]
+        room_ids = [r for r in (domain.get('rooms') or self.rooms) if r in self.rooms]
+        enrolled = domain.get('enrolled', 0)
+        anchor = self.slots.get(str(near_slot or entry.get('time_slot_id')))
+        current = (str(entry.get('time_slot_id')), entry.get('room_id'))
+
+        found = []
+        for slot_id in slot_ids:
+            slot = self.slots[slot_id]
+            if faculty_id and self.faculty_at.get((faculty_id, slot_id), set()) - {offset}:
+                continue
+            if any(self.student_at.get((sid, slot_id), set()) - {offset} for sid in students):
+                continue
+            same_day = self.course_day.get((entry.get('course_id'), slot['day']), set()) - {offset}
+            if len(same_day) + 1 > self.max_sessions_per_day:
+                continue
+            room_id = next(
+                (
+                    r for r in room_ids
+                    if (slot_id, r) != current
+                    and not self.room_at.get((r, slot_id), set()) - {offset}
+                    and (self.rooms[r]['capacity'] or 0) >= enrolled
+                ),
+                None,
+            )
+            if room_id is None:
+                continue
+            found.append({
+                'slot_id': slot_id,
+                'day': slot['day'],
+                'period': slot['period'],
+                'start_time': slot['start_time'],
+                'end_time': slot['end_time'],
+                'room_id': room_id,
+                'room_code': self.rooms[room_id]['room_code'],
+            })
+        if anchor is not None:
+            order = self.slot_order[anchor['slot_id']]
+            found.sort(key=lambda a: (a['day'] != anchor['day'], abs(self.slot_order[a['slot_id']] - order)))
+        return found[:limit]
+
+
+class ConflictResolutionService:
+    """Validates and applies moves / swaps against cached VariantOccupancy indexes"""
+
+    def __init__(self, redis_client, max_variants: Optional[int] = None) -> None:
+        self.redis = redis_client
+        self.max_variants = max_variants or settings.LIVE_CONFLICT_MAX_VARIANTS
+        self._indexes: "OrderedDict[Tuple[str, str], VariantOccupancy]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Index cache
+    # ------------------------------------------------------------------
+
+    def _load(self, job_id: str, variant: str, version: int) -> Optional[VariantOccupancy]:
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hmget(occupancy_key(job_id, variant), ['_slots', '_rooms'])
+        pipe.hgetall(entries_key(job_id, variant))
+        pipe.hgetall(domains_key(job_id))
+        (raw_slots, raw_rooms), raw_entries, raw_domains = pipe.execute()
+        if raw_slots is None:
+            return None
+        return VariantOccupancy(
+            {int(o): json.loads(row) for o, row in raw_entries.items()},
+            json.loads(raw_slots),
+            json.loads(raw_rooms),
+            {
+                (cid.decode() if isinstance(cid, bytes) else cid): json.loads(row)
+                for cid, row in raw_domains.items()
+            },
+            version,
+        )
+
+    def occupancy(self, job_id: str, variant: str) -> Optional[VariantOccupancy]:
+        """The variant's index at the current edit version; None when not indexed."""
+        version = int(self.redis.get(edits_key(job_id, variant)) or 0)
+        key = (job_id, variant)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None and index.version == version:
+                self._indexes.move_to_end(key)
+                return index
+        index = self._load(job_id, variant, version)
+        if index is None:
+            return None
+        with self._lock:
+            self._indexes[key] = index
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.max_variants:
+                self._indexes.popitem(last=False)
+        return index
+
+    def _forget(self, job_id: str, variant: str) -> None:
+        with self._lock:
+            self._indexes.pop((job_id, variant), None)
+
+    # ------------------------------------------------------------------
+    # Edits
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _placements(
+        index: VariantOccupancy,
+        offset: int,
+        slot_id: Optional[str],
+        room_id: Optional[str],
+        swap_with: Optional[int],
+    ) -> Dict[int, Tuple[str, str]]:
+        if offset not in index.entries:
+            raise EditRejected(f"Unknown session offset {offset}")
+        entry = index.entries[offset]
+        if swap_with is not None:
+            if swap_with not in index.entries or swap_with == offset:
+                raise EditRejected(f"Unknown session offset {swap_with}")
+            other = index.entries[swap_with]
+            return {
+                offset: (str(other.get('time_slot_id')), other.get('room_id')),
+                swap_with: (str(entry.get('time_slot_id')), entry.get('room_id')),
+            }
+        return {
+            offset: (
+                str(slot_id if slot_id is not None else entry.get('time_slot_id')),
+                room_id if room_id is not None else entry.get('room_id'),
+            )
+        }
+
+    @staticmethod
+    def _verdict(index, offset, placements, alternatives: int) -> Dict:
+        conflicts = index.trial(placements)
+        valid = not any(c['severity'] == CRITICAL for cs in conflicts.values() for c in cs)
+        return {
+            'valid': valid,
+            'conflicts': {str(o): cs for o, cs in conflicts.items()},
+            'alternatives': (
+                [] if valid or not alternatives
+                else index.alternatives(offset, alternatives, near_slot=placements[offset][0])
+            ),
+            'version': index.version,
+        }
+
+    def validate(
+        self,
+        job_id: str,
+        variant: str,
+        offset: int,
+        slot_id: Optional[str] = None,
+        room_id: Optional[str] = None,
+        swap_with: Optional[int] = None,
+        alternatives: int = 5,
+    ) -> Optional[Dict]:
+        """
+        Conflicts a move (slot_id / room_id) or swap (swap_with) would
+        cause, plus alternatives when it clashes; None when not indexed.
+        """
+        index = self.occupancy(job_id, variant)
+        if index is None:
+            return None
+        with index.lock:
+            placements = self._placements(index, offset, slot_id, room_id, swap_with)
+            return self._verdict(index, offset, placements, alternatives)
+
+    def apply(
+        self,
+        job_id: str,
+        variant: str,
+        offset: int,
+        slot_id: Optional[str] = None,
+        room_id: Optional[str] = None,
+        swap_with: Optional[int] = None,
+        force: bool = False,
+        alternatives: int = 5,
+    ) -> Optional[Dict]:
+        """
+        Re-validate and apply a move / swap.  Clashing edits are refused
+        unless `force`; the edit is written to the DB first, then the
+        result, occupancy and assignment indexes are updated in place
+        under the variant's lock.  None when not indexed.
+        """
+        lock = self.redis.lock(
+            f"{edits_key(job_id, variant)}:lock",
+            timeout=EDIT_LOCK_TIMEOUT, blocking_timeout=EDIT_LOCK_WAIT,
+        )
+        if not lock.acquire():
+            raise TimeoutError("Another edit to this variant is in progress")
+        try:
+            index = self.occupancy(job_id, variant)
+            if index is None:
+                return None
+            with index.lock:
+                placements = self._placements(index, offset, slot_id, room_id, swap_with)
+                verdict = self._verdict(index, offset, placements, alternatives)
+                if not verdict['valid'] and not force:
+                    return {**verdict, 'applied': False}
+                changes = {
+                    o: (index.entries[o], index.placed(o, slot, room))
+                    for o, (slot, room) in placements.items()
+                }
+                placed = {o: new for o, (_old, new) in changes.items()}
+                # Durable copy first: a failed write leaves nothing applied
+                persist_edit(job_id, variant, placed, index.conflict_rows(placed))
+                try:
+                    # Entries first: move_session consults them to keep bits
+                    # another session still holds (e.g. the swap partner).
+                    for o, (_old, new) in changes.items():
+                        update_indexed_entry(self.redis, job_id, variant, o, new)
+                    for o, (old, new) in changes.items():
+                        move_session(
+                            self.redis, job_id, variant, o, old, new, index.students_of(old),
+                        )
+                    update_assignment(self.redis, job_id, variant, placed)
+                except Exception:
+                    # Partially written: make every worker reload from Redis
+                    self._forget(job_id, variant)
+                    self.redis.incr(edits_key(job_id, variant))
+                    raise
+                version = self.redis.incr(edits_key(job_id, variant))
+                index.relocate(placements)
+                index.version = int(version)
+                return {
+                    **verdict,
+                    'applied': True,
+                    'version': index.version,
+                    'entries': {str(o): new for o, new in placed.items()},
+                }
+        finally:
+            try:
+                lock.release()
+            except Exception:
+                pass
+
+    def detect(self, job_id: str, variant: str) -> Optional[List[dict]]:
+        """Current hard clashes of the variant (after any edits); None when not indexed."""
+        index = self.occupancy(job_id, variant)
+        if index is None:
+            return None
+        conflicts = []
+        with index.lock:
+            for conflict_type, entity_type, table in (
+                ('faculty_conflict', 'faculty', index.faculty_at),
+                ('room_conflict', 'room', index.room_at),
+                ('student_conflict', 'student', index.student_at),
+            ):
+                for (entity_id, slot_id), offsets in table.items():
+                    if len(offsets) > 1:
+                        conflicts.append({
+                            'type': conflict_type, 'severity': CRITICAL,
+                            'entity_type': entity_type, 'entity_id': entity_id,
+                            'time_slot_id': slot_id, 'offsets': sorted(offsets),
+                            'course_ids': index.course_ids_of(offsets),
+                        })
+        return conflicts
@@ -0,0 +1,399 @@
+"""
+Occupancy Index — per-variant room / faculty / student × slot bitmaps.
+
+"Which rooms of type X with capacity ≥ N are free Tuesday period 3?" used to
+mean loading a whole timetable.  At persist time the saga now stores, for
+the final timetable and each variant:
+
+  result:job:{job_id}:occupancy:{variant}  HASH
+      _slots              JSON [{slot_id, day, day_of_week, period,
+                          start_time, end_time}]
+                          in bit order
+      _rooms              JSON [{room_id, room_code, room_type, capacity,
+                          features}]
+      room:{room_id}      busy-slot bitmap
+      faculty:{faculty_id}
+      student:{student_id}
+
+A bitmap is a little-endian integer whose bit i is set when the entity is
+busy in _slots[i], so free-room, free-slot and common-free-slot queries are
+HMGETs of the catalogue and the bitmaps involved plus bitwise AND / OR over
+Python ints.
+
+Edits update bitmaps in place (move_session): the new slot's bits are set
+and the old slot's bits are cleared only for entities that no other entry
+still holds there, checked against the result and student indexes.
+
+The slot / room catalogue is also kept in generation_jobs.timetable_data
+(occupancy_catalogue), so once the bitmaps expire with the rest of the
+result keys rebuild_occupancy_index re-derives them from the persisted
+entries instead of the queries going dark.
+
+Design: plain functions over a redis-py client (sync, bytes responses);
+the caller owns the TTL and error handling.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from core.services.result_index import FINAL_VARIANT, entries_key, index_key
+from core.services.student_index import students_key, unpack_offsets
+
+logger = logging.getLogger(__name__)
+
+OCCUPANCY_KINDS = ('room', 'faculty', 'student')
+_SLOTS_FIELD = '_slots'
+_ROOMS_FIELD = '_rooms'
+
+
+def occupancy_key(job_id: str, variant: str) -> str:
+    return f"result:job:{job_id}:occupancy:{variant}"
+
+
+def _to_bytes(mask: int) -> bytes:
+    return mask.to_bytes(max(1, (mask.bit_length() + 7) // 8), 'little')
+
+
+def _to_int(raw: Optional[bytes]) -> int:
+    return int.from_bytes(raw, 'little') if raw else 0
+
+
+def _entry_students(entry: dict, students_of: Mapping[str, Iterable[str]]) -> Iterable[str]:
+    students = entry.get('student_ids')
+    if students is None:
+        students = students_of.get(entry.get('course_id'), ())
+    return students
+
+
+def build_occupancy(
+    entries: Iterable[dict],
+    slot_bits: Mapping[str, int],
+    students_of: Mapping[str, Iterable[str]],
+) -> Dict[str, int]:
+    """{"<kind>:<id>": busy bitmap} over `entries` (slot ids → bit via slot_bits)."""
+    masks: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        bit = slot_bits.get(str(entry.get('time_slot_id')))
+        if bit is None:
+            continue
+        flag = 1 << bit
+        if entry.get('room_id'):
+            masks[f"room:{entry['room_id']}"] |= flag
+        if entry.get('faculty_id'):
+            masks[f"faculty:{entry['faculty_id']}"] |= flag
+        for sid in _entry_students(entry, students_of):
+            masks[f"student:{sid}"] |= flag
+    return dict(masks)
+
+
+def occupancy_catalogue(time_slots: Sequence, rooms: Sequence) -> dict:
+    """JSON-ready {slots, rooms} catalogue; slots in bit order."""
+    slots = [
+        {
+            'slot_id': str(ts.slot_id),
+            'day': ts.day,
+            'day_of_week': ts.day_of_week,
+            'period': ts.period,
+            'start_time': ts.start_time,
+            'end_time': ts.end_time,
+        }
+        for ts in sorted(time_slots, key=lambda ts: (ts.day, ts.period))
+    ]
+    room_meta = [
+        {
+            'room_id': str(r.room_id),
+            'room_code': r.room_code,
+            'room_type': r.room_type,
+            'capacity': r.capacity,
+            'features': list(r.features or []),
+        }
+        for r in rooms
+    ]
+    return {'slots': slots, 'rooms': room_meta}
+
+
+def _store_catalogued(
+    redis_client,
+    job_id: str,
+    variant: str,
+    entries: Iterable[dict],
+    catalogue: Mapping[str, list],
+    students_of: Mapping[str, Iterable[str]],
+    ttl_seconds: int,
+) -> int:
+    slots = catalogue['slots']
+    slot_bits = {s['slot_id']: i for i, s in enumerate(slots)}
+    masks = build_occupancy(entries, slot_bits, students_of)
+    o_key = occupancy_key(job_id, variant)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(o_key)
+    pipe.hset(o_key, mapping={
+        _SLOTS_FIELD: json.dumps(slots),
+        _ROOMS_FIELD: json.dumps(catalogue['rooms']),
+        **{field: _to_bytes(mask) for field, mask in masks.items()},
+    })
+    pipe.expire(o_key, ttl_seconds)
+    pipe.execute()
+    return len(masks)
+
+
+def store_occupancy_index(
+    redis_client,
+    job_id: str,
+    variant: str,
+    entries: List[dict],
+    time_slots: Sequence,
+    rooms: Sequence,
+    students_of: Mapping[str, Iterable[str]],
+    ttl_seconds: int,
+) -> int:
+    """Write one variant's slot / room catalogue and bitmaps; returns the bitmap count."""
+    return _store_catalogued(
+        redis_client, job_id, variant, entries,
+        occupancy_catalogue(time_slots, rooms), students_of, ttl_seconds,
+    )
+
+
+def rebuild_occupancy_index(
+    redis_client,
+    job_id: str,
+    variant: str,
+    timetable_data: Optional[Mapping],
+    ttl_seconds: int,
+) -> bool:
+    """
+    Re-derive one variant's bitmaps from the persisted timetable_data
+    document once the Redis copy has expired.  Students come from the
+    final entries' student_ids (variants share the course enrolments).
+    False when the document predates the stored catalogue or lacks the
+    variant.
+    """
+    if not timetable_data or not timetable_data.get('occupancy_catalogue'):
+        return False
+    final_entries = timetable_data.get('timetable_entries') or []
+    if variant == FINAL_VARIANT:
+        entries = final_entries
+    else:
+        entries = next(
+            (
+                v.get('timetable_entries') or []
+                for v in timetable_data.get('variants') or []
+                if str(v.get('variant_id')) == variant
+            ),
+            None,
+        )
+        if entries is None:
+            return False
+    students_of = {
+        e.get('course_id'): e.get('student_ids') or []
+        for e in final_entries if e.get('student_ids') is not None
+    }
+    _store_catalogued(
+        redis_client, job_id, variant, entries,
+        timetable_data['occupancy_catalogue'], students_of, ttl_seconds,
+    )
+    return True
+
+
+# ----------------------------------------------------------------------
+# Queries
+# ----------------------------------------------------------------------
+
+def _catalogue(redis_client, job_id: str, variant: str, fields: List[str]):
+    """(slots, rooms, raw bitmaps of `fields`) or None when not indexed."""
+    raw = redis_client.hmget(occupancy_key(job_id, variant), [_SLOTS_FIELD, _ROOMS_FIELD, *fields])
+    if raw[0] is None:
+        return None
+    return json.loads(raw[0]), json.loads(raw[1]), raw[2:]
+
+
+def _slot_bit(slots: List[dict], slot_id=None, day=None, period=None) -> Optional[int]:
+    for bit, slot in enumerate(slots):
+        if slot_id is not None:
+            if slot['slot_id'] == str(slot_id):
+                return bit
+        elif slot['day'] == day and slot['period'] == period:
+            return bit
+    return None
+
+
+def _room_matches(room: dict, room_type, min_capacity: int, features: Sequence[str]) -> bool:
+    if room_type and str(room['room_type']).lower() != str(room_type).lower():
+        return False
+    if (room['capacity'] or 0) < min_capacity:
+        return False
+    return set(features) <= set(room['features'])
+
+
+def free_rooms(
+    redis_client,
+    job_id: str,
+    variant: str,
+    slot_id: Optional[str] = None,
+    day: Optional[int] = None,
+    period: Optional[int] = None,
+    room_type: Optional[str] = None,
+    min_capacity: int = 0,
+    features: Sequence[str] = (),
+) -> Optional[List[dict]]:
+    """
+    Rooms matching the filters that are free in the slot (by slot_id or
+    day + period), smallest adequate first.  None when not indexed; raises
+    KeyError for an unknown slot.
+    """
+    o_key = occupancy_key(job_id, variant)
+    head = redis_client.hmget(o_key, [_SLOTS_FIELD, _ROOMS_FIELD])
+    if head[0] is None:
+        return None
+    slots, rooms = json.loads(head[0]), json.loads(head[1])
+    bit = _slot_bit(slots, slot_id, day, period)
+    if bit is None:
+        raise KeyError(slot_id if slot_id is not None else (day, period))
+    candidates = [r for r in rooms if _room_matches(r, room_type, min_capacity, features)]
+    if not candidates:
+        return []
+    raw = redis_client.hmget(o_key, [f"room:{r['room_id']}" for r in candidates])
+    free = [r for r, mask in zip(candidates, raw) if not _to_int(mask) >> bit & 1]
+    free.sort(key=lambda r: (r['capacity'] or 0, r['room_code']))
+    return free
+
+
+def free_slots(
+    redis_client,
+    job_id: str,
+    variant: str,
+    kind: str,
+    entity_id: str,
+) -> Optional[List[dict]]:
+    """Slots in which one room / faculty / student is free; None when not indexed."""
+    if kind not in OCCUPANCY_KINDS:
+        raise ValueError(f"Unknown occupancy kind: {kind}")
+    loaded = _catalogue(redis_client, job_id, variant, [f"{kind}:{entity_id}"])
+    if loaded is None:
+        return None
+    slots, _rooms, (raw,) = loaded
+    busy = _to_int(raw)
+    return [slot for bit, slot in enumerate(slots) if not busy >> bit & 1]
+
+
+def common_free_slots(
+    redis_client,
+    job_id: str,
+    variant: str,
+    faculty_ids: Sequence[str] = (),
+    student_ids: Sequence[str] = (),
+    room_ids: Sequence[str] = (),
+) -> Optional[List[dict]]:
+    """Slots in which every listed faculty member, student and room is free."""
+    fields = (
+        [f"faculty:{f}" for f in faculty_ids]
+        + [f"student:{s}" for s in student_ids]
+        + [f"room:{r}" for r in room_ids]
+    )
+    loaded = _catalogue(redis_client, job_id, variant, fields)
+    if loaded is None:
+        return None
+    slots, _rooms, raw = loaded
+    busy = 0
+    for mask in raw:
+        busy |= _to_int(mask)
+    return [slot for bit, slot in enumerate(slots) if not busy >> bit & 1]
+
+
+# ----------------------------------------------------------------------
+# In-place updates
+# ----------------------------------------------------------------------
+
+def _still_held(
+    redis_client,
+    job_id: str,
+    variant: str,
+    offset: int,
+    slot_id: str,
+    fields: List[str],
+) -> set:
+    """
+    Subset of occupancy `fields` that an entry other than `offset` still
+    holds in `slot_id`, read from the result and student indexes.
+    """
+    index_fields = [f for f in fields if not f.startswith('student:')]
+    student_ids = [f.split(':', 1)[1] for f in fields if f.startswith('student:')]
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hmget(index_key(job_id, variant), index_fields or ['_count'])
+    pipe.hmget(students_key(job_id, variant), student_ids or ['_count'])
+    raw_index, raw_students = pipe.execute()
+
+    offsets_of: Dict[str, List[int]] = {}
+    for field, raw in zip(index_fields, raw_index):
+        if isinstance(raw, bytes):
+            raw = raw.decode()
+        offsets_of[field] = [int(o) for o in raw.split(',')] if raw else []
+    for sid, raw in zip(student_ids, raw_students):
+        offsets_of[f"student:{sid}"] = list(unpack_offsets(raw)) if raw else []
+
+    wanted = sorted({o for offs in offsets_of.values() for o in offs if o != offset})
+    if not wanted:
+        return set()
+    rows = redis_client.hmget(entries_key(job_id, variant), wanted)
+    in_slot = {
+        o for o, row in zip(wanted, rows)
+        if row is not None and str(json.loads(row).get('time_slot_id')) == slot_id
+    }
+    return {field for field, offs in offsets_of.items() if in_slot.intersection(offs)}
+
+
+def move_session(
+    redis_client,
+    job_id: str,
+    variant: str,
+    offset: int,
+    old_entry: dict,
+    new_entry: dict,
+    students: Iterable[str] = (),
+) -> int:
+    """
+    Update bitmaps in place for entry `offset` moving from old_entry's
+    (slot, room, faculty) to new_entry's; `students` attend the session.
+    Returns the number of bitmaps changed.
+    """
+    students = list(dict.fromkeys(map(str, students)))
+
+    def fields_of(entry: dict) -> List[str]:
+        fields = [f"student:{s}" for s in students]
+        if entry.get('room_id'):
+            fields.append(f"room:{entry['room_id']}")
+        if entry.get('faculty_id'):
+            fields.append(f"faculty:{entry['faculty_id']}")
+        return fields
+
+    old_slot, new_slot = str(old_entry.get('time_slot_id')), str(new_entry.get('time_slot_id'))
+    old_fields, new_fields = fields_of(old_entry), fields_of(new_entry)
+    # Entities leaving the old slot keep their bit if another entry holds it
+    leaving = [f for f in old_fields if old_slot != new_slot or f not in new_fields]
+    held = _still_held(redis_client, job_id, variant, offset, old_slot, leaving) if leaving else set()
+    clears = [f for f in leaving if f not in held]
+    o_key = occupancy_key(job_id, variant)
+    touched = sorted(set(clears) | set(new_fields))
+
+    def _apply(pipe) -> None:
+        raw_slots, *raw = pipe.hmget(o_key, [_SLOTS_FIELD, *touched])
+        if raw_slots is None:
+            return
+        slots = json.loads(raw_slots)
+        old_bit = _slot_bit(slots, old_slot)
+        new_bit = _slot_bit(slots, new_slot)
+        masks = {f: _to_int(m) for f, m in zip(touched, raw)}
+        if old_bit is not None:
+            for f in clears:
+                masks[f] &= ~(1 << old_bit)
+        if new_bit is not None:
+            for f in new_fields:
+                masks[f] |= 1 << new_bit
+        pipe.multi()
+        pipe.hset(o_key, mapping={f: _to_bytes(m) for f, m in masks.items()})
+
+    redis_client.transaction(_apply, o_key)
+    return len(touched)
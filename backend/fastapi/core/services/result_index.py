@@ -0,0 +1,163 @@
+"""
+Result Index — per-variant entry offsets for timetable views.
+
+The department view used to load the whole result document and filter every
+entry, resolving each entry's department with another scan of the timetable
+(O(N²) on 10k-entry results).  At persist time the saga now stores, next to
+result:job:{job_id}, for the final timetable and each variant:
+
+  result:job:{job_id}:entries:{variant}  HASH offset → entry JSON
+  result:job:{job_id}:index:{variant}    HASH "<dimension>:<value>" → "o1,o2,…"
+
+with dimensions department, faculty, room and day.  A view is one HGET of
+the offsets plus one HMGET of exactly those entries — O(result size), and
+no other entry is transferred or deserialized.  Edits rewrite one entry and
+the index fields it leaves / joins in place (update_indexed_entry).
+
+Design: plain functions over a redis-py client (sync, bytes responses);
+the caller owns the TTL and error handling.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# dimension → entry field holding its value
+INDEX_DIMENSIONS: Dict[str, str] = {
+    'department': 'department_id',
+    'faculty': 'faculty_id',
+    'room': 'room_id',
+    'day': 'day',
+}
+FINAL_VARIANT = 'final'
+
+
+def entries_key(job_id: str, variant: str) -> str:
+    return f"result:job:{job_id}:entries:{variant}"
+
+
+def index_key(job_id: str, variant: str) -> str:
+    return f"result:job:{job_id}:index:{variant}"
+
+
+def build_entry_index(entries: Iterable[dict]) -> Dict[str, List[int]]:
+    """{"<dimension>:<value>": [offsets]} over every INDEX_DIMENSIONS field."""
+    index: Dict[str, List[int]] = defaultdict(list)
+    for offset, entry in enumerate(entries):
+        for dimension, field in INDEX_DIMENSIONS.items():
+            value = entry.get(field)
+            if value is not None and value != '':
+                index[f"{dimension}:{value}"].append(offset)
+    return dict(index)
+
+
+def store_result_index(
+    redis_client,
+    job_id: str,
+    variant: str,
+    entries: List[dict],
+    ttl_seconds: int,
+) -> int:
+    """Write the entries hash and its offset index; returns the field count."""
+    index = build_entry_index(entries)
+    e_key, i_key = entries_key(job_id, variant), index_key(job_id, variant)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(e_key, i_key)
+    if entries:
+        pipe.hset(e_key, mapping={
+            str(offset): json.dumps(entry, default=str)
+            for offset, entry in enumerate(entries)
+        })
+        pipe.expire(e_key, ttl_seconds)
+    # Always create the index hash so readers can tell "indexed, empty"
+    # from "not indexed" (older results).
+    pipe.hset(i_key, mapping={
+        '_count': str(len(entries)),
+        **{field: ','.join(map(str, offsets)) for field, offsets in index.items()},
+    })
+    pipe.expire(i_key, ttl_seconds)
+    pipe.execute()
+    return len(index)
+
+
+def fetch_indexed_entries(
+    redis_client,
+    job_id: str,
+    variant: str,
+    dimension: str,
+    value: str,
+) -> Optional[List[dict]]:
+    """
+    Entries of `variant` whose `dimension` equals `value`, in persist order.
+    Returns None when the result has no index (caller falls back).
+    """
+    i_key = index_key(job_id, variant)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.exists(i_key)
+    pipe.hget(i_key, f"{dimension}:{value}")
+    indexed, raw_offsets = pipe.execute()
+    if not indexed:
+        return None
+    if not raw_offsets:
+        return []
+    if isinstance(raw_offsets, bytes):
+        raw_offsets = raw_offsets.decode()
+    offsets = raw_offsets.split(',')
+    rows = redis_client.hmget(entries_key(job_id, variant), offsets)
+    return [json.loads(row) for row in rows if row is not None]
+
+
+def update_indexed_entry(
+    redis_client,
+    job_id: str,
+    variant: str,
+    offset: int,
+    entry: dict,
+) -> None:
+    """
+    Replace the entry at `offset` after an edit (e.g. a session moved to
+    another slot / room) and move its offset between index fields whose
+    value changed, atomically (WATCH / MULTI).  Offsets never shift, so
+    other entries and the student index stay valid.
+    """
+    e_key, i_key = entries_key(job_id, variant), index_key(job_id, variant)
+    field = str(offset)
+
+    def _apply(pipe) -> None:
+        raw = pipe.hget(e_key, field)
+        old = json.loads(raw) if raw else {}
+        moves = []  # (index field, add?)
+        for dimension, attr in INDEX_DIMENSIONS.items():
+            before, after = old.get(attr), entry.get(attr)
+            if before == after:
+                continue
+            if before is not None and before != '':
+                moves.append((f"{dimension}:{before}", False))
+            if after is not None and after != '':
+                moves.append((f"{dimension}:{after}", True))
+        fields = [name for name, _add in moves]
+        current = dict(zip(fields, pipe.hmget(i_key, fields))) if fields else {}
+        updates: Dict[str, str] = {}
+        emptied: List[str] = []
+        for name, add in moves:
+            raw_offsets = current[name]
+            if isinstance(raw_offsets, bytes):
+                raw_offsets = raw_offsets.decode()
+            offsets = [int(o) for o in raw_offsets.split(',')] if raw_offsets else []
+            offsets = sorted({*offsets, offset}) if add else [o for o in offsets if o != offset]
+            if offsets:
+                updates[name] = ','.join(map(str, offsets))
+            else:
+                emptied.append(name)
+        pipe.multi()
+        pipe.hset(e_key, field, json.dumps(entry, default=str))
+        if updates:
+            pipe.hset(i_key, mapping=updates)
+        if emptied:
+            pipe.hdel(i_key, *emptied)
+
+    redis_client.transaction(_apply, e_key, i_key)
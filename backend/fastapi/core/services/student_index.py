@@ -0,0 +1,134 @@
+"""
+Student Index — per-variant student → entry offsets for personal schedules.
+
+A student's week used to be assembled from the timetable by joining every
+entry's course against enrollments; NEP students with electives across
+departments touch many courses, so each request paid many joins.  At
+persist time the saga now stores, next to the result index
+(core.services.result_index), for the final timetable and each variant:
+
+  result:job:{job_id}:students:{variant}  HASH student_id → packed uint32
+                                          offsets into entries:{variant}
+
+One HGET plus one HMGET of exactly the student's entries returns their week;
+a whole section is one HMGET of its students plus one HMGET of the union of
+their offsets.
+
+Offsets are stable across edits: a live edit moves or swaps sessions
+without changing who attends them, so it rewrites only the entries
+(result_index.update_indexed_entry) and never the student arrays.
+
+Design: plain functions over a redis-py client (sync, bytes responses);
+the caller owns the TTL and error handling.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sys
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from core.services.result_index import entries_key
+
+logger = logging.getLogger(__name__)
+
+_COUNT_FIELD = '_count'
+
+
+def students_key(job_id: str, variant: str) -> str:
+    return f"result:job:{job_id}:students:{variant}"
+
+
+def pack_offsets(offsets: Iterable[int]) -> bytes:
+    packed = array('I', offsets)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_offsets(raw: bytes) -> array:
+    offsets = array('I')
+    offsets.frombytes(raw)
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    return offsets
+
+
+def build_student_index(
+    entries: Iterable[dict],
+    students_of: Mapping[str, Iterable[str]],
+) -> Dict[str, array]:
+    """
+    {student_id: offsets} over `entries`.  An entry's students are its own
+    student_ids when present, else those of its course in `students_of`.
+    """
+    index: Dict[str, array] = defaultdict(lambda: array('I'))
+    for offset, entry in enumerate(entries):
+        students = entry.get('student_ids')
+        if students is None:
+            students = students_of.get(entry.get('course_id'), ())
+        for sid in dict.fromkeys(students):
+            index[str(sid)].append(offset)
+    return dict(index)
+
+
+def store_student_index(
+    redis_client,
+    job_id: str,
+    variant: str,
+    entries: List[dict],
+    students_of: Mapping[str, Iterable[str]],
+    ttl_seconds: int,
+) -> int:
+    """Write the student → offsets hash for one variant; returns the student count."""
+    index = build_student_index(entries, students_of)
+    s_key = students_key(job_id, variant)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(s_key)
+    # Like the result index, always create the hash so readers can tell
+    # "indexed, no classes" from "not indexed".
+    pipe.hset(s_key, mapping={
+        _COUNT_FIELD: str(len(index)),
+        **{sid: pack_offsets(offsets) for sid, offsets in index.items()},
+    })
+    pipe.expire(s_key, ttl_seconds)
+    pipe.execute()
+    return len(index)
+
+
+def fetch_student_entries(
+    redis_client,
+    job_id: str,
+    variant: str,
+    student_ids: List[str],
+) -> Optional[Dict[str, List[dict]]]:
+    """
+    {student_id: entries of `variant` they attend, in persist order} for a
+    single student or a whole section, in two round trips.  Returns None
+    when the result has no student index (caller falls back).
+    """
+    s_key = students_key(job_id, variant)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.exists(s_key)
+    pipe.hmget(s_key, list(student_ids) or [_COUNT_FIELD])
+    indexed, raw_offsets = pipe.execute()
+    if not indexed:
+        return None
+
+    per_student = {
+        sid: unpack_offsets(raw) if raw else array('I')
+        for sid, raw in zip(student_ids, raw_offsets)
+    }
+    wanted = sorted(set().union(*per_student.values())) if per_student else []
+    if not wanted:
+        return {sid: [] for sid in student_ids}
+    rows = redis_client.hmget(entries_key(job_id, variant), wanted)
+    by_offset = {
+        offset: json.loads(row) for offset, row in zip(wanted, rows) if row is not None
+    }
+    return {
+        sid: [by_offset[o] for o in offsets if o in by_offset]
+        for sid, offsets in per_student.items()
+    }
@@ -0,0 +1,470 @@
+"""
+Variant Diff — array-encoded assignments and precomputed pairwise diffs.
+
+Django's compare endpoint used to pull two variants' entry lists out of
+JSONB and match them in Python on every request.  At persist time the saga
+now encodes every variant (and the final timetable) as aligned integer
+arrays over one shared (course_id, session) key order:
+
+  result:job:{job_id}:assign  HASH
+      _keys _slots _rooms _depts _faculty   JSON vocabularies
+      _slot_day                             int16  day of each slot
+      _dept _fac                            int32  per key
+      {variant}:slot {variant}:room         int32  per key (-1 = not placed)
+      {variant}:offset                      int32  per key, offset into
+                                                   result:job:{id}:entries:{variant}
+
+and compares every pair once, vectorised:
+
+  result:job:{job_id}:diffs  HASH
+      {a}:{b}          int32 indexes of the keys whose slot or room differ
+      {a}:{b}:summary  JSON {moved, room_changes, changed, unchanged,
+                             per_department, faculty_load_changes}
+
+A compare request is two HMGETs plus one HMGET of the page's entries; a
+diff against an arbitrary snapshot encodes it with the stored vocabularies
+and runs the same array comparison (diff_snapshot).  Live edits re-point
+the edited variant's arrays and re-diff its pairs (update_assignment).
+"""
+from __future__ import annotations
+
+import json
+import logging
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.services.result_index import entries_key
+
+logger = logging.getLogger(__name__)
+
+_I32 = np.dtype('<i4')
+_I16 = np.dtype('<i2')
+
+
+def assign_key(job_id: str) -> str:
+    return f"result:job:{job_id}:assign"
+
+
+def diffs_key(job_id: str) -> str:
+    return f"result:job:{job_id}:diffs"
+
+
+def _session_key(entry: dict) -> Tuple[str, int]:
+    return (str(entry.get('course_id')), int(entry.get('session_number') or 0))
+
+
+class _Vocab:
+    """Append-only string → index interning."""
+
+    def __init__(self, items: Iterable[str] = ()):
+        self.items: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for item in items:
+            self.intern(item)
+
+    def intern(self, item) -> int:
+        item = '' if item is None else str(item)
+        idx = self.ids.get(item)
+        if idx is None:
+            idx = self.ids[item] = len(self.items)
+            self.items.append(item)
+        return idx
+
+
+# ----------------------------------------------------------------------
+# Encoding and comparison
+# ----------------------------------------------------------------------
+
+def encode_variants(
+    variants: Dict[str, List[dict]],
+    time_slots: Sequence,
+) -> Dict:
+    """
+    Encode {variant: entries} over the union of their (course, session)
+    keys.  Entries must carry course_id, session_number, time_slot_id,
+    room_id, department_id and faculty_id.
+    """
+    slots = _Vocab()
+    slot_day: List[int] = []
+    for ts in time_slots:
+        if str(ts.slot_id) not in slots.ids:
+            slots.intern(ts.slot_id)
+            slot_day.append(int(ts.day))
+    rooms, depts, faculty = _Vocab(), _Vocab(), _Vocab()
+
+    key_index: Dict[Tuple[str, int], int] = {}
+    key_dept: List[int] = []
+    key_fac: List[int] = []
+    for entries in variants.values():
+        for entry in entries:
+            key = _session_key(entry)
+            if key not in key_index:
+                key_index[key] = len(key_index)
+                key_dept.append(depts.intern(entry.get('department_id')))
+                key_fac.append(faculty.intern(entry.get('faculty_id')))
+
+    n = len(key_index)
+    arrays: Dict[str, Dict[str, np.ndarray]] = {}
+    for name, entries in variants.items():
+        slot_arr = np.full(n, -1, dtype=_I32)
+        room_arr = np.full(n, -1, dtype=_I32)
+        offset_arr = np.full(n, -1, dtype=_I32)
+        for offset, entry in enumerate(entries):
+            k = key_index[_session_key(entry)]
+            sid = str(entry.get('time_slot_id'))
+            if sid not in slots.ids:
+                continue
+            slot_arr[k] = slots.ids[sid]
+            room_arr[k] = rooms.intern(entry.get('room_id'))
+            offset_arr[k] = offset
+        arrays[name] = {'slot': slot_arr, 'room': room_arr, 'offset': offset_arr}
+
+    return {
+        'keys': [list(k) for k in key_index],
+        'slots': slots.items,
+        'rooms': rooms.items,
+        'depts': depts.items,
+        'faculty': faculty.items,
+        'slot_day': np.asarray(slot_day, dtype=_I16),
+        'dept': np.asarray(key_dept, dtype=_I32),
+        'fac': np.asarray(key_fac, dtype=_I32),
+        'variants': arrays,
+    }
+
+
+def _daily_load(slot: np.ndarray, fac: np.ndarray, slot_day: np.ndarray, n_fac: int) -> np.ndarray:
+    """(faculty × day) session counts for one assignment."""
+    n_days = int(slot_day.max()) + 1 if slot_day.size else 1
+    placed = slot >= 0
+    load = np.zeros((n_fac, n_days), dtype=np.int32)
+    np.add.at(load, (fac[placed], slot_day[slot[placed]]), 1)
+    return load
+
+
+def compare_assignments(
+    a: Dict[str, np.ndarray],
+    b: Dict[str, np.ndarray],
+    enc: Dict,
+) -> Tuple[np.ndarray, Dict]:
+    """(changed key indexes, summary) between two encoded assignments."""
+    moved = a['slot'] != b['slot']
+    room_changed = a['room'] != b['room']
+    changed = np.flatnonzero(moved | room_changed).astype(_I32)
+
+    depts = enc['depts']
+    per_dept = np.bincount(enc['dept'][changed], minlength=len(depts))
+    faculty = enc['faculty']
+    load_a = _daily_load(a['slot'], enc['fac'], enc['slot_day'], len(faculty))
+    load_b = _daily_load(b['slot'], enc['fac'], enc['slot_day'], len(faculty))
+    load_rows = np.flatnonzero((load_a != load_b).any(axis=1))
+
+    summary = {
+        'moved': int(moved.sum()),
+        'room_changes': int(room_changed.sum()),
+        'changed': int(changed.size),
+        'unchanged': int(len(moved) - changed.size),
+        'per_department': {
+            depts[i]: int(c) for i, c in enumerate(per_dept) if c and depts[i]
+        },
+        'faculty_load_changes': [
+            {
+                'faculty_id': faculty[i],
+                'daily_a': load_a[i].tolist(),
+                'daily_b': load_b[i].tolist(),
+                'max_daily_a': int(load_a[i].max()),
+                'max_daily_b': int(load_b[i].max()),
+            }
+            for i in load_rows if faculty[i]
+        ],
+    }
+    return changed, summary
+
+
+# ----------------------------------------------------------------------
+# Persistence
+# ----------------------------------------------------------------------
+
+def store_variant_diffs(
+    redis_client,
+    job_id: str,
+    variants: Dict[str, List[dict]],
+    time_slots: Sequence,
+    ttl_seconds: int,
+) -> int:
+    """Encode every variant, diff every pair once and store both; returns the pair count."""
+    enc = encode_variants(variants, time_slots)
+    assign = {
+        '_keys': json.dumps(enc['keys']),
+        '_slots': json.dumps(enc['slots']),
+        '_rooms': json.dumps(enc['rooms']),
+        '_depts': json.dumps(enc['depts']),
+        '_faculty': json.dumps(enc['faculty']),
+        '_slot_day': enc['slot_day'].tobytes(),
+        '_dept': enc['dept'].tobytes(),
+        '_fac': enc['fac'].tobytes(),
+        '_variants': json.dumps(list(variants)),
+    }
+    for name, arrs in enc['variants'].items():
+        for col, arr in arrs.items():
+            assign[f"{name}:{col}"] = arr.tobytes()
+
+    diffs: Dict[str, object] = {}
+    for a, b in combinations(variants, 2):
+        changed, summary = compare_assignments(enc['variants'][a], enc['variants'][b], enc)
+        diffs[f"{a}:{b}"] = changed.tobytes()
+        diffs[f"{a}:{b}:summary"] = json.dumps(summary)
+
+    a_key, d_key = assign_key(job_id), diffs_key(job_id)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.delete(a_key, d_key)
+    pipe.hset(a_key, mapping=assign)
+    pipe.expire(a_key, ttl_seconds)
+    # Always create the diffs hash so readers can tell "no pairs" from "not stored"
+    pipe.hset(d_key, mapping={'_pairs': str(len(diffs) // 2), **diffs})
+    pipe.expire(d_key, ttl_seconds)
+    pipe.execute()
+    return len(diffs) // 2
+
+
+def update_assignment(
+    redis_client,
+    job_id: str,
+    variant: str,
+    entries: Dict[int, dict],
+) -> bool:
+    """
+    Re-point one variant's encoded sessions after a live edit ({offset:
+    entry as now placed}) and recompute the diffs of every pair involving
+    it; False when the job has no stored encoding.
+    """
+    a_key, d_key = assign_key(job_id), diffs_key(job_id)
+
+    def _apply(pipe) -> bool:
+        raw_names = pipe.hget(a_key, '_variants')
+        if raw_names is None:
+            return False
+        names = json.loads(raw_names)
+        if variant not in names:
+            return False
+        enc = _load_encoding(pipe, job_id, names)
+        if enc is None:
+            return False
+        arrs = {col: arr.copy() for col, arr in enc['variants'][variant].items()}
+        slot_ids = {s: i for i, s in enumerate(enc['slots'])}
+        rooms = _Vocab(enc['rooms'])
+        for offset, entry in entries.items():
+            keys = np.flatnonzero(arrs['offset'] == int(offset))
+            arrs['slot'][keys] = slot_ids.get(str(entry.get('time_slot_id')), -1)
+            arrs['room'][keys] = rooms.intern(entry.get('room_id'))
+        enc['rooms'] = rooms.items
+        enc['variants'][variant] = arrs
+
+        diffs: Dict[str, object] = {}
+        for a, b in combinations(names, 2):
+            if variant in (a, b):
+                changed, summary = compare_assignments(enc['variants'][a], enc['variants'][b], enc)
+                diffs[f"{a}:{b}"] = changed.tobytes()
+                diffs[f"{a}:{b}:summary"] = json.dumps(summary)
+        pipe.multi()
+        pipe.hset(a_key, mapping={
+            '_rooms': json.dumps(rooms.items),
+            f"{variant}:slot": arrs['slot'].tobytes(),
+            f"{variant}:room": arrs['room'].tobytes(),
+        })
+        if diffs:
+            pipe.hset(d_key, mapping=diffs)
+        return True
+
+    return redis_client.transaction(_apply, a_key, value_from_callable=True)
+
+
+def _load_encoding(redis_client, job_id: str, variants: Sequence[str]) -> Optional[Dict]:
+    fields = ['_keys', '_slots', '_rooms', '_depts', '_faculty', '_slot_day', '_dept', '_fac']
+    for name in variants:
+        fields += [f"{name}:slot", f"{name}:room", f"{name}:offset"]
+    raw = dict(zip(fields, redis_client.hmget(assign_key(job_id), fields)))
+    if raw['_keys'] is None:
+        return None
+    enc = {
+        'keys': json.loads(raw['_keys']),
+        'slots': json.loads(raw['_slots']),
+        'rooms': json.loads(raw['_rooms']),
+        'depts': json.loads(raw['_depts']),
+        'faculty': json.loads(raw['_faculty']),
+        'slot_day': np.frombuffer(raw['_slot_day'] or b'', dtype=_I16),
+        'dept': np.frombuffer(raw['_dept'] or b'', dtype=_I32),
+        'fac': np.frombuffer(raw['_fac'] or b'', dtype=_I32),
+        'variants': {},
+    }
+    for name in variants:
+        if raw[f"{name}:slot"] is None:
+            raise KeyError(name)
+        enc['variants'][name] = {
+            col: np.frombuffer(raw[f"{name}:{col}"], dtype=_I32)
+            for col in ('slot', 'room', 'offset')
+        }
+    return enc
+
+
+# ----------------------------------------------------------------------
+# Reads
+# ----------------------------------------------------------------------
+
+def fetch_variant_diff(
+    redis_client,
+    job_id: str,
+    a: str,
+    b: str,
+    department_id: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 200,
+    include_shared: bool = False,
+) -> Optional[Dict]:
+    """
+    Precomputed diff of variants a and b: summary plus one page of changed
+    sessions with their entries on each side, and optionally the entries of
+    A that are identical in B.  None when the job has no stored diffs;
+    KeyError for an unknown variant.
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.exists(diffs_key(job_id))
+    pipe.hmget(diffs_key(job_id), [f"{a}:{b}", f"{a}:{b}:summary", f"{b}:{a}", f"{b}:{a}:summary"])
+    exists, (fwd, fwd_sum, rev, rev_sum) = pipe.execute()
+    if not exists:
+        return None
+    enc = _load_encoding(redis_client, job_id, [a, b] if a != b else [a])
+    if enc is None:
+        return None
+    va, vb = enc['variants'][a], enc['variants'][b]
+
+    if fwd_sum is not None:
+        changed, summary = np.frombuffer(fwd or b'', dtype=_I32), json.loads(fwd_sum)
+    elif rev_sum is not None:
+        changed, summary = np.frombuffer(rev or b'', dtype=_I32), _swap_summary(json.loads(rev_sum))
+    else:  # same variant on both sides
+        changed, summary = compare_assignments(va, vb, enc)
+    return _page(
+        redis_client, job_id, a, b, enc, va, vb, changed, summary,
+        lambda offsets: _entries(redis_client, job_id, b, offsets),
+        department_id, page, page_size, include_shared,
+    )
+
+
+def diff_snapshot(
+    redis_client,
+    job_id: str,
+    variant: str,
+    snapshot_entries: List[dict],
+    department_id: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 200,
+) -> Optional[Dict]:
+    """
+    Diff a stored variant against an arbitrary snapshot (entries with
+    course_id, session_number, time_slot_id, room_id), e.g. a timetable
+    being edited.  Snapshot sessions outside the stored key set are
+    reported under 'unknown_sessions'.
+    """
+    enc = _load_encoding(redis_client, job_id, [variant])
+    if enc is None:
+        return None
+    key_index = {(str(c), int(s)): i for i, (c, s) in enumerate(enc['keys'])}
+    slot_ids = {s: i for i, s in enumerate(enc['slots'])}
+    rooms = _Vocab(enc['rooms'])  # rooms new to the snapshot are appended
+    n = len(key_index)
+    snap = {col: np.full(n, -1, dtype=_I32) for col in ('slot', 'room', 'offset')}
+    unknown = 0
+    for offset, entry in enumerate(snapshot_entries):
+        k = key_index.get(_session_key(entry))
+        if k is None:
+            unknown += 1
+            continue
+        snap['slot'][k] = slot_ids.get(str(entry.get('time_slot_id')), -1)
+        snap['room'][k] = rooms.intern(entry.get('room_id'))
+        snap['offset'][k] = offset
+    enc['rooms'] = rooms.items
+    base = enc['variants'][variant]
+    changed, summary = compare_assignments(base, snap, enc)
+    summary['unknown_sessions'] = unknown
+    return _page(
+        redis_client, job_id, variant, 'snapshot', enc, base, snap, changed, summary,
+        lambda offsets: [snapshot_entries[o] if o >= 0 else None for o in offsets],
+        department_id, page, page_size, include_shared=False,
+    )
+
+
+def _swap_summary(summary: Dict) -> Dict:
+    for change in summary.get('faculty_load_changes', []):
+        change['daily_a'], change['daily_b'] = change['daily_b'], change['daily_a']
+        change['max_daily_a'], change['max_daily_b'] = change['max_daily_b'], change['max_daily_a']
+    return summary
+
+
+def _page(
+    redis_client, job_id, a, b, enc, va, vb, changed, summary,
+    entries_b, department_id, page, page_size, include_shared,
+) -> Dict:
+    """One page of changes (with both sides' entries) and the response envelope."""
+    if department_id and department_id != 'all':
+        dept_idx = enc['depts'].index(department_id) if department_id in enc['depts'] else -1
+        changed = changed[enc['dept'][changed] == dept_idx]
+    page, page_size = max(page, 1), max(page_size, 1)
+    window = changed[(page - 1) * page_size: page * page_size]
+
+    slots, rooms = enc['slots'], enc['rooms']
+
+    def _pos(v, k, arr, vocab):
+        i = int(v[arr][k])
+        return vocab[i] if 0 <= i < len(vocab) else None
+
+    rows_a = _entries(redis_client, job_id, a, [int(va['offset'][k]) for k in window])
+    rows_b = entries_b([int(vb['offset'][k]) for k in window])
+
+    changes = []
+    for k, row_a, row_b in zip(window, rows_a, rows_b):
+        course_id, session = enc['keys'][k]
+        changes.append({
+            'course_id': course_id,
+            'session_number': session,
+            'department_id': enc['depts'][enc['dept'][k]],
+            'slot_a': _pos(va, k, 'slot', slots),
+            'slot_b': _pos(vb, k, 'slot', slots),
+            'room_a': _pos(va, k, 'room', rooms),
+            'room_b': _pos(vb, k, 'room', rooms),
+            'moved': bool(va['slot'][k] != vb['slot'][k]),
+            'room_changed': bool(va['room'][k] != vb['room'][k]),
+            'entry_a': row_a,
+            'entry_b': row_b,
+        })
+
+    result = {
+        'a': a,
+        'b': b,
+        'summary': summary,
+        'department_id': department_id or 'all',
+        'total_changes': int(changed.size),
+        'page': page,
+        'page_size': page_size,
+        'changes': changes,
+    }
+    if include_shared:
+        same = np.ones(len(enc['keys']), dtype=bool)
+        same[changed] = False
+        same &= va['offset'] >= 0
+        if department_id and department_id != 'all':
+            same &= enc['dept'] == dept_idx
+        result['shared_entries'] = _entries(
+            redis_client, job_id, a, va['offset'][same].tolist()
+        )
+    return result
+
+
+def _entries(redis_client, job_id: str, variant: str, offsets: List[int]) -> List[Optional[dict]]:
+    """Entries of `variant` at `offsets` (None for -1 / missing), one HMGET."""
+    wanted = [o for o in offsets if o >= 0]
+    if not wanted:
+        return [None] * len(offsets)
+    rows = dict(zip(wanted, redis_client.hmget(entries_key(job_id, variant), wanted)))
+    return [json.loads(rows[o]) if o >= 0 and rows.get(o) else None for o in offsets]
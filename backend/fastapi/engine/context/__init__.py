@@ -8,8 +8,12 @@ NOT: Trigger actions, modify schedules, run in CP-SAT loops
 """
 from .feature_store import ContextFeatureStore
 from .signal_extractor import SignalExtractor
+from .columnar_store import ColumnarFeatureStore, CoEnrollmentMatrix, FeatureSnapshot
 
 __all__ = [
     'ContextFeatureStore',
-    'SignalExtractor'
+    'SignalExtractor',
+    'ColumnarFeatureStore',
+    'CoEnrollmentMatrix',
+    'FeatureSnapshot'
 ]
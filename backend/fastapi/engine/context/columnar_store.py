@@ -0,0 +1,371 @@
+"""
+Columnar Context Store - Memory-Mapped Feature Snapshots
+Following Google/Meta standards: One file = one responsibility
+
+ContextFeatureStore reads one JSON document per semester and the extractor
+counted co-enrollment with a Python loop over every course pair of every
+student, so both grew quadratically with the catalogue.  This backend keeps
+the numeric features as columns:
+
+  * one .npy file per column, loaded with mmap_mode='r' (zero-copy reads,
+    pages shared between worker processes);
+  * co-enrollment as a symmetric CSR matrix (indptr / indices / counts)
+    built with vectorised numpy from (student, course) enrolment pairs;
+  * string ids (courses, faculty, rooms, students, slots) interned once in
+    manifest.json; every column is addressed by those indexes.
+
+Layout: <root>/<org_id>/<semester_id>/v<N>/{manifest.json, *.npy} plus a
+CURRENT file naming the live version.  A version directory is written
+under a temp name and renamed into place, then CURRENT is os.replace()d,
+so readers only ever see complete snapshots.
+"""
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+TIME_BUCKETS = ('morning', 'midday', 'evening')
+_CURRENT = 'CURRENT'
+_MANIFEST = 'manifest.json'
+
+
+class CoEnrollmentMatrix:
+    """
+    Symmetric sparse course × course co-enrollment counts in CSR form,
+    plus per-course head-counts for the Dice strength 2·|A∩B| / (|A|+|B|).
+    """
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        counts: np.ndarray,
+        course_students: np.ndarray,
+    ):
+        self.indptr = indptr
+        self.indices = indices
+        self.counts = counts
+        self.course_students = course_students
+
+    @property
+    def n_courses(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def nnz_pairs(self) -> int:
+        """Distinct unordered course pairs with at least one shared student."""
+        return len(self.indices) // 2
+
+    @classmethod
+    def from_enrollments(
+        cls,
+        student_idx: np.ndarray,
+        course_idx: np.ndarray,
+        n_courses: int,
+    ) -> 'CoEnrollmentMatrix':
+        """
+        Build from parallel (student, course) index arrays.  Students are
+        grouped by size k and each group's k·(k-1)/2 pairs are emitted as
+        one (n_k, k) gather, so the work is O(Σ k²) in numpy, not Python.
+        """
+        n = int(n_courses)
+        keys = np.unique(
+            np.asarray(student_idx, dtype=np.int64) * n + np.asarray(course_idx, dtype=np.int64)
+        )
+        students, courses = keys // n, keys % n  # sorted by student, then course
+        course_students = np.bincount(courses, minlength=n).astype(np.int32)
+
+        rows: List[np.ndarray] = []
+        cols: List[np.ndarray] = []
+        if len(keys):
+            starts = np.flatnonzero(np.r_[True, students[1:] != students[:-1]])
+            sizes = np.diff(np.r_[starts, len(keys)])
+            for k in np.unique(sizes):
+                if k < 2:
+                    continue
+                group = courses[starts[sizes == k][:, None] + np.arange(k)]
+                iu, ju = np.triu_indices(k, 1)
+                rows.append(group[:, iu].ravel())
+                cols.append(group[:, ju].ravel())
+        if rows:
+            pair_keys, pair_counts = np.unique(
+                np.concatenate(rows) * n + np.concatenate(cols), return_counts=True,
+            )
+            i, j = pair_keys // n, pair_keys % n
+            row = np.concatenate([i, j])
+            col = np.concatenate([j, i])
+            val = np.concatenate([pair_counts, pair_counts]).astype(np.int32)
+            order = np.lexsort((col, row))
+            row, col, val = row[order], col[order], val[order]
+        else:
+            row = col = np.zeros(0, dtype=np.int64)
+            val = np.zeros(0, dtype=np.int32)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row, minlength=n), out=indptr[1:])
+        return cls(indptr, col.astype(np.int32), val, course_students)
+
+    def neighbours(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(course indexes, shared-student counts) co-enrolled with course i."""
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return self.indices[lo:hi], self.counts[lo:hi]
+
+    def count(self, i: int, j: int) -> int:
+        cols, counts = self.neighbours(i)
+        pos = int(np.searchsorted(cols, j))
+        if pos < len(cols) and cols[pos] == j:
+            return int(counts[pos])
+        return 0
+
+    def strength(self, i: int, j: int) -> float:
+        shared = self.count(i, j)
+        total = int(self.course_students[i]) + int(self.course_students[j])
+        return (2.0 * shared) / total if total > 0 else 0.0
+
+    def pairs(self) -> Iterable[Tuple[int, int, int]]:
+        """(i, j, count) for each unordered pair, i < j."""
+        for i in range(self.n_courses):
+            cols, counts = self.neighbours(i)
+            for j, c in zip(cols[cols > i].tolist(), counts[cols > i].tolist()):
+                yield i, j, c
+
+
+class FeatureSnapshot:
+    """
+    One read-only, memory-mapped version of an org's semester features.
+    Getters mirror ContextFeatureStore's and return the same neutral
+    defaults for unknown ids.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path / _MANIFEST) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format_version') != FORMAT_VERSION:
+            raise ValueError(
+                f"{path}: unsupported feature format v{self.manifest.get('format_version')}"
+            )
+        ids = self.manifest['ids']
+        self.course_ids: List[str] = ids['courses']
+        self.faculty_ids: List[str] = ids['faculty']
+        self.room_ids: List[str] = ids['rooms']
+        self.student_ids: List[str] = ids['students']
+        self.slot_ids: List[str] = ids['slots']
+        self._course_pos = {c: i for i, c in enumerate(self.course_ids)}
+        self._faculty_pos = {f: i for i, f in enumerate(self.faculty_ids)}
+        self._room_pos = {r: i for i, r in enumerate(self.room_ids)}
+        self._student_pos = {s: i for i, s in enumerate(self.student_ids)}
+        self._slot_pos = {s: i for i, s in enumerate(self.slot_ids)}
+
+        col = self._column
+        self.course_popularity = col('course_popularity')
+        self.room_utilization = col('room_utilization')
+        self.faculty_time_effectiveness = col('faculty_time_effectiveness')
+        self.hotspot_indptr = col('hotspot_indptr')
+        self.hotspot_slots = col('hotspot_slots')
+        self.co_enrollment = CoEnrollmentMatrix(
+            col('co_enrollment_indptr'),
+            col('co_enrollment_indices'),
+            col('co_enrollment_counts'),
+            col('course_students'),
+        )
+
+    def _column(self, name: str) -> np.ndarray:
+        return np.load(self.path / f"{name}.npy", mmap_mode='r')
+
+    @property
+    def version(self) -> int:
+        return self.manifest['version']
+
+    def get_faculty_time_effectiveness(self, faculty_id: str, time_bucket: str) -> float:
+        f = self._faculty_pos.get(faculty_id)
+        if f is None or time_bucket not in TIME_BUCKETS:
+            return 0.5
+        value = float(self.faculty_time_effectiveness[f, TIME_BUCKETS.index(time_bucket)])
+        return 0.5 if np.isnan(value) else value
+
+    def get_course_popularity(self, course_id: str) -> float:
+        i = self._course_pos.get(course_id)
+        return 0.5 if i is None else float(self.course_popularity[i])
+
+    def get_overload_risk(self, student_id: str, time_slot: str) -> bool:
+        s = self._student_pos.get(str(student_id))
+        t = self._slot_pos.get(str(time_slot))
+        if s is None or t is None:
+            return False
+        slots = self.hotspot_slots[self.hotspot_indptr[s]:self.hotspot_indptr[s + 1]]
+        pos = int(np.searchsorted(slots, t))
+        return pos < len(slots) and slots[pos] == t
+
+    def get_room_utilization(self, room_id: str) -> float:
+        i = self._room_pos.get(room_id)
+        return 0.5 if i is None else float(self.room_utilization[i])
+
+    def get_co_enrollment_strength(self, course_id1: str, course_id2: str) -> float:
+        i = self._course_pos.get(course_id1)
+        j = self._course_pos.get(course_id2)
+        if i is None or j is None:
+            return 0.0
+        return self.co_enrollment.strength(i, j)
+
+
+class ColumnarFeatureStore:
+    """
+    Versioned, per-org / per-semester columnar snapshots; see module docstring.
+    """
+
+    def __init__(self, root: str = "data/context_features"):
+        self.root = Path(root)
+
+    def _semester_dir(self, org_id: str, semester_id: str) -> Path:
+        return self.root / str(org_id) / str(semester_id)
+
+    def versions(self, org_id: str, semester_id: str) -> List[int]:
+        base = self._semester_dir(org_id, semester_id)
+        if not base.exists():
+            return []
+        return sorted(
+            int(p.name[1:]) for p in base.iterdir()
+            if p.is_dir() and p.name.startswith('v') and p.name[1:].isdigit()
+        )
+
+    def current_version(self, org_id: str, semester_id: str) -> Optional[int]:
+        pointer = self._semester_dir(org_id, semester_id) / _CURRENT
+        try:
+            return int(pointer.read_text().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def load(
+        self, org_id: str, semester_id: str, version: Optional[int] = None,
+    ) -> Optional[FeatureSnapshot]:
+        """Map a snapshot (default: the CURRENT one); None if there is none."""
+        if version is None:
+            version = self.current_version(org_id, semester_id)
+        if version is None:
+            return None
+        path = self._semester_dir(org_id, semester_id) / f"v{version}"
+        if not path.exists():
+            return None
+        return FeatureSnapshot(path)
+
+    def save(
+        self,
+        org_id: str,
+        semester_id: str,
+        features: Dict,
+        co_enrollment: CoEnrollmentMatrix,
+        course_ids: List[str],
+    ) -> int:
+        """
+        Write a new version from SignalExtractor-style feature dicts and a
+        co-enrollment matrix indexed like `course_ids`; returns the version.
+        """
+        base = self._semester_dir(org_id, semester_id)
+        base.mkdir(parents=True, exist_ok=True)
+        columns, ids = self._to_columns(features, co_enrollment, course_ids)
+
+        tmp = base / f".tmp-{os.getpid()}-{datetime.now().strftime('%H%M%S%f')}"
+        tmp.mkdir()
+        try:
+            for name, array in columns.items():
+                with open(tmp / f"{name}.npy", 'wb') as f:
+                    np.save(f, array)
+                    f.flush()
+                    os.fsync(f.fileno())
+            version = max(self.versions(org_id, semester_id), default=0) + 1
+            manifest = {
+                'format_version': FORMAT_VERSION,
+                'org_id': str(org_id),
+                'semester_id': str(semester_id),
+                'last_update': features.get('last_update', datetime.now().isoformat()),
+                'ids': ids,
+                'columns': {
+                    name: {'dtype': str(a.dtype), 'shape': list(a.shape)}
+                    for name, a in columns.items()
+                },
+            }
+            while True:
+                manifest['version'] = version
+                with open(tmp / _MANIFEST, 'w') as f:
+                    json.dump(manifest, f)
+                try:
+                    os.rename(tmp, base / f"v{version}")
+                    break
+                except OSError:
+                    if not (base / f"v{version}").exists():
+                        raise
+                    version += 1  # a concurrent writer took this number
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        pointer_tmp = base / f".{_CURRENT}.{os.getpid()}.tmp"
+        pointer_tmp.write_text(str(version))
+        os.replace(pointer_tmp, base / _CURRENT)
+        logger.info(
+            "[ColumnarStore] Saved org=%s semester=%s v%d  courses=%d  co_pairs=%d",
+            org_id, semester_id, version, len(course_ids), co_enrollment.nnz_pairs,
+        )
+        return version
+
+    @staticmethod
+    def _to_columns(
+        features: Dict,
+        co_enrollment: CoEnrollmentMatrix,
+        course_ids: List[str],
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, List[str]]]:
+        course_pos = {c: i for i, c in enumerate(course_ids)}
+        popularity = np.full(len(course_ids), 0.5, dtype=np.float32)
+        for cid, value in features.get('course_popularity', {}).items():
+            if cid in course_pos:
+                popularity[course_pos[cid]] = value
+
+        util = features.get('room_utilization', {})
+        room_ids = list(util)
+        utilization = np.asarray([util[r] for r in room_ids], dtype=np.float32)
+
+        fte = features.get('faculty_time_effectiveness', {})
+        faculty_ids = list(fte)
+        effectiveness = np.full((len(faculty_ids), len(TIME_BUCKETS)), np.nan, dtype=np.float32)
+        for f, fid in enumerate(faculty_ids):
+            for bucket, value in fte[fid].items():
+                if bucket in TIME_BUCKETS:
+                    effectiveness[f, TIME_BUCKETS.index(bucket)] = value
+
+        hotspots = features.get('student_overload_hotspots', {})
+        student_ids = list(hotspots)
+        slot_ids = sorted({str(t) for slots in hotspots.values() for t in slots})
+        slot_pos = {t: i for i, t in enumerate(slot_ids)}
+        hotspot_indptr = np.zeros(len(student_ids) + 1, dtype=np.int64)
+        hotspot_slots: List[int] = []
+        for s, sid in enumerate(student_ids):
+            hotspot_slots.extend(sorted({slot_pos[str(t)] for t in hotspots[sid]}))
+            hotspot_indptr[s + 1] = len(hotspot_slots)
+
+        columns = {
+            'course_popularity': popularity,
+            'room_utilization': utilization,
+            'faculty_time_effectiveness': effectiveness,
+            'hotspot_indptr': hotspot_indptr,
+            'hotspot_slots': np.asarray(hotspot_slots, dtype=np.int32),
+            'co_enrollment_indptr': np.asarray(co_enrollment.indptr, dtype=np.int64),
+            'co_enrollment_indices': np.asarray(co_enrollment.indices, dtype=np.int32),
+            'co_enrollment_counts': np.asarray(co_enrollment.counts, dtype=np.int32),
+            'course_students': np.asarray(co_enrollment.course_students, dtype=np.int32),
+        }
+        ids = {
+            'courses': [str(c) for c in course_ids],
+            'faculty': [str(f) for f in faculty_ids],
+            'rooms': [str(r) for r in room_ids],
+            'students': [str(s) for s in student_ids],
+            'slots': slot_ids,
+        }
+        return columns, ids
@@ -13,6 +13,8 @@ from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+from .columnar_store import ColumnarFeatureStore, FeatureSnapshot
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,17 +45,41 @@ class ContextFeatureStore:
         self.room_utilization: Dict[str, float] = {}
         self.co_enrollment_stats: Dict[str, Dict[str, float]] = {}
         
+        # Memory-mapped columnar snapshot (org-scoped loads); getters read
+        # it directly instead of the dict caches when set
+        self.snapshot: Optional[FeatureSnapshot] = None
+        
         # Metadata
         self.last_update: Optional[datetime] = None
         self.semester_version: Optional[str] = None
         
         logger.info("[ContextStore] Initialized (read-only signal provider)")
     
-    def load_features(self, semester_id: str):
+    def load_features(self, semester_id: str, org_id: Optional[str] = None):
         """
         Load pre-computed features for a semester
         This is called ONCE at semester start, not per request
+        
+        With org_id the org's CURRENT columnar snapshot is memory-mapped
+        (no parsing of feature values); the JSON file is the fallback.
         """
+        self.snapshot = None
+        if org_id is not None:
+            try:
+                snapshot = ColumnarFeatureStore(self.storage_path).load(org_id, semester_id)
+            except Exception as e:
+                logger.error(f"[ContextStore] Failed to map columnar features: {e}")
+                snapshot = None
+            if snapshot is not None:
+                self.snapshot = snapshot
+                self.last_update = datetime.fromisoformat(snapshot.manifest['last_update'])
+                self.semester_version = semester_id
+                logger.info(
+                    f"[ContextStore] Mapped features for org {org_id} semester {semester_id} "
+                    f"v{snapshot.version}"
+                )
+                return
+        
         feature_file = self.storage_path / f"features_{semester_id}.json"
         
         if not feature_file.exists():
@@ -89,6 +115,8 @@ class ContextFeatureStore:
         
         Read-only: Does NOT modify anything
         """
+        if self.snapshot is not None:
+            return self.snapshot.get_faculty_time_effectiveness(faculty_id, time_bucket)
         return self.faculty_time_effectiveness.get(faculty_id, {}).get(time_bucket, 0.5)
     
     def get_course_popularity(self, course_id: str) -> float:
@@ -98,6 +126,8 @@ class ContextFeatureStore:
         
         Read-only: Does NOT modify anything
         """
+        if self.snapshot is not None:
+            return self.snapshot.get_course_popularity(course_id)
         return self.course_popularity.get(course_id, 0.5)
     
     def get_overload_risk(self, student_id: str, time_slot: str) -> bool:
@@ -107,6 +137,8 @@ class ContextFeatureStore:
         
         Read-only: Does NOT modify anything
         """
+        if self.snapshot is not None:
+            return self.snapshot.get_overload_risk(student_id, time_slot)
         hotspots = self.student_overload_hotspots.get(student_id, [])
         return time_slot in hotspots
     
@@ -117,6 +149,8 @@ class ContextFeatureStore:
         
         Read-only: Does NOT modify anything
         """
+        if self.snapshot is not None:
+            return self.snapshot.get_room_utilization(room_id)
         return self.room_utilization.get(room_id, 0.5)
     
     def get_co_enrollment_strength(self, course_id1: str, course_id2: str) -> float:
@@ -126,6 +160,8 @@ class ContextFeatureStore:
         
         Read-only: Does NOT modify anything
         """
+        if self.snapshot is not None:
+            return self.snapshot.get_co_enrollment_strength(course_id1, course_id2)
         key = f"{min(course_id1, course_id2)}_{max(course_id1, course_id2)}"
         return self.co_enrollment_stats.get(key, {}).get('strength', 0.0)
     
@@ -164,6 +200,17 @@ class ContextFeatureStore:
     
     def get_stats(self) -> Dict:
         """Get feature store statistics for monitoring"""
+        if self.snapshot is not None:
+            snap = self.snapshot
+            return {
+                'semester_version': self.semester_version,
+                'last_update': self.last_update.isoformat() if self.last_update else None,
+                'faculty_patterns_count': len(snap.faculty_ids),
+                'course_count': len(snap.course_ids),
+                'room_count': len(snap.room_ids),
+                'co_enrollment_pairs': snap.co_enrollment.nnz_pairs,
+                'columnar_version': snap.version
+            }
         return {
             'semester_version': self.semester_version,
             'last_update': self.last_update.isoformat() if self.last_update else None,
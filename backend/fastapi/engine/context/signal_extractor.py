@@ -8,11 +8,15 @@ NOT: Run during scheduling, run in real-time, block scheduling
 """
 import logging
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict, Counter
 
+import numpy as np
+
+from .columnar_store import CoEnrollmentMatrix, ColumnarFeatureStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,7 +27,8 @@ class SignalExtractor:
     When: Once per semester, nightly batch, or manual trigger
     NOT: During scheduling, per request, or in real-time
     
-    Output: JSON feature file consumed by ContextFeatureStore
+    Output: JSON feature file consumed by ContextFeatureStore, or (with an
+    org_id) a versioned columnar snapshot under <output_path>/<org_id>/
     """
     
     def __init__(self, output_path: str = "data/context_features"):
@@ -37,7 +42,8 @@ class SignalExtractor:
         historical_schedules: List[Dict],
         faculty_feedback: List[Dict],
         student_enrollments: List[Dict],
-        room_usage: List[Dict]
+        room_usage: List[Dict],
+        org_id: Optional[str] = None
     ) -> Dict:
         """
         Extract features from historical data (OFFLINE BATCH)
@@ -53,9 +59,14 @@ class SignalExtractor:
         - In real-time
         
         Returns: Feature dictionary to be saved to disk
+        
+        With org_id the features go to the columnar store (co-enrollment as
+        a sparse matrix) and the returned dict carries 'co_enrollment_pairs'
+        and 'columnar_version' instead of the per-pair JSON map.
         """
         logger.info(f"[SignalExtractor] Starting batch extraction for semester {semester_id}")
         
+        course_ids, matrix = self._co_enrollment_matrix(student_enrollments)
         features = {
             'semester_id': semester_id,
             'extraction_time': datetime.now().isoformat(),
@@ -70,15 +81,27 @@ class SignalExtractor:
                 student_enrollments
             ),
             'room_utilization': self._extract_room_utilization(room_usage),
-            'co_enrollment_stats': self._extract_co_enrollment(student_enrollments)
         }
         
-        # Save to disk
-        output_file = self.output_path / f"features_{semester_id}.json"
-        with open(output_file, 'w') as f:
-            json.dump(features, f, indent=2)
-        
-        logger.info(f"[SignalExtractor] Features saved to {output_file}")
+        if org_id is not None:
+            # Columnar snapshot (memory-mapped reads, atomic versioned write)
+            features['co_enrollment_pairs'] = matrix.nnz_pairs
+            features['columnar_version'] = ColumnarFeatureStore(self.output_path).save(
+                org_id, semester_id, features, matrix, course_ids
+            )
+            logger.info(
+                f"[SignalExtractor] Features saved for org {org_id} "
+                f"v{features['columnar_version']}"
+            )
+        else:
+            features['co_enrollment_stats'] = self._co_enrollment_stats(course_ids, matrix)
+            
+            # Save to disk
+            output_file = self.output_path / f"features_{semester_id}.json"
+            with open(output_file, 'w') as f:
+                json.dump(features, f, indent=2)
+            
+            logger.info(f"[SignalExtractor] Features saved to {output_file}")
         logger.info(f"[SignalExtractor] Faculty patterns: {len(features['faculty_time_effectiveness'])}")
         logger.info(f"[SignalExtractor] Course popularity: {len(features['course_popularity'])}")
         
@@ -211,33 +234,46 @@ class SignalExtractor:
         - Find pairs of courses taken by same students
         - Calculate co-enrollment strength
         """
-        # Group courses by student
-        student_courses = defaultdict(set)
+        course_ids, matrix = self._co_enrollment_matrix(student_enrollments)
+        return self._co_enrollment_stats(course_ids, matrix)
+    
+    def _co_enrollment_matrix(
+        self,
+        student_enrollments: List[Dict]
+    ) -> Tuple[List[str], CoEnrollmentMatrix]:
+        """
+        Sparse course × course co-enrollment counts (vectorised, no Python
+        loop over course pairs).  Returns (course ids, matrix indexed by them).
+        """
+        student_pos: Dict[str, int] = {}
+        course_pos: Dict[str, int] = {}
+        students, courses = [], []
         for enrollment in student_enrollments:
             student_id = enrollment.get('student_id')
             course_id = enrollment.get('course_id')
             if student_id and course_id:
-                student_courses[student_id].add(course_id)
-        
-        # Count co-enrollments
-        co_enrollment_counts = defaultdict(int)
-        course_total_students = Counter()
-        
-        for student_id, courses in student_courses.items():
-            courses_list = list(courses)
-            for i, c1 in enumerate(courses_list):
-                course_total_students[c1] += 1
-                for c2 in courses_list[i+1:]:
-                    key = f"{min(c1, c2)}_{max(c1, c2)}"
-                    co_enrollment_counts[key] += 1
-        
-        # Calculate strength (Jaccard similarity)
-        co_enrollment_stats = {}
-        for key, count in co_enrollment_counts.items():
-            c1, c2 = key.split('_')
-            total = course_total_students[c1] + course_total_students[c2]
-            strength = (2 * count) / total if total > 0 else 0.0
-            co_enrollment_stats[key] = {'strength': strength, 'count': count}
+                students.append(student_pos.setdefault(student_id, len(student_pos)))
+                courses.append(course_pos.setdefault(course_id, len(course_pos)))
         
-        logger.debug(f"[SignalExtractor] Extracted {len(co_enrollment_stats)} co-enrollment pairs")
-        return co_enrollment_stats
+        matrix = CoEnrollmentMatrix.from_enrollments(
+            np.asarray(students, dtype=np.int64),
+            np.asarray(courses, dtype=np.int64),
+            len(course_pos),
+        )
+        logger.debug(f"[SignalExtractor] Extracted {matrix.nnz_pairs} co-enrollment pairs")
+        return list(course_pos), matrix
+    
+    @staticmethod
+    def _co_enrollment_stats(
+        course_ids: List[str],
+        matrix: CoEnrollmentMatrix
+    ) -> Dict[str, Dict[str, float]]:
+        """Legacy JSON shape: {"<c1>_<c2>": {'strength', 'count'}} (c1 < c2)"""
+        totals = matrix.course_students
+        stats = {}
+        for i, j, count in matrix.pairs():
+            c1, c2 = sorted((course_ids[i], course_ids[j]))
+            total = int(totals[i]) + int(totals[j])
+            strength = (2 * count) / total if total > 0 else 0.0
+            stats[f"{c1}_{c2}"] = {'strength': strength, 'count': count}
+        return stats
@@ -4,6 +4,7 @@ Following Google/Meta standards: Clean public interface
 """
 from .solver import AdaptiveCPSATSolver
 from .strategies import STRATEGIES, get_strategy_by_index, select_strategy_for_cluster_size
+from .budget import AdaptiveBudgetAllocator, BudgetPlan, ClusterFeatures, StrategyOutcomeHistory
 from .progress import log_cluster_start, log_cluster_success
 from .constraints import (
     add_faculty_constraints,
@@ -27,6 +28,11 @@ __all__ = [
     'STRATEGIES',
     'get_strategy_by_index',
     'select_strategy_for_cluster_size',
+    # Adaptive strategy budgets
+    'AdaptiveBudgetAllocator',
+    'BudgetPlan',
+    'ClusterFeatures',
+    'StrategyOutcomeHistory',
     'log_cluster_start',
     'log_cluster_success',
     'add_faculty_constraints',
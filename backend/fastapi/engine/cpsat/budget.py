@@ -0,0 +1,391 @@
+"""
+CP-SAT Adaptive Budget Allocator
+Learned per-cluster time budgets and starting rung for the strategy ladder.
+Following Google/Meta standards: One file = one responsibility
+
+Why:
+  STRATEGIES carries constant timeouts (15s / 20s / 10s) and the starting rung
+  is chosen from course count alone.  An easy 6-course cluster and a dense
+  15-course cluster with 40% stage-3 room fallbacks get the same budget, so
+  easy clusters idle on time they never use while hard ones time out.
+
+How:
+  1. ClusterFeatures — cheap shape descriptors computed in solve_cluster()
+     after domain precomputation (vars, conflict groups, faculty load ratio,
+     domain stage tally).
+  2. StrategyOutcomeHistory — per (strategy, feature bucket) outcome counts
+     and EWMA time-to-feasible, persisted as JSON between jobs.  A timeout
+     (UNKNOWN) is a censored observation: it only proves the solve needs more
+     than the time it was given, so it raises the time estimate and never
+     counts against P(success).  Only proven INFEASIBLE attempts do.
+  3. AdaptiveBudgetAllocator.plan() — predicts P(success) and time-to-feasible
+     per strategy, skips rungs that history has proven infeasible, and sizes
+     each timeout from the prediction.  The ladder's constant is the floor
+     until successes faster than it have been observed.  When a job deadline
+     is set, the cluster's total is capped at its difficulty-weighted share of
+     the remaining time, so time not used by easy clusters flows to the hard
+     ones that follow.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .strategies import STRATEGIES
+
+logger = logging.getLogger(__name__)
+
+# Observations required before history overrides the feature prior.
+MIN_OBSERVATIONS = 5
+# Rungs whose predicted success falls below this are skipped (never the last).
+SKIP_PROBABILITY = 0.05
+# Headroom multiplier over the predicted time-to-feasible.
+TIMEOUT_HEADROOM = 1.5
+# EWMA smoothing for time-to-feasible.
+EWMA_ALPHA = 0.3
+# A timed-out attempt raises the time estimate to at least this × its duration.
+TIMEOUT_CENSOR_FACTOR = 1.5
+
+# CP-SAT status names (solver.StatusName) as recorded per attempt.
+_SUCCESS_STATUSES = ("OPTIMAL", "FEASIBLE")
+_INFEASIBLE_STATUS = "INFEASIBLE"
+_TIMEOUT_STATUS = "UNKNOWN"
+
+
+@dataclass(frozen=True)
+class ClusterFeatures:
+    """Shape descriptors of one cluster, computed once before the strategy loop."""
+
+    n_courses: int
+    n_sessions: int
+    n_vars: int
+    n_conflict_groups: int
+    faculty_load_ratio: float          # busiest faculty's sessions / total slots
+    stage_tally: Tuple[int, int, int, int] = (0, 0, 0, 0)  # domain fallback stages 1-4
+
+    @property
+    def conflict_density(self) -> float:
+        return self.n_conflict_groups / self.n_vars if self.n_vars else 0.0
+
+    @property
+    def room_fallback_ratio(self) -> float:
+        """Fraction of courses whose room domain needed stage 3/4 relaxation."""
+        total = sum(self.stage_tally)
+        return (self.stage_tally[2] + self.stage_tally[3]) / total if total else 0.0
+
+    def bucket(self) -> str:
+        """Discretised history key — coarse enough to accumulate observations."""
+        size = min(self.n_sessions // 20, 5)
+        density = min(int(self.conflict_density * 4), 4)
+        load = min(int(self.faculty_load_ratio * 4), 4)
+        rooms = min(int(self.room_fallback_ratio * 4), 4)
+        return f"s{size}d{density}l{load}r{rooms}"
+
+    def difficulty(self) -> float:
+        """Relative hardness in session units (used to split the job deadline)."""
+        multiplier = (
+            1.0
+            + 1.5 * min(self.conflict_density, 1.0)
+            + 1.0 * min(self.faculty_load_ratio, 1.0)
+            + 0.5 * self.room_fallback_ratio
+        )
+        return max(self.n_sessions, 1) * multiplier
+
+
+@dataclass
+class BudgetPlan:
+    """Output of AdaptiveBudgetAllocator.plan() for one cluster."""
+
+    start_idx: int
+    timeouts: List[float]              # one entry per STRATEGIES rung
+    success_probability: List[float]
+    share_seconds: Optional[float] = None
+
+    def strategy_at(self, idx: int) -> Dict:
+        """STRATEGIES[idx] with the planned timeout (the ladder itself is never mutated)."""
+        return {**STRATEGIES[idx], "timeout": self.timeouts[idx]}
+
+
+@dataclass
+class _OutcomeStats:
+    attempts: int = 0
+    successes: int = 0
+    infeasible: int = 0
+    timeouts: int = 0
+    ewma_seconds: float = 0.0
+
+    @property
+    def decided(self) -> int:
+        """Attempts with a definite answer (solved or proven infeasible)."""
+        return self.successes + self.infeasible
+
+    def to_dict(self) -> Dict:
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "infeasible": self.infeasible,
+            "timeouts": self.timeouts,
+            "ewma_seconds": round(self.ewma_seconds, 3),
+        }
+
+
+@dataclass
+class StrategyOutcomeHistory:
+    """
+    Historical strategy outcomes keyed by (strategy name, feature bucket).
+
+    Thread-safe for the in-process dept/cross-dept phases.  Process-pool
+    workers return their outcomes to the parent, which records them here.
+    """
+
+    path: Optional[Path] = None
+    _stats: Dict[str, Dict[str, _OutcomeStats]] = field(default_factory=dict, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def record(self, strategy_name: str, bucket: str, status: str, seconds: float) -> None:
+        """
+        Record one attempt; `status` is the CP-SAT status name.
+
+        Successes feed the time-to-feasible EWMA.  A timeout (UNKNOWN) is
+        right-censored — the solve needs more than `seconds` — so it lifts the
+        estimate instead.  Other statuses (MODEL_INVALID, errors) only count
+        as attempts.
+        """
+        with self._lock:
+            stats = self._stats.setdefault(strategy_name, {}).setdefault(bucket, _OutcomeStats())
+            stats.attempts += 1
+            if status in _SUCCESS_STATUSES:
+                stats.successes += 1
+                stats.ewma_seconds = (
+                    seconds if stats.ewma_seconds == 0.0
+                    else EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * stats.ewma_seconds
+                )
+            elif status == _INFEASIBLE_STATUS:
+                stats.infeasible += 1
+            elif status == _TIMEOUT_STATUS:
+                stats.timeouts += 1
+                stats.ewma_seconds = max(stats.ewma_seconds, seconds * TIMEOUT_CENSOR_FACTOR)
+
+    def lookup(self, strategy_name: str, bucket: str) -> Optional[_OutcomeStats]:
+        return self._stats.get(strategy_name, {}).get(bucket)
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "StrategyOutcomeHistory":
+        history = cls(path=Path(path) if path else None)
+        if history.path is None or not history.path.exists():
+            return history
+        try:
+            raw = json.loads(history.path.read_text())
+            for name, buckets in raw.get("strategies", {}).items():
+                history._stats[name] = {
+                    b: _OutcomeStats(
+                        attempts=int(s.get("attempts", 0)),
+                        successes=int(s.get("successes", 0)),
+                        infeasible=int(s.get("infeasible", 0)),
+                        timeouts=int(s.get("timeouts", 0)),
+                        ewma_seconds=float(s.get("ewma_seconds", 0.0)),
+                    )
+                    for b, s in buckets.items()
+                }
+        except Exception as exc:
+            logger.warning("[CP-SAT-Budget] History load failed — starting fresh: %s", exc)
+        return history
+
+    def save(self) -> None:
+        """Atomic write (tmp + rename) so concurrent readers never see a torn file."""
+        if self.path is None:
+            return
+        with self._lock:
+            payload = {
+                "version": 1,
+                "saved_at": time.time(),
+                "strategies": {
+                    name: {b: s.to_dict() for b, s in buckets.items()}
+                    for name, buckets in self._stats.items()
+                },
+            }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(payload))
+            os.replace(tmp, self.path)
+        except Exception as exc:
+            logger.warning("[CP-SAT-Budget] History save failed (non-fatal): %s", exc)
+
+
+class AdaptiveBudgetAllocator:
+    """
+    Predicts per-strategy success and sizes timeouts for each cluster.
+
+    One allocator per generation job (it owns the job deadline); the outcome
+    history is shared across jobs through get_shared_history().
+    """
+
+    def __init__(
+        self,
+        history: Optional[StrategyOutcomeHistory] = None,
+        job_budget_seconds: Optional[float] = None,
+        min_timeout: float = 3.0,
+    ) -> None:
+        self.history = history or get_shared_history()
+        self.min_timeout = min_timeout
+        self._deadline = (
+            time.monotonic() + job_budget_seconds if job_budget_seconds else None
+        )
+        self._pending_sessions = 0
+        self._difficulty_per_session = 1.0
+        self._planned = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Job-level bookkeeping
+    # ------------------------------------------------------------------
+
+    def expect_sessions(self, n_sessions: int) -> None:
+        """Announce work not yet planned so the deadline is split fairly."""
+        with self._lock:
+            self._pending_sessions += max(0, n_sessions)
+
+    def remaining_seconds(self) -> Optional[float]:
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    # ------------------------------------------------------------------
+    # Prediction
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _prior(strategy_idx: int, features: ClusterFeatures) -> Tuple[float, float]:
+        """
+        Feature-only (success probability, time budget) before history exists.
+
+        The time is the ladder's own timeout: features say nothing reliable
+        about how fast a cluster solves, so a cold start never gets less time
+        than the fixed ladder would have given it.
+        """
+        strategy = STRATEGIES[strategy_idx]
+        tightness = (
+            0.4 * min(features.conflict_density, 1.0)
+            + 0.4 * min(features.faculty_load_ratio, 1.0)
+        )
+        if strategy.get("room_capacity"):
+            tightness += 0.4 * features.room_fallback_ratio
+        if not strategy.get("faculty_conflicts"):
+            tightness *= 0.25
+        p = max(0.05, min(0.95, 0.9 - tightness))
+        return p, float(strategy["timeout"])
+
+    def predict(self, strategy_idx: int, features: ClusterFeatures) -> Tuple[float, float]:
+        """
+        Blend the feature prior with observed history for this bucket.
+
+        Returns (P(success), time budget).  Timeouts are excluded from the
+        probability (they are not evidence of infeasibility).  The budget is
+        the EWMA × headroom once successes exist — the only case where it may
+        fall below the ladder's timeout — and otherwise the ladder's timeout
+        lifted by any censored timeouts.
+        """
+        p_prior, t_prior = self._prior(strategy_idx, features)
+        stats = self.history.lookup(STRATEGIES[strategy_idx]["name"], features.bucket())
+        if stats is None or stats.attempts == 0:
+            return p_prior, t_prior
+        # Beta-style smoothing: prior counts as MIN_OBSERVATIONS pseudo-attempts.
+        p = (stats.successes + p_prior * MIN_OBSERVATIONS) / (stats.decided + MIN_OBSERVATIONS)
+        if stats.successes:
+            t = stats.ewma_seconds * TIMEOUT_HEADROOM
+        else:
+            t = max(t_prior, stats.ewma_seconds)
+        return p, t
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def plan(self, features: ClusterFeatures) -> BudgetPlan:
+        n = len(STRATEGIES)
+        probs: List[float] = []
+        timeouts: List[float] = []
+        for idx, strategy in enumerate(STRATEGIES):
+            p, t = self.predict(idx, features)
+            probs.append(p)
+            ceiling = float(strategy["timeout"]) * 2.0
+            timeouts.append(max(self.min_timeout, min(ceiling, t)))
+
+        # Starting rung: skip hopeless rungs only once history has confirmed
+        # it with proven outcomes — timeouts alone never retire a rung.
+        start_idx = 0
+        for idx in range(n - 1):
+            stats = self.history.lookup(STRATEGIES[idx]["name"], features.bucket())
+            confirmed = stats is not None and stats.decided >= MIN_OBSERVATIONS
+            if confirmed and probs[idx] < SKIP_PROBABILITY:
+                start_idx = idx + 1
+            else:
+                break
+
+        share = self._take_share(features)
+        if share is not None:
+            planned_total = sum(timeouts[start_idx:])
+            if planned_total > share:
+                scale = share / planned_total
+                timeouts = [
+                    t if i < start_idx else max(self.min_timeout, t * scale)
+                    for i, t in enumerate(timeouts)
+                ]
+
+        return BudgetPlan(
+            start_idx=start_idx,
+            timeouts=[round(t, 2) for t in timeouts],
+            success_probability=[round(p, 3) for p in probs],
+            share_seconds=round(share, 2) if share is not None else None,
+        )
+
+    def _take_share(self, features: ClusterFeatures) -> Optional[float]:
+        """This cluster's difficulty-weighted slice of the remaining job time."""
+        remaining = self.remaining_seconds()
+        with self._lock:
+            weight = features.difficulty()
+            self._planned += 1
+            # Running mean of difficulty-per-session estimates the unseen work.
+            per_session = weight / max(features.n_sessions, 1)
+            self._difficulty_per_session += (
+                (per_session - self._difficulty_per_session) / self._planned
+            )
+            self._pending_sessions = max(0, self._pending_sessions - features.n_sessions)
+            pending_weight = self._pending_sessions * self._difficulty_per_session
+        if remaining is None:
+            return None
+        return remaining * weight / (weight + pending_weight)
+
+    def record(
+        self, features: ClusterFeatures, strategy_name: str, status: str, seconds: float
+    ) -> None:
+        self.history.record(strategy_name, features.bucket(), status, seconds)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide shared history
+# ---------------------------------------------------------------------------
+
+_shared_history: Optional[StrategyOutcomeHistory] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_history() -> StrategyOutcomeHistory:
+    """Lazily load the persisted outcome history once per process."""
+    global _shared_history
+    with _shared_lock:
+        if _shared_history is None:
+            try:
+                from config import settings
+                path = settings.CPSAT_BUDGET_HISTORY_PATH
+            except Exception:
+                path = None
+            _shared_history = StrategyOutcomeHistory.load(path)
+        return _shared_history
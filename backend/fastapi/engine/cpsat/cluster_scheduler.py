@@ -0,0 +1,233 @@
+"""
+Cluster Scheduler — largest-first (LPT) submission for the parallel CP-SAT pool.
+Following Google/Meta standards: One file = one responsibility
+
+Why:
+  _stage2_cpsat_legacy submitted clusters in enumeration order with a fixed
+  workers_per_cluster.  A large hard cluster that happens to be last starts
+  only when everything else is done and then runs alone on a few threads
+  while the remaining cores idle — makespan ≈ (sum of others)/P + longest.
+
+How:
+  1. estimate_cluster_difficulty() — cheap pre-solve estimate (sessions ×
+     conflict pressure) from data the parent already holds.
+  2. lpt_order() — Longest Processing Time first; ProcessPoolExecutor takes
+     work FIFO, so submission order is execution order.
+  3. WorkerGrantBoard — shared (Manager) dict where workers publish their
+     start time and read their granted num_search_workers before every
+     strategy attempt.  When the queue drains, rebalance() hands idle cores
+     to the clusters with the largest estimated remaining work.
+  4. ClusterTimeline — per-cluster start/finish/worker history, published by
+     the saga for inspection.
+
+OR-Tools cannot change num_search_workers inside a running Solve(), so a
+grant takes effect at the next strategy attempt (or component solve) of the
+boosted cluster — the granularity at which CP-SAT models are rebuilt anyway.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from models.timetable_models import Course
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_cluster_difficulty(
+    cluster: Sequence[Course],
+    student_course_index: Optional[Dict[str, set]] = None,
+) -> float:
+    """
+    Cheap difficulty estimate used only for ordering and core grants.
+
+    Sessions drive model size; shared students and shared faculty drive
+    constraint density.  O(sum of enrollments) — no domain precomputation.
+    """
+    sessions = 0
+    enrolment_total = 0
+    distinct_students: set = set()
+    faculty_sessions: Dict[str, int] = {}
+    for course in cluster:
+        duration = max(getattr(course, "duration", 1) or 1, 1)
+        sessions += duration
+        if student_course_index is not None:
+            students = student_course_index.get(course.course_id, set())
+        else:
+            students = set(getattr(course, "student_ids", []) or [])
+        enrolment_total += len(students)
+        distinct_students.update(students)
+        fid = getattr(course, "faculty_id", None)
+        if fid:
+            faculty_sessions[fid] = faculty_sessions.get(fid, 0) + duration
+
+    # Overlap factor: 1.0 when no student takes two courses in the cluster.
+    overlap = enrolment_total / len(distinct_students) if distinct_students else 1.0
+    faculty_pressure = max(faculty_sessions.values()) if faculty_sessions else 0
+    return sessions * (1.0 + 0.5 * (overlap - 1.0)) + 0.25 * faculty_pressure
+
+
+def lpt_order(difficulties: Sequence[float]) -> List[int]:
+    """Cluster indices sorted by estimated difficulty, largest first (stable)."""
+    return sorted(range(len(difficulties)), key=lambda i: (-difficulties[i], i))
+
+
+@dataclass
+class ClusterTimeline:
+    """Start/finish record of one cluster in the parallel pool."""
+
+    cluster_id: int
+    difficulty: float
+    submit_order: int
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    workers: List[int] = field(default_factory=list)  # grant history
+    status: str = "queued"
+
+    def to_dict(self, origin: float) -> Dict:
+        def rel(t: Optional[float]) -> Optional[float]:
+            return round(t - origin, 3) if t is not None else None
+
+        return {
+            "cluster_id": self.cluster_id,
+            "difficulty": round(self.difficulty, 2),
+            "submit_order": self.submit_order,
+            "start_s": rel(self.started_at),
+            "finish_s": rel(self.finished_at),
+            "duration_s": (
+                round(self.finished_at - self.started_at, 3)
+                if self.started_at is not None and self.finished_at is not None else None
+            ),
+            "workers": self.workers,
+            "status": self.status,
+        }
+
+
+class WorkerGrantBoard:
+    """
+    Parent-side view of the shared grant dict.
+
+    Keys in the shared mapping:
+      ("start", cid) → wall time the worker picked the cluster up
+      ("grant", cid) → num_search_workers the worker should use next attempt
+    """
+
+    def __init__(
+        self,
+        shared,
+        difficulties: Sequence[float],
+        physical_cores: int,
+        base_workers: int,
+    ) -> None:
+        self.shared = shared
+        self.difficulties = list(difficulties)
+        self.physical_cores = max(1, physical_cores)
+        self.base_workers = max(1, base_workers)
+        self.origin = time.time()
+        self.timelines: Dict[int, ClusterTimeline] = {}
+        self._done: set = set()
+
+    def submitted(self, cluster_id: int, order: int) -> None:
+        self.timelines[cluster_id] = ClusterTimeline(
+            cluster_id=cluster_id,
+            difficulty=self.difficulties[cluster_id],
+            submit_order=order,
+            submitted_at=time.time(),
+            workers=[self.base_workers],
+        )
+        if self.shared is not None:
+            self.shared[("grant", cluster_id)] = self.base_workers
+
+    def finished(self, cluster_id: int, status: str) -> None:
+        self._done.add(cluster_id)
+        tl = self.timelines.get(cluster_id)
+        if tl is None:
+            return
+        tl.finished_at = time.time()
+        tl.status = status
+        if self.shared is not None:
+            start = self.shared.get(("start", cluster_id))
+            if start is not None:
+                tl.started_at = start
+
+    def running(self) -> List[int]:
+        """Clusters a worker has picked up but not yet returned."""
+        if self.shared is None:
+            return []
+        return [
+            cid for cid in self.timelines
+            if cid not in self._done and self.shared.get(("start", cid)) is not None
+        ]
+
+    def rebalance(self) -> None:
+        """
+        Once the queue has drained (every cluster picked up or finished),
+        spread the cores freed by finished clusters over the ones still
+        running, proportional to difficulty.
+        """
+        if self.shared is None:
+            return
+        running = self.running()
+        if not running or len(running) + len(self._done) < len(self.timelines):
+            return
+        total = sum(self.difficulties[c] for c in running) or 1.0
+        spare = self.physical_cores - self.base_workers * len(running)
+        if spare <= 0:
+            return
+        # Integer shares by difficulty; the last (smallest) takes the remainder.
+        running.sort(key=lambda c: -self.difficulties[c])
+        granted = 0
+        for i, cid in enumerate(running):
+            extra = (
+                spare - granted if i == len(running) - 1
+                else int(spare * self.difficulties[cid] / total)
+            )
+            granted += extra
+            new_grant = self.base_workers + extra
+            try:
+                current = self.shared.get(("grant", cid), self.base_workers)
+                if new_grant > current:
+                    self.shared[("grant", cid)] = new_grant
+                    self.timelines[cid].workers.append(new_grant)
+                    logger.info(
+                        "[CP-SAT-Sched] Idle cores → cluster %d  workers %d → %d",
+                        cid, current, new_grant,
+                    )
+            except Exception as exc:
+                logger.debug("[CP-SAT-Sched] Grant update failed: %s", exc)
+
+    def export(self) -> List[Dict]:
+        return [
+            tl.to_dict(self.origin)
+            for tl in sorted(self.timelines.values(), key=lambda t: t.submit_order)
+        ]
+
+    def makespan(self) -> float:
+        finishes = [t.finished_at for t in self.timelines.values() if t.finished_at]
+        return round(max(finishes) - self.origin, 3) if finishes else 0.0
+
+
+class WorkerGrant:
+    """
+    Worker-side handle: marks the cluster started and reads the current grant.
+    Picklable (holds only the Manager proxy and the cluster id).
+    """
+
+    def __init__(self, shared, cluster_id: int) -> None:
+        self.shared = shared
+        self.cluster_id = cluster_id
+
+    def mark_started(self) -> None:
+        try:
+            self.shared[("start", self.cluster_id)] = time.time()
+        except Exception:
+            pass
+
+    def current(self, default: int) -> int:
+        try:
+            return int(self.shared.get(("grant", self.cluster_id), default))
+        except Exception:
+            return default
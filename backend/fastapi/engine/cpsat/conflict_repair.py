@@ -0,0 +1,457 @@
+"""
+Conflict Repair — post-merge min-conflicts / Kempe-chain local search.
+Following Google/Meta standards: One file = one responsibility
+
+Dept, cross-dept and legacy cluster solutions are solved independently and
+merged; GA mutation then moves sessions without any clash check.  Faculty,
+room and student clashes between clusters were only *counted* when building
+variant payloads.  ConflictRepairer fixes them.
+
+Occupancy is kept as flat count arrays indexed [entity × n_slots + slot]
+(faculty, room, student), so the clash cost of a session at a (slot, room)
+is O(its students) and a move touches only the entities of that session.
+
+Search (until no conflicts, the time budget, or should_stop()):
+  * pick a random conflicting session; scan its domain (faculty-allowed
+    slots × candidate rooms, the same derivation CP-SAT uses) for the
+    least-clash (slot, room); move if it does not worsen, with a short tabu
+    on the vacated slot to avoid cycling;
+  * when no single move improves, try Kempe-chain swaps: the session and
+    every session it clashes with transitively across slots a and b swap
+    slot labels together, accepted only if total clash cost drops.
+
+Only conflicting sessions seed moves (chains may carry clean neighbours
+along).  Unscheduled sentinel sessions are placed when a clash-free
+position exists.  Faculty/room clashes weigh HARD_WEIGHT student clashes.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import time
+from array import array
+from collections import deque
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from models.timetable_models import Course, Room, TimeSlot
+from engine.cpsat.domains import candidate_rooms, candidate_slots
+from engine.cpsat.room_index import RoomIndex
+from engine.cpsat.slot_masks import SlotMasks
+
+logger = logging.getLogger(__name__)
+
+_GREEDY_SENTINEL = "__UNSCHEDULED__"
+
+HARD_WEIGHT = 10      # faculty / room double-booking vs one student clash
+TABU_TENURE = 7       # iterations a vacated (session, slot) stays tabu
+MAX_CHAIN = 12        # Kempe chain size cap
+KEMPE_TRIES = 4       # target slots tried per stuck session
+STOP_CHECK_EVERY = 32  # moves between should_stop() calls
+
+
+class ConflictRepairer:
+    """
+    Min-conflicts repair over a merged solution; see module docstring.
+
+    Domains and entity indexes are built once in __init__ and reused by
+    every repair() call (final solution and each GA variant).
+    """
+
+    def __init__(
+        self,
+        courses: List[Course],
+        rooms: List[Room],
+        time_slots: List[TimeSlot],
+        room_index: Optional[RoomIndex] = None,
+        slot_masks: Optional[SlotMasks] = None,
+        seed: int = 42,
+    ) -> None:
+        self.slot_ids = [ts.slot_id for ts in time_slots]
+        self.slot_of = {str(ts.slot_id): i for i, ts in enumerate(time_slots)}
+        self.n_slots = len(time_slots)
+        self.room_ids = [r.room_id for r in rooms]
+        self.room_of = {str(r.room_id): i for i, r in enumerate(rooms)}
+        self.seed = seed
+        room_index = room_index or RoomIndex(rooms)
+        slot_id_strs = list(self.slot_of)
+
+        faculty_of: Dict[str, int] = {}
+        student_of: Dict[str, int] = {}
+        self.course_ids: List[str] = []
+        self.course_pos: Dict[str, int] = {}
+        self.c_faculty: List[int] = []
+        self.c_students: List[Tuple[int, ...]] = []
+        self.c_student_set: List[frozenset] = []
+        self.c_slots: List[List[int]] = []
+        self.c_rooms: List[List[int]] = []
+
+        for course in courses:
+            cid = course.course_id
+            if cid in self.course_pos:
+                continue
+            self.course_pos[cid] = len(self.course_ids)
+            self.course_ids.append(cid)
+            fid = getattr(course, 'faculty_id', None)
+            self.c_faculty.append(faculty_of.setdefault(fid, len(faculty_of)) if fid else -1)
+            students = tuple(
+                student_of.setdefault(sid, len(student_of))
+                for sid in dict.fromkeys(getattr(course, 'student_ids', None) or [])
+            )
+            self.c_students.append(students)
+            self.c_student_set.append(frozenset(students))
+
+            # Domain: same derivation as AdaptiveCPSATSolver._precompute_valid_domains.
+            self.c_rooms.append([
+                self.room_of[str(r.room_id)]
+                for r in candidate_rooms(course, room_index)
+                if str(r.room_id) in self.room_of
+            ])
+            self.c_slots.append([
+                self.slot_of[s] for s in candidate_slots(course, slot_id_strs, slot_masks)
+            ])
+
+        self.n_faculty = len(faculty_of)
+        self.n_students = len(student_of)
+        self.report: Dict = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def repair(
+        self,
+        solution: Dict,
+        time_budget: float = 10.0,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Dict:
+        """
+        Return a repaired copy of `solution` ({(course_id, session): (slot, room)}).
+
+        Stops when no conflicts remain, after `time_budget` seconds, or as
+        soon as `should_stop()` returns True (checked between moves).
+        Sessions of unknown courses or slots are passed through untouched.
+        """
+        t0 = time.perf_counter()
+        rng = random.Random(self.seed)
+        S = self.n_slots
+        self._fac = array('H', bytes(2 * max(self.n_faculty, 1) * S))
+        self._room = array('H', bytes(2 * max(len(self.room_ids), 1) * S))
+        self._stu = array('H', bytes(2 * max(self.n_students, 1) * S))
+
+        # --- load sessions -------------------------------------------------
+        keys: List[tuple] = []
+        s_course: List[int] = []
+        s_slot: List[int] = []
+        s_room: List[int] = []
+        passthrough: Dict = {}
+        for key, value in solution.items():
+            cpos = self.course_pos.get(key[0])
+            slot_id, room_id = value
+            slot = -1 if slot_id == _GREEDY_SENTINEL else self.slot_of.get(str(slot_id))
+            if cpos is None or slot is None:
+                passthrough[key] = value
+                continue
+            keys.append(key)
+            s_course.append(cpos)
+            s_slot.append(slot)
+            s_room.append(self.room_of.get(str(room_id), -1) if room_id else -1)
+        self._s_course, self._s_slot, self._s_room = s_course, s_slot, s_room
+
+        at_slot: List[Set[int]] = [set() for _ in range(S)]
+        self._at_slot = at_slot
+        for i, slot in enumerate(s_slot):
+            if slot >= 0:
+                self._occupy(i, slot, s_room[i], 1)
+                at_slot[slot].add(i)
+
+        conflicted: List[int] = []
+        position: Dict[int, int] = {}
+
+        def mark(i: int) -> None:
+            if i not in position:
+                position[i] = len(conflicted)
+                conflicted.append(i)
+
+        def unmark(i: int) -> None:
+            pos = position.pop(i, None)
+            if pos is not None:
+                last = conflicted.pop()
+                if pos < len(conflicted):
+                    conflicted[pos] = last
+                    position[last] = pos
+
+        before = self._count_conflicts()
+        for i, slot in enumerate(s_slot):
+            if slot < 0 or self._clash_in_place(i) > 0:
+                mark(i)
+
+        tabu: Dict[Tuple[int, int], int] = {}
+        moves = kempe_moves = placed = iterations = 0
+        stop_reason = 'resolved'
+        since_improve = 0
+        best_remaining = len(conflicted)
+
+        while conflicted:
+            iterations += 1
+            if time.perf_counter() - t0 > time_budget:
+                stop_reason = 'time_budget'
+                break
+            if should_stop is not None and iterations % STOP_CHECK_EVERY == 0 and should_stop():
+                stop_reason = 'cancelled'
+                break
+            if since_improve > 50 * (best_remaining + 10):
+                stop_reason = 'stalled'
+                break
+
+            i = conflicted[rng.randrange(len(conflicted))]
+            cur_slot, cur_room = s_slot[i], s_room[i]
+            if cur_slot >= 0:
+                self._occupy(i, cur_slot, cur_room, -1)
+                at_slot[cur_slot].discard(i)
+                old_cost = self._cost(i, cur_slot, cur_room)
+                vacated = self._sharing(i, cur_slot)
+            else:
+                old_cost, vacated = None, []
+
+            best_cost, best_moves = None, []
+            for slot in self.c_slots[s_course[i]]:
+                if tabu.get((i, slot), 0) > iterations:
+                    continue
+                base = self._slot_cost(i, slot)
+                if best_cost is not None and base > best_cost:
+                    continue
+                room = self._free_room(i, slot)
+                cost = base + (HARD_WEIGHT * self._room_load(room, slot) if room >= 0 else 0)
+                if best_cost is None or cost < best_cost:
+                    best_cost, best_moves = cost, [(slot, room)]
+                elif cost == best_cost:
+                    best_moves.append((slot, room))
+
+            if best_moves and (
+                (old_cost is None and best_cost == 0)
+                or (old_cost is not None and best_cost <= old_cost)
+            ):
+                slot, room = rng.choice(best_moves)
+                if cur_slot >= 0 and slot != cur_slot:
+                    tabu[(i, cur_slot)] = iterations + TABU_TENURE
+                self._place(i, slot, room)
+                if old_cost is None:
+                    placed += 1
+                if (slot, room) != (cur_slot, cur_room):
+                    moves += 1
+                affected = {i}
+                affected.update(vacated)
+                affected.update(self._sharing(i, slot))
+            elif old_cost is None:
+                # Unscheduled and no clash-free position: leave it unplaced.
+                unmark(i)
+                continue
+            else:
+                self._place(i, cur_slot, cur_room)
+                affected = self._kempe(i, rng)
+                if affected:
+                    kempe_moves += 1
+                else:
+                    since_improve += 1
+                    continue
+
+            for j in affected:
+                if s_slot[j] >= 0 and self._clash_in_place(j) == 0:
+                    unmark(j)
+                else:
+                    mark(j)
+            if len(conflicted) < best_remaining:
+                best_remaining = len(conflicted)
+                since_improve = 0
+            else:
+                since_improve += 1
+
+        after = self._count_conflicts()
+        repaired = dict(passthrough)
+        for i, key in enumerate(keys):
+            if s_slot[i] < 0:
+                repaired[key] = solution[key]
+            else:
+                room = s_room[i]
+                repaired[key] = (
+                    self.slot_ids[s_slot[i]],
+                    self.room_ids[room] if room >= 0 else solution[key][1],
+                )
+
+        self.report = {
+            'conflicts_before': before,
+            'conflicts_after': after,
+            'moves': moves,
+            'kempe_moves': kempe_moves,
+            'placed_unscheduled': placed,
+            'iterations': iterations,
+            'remaining_conflicted_sessions': len(conflicted),
+            'stop_reason': stop_reason,
+            'elapsed_s': round(time.perf_counter() - t0, 3),
+        }
+        logger.info("[Repair] %s", self.report)
+        self._fac = self._room = self._stu = None
+        return repaired
+
+    # ------------------------------------------------------------------
+    # Occupancy
+    # ------------------------------------------------------------------
+
+    def _occupy(self, i: int, slot: int, room: int, delta: int) -> None:
+        S = self.n_slots
+        c = self._s_course[i]
+        f = self.c_faculty[c]
+        if f >= 0:
+            self._fac[f * S + slot] += delta
+        if room >= 0:
+            self._room[room * S + slot] += delta
+        stu = self._stu
+        for s in self.c_students[c]:
+            stu[s * S + slot] += delta
+
+    def _place(self, i: int, slot: int, room: int) -> None:
+        self._occupy(i, slot, room, 1)
+        self._s_slot[i], self._s_room[i] = slot, room
+        self._at_slot[slot].add(i)
+
+    def _unplace(self, i: int) -> None:
+        slot = self._s_slot[i]
+        self._occupy(i, slot, self._s_room[i], -1)
+        self._at_slot[slot].discard(i)
+
+    def _room_load(self, room: int, slot: int) -> int:
+        return self._room[room * self.n_slots + slot]
+
+    # ------------------------------------------------------------------
+    # Cost (session i must NOT be counted in occupancy when evaluated)
+    # ------------------------------------------------------------------
+
+    def _slot_cost(self, i: int, slot: int) -> int:
+        S = self.n_slots
+        c = self._s_course[i]
+        f = self.c_faculty[c]
+        cost = HARD_WEIGHT * self._fac[f * S + slot] if f >= 0 else 0
+        stu = self._stu
+        for s in self.c_students[c]:
+            cost += stu[s * S + slot]
+        return cost
+
+    def _cost(self, i: int, slot: int, room: int) -> int:
+        cost = self._slot_cost(i, slot)
+        if room >= 0:
+            cost += HARD_WEIGHT * self._room_load(room, slot)
+        return cost
+
+    def _clash_in_place(self, i: int) -> int:
+        slot, room = self._s_slot[i], self._s_room[i]
+        self._occupy(i, slot, room, -1)
+        cost = self._cost(i, slot, room)
+        self._occupy(i, slot, room, 1)
+        return cost
+
+    def _free_room(self, i: int, slot: int) -> int:
+        """Best-fit candidate room free at `slot`, else the least-loaded one."""
+        rooms = self.c_rooms[self._s_course[i]]
+        if not rooms:
+            return -1
+        S = self.n_slots
+        best, best_load = rooms[0], None
+        for r in rooms:
+            load = self._room[r * S + slot]
+            if load == 0:
+                return r
+            if best_load is None or load < best_load:
+                best, best_load = r, load
+        return best
+
+    def _sharing(self, i: int, slot: int) -> List[int]:
+        """Sessions at `slot` sharing faculty, room or a student with session i."""
+        c = self._s_course[i]
+        f, room = self.c_faculty[c], self._s_room[i]
+        students = self.c_student_set[c]
+        out = []
+        for j in self._at_slot[slot]:
+            if j == i:
+                continue
+            cj = self._s_course[j]
+            if (
+                (f >= 0 and self.c_faculty[cj] == f)
+                or (room >= 0 and self._s_room[j] == room)
+                or not students.isdisjoint(self.c_student_set[cj])
+            ):
+                out.append(j)
+        return out
+
+    def _count_conflicts(self) -> Dict[str, int]:
+        """Clashing pairs per resource from the occupancy arrays."""
+        def pairs(arr) -> int:
+            return sum(n * (n - 1) // 2 for n in arr if n > 1)
+        return {
+            'faculty': pairs(self._fac),
+            'room': pairs(self._room),
+            'student': pairs(self._stu),
+        }
+
+    # ------------------------------------------------------------------
+    # Kempe chains
+    # ------------------------------------------------------------------
+
+    def _kempe(self, i: int, rng: random.Random) -> Optional[Set[int]]:
+        """
+        Try swapping the Kempe chain of session i between its slot a and a
+        few domain slots b.  Returns the affected sessions when a chain swap
+        lowered the total clash cost, else None (state unchanged).
+        """
+        a = self._s_slot[i]
+        options = [b for b in self.c_slots[self._s_course[i]] if b != a]
+        if not options:
+            return None
+        for b in rng.sample(options, min(KEMPE_TRIES, len(options))):
+            chain = self._chain(i, a, b)
+            if chain is None:
+                continue
+            old = {j: (self._s_slot[j], self._s_room[j]) for j in chain}
+            for j in chain:
+                self._unplace(j)
+            before = 0
+            for j in chain:
+                before += self._cost(j, *old[j])
+                self._place(j, *old[j])
+            for j in chain:
+                self._unplace(j)
+            after = 0
+            for j in chain:
+                target = b if old[j][0] == a else a
+                room = old[j][1]
+                if room < 0 or self._room_load(room, target) > 0:
+                    room = self._free_room(j, target)
+                after += self._cost(j, target, room)
+                self._place(j, target, room)
+            if after < before:
+                affected = set(chain)
+                for j in chain:
+                    affected.update(self._sharing(j, a))
+                    affected.update(self._sharing(j, b))
+                return affected
+            for j in chain:
+                self._unplace(j)
+            for j in chain:
+                self._place(j, *old[j])
+        return None
+
+    def _chain(self, i: int, a: int, b: int) -> Optional[List[int]]:
+        """BFS over faculty/student clashes alternating slots a ↔ b; None if unusable."""
+        seen = {i}
+        queue = deque([i])
+        while queue:
+            j = queue.popleft()
+            other = b if self._s_slot[j] == a else a
+            if other not in self.c_slots[self._s_course[j]]:
+                return None
+            for k in self._sharing(j, other):
+                if k not in seen:
+                    seen.add(k)
+                    if len(seen) > MAX_CHAIN:
+                        return None
+                    queue.append(k)
+        return list(seen)
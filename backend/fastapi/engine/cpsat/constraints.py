@@ -5,12 +5,16 @@ Following Google/Meta standards: One file = constraint logic
 """
 import logging
 from ortools.sat.python import cp_model
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from collections import defaultdict
 from models.timetable_models import Course
 
 logger = logging.getLogger(__name__)
 
+# SIH HC5: sessions of one course on one day.  The single source for the
+# CP-SAT constraint, LNS, DSATUR, the GA operators and conflict detection.
+MAX_SESSIONS_PER_DAY = 2
+
 
 def build_student_course_index(courses: List[Course]) -> Dict[str, set]:
     """
@@ -282,7 +286,7 @@ def add_max_sessions_per_day_constraints(
     variables: Dict,
     cluster: List[Course],
     time_slots_by_id: Dict,
-    max_sessions_per_day: int = 2
+    max_sessions_per_day: int = MAX_SESSIONS_PER_DAY
 ) -> None:
     """
     Add per-course per-day session limit (SIH requirement: 'Maximum number
@@ -293,8 +297,8 @@ def add_max_sessions_per_day_constraints(
 
     Args:
         time_slots_by_id: Dict mapping slot_id (str) → TimeSlot object
-        max_sessions_per_day: Default 2 (most universities allow 1–2 sessions
-                              of the same course per day maximum).
+        max_sessions_per_day: Default MAX_SESSIONS_PER_DAY (most universities
+                              allow 1–2 sessions of the same course per day).
     """
     try:
         # Group vars by (course_id, day_of_week)
@@ -325,7 +329,8 @@ def add_max_sessions_per_day_constraints(
 def add_fixed_slot_constraints(
     model: cp_model.CpModel,
     variables: Dict,
-    cluster: List[Course]
+    cluster: List[Course],
+    session_gates: Optional[Dict[tuple, Any]] = None,
 ) -> int:
     """
     Add hard constraints for courses with pre-fixed time slots (SIH requirement:
@@ -338,11 +343,16 @@ def add_fixed_slot_constraints(
     by a feature string starting with 'fixed_slot:' followed by the slot_id,
     e.g. 'fixed_slot:5' means the course must be at slot_id=5.
 
+    `session_gates` maps (course_id, session) → literal for sessions whose
+    placement is optional (unsat-core diagnosis / soft re-solve); their
+    "one room at the fixed slot" constraint is only enforced when placed.
+
     Returns:
         Number of fixed-slot constraints added
     """
     try:
         fixed_count = 0
+        session_gates = session_gates or {}
 
         for course in cluster:
             # Check for fixed slot marker in required_features
@@ -374,7 +384,10 @@ def add_fixed_slot_constraints(
                     # Variables in the fixed slot: sum must equal 1 (one room chosen)
                     else:
                         if vars_list:
-                            model.Add(sum(vars_list) == 1)
+                            ct = model.Add(sum(vars_list) == 1)
+                            gate = session_gates.get((course.course_id, session))
+                            if gate is not None:
+                                ct.OnlyEnforceIf(gate)
                         else:
                             logger.warning(
                                 f"[Constraints] Course {course.course_code} session {session}: "
@@ -393,3 +406,124 @@ def add_fixed_slot_constraints(
     except Exception as e:
         logger.error(f"[Constraints] Fixed-slot constraints failed: {e}")
         return 0
+
+
+def _parallel_section_group(course_id: str) -> Optional[str]:
+    """'<course>_off_<offering>_sec<i>' → '<course>_off_<offering>' (fetch_courses split)."""
+    base, sep, idx = course_id.rpartition('_sec')
+    return base if sep and idx.isdigit() else None
+
+
+def add_symmetry_breaking_constraints(
+    model: cp_model.CpModel,
+    variables: Dict,
+    cluster: List[Course],
+    slot_ordinal: Dict[str, int],
+    faculty_of_course: Dict[str, str],
+    students_of_course: Dict[str, set],
+    strict: bool = True,
+    sections: bool = True,
+) -> int:
+    """
+    Break session / parallel-section symmetry with slot-index ordering.
+
+    Sessions 0..duration-1 of a course are interchangeable (same domain, same
+    constraints), so every timetable appears duration! times in the search
+    space.  Per-session slot-index expressions
+        idx(c, s) = Σ ordinal(t) · x[c, s, t, r]
+    equal the chosen slot's ordinal (exactly-one holds), and
+        idx(c, 0) < idx(c, 1) < … < idx(c, d-1)
+    keeps exactly one representative.  `strict` (faculty conflicts on) uses
+    <, otherwise ≤ so no solution of a relaxed strategy is cut off.
+
+    Parallel sections from the >60-student split in fetch_courses are
+    interchangeable when they share faculty, duration, domain and features
+    and clash with the same set of other courses (HC4 is pairwise course
+    non-overlap for courses sharing a student).  Such sections are ordered
+    by the slot of their first session.  Callers pass `sections=False` when
+    student constraints are not all-student (CRITICAL mode), where the
+    neighbourhoods differ.
+
+    Returns:
+        Number of ordering constraints added
+    """
+    try:
+        session_terms: Dict[tuple, list] = defaultdict(list)
+        session_domain: Dict[tuple, set] = defaultdict(set)
+        for (c_id, s_idx, t_slot_id, r_id), var in variables.items():
+            session_terms[(c_id, s_idx)].append((slot_ordinal.get(str(t_slot_id), 0), var))
+            session_domain[(c_id, s_idx)].add((t_slot_id, r_id))
+
+        def idx(c_id: str, s_idx: int):
+            return sum(o * v for o, v in session_terms[(c_id, s_idx)])
+
+        def order(a, b) -> None:
+            if strict:
+                model.Add(a < b)
+            else:
+                model.Add(a <= b)
+
+        added = 0
+        for course in cluster:
+            c_id = course.course_id
+            for s_idx in range(course.duration - 1):
+                if (
+                    session_terms.get((c_id, s_idx))
+                    and session_domain[(c_id, s_idx)] == session_domain.get((c_id, s_idx + 1))
+                ):
+                    order(idx(c_id, s_idx), idx(c_id, s_idx + 1))
+                    added += 1
+
+        sections_added = 0
+        if sections:
+            groups: Dict[str, List[Course]] = defaultdict(list)
+            for course in cluster:
+                group = _parallel_section_group(course.course_id)
+                if group is not None:
+                    groups[group].append(course)
+            groups = {g: cs for g, cs in groups.items() if len(cs) > 1}
+
+            if groups:
+                courses_of_student: Dict[str, set] = defaultdict(set)
+                for course in cluster:
+                    for sid in students_of_course.get(course.course_id, ()):
+                        courses_of_student[sid].add(course.course_id)
+
+                for members in groups.values():
+                    member_ids = {c.course_id for c in members}
+                    classes: Dict[tuple, List[Course]] = defaultdict(list)
+                    for course in members:
+                        c_id = course.course_id
+                        if not session_terms.get((c_id, 0)):
+                            continue
+                        clashes = set()
+                        for sid in students_of_course.get(c_id, ()):
+                            clashes |= courses_of_student[sid]
+                        clashes.discard(c_id)
+                        if clashes & member_ids:
+                            continue  # sections sharing students are not interchangeable
+                        signature = (
+                            faculty_of_course.get(c_id),
+                            course.duration,
+                            frozenset(session_domain[(c_id, 0)]),
+                            tuple(sorted(getattr(course, 'required_features', []) or [])),
+                            frozenset(clashes),
+                        )
+                        classes[signature].append(course)
+                    for same in classes.values():
+                        same.sort(key=lambda c: c.course_id)
+                        for a, b in zip(same, same[1:]):
+                            # Same faculty ⇒ the sections never share a slot under
+                            # HC1, so the strict variant is exact here too.
+                            order(idx(a.course_id, 0), idx(b.course_id, 0))
+                            sections_added += 1
+
+        logger.info(
+            f"[Constraints] Added {added} session-order and {sections_added} "
+            f"section-order symmetry-breaking constraints"
+        )
+        return added + sections_added
+
+    except Exception as e:
+        logger.error(f"[Constraints] Symmetry-breaking constraints failed: {e}")
+        return 0
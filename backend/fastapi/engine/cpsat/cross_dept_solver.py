@@ -22,7 +22,7 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from models.timetable_models import Course, Faculty, Room, TimeSlot
 from engine.cpsat.committed_registry import CommittedResourceRegistry
@@ -39,6 +39,10 @@ def solve_cross_dept_timetable(
     committed_registry: CommittedResourceRegistry,
     job_id: str = "",
     redis_client=None,
+    budget_allocator=None,
+    unsat_cores: Optional[List[Dict]] = None,
+    room_index=None,
+    slot_masks=None,
 ) -> Dict:
     """
     Schedule cross-department courses after all dept timetables are committed.
@@ -51,6 +55,13 @@ def solve_cross_dept_timetable(
         committed_registry: FULLY POPULATED registry (all dept-phase assignments in)
         job_id:             For structured logging
         redis_client:       For progress pushes
+        budget_allocator:   Job-scoped AdaptiveBudgetAllocator (shared deadline +
+                            learned strategy timeouts); None = history only
+        unsat_cores:        Job-scoped list; infeasible course subsets found by
+                            the solver's unsat-core diagnosis are appended
+        room_index:         Job-scoped RoomIndex over `rooms`; None = build one
+        slot_masks:         Job-scoped SlotMasks (faculty availability / org
+                            blocks / preferences); None = build one
 
     Returns:
         solution dict: {(course_id, session_idx): (slot_id, room_id)}
@@ -84,6 +95,10 @@ def solve_cross_dept_timetable(
         job_id=job_id,
         redis_client=redis_client,
         student_course_index=student_index,
+        budget_allocator=budget_allocator,
+        unsat_cores=unsat_cores,
+        room_index=room_index,
+        slot_masks=slot_masks,
     )
 
     try:
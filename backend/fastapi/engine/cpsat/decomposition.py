@@ -0,0 +1,105 @@
+"""
+Cluster Decomposition — independent sub-problems inside one CP-SAT cluster.
+Following Google/Meta standards: One file = one responsibility
+
+Louvain groups courses by *weighted* affinity, so a cluster regularly holds
+two or more course groups that share no faculty, no students and no
+candidate rooms.  Such groups cannot constrain each other: every HC1/HC2/HC4
+clique touches one group only.  Solving them as a single model still makes
+CP-SAT search their product space, and an infeasible group drags the whole
+cluster down the relaxation ladder.
+
+find_independent_components() runs union-find over the cluster's
+interaction graph after domain precomputation, when room candidates are
+known exactly.  split_conflict_groups() partitions the precomputed HC4
+groups so each component model only iterates its own entries.
+"""
+from __future__ import annotations
+
+from typing import Dict, Hashable, List, Set
+
+from models.timetable_models import Course
+
+
+class _UnionFind:
+    """Path-halving union-find over course ids."""
+
+    def __init__(self, keys) -> None:
+        self.parent: Dict[Hashable, Hashable] = {k: k for k in keys}
+
+    def find(self, x: Hashable) -> Hashable:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: Hashable, b: Hashable) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+
+def find_independent_components(
+    cluster: List[Course],
+    faculty_of_course: Dict[str, str],
+    students_of_course: Dict[str, Set[str]],
+    valid_domains: Dict[tuple, list],
+) -> List[List[Course]]:
+    """
+    Split a cluster into connected components of its interaction graph.
+
+    Two courses interact when they share a faculty member, an enrolled
+    student, or any candidate room in their valid domains.  Each resource
+    is unioned with the first course that claimed it, so the pass is
+    O(enrollments + domain entries) rather than pairwise.
+
+    Returns components largest-first; course order within a component
+    follows the cluster order.
+    """
+    uf = _UnionFind(c.course_id for c in cluster)
+    owner: Dict[tuple, str] = {}
+
+    def claim(resource: tuple, course_id: str) -> None:
+        first = owner.setdefault(resource, course_id)
+        if first != course_id:
+            uf.union(first, course_id)
+
+    for course in cluster:
+        cid = course.course_id
+        fid = faculty_of_course.get(cid)
+        if fid:
+            claim(("f", fid), cid)
+        for sid in students_of_course.get(cid, ()):
+            claim(("s", sid), cid)
+
+    for (cid, _session), pairs in valid_domains.items():
+        if cid not in uf.parent:
+            continue
+        seen_rooms: Set[str] = set()
+        for _slot, room_id in pairs:
+            if room_id not in seen_rooms:
+                seen_rooms.add(room_id)
+                claim(("r", room_id), cid)
+
+    groups: Dict[Hashable, List[Course]] = {}
+    for course in cluster:
+        groups.setdefault(uf.find(course.course_id), []).append(course)
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def split_conflict_groups(
+    conflict_groups: Dict[tuple, list],
+    component_of_course: Dict[str, int],
+    n_components: int,
+) -> List[Dict[tuple, list]]:
+    """
+    Partition precomputed HC4 groups by component.
+
+    A conflict group is keyed by (student, slot); all its courses share that
+    student and therefore fall in one component.
+    """
+    parts: List[Dict[tuple, list]] = [{} for _ in range(n_components)]
+    for key, domain_keys in conflict_groups.items():
+        parts[component_of_course[domain_keys[0][0]]][key] = domain_keys
+    return parts
@@ -135,6 +135,10 @@ def solve_department_timetable(
     committed_registry: CommittedResourceRegistry,
     job_id: str = "",
     redis_client=None,
+    budget_allocator=None,
+    unsat_cores: Optional[List[Dict]] = None,
+    room_index=None,
+    slot_masks=None,
 ) -> DeptTimetableResult:
     """
     Solve one department's timetable respecting already-committed resources.
@@ -152,6 +156,13 @@ def solve_department_timetable(
         committed_registry: Already-committed slots (populated by earlier depts)
         job_id:             For structured logging
         redis_client:       For per-dept progress pushes (optional)
+        budget_allocator:   Job-scoped AdaptiveBudgetAllocator (shared deadline +
+                            learned strategy timeouts); None = history only
+        unsat_cores:        Job-scoped list; infeasible course subsets found by
+                            the solver's unsat-core diagnosis are appended
+        room_index:         Job-scoped RoomIndex over `rooms`; None = build one
+        slot_masks:         Job-scoped SlotMasks (faculty availability / org
+                            blocks / preferences); None = build one
 
     Returns:
         DeptTimetableResult with solution dict and stats.
@@ -188,6 +199,10 @@ def solve_department_timetable(
         job_id=job_id,
         redis_client=redis_client,
         student_course_index=student_index,
+        budget_allocator=budget_allocator,
+        unsat_cores=unsat_cores,
+        room_index=room_index,
+        slot_masks=slot_masks,
     )
 
     try:
@@ -0,0 +1,71 @@
+"""
+Course Domains — per-course candidate slots and rooms outside CP-SAT.
+Following Google/Meta standards: One file = one responsibility
+
+AdaptiveCPSATSolver._precompute_valid_domains derives each session's
+(slot, room) pairs from the job's RoomIndex and SlotMasks.  The post-solve
+stages (conflict repair, LNS, GA operators) move sessions after CP-SAT and
+must stay inside the same domains, so the derivation lives here once:
+
+  * candidate_rooms() — RoomIndex stages 1-4 on the course's type, features
+    (fixed_slot markers stripped) and enrolment, ordered best fit first;
+  * candidate_slots() — the fixed slot when the course has one, else the
+    faculty's allowed slots (org lunch blocks applied), falling back to the
+    full grid when the mask leaves fewer slots than sessions.
+"""
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+from models.timetable_models import Course, Room
+from engine.cpsat.room_index import RoomIndex
+from engine.cpsat.slot_masks import SlotMasks
+
+
+def fixed_slot(course: Course) -> Optional[str]:
+    """Slot id from a 'fixed_slot:<id>' required feature, if any."""
+    for feature in getattr(course, 'required_features', []) or []:
+        if isinstance(feature, str) and feature.startswith('fixed_slot:'):
+            return feature.split(':', 1)[1].strip()
+    return None
+
+
+def enrolment(course: Course) -> int:
+    """Enrolled head-count used for room fitting (30 when unknown)."""
+    return (
+        getattr(course, 'enrolled_students', 0)
+        or len(getattr(course, 'student_ids', None) or [])
+        or 30
+    )
+
+
+def candidate_rooms(course: Course, room_index: RoomIndex) -> List[Room]:
+    """Rooms CP-SAT would offer this course, best fit (smallest ≥ enrolment) first."""
+    enrolled = enrolment(course)
+    features = [
+        f for f in getattr(course, 'required_features', []) or []
+        if not (isinstance(f, str) and f.startswith('fixed_slot:'))
+    ]
+    rooms, _stage = room_index.candidates(
+        getattr(course, 'room_type_required', 'CLASSROOM') or 'CLASSROOM',
+        features, enrolled,
+    )
+    return sorted(rooms, key=lambda r: (r.capacity < enrolled, abs(r.capacity - enrolled)))
+
+
+def candidate_slots(
+    course: Course,
+    slot_ids: Sequence[str],
+    slot_masks: Optional[SlotMasks] = None,
+) -> List[str]:
+    """Slot ids (as strings, grid order) this course's sessions may use."""
+    fixed = fixed_slot(course)
+    if fixed is not None and fixed in slot_ids:
+        return [fixed]
+    slots = [str(s) for s in slot_ids]
+    if slot_masks is not None:
+        allowed = slot_masks.allowed_slots(getattr(course, 'faculty_id', None))
+        masked = [s for s in slots if s in allowed]
+        if len(masked) >= course.duration:
+            return masked
+    return slots
@@ -0,0 +1,192 @@
+"""
+DSatur Scheduler — saturation-degree constructive placement for one cluster.
+Following Google/Meta standards: One file = one responsibility
+
+Used as:
+  * the default fallback when every CP-SAT strategy fails (replaces the old
+    first-fit greedy, which ignored students and took pairs[0] when stuck);
+  * a solution hint that seeds each CP-SAT attempt.
+
+Graph: one node per course; courses are adjacent when they share a faculty
+member or an enrolled student.  A course's sessions are coloured (slotted)
+one at a time, and a slot taken by any session of the course or of a
+neighbour is "saturated" for every session of the course.
+
+Order: the uncoloured session whose course has the most saturated slots
+goes next (ties: higher degree, then fewer candidate slots).  Value: the
+conflict-free slot that keeps the course under its per-day cap, paired with
+the best-fit free room (smallest capacity ≥ enrolment).  When no clean slot
+exists, the slot with the fewest faculty/room double-bookings, then fewest
+student clashes, is taken — never blindly the first pair.
+
+O(sessions² + sessions × domain) — milliseconds for a 10–50 course cluster.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from models.timetable_models import Course, Room, TimeSlot
+from engine.cpsat.constraints import MAX_SESSIONS_PER_DAY
+
+logger = logging.getLogger(__name__)
+
+
+def _fixed_slot(course: Course) -> Optional[str]:
+    for feature in getattr(course, 'required_features', []) or []:
+        if isinstance(feature, str) and feature.startswith('fixed_slot:'):
+            return feature.split(':', 1)[1].strip()
+    return None
+
+
+def dsatur_schedule(
+    cluster: List[Course],
+    valid_domains: Dict[tuple, List[tuple]],
+    faculty_of_course: Dict[str, str],
+    students_of_course: Dict[str, Set[str]],
+    rooms: List[Room],
+    time_slots: List[TimeSlot],
+    max_sessions_per_day: int = MAX_SESSIONS_PER_DAY,
+    assigned: Optional[Dict] = None,
+) -> Dict[Tuple[str, int], Tuple[str, str]]:
+    """
+    Place every session of `cluster`; returns {(course_id, session): (slot_id, room_id)}.
+
+    `assigned` entries are kept and their faculty/student/room usage is
+    respected (e.g. a partial CP-SAT solution).  Sessions with an empty
+    domain are placed over the full slot × room grid instead of a sentinel.
+    """
+    solution: Dict = dict(assigned or {})
+    capacity = {r.room_id: r.capacity for r in rooms}
+    day_of_slot = {str(ts.slot_id): ts.day for ts in time_slots}
+    slot_order = {str(ts.slot_id): i for i, ts in enumerate(time_slots)}
+    course_ids = [c.course_id for c in cluster]
+
+    # --- adjacency (faculty / shared students) --------------------------------
+    neighbours: Dict[str, Set[str]] = {cid: set() for cid in course_ids}
+    by_resource: Dict[tuple, List[str]] = defaultdict(list)
+    for course in cluster:
+        cid = course.course_id
+        fid = faculty_of_course.get(cid)
+        if fid:
+            by_resource[('f', fid)].append(cid)
+        for sid in students_of_course.get(cid, ()):
+            by_resource[('s', sid)].append(cid)
+    for members in by_resource.values():
+        if len(members) > 1:
+            for a in members:
+                neighbours[a].update(members)
+    for cid in course_ids:
+        neighbours[cid].discard(cid)
+
+    # --- occupancy -------------------------------------------------------------
+    saturated: Dict[str, Set[str]] = {cid: set() for cid in course_ids}
+    faculty_busy: Dict[str, Set[str]] = defaultdict(set)
+    student_busy: Dict[str, Set[str]] = defaultdict(set)
+    room_busy: Dict[str, Set[str]] = defaultdict(set)
+    per_day: Dict[Tuple[str, int], int] = defaultdict(int)
+
+    def occupy(cid: str, slot: str, room_id) -> None:
+        fid = faculty_of_course.get(cid)
+        if fid:
+            faculty_busy[fid].add(slot)
+        for sid in students_of_course.get(cid, ()):
+            student_busy[sid].add(slot)
+        if room_id:
+            room_busy[str(room_id)].add(slot)
+        per_day[(cid, day_of_slot.get(slot, -1))] += 1
+        if cid in saturated:
+            saturated[cid].add(slot)
+            for nb in neighbours[cid]:
+                saturated[nb].add(slot)
+
+    for (cid, _s), (slot_id, room_id) in solution.items():
+        occupy(cid, str(slot_id), room_id)
+
+    # --- candidate slots per session: slot → rooms (best fit first) ------------
+    enrolled: Dict[str, int] = {}
+    for course in cluster:
+        enrolled[course.course_id] = (
+            getattr(course, 'enrolled_students', 0)
+            or len(students_of_course.get(course.course_id, ())) or 30
+        )
+
+    def room_key(cid: str):
+        need = enrolled[cid]
+        return lambda r: (capacity.get(r, 0) < need, abs(capacity.get(r, 0) - need))
+
+    pending: List[Tuple[str, int]] = []
+    candidates: Dict[Tuple[str, int], Dict[str, List[str]]] = {}
+    for course in cluster:
+        cid = course.course_id
+        fixed = _fixed_slot(course)
+        for session in range(course.duration):
+            key = (cid, session)
+            if key in solution:
+                continue
+            pairs = valid_domains.get(key) or [
+                (ts.slot_id, r.room_id) for ts in time_slots for r in rooms
+            ]
+            by_slot: Dict[str, List[str]] = defaultdict(list)
+            for slot_id, room_id in pairs:
+                by_slot[str(slot_id)].append(room_id)
+            if fixed is not None and fixed in by_slot:
+                by_slot = {fixed: by_slot[fixed]}
+            for rlist in by_slot.values():
+                rlist.sort(key=room_key(cid))
+            candidates[key] = by_slot
+            pending.append(key)
+
+    slot_id_of = {str(ts.slot_id): ts.slot_id for ts in time_slots}
+    degree = {cid: len(nbs) for cid, nbs in neighbours.items()}
+    clashes = 0
+
+    while pending:
+        # Highest saturation; ties → higher degree → fewer candidate slots.
+        best_i = max(
+            range(len(pending)),
+            key=lambda i: (
+                len(saturated[pending[i][0]]),
+                degree[pending[i][0]],
+                -len(candidates[pending[i]]),
+            ),
+        )
+        key = pending.pop(best_i)
+        cid, _session = key
+        fid = faculty_of_course.get(cid)
+        students = students_of_course.get(cid, ())
+
+        best = None
+        best_score = None
+        for slot, rlist in candidates[key].items():
+            free_room = next((r for r in rlist if slot not in room_busy[str(r)]), None)
+            # Faculty / room double-booking first, then student clashes.
+            hard = (1 if free_room is None else 0)
+            soft = 0
+            if slot in saturated[cid]:
+                # A neighbour (or this course) already sits here: count real
+                # clashes so the stuck case picks the least damaging slot.
+                hard += 1 if fid and slot in faculty_busy[fid] else 0
+                soft = sum(1 for sid in students if slot in student_busy[sid])
+            over_day = per_day[(cid, day_of_slot.get(slot, -1))] >= max_sessions_per_day
+            score = (hard, soft, over_day, slot_order.get(slot, 0))
+            if best_score is None or score < best_score:
+                best_score = score
+                best = (slot, free_room if free_room is not None else rlist[0])
+                if score[:3] == (0, 0, False):
+                    break
+
+        if best is None:
+            continue
+        slot, room_id = best
+        clashes += best_score[0] + best_score[1]
+        solution[key] = (slot_id_of.get(slot, slot), room_id)
+        occupy(cid, slot, room_id)
+
+    if clashes:
+        logger.info(
+            "[DSatur] %d sessions placed with %d unavoidable clashes",
+            len(candidates), clashes,
+        )
+    return solution
@@ -0,0 +1,475 @@
+"""
+CP-SAT Large Neighbourhood Search — anytime improvement of a merged timetable.
+Following Google/Meta standards: One file = one responsibility
+
+The GA improves soft objectives by random mutation, which scatters sessions
+without regard for clashes.  LNS keeps every hard constraint and improves
+the same soft terms the GA scores (period quality, faculty slot preferences,
+room fit — see engine.ga.fitness) by exact re-optimisation of small pieces:
+
+  1. free a neighbourhood: one day, one faculty member's week, one room
+     group ("building" — rooms sharing a department, else a room type), or
+     one student cohort's courses, capped at max_sessions sessions;
+  2. re-solve only that neighbourhood with CP-SAT: everything else is fixed,
+     so domains exclude slots/rooms the fixed part already uses; the current
+     assignment is the hint and the objective is the per-session soft value;
+  3. accept when the value rises (or the old placement clashed).
+
+Neighbourhoods sharing no faculty member and no student are solved in
+parallel threads (CP-SAT releases the GIL); results are committed in order
+and re-validated against the current timetable, so two parallel solutions
+that picked the same free room cannot both land.
+
+Sessions of one course are interchangeable, so the sub-model uses one
+boolean per (course, slot, room) with Σ = sessions freed — no session
+symmetry.  The stage is anytime: solution() is valid after every batch.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from ortools.sat.python import cp_model
+
+from models.timetable_models import Course, Room, TimeSlot
+from engine.cpsat.constraints import MAX_SESSIONS_PER_DAY
+from engine.cpsat.domains import candidate_rooms, candidate_slots, enrolment
+from engine.cpsat.room_index import RoomIndex
+from engine.cpsat.slot_masks import SlotMasks
+
+logger = logging.getLogger(__name__)
+
+_GREEDY_SENTINEL = "__UNSCHEDULED__"
+
+NEIGHBOURHOODS = ('day', 'faculty', 'building', 'cohort')
+ROOMS_PER_COURSE = 8      # best-fit room candidates per course (plus current)
+VALUE_SCALE = 100         # soft values → CP-SAT integer coefficients
+
+
+class LNSOptimizer:
+    """Anytime CP-SAT LNS over a full timetable; see module docstring."""
+
+    def __init__(
+        self,
+        courses: List[Course],
+        rooms: List[Room],
+        time_slots: List[TimeSlot],
+        room_index: Optional[RoomIndex] = None,
+        slot_masks: Optional[SlotMasks] = None,
+        fitness_weights: Optional[Dict] = None,
+        max_sessions: int = 60,
+        parallel: int = 2,
+        workers_per_solve: int = 1,
+        subproblem_timeout: float = 5.0,
+        seed: int = 42,
+    ) -> None:
+        self.courses = {c.course_id: c for c in courses}
+        self.slots = list(time_slots)
+        self.slot_by_id = {str(ts.slot_id): ts for ts in time_slots}
+        self.slot_order = {str(ts.slot_id): i for i, ts in enumerate(time_slots)}
+        self.rooms = {r.room_id: r for r in rooms}
+        self.slot_masks = slot_masks
+        self.max_sessions = max_sessions
+        self.parallel = max(1, parallel)
+        self.workers_per_solve = max(1, workers_per_solve)
+        self.subproblem_timeout = subproblem_timeout
+        self.rng = random.Random(seed)
+        weights = {'faculty': 0.35, 'room': 0.25}
+        weights.update(fitness_weights or {})
+        self._w_faculty, self._w_room = weights['faculty'], weights['room']
+
+        room_index = room_index or RoomIndex(rooms)
+        self.students: Dict[str, frozenset] = {}
+        self.candidate_slots: Dict[str, List[str]] = {}
+        self.candidate_rooms: Dict[str, List[str]] = {}
+        self.enrolled: Dict[str, int] = {}
+        for cid, course in self.courses.items():
+            students = frozenset(getattr(course, 'student_ids', None) or [])
+            self.students[cid] = students
+            self.enrolled[cid] = enrolment(course)
+            self.candidate_rooms[cid] = [
+                r.room_id for r in candidate_rooms(course, room_index)[:ROOMS_PER_COURSE]
+            ]
+            self.candidate_slots[cid] = candidate_slots(course, list(self.slot_by_id), slot_masks)
+
+        # Room groups for 'building' neighbourhoods.
+        groups: Dict[str, List[str]] = defaultdict(list)
+        for room in rooms:
+            key = room.department_id or room.dept_id or f"type:{room.room_type.upper()}"
+            groups[key].append(room.room_id)
+        self.room_groups = [g for g in groups.values() if g]
+
+        self._solution: Dict = {}
+        self.report: Dict = {}
+
+    # ------------------------------------------------------------------
+    # Soft value (linear per session; mirrors engine.ga.fitness terms)
+    # ------------------------------------------------------------------
+
+    def value(self, course_id: str, slot_id: str, room_id: str) -> float:
+        ts = self.slot_by_id.get(str(slot_id))
+        faculty = 0.0
+        if ts is not None:
+            if ts.period == 0:
+                faculty -= 5.0
+            elif ts.period >= 7:
+                faculty -= 3.0
+            elif 1 <= ts.period <= 5:
+                faculty += 1.0
+            if self.slot_masks is not None:
+                faculty += 2.0 * self.slot_masks.weight(
+                    self.courses[course_id].faculty_id, slot_id,
+                )
+        room_score = 0.0
+        room = self.rooms.get(room_id)
+        enrolled = self.enrolled[course_id]
+        if room is not None:
+            if room.capacity > enrolled * 2:
+                room_score -= 5.0
+            elif room.capacity > enrolled * 1.5:
+                room_score -= 2.0
+            elif room.capacity >= enrolled:
+                room_score += 2.0
+        return self._w_faculty * faculty + self._w_room * room_score
+
+    # ------------------------------------------------------------------
+    # Occupancy of the current solution
+    # ------------------------------------------------------------------
+
+    def _index(self) -> None:
+        self._fac_busy: Dict[str, Counter] = defaultdict(Counter)
+        self._stu_busy: Dict[str, Counter] = defaultdict(Counter)
+        self._room_busy: Counter = Counter()
+        self._by_course: Dict[str, List[tuple]] = defaultdict(list)
+        for key, (slot, room) in self._solution.items():
+            if key[0] in self.courses and slot != _GREEDY_SENTINEL:
+                self._occupy(key[0], str(slot), room, 1)
+            self._by_course[key[0]].append(key)
+
+    def _occupy(self, cid: str, slot: str, room, delta: int) -> None:
+        fid = self.courses[cid].faculty_id
+        if fid:
+            self._fac_busy[fid][slot] += delta
+        for sid in self.students[cid]:
+            self._stu_busy[sid][slot] += delta
+        if room:
+            self._room_busy[(room, slot)] += delta
+
+    # ------------------------------------------------------------------
+    # Neighbourhoods
+    # ------------------------------------------------------------------
+
+    def _pick(self, kind: str) -> List[tuple]:
+        """Session keys of one neighbourhood of `kind` (placed sessions only)."""
+        placed = [
+            k for k, (slot, _r) in self._solution.items()
+            if k[0] in self.courses and slot != _GREEDY_SENTINEL
+        ]
+        if not placed:
+            return []
+        if kind == 'day':
+            day = self.rng.choice(self.slots).day
+            pool = [k for k in placed if self.slot_by_id[str(self._solution[k][0])].day == day]
+        elif kind == 'faculty':
+            fid = self.courses[self.rng.choice(placed)[0]].faculty_id
+            pool = [k for k in placed if self.courses[k[0]].faculty_id == fid]
+        elif kind == 'building':
+            rooms = set(self.rng.choice(self.room_groups)) if self.room_groups else set()
+            pool = [k for k in placed if self._solution[k][1] in rooms]
+        else:  # cohort
+            students = self.students[self.rng.choice(placed)[0]]
+            if not students:
+                return []
+            sid = self.rng.choice(sorted(students))
+            pool = [k for k in placed if sid in self.students[k[0]]]
+        # Cap by whole courses, chosen at random.
+        by_course: Dict[str, List[tuple]] = defaultdict(list)
+        for key in pool:
+            by_course[key[0]].append(key)
+        order = list(by_course)
+        self.rng.shuffle(order)
+        chosen: List[tuple] = []
+        for cid in order:
+            if chosen and len(chosen) + len(by_course[cid]) > self.max_sessions:
+                continue
+            chosen.extend(by_course[cid])
+        return chosen
+
+    def _footprint(self, keys: List[tuple]) -> Tuple[Set[str], Set[str]]:
+        courses = {k[0] for k in keys}
+        faculty = {self.courses[c].faculty_id for c in courses if self.courses[c].faculty_id}
+        students: Set[str] = set()
+        for c in courses:
+            students |= self.students[c]
+        return faculty, students
+
+    # ------------------------------------------------------------------
+    # Sub-model
+    # ------------------------------------------------------------------
+
+    def _build(self, keys: List[tuple]):
+        """CP-SAT model re-placing `keys` against the fixed rest; None if unusable."""
+        freed_by_course: Dict[str, List[tuple]] = defaultdict(list)
+        for key in keys:
+            freed_by_course[key[0]].append(key)
+        for key in keys:
+            slot, room = self._solution[key]
+            self._occupy(key[0], str(slot), room, -1)
+        try:
+            model = cp_model.CpModel()
+            x: Dict[tuple, cp_model.IntVar] = {}
+            old_value = 0.0
+            old_clash = False
+            for cid, ckeys in freed_by_course.items():
+                course = self.courses[cid]
+                fid = course.faculty_id
+                own_fixed = {
+                    str(self._solution[k][0]) for k in self._by_course[cid] if k not in ckeys
+                }
+                rooms = list(self.candidate_rooms[cid])
+                for k in ckeys:
+                    if self._solution[k][1] not in rooms and self._solution[k][1] in self.rooms:
+                        rooms.append(self._solution[k][1])
+                slots = []
+                for slot in self.candidate_slots[cid]:
+                    if slot in own_fixed or (fid and self._fac_busy[fid][slot]):
+                        continue
+                    if any(self._stu_busy[s][slot] for s in self.students[cid]):
+                        continue
+                    slots.append(slot)
+                for k in ckeys:
+                    slot, room = str(self._solution[k][0]), self._solution[k][1]
+                    old_value += self.value(cid, slot, room)
+                    if slot not in slots or self._room_busy[(room, slot)]:
+                        old_clash = True
+                placed_per_day: Dict[int, list] = defaultdict(list)
+                course_vars = []
+                usable_slots = 0
+                for slot in slots:
+                    in_slot = []
+                    for room in rooms:
+                        if self._room_busy[(room, slot)]:
+                            continue
+                        var = model.NewBoolVar("")
+                        x[(cid, slot, room)] = var
+                        in_slot.append(var)
+                    if in_slot:
+                        usable_slots += 1
+                        model.AddAtMostOne(in_slot)
+                        course_vars.extend(in_slot)
+                        placed_per_day[self.slot_by_id[slot].day].extend(in_slot)
+                if usable_slots < len(ckeys):
+                    return None
+                model.Add(sum(course_vars) == len(ckeys))
+                fixed_days = Counter(self.slot_by_id[s].day for s in own_fixed if s in self.slot_by_id)
+                for day, dvars in placed_per_day.items():
+                    cap = max(0, MAX_SESSIONS_PER_DAY - fixed_days[day])
+                    if cap < len(ckeys):
+                        model.Add(sum(dvars) <= cap)
+
+            # Faculty / room / student exclusivity inside the neighbourhood.
+            by_fac_slot: Dict[tuple, list] = defaultdict(list)
+            by_room_slot: Dict[tuple, list] = defaultdict(list)
+            by_course_slot: Dict[tuple, list] = defaultdict(list)
+            for (cid, slot, room), var in x.items():
+                fid = self.courses[cid].faculty_id
+                if fid:
+                    by_fac_slot[(fid, slot)].append(var)
+                by_room_slot[(room, slot)].append(var)
+                by_course_slot[(cid, slot)].append(var)
+            for group in (by_fac_slot, by_room_slot):
+                for vars_ in group.values():
+                    if len(vars_) > 1:
+                        model.AddAtMostOne(vars_)
+            cohorts: Set[frozenset] = set()
+            courses_of_student: Dict[str, Set[str]] = defaultdict(set)
+            for cid in freed_by_course:
+                for sid in self.students[cid]:
+                    courses_of_student[sid].add(cid)
+            for cset in courses_of_student.values():
+                if len(cset) > 1:
+                    cohorts.add(frozenset(cset))
+            for cset in cohorts:
+                for slot in self.slot_by_id:
+                    vars_ = [v for c in cset for v in by_course_slot.get((c, slot), ())]
+                    if len(vars_) > 1:
+                        model.AddAtMostOne(vars_)
+
+            model.Maximize(sum(
+                int(round(VALUE_SCALE * self.value(cid, slot, room))) * var
+                for (cid, slot, room), var in x.items()
+            ))
+            hinted = Counter((k[0], str(self._solution[k][0]), self._solution[k][1]) for k in keys)
+            for key, var in x.items():
+                model.AddHint(var, 1 if hinted.get(key) else 0)
+            return model, x, freed_by_course, old_value, old_clash
+        finally:
+            for key in keys:
+                slot, room = self._solution[key]
+                self._occupy(key[0], str(slot), room, 1)
+
+    def _solve(self, built, deadline: float):
+        model, x, freed_by_course, old_value, old_clash = built
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = max(
+            0.1, min(self.subproblem_timeout, deadline - time.perf_counter()),
+        )
+        solver.parameters.num_workers = self.workers_per_solve
+        status = solver.Solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return None
+        placement: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for (cid, slot, room), var in x.items():
+            if solver.Value(var):
+                placement[cid].append((slot, room))
+        new_value = sum(self.value(c, s, r) for c, pairs in placement.items() for s, r in pairs)
+        return placement, new_value
+
+    def _commit(self, freed_by_course, placement) -> bool:
+        """Apply a sub-solution if it still fits the current timetable."""
+        keys = [k for ks in freed_by_course.values() for k in ks]
+        for key in keys:
+            slot, room = self._solution[key]
+            self._occupy(key[0], str(slot), room, -1)
+        ok = True
+        staged: List[Tuple[str, str, str]] = []
+        for cid, pairs in placement.items():
+            fid = self.courses[cid].faculty_id
+            for slot, room in pairs:
+                if (
+                    (fid and self._fac_busy[fid][slot])
+                    or self._room_busy[(room, slot)]
+                    or any(self._stu_busy[s][slot] for s in self.students[cid])
+                ):
+                    ok = False
+                    break
+                self._occupy(cid, slot, room, 1)
+                staged.append((cid, slot, room))
+            if not ok:
+                break
+        if not ok:
+            for cid, slot, room in staged:
+                self._occupy(cid, slot, room, -1)
+            for key in keys:
+                slot, room = self._solution[key]
+                self._occupy(key[0], str(slot), room, 1)
+            return False
+        for cid, ckeys in freed_by_course.items():
+            pairs = sorted(placement[cid], key=lambda p: self.slot_order[p[0]])
+            for key, (slot, room) in zip(sorted(ckeys, key=lambda k: k[1]), pairs):
+                self._solution[key] = (self.slot_by_id[slot].slot_id, room)
+        return True
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def solution(self) -> Dict:
+        """Current (always hard-feasible w.r.t. the start) timetable."""
+        return dict(self._solution)
+
+    def optimize(
+        self,
+        initial_solution: Dict,
+        time_budget: float,
+        should_stop: Optional[Callable[[], bool]] = None,
+        progress_callback: Optional[Callable[[float, Dict], None]] = None,
+    ) -> Dict:
+        """
+        Improve `initial_solution` until `time_budget` seconds pass or
+        should_stop() is True (checked between batches).
+
+        progress_callback(fraction_of_budget, report) is called after every
+        batch; exceptions from it propagate (cooperative cancellation).
+        """
+        t0, cpu0 = time.perf_counter(), time.process_time()
+        deadline = t0 + time_budget
+        self._solution = dict(initial_solution)
+        self._index()
+        start_value = self._total_value()
+        attempted = accepted = infeasible = rejected = batches = 0
+        gain_by_kind: Dict[str, float] = defaultdict(float)
+        stop_reason = 'time_budget'
+
+        with ThreadPoolExecutor(max_workers=self.parallel) as pool:
+            while time.perf_counter() < deadline - 0.1:
+                if should_stop is not None and should_stop():
+                    stop_reason = 'cancelled'
+                    break
+                batch = []
+                used_fac: Set[str] = set()
+                used_stu: Set[str] = set()
+                for _try in range(self.parallel * 3):
+                    if len(batch) >= self.parallel:
+                        break
+                    kind = self.rng.choice(NEIGHBOURHOODS)
+                    keys = self._pick(kind)
+                    if not keys:
+                        continue
+                    fac, stu = self._footprint(keys)
+                    if fac & used_fac or stu & used_stu:
+                        continue
+                    built = self._build(keys)
+                    attempted += 1
+                    if built is None:
+                        infeasible += 1
+                        continue
+                    used_fac |= fac
+                    used_stu |= stu
+                    batch.append((kind, built))
+                if not batch:
+                    if attempted and attempted == infeasible:
+                        continue
+                    stop_reason = 'no_neighbourhood'
+                    break
+                futures = [(kind, built, pool.submit(self._solve, built, deadline))
+                           for kind, built in batch]
+                for kind, built, future in futures:
+                    result = future.result()
+                    if result is None:
+                        infeasible += 1
+                        continue
+                    placement, new_value = result
+                    _m, _x, freed_by_course, old_value, old_clash = built
+                    if new_value > old_value + 1e-9 or old_clash:
+                        if self._commit(freed_by_course, placement):
+                            accepted += 1
+                            gain_by_kind[kind] += new_value - old_value
+                        else:
+                            rejected += 1
+                batches += 1
+                if progress_callback is not None:
+                    progress_callback(
+                        min((time.perf_counter() - t0) / max(time_budget, 1e-9), 1.0),
+                        {'accepted': accepted, 'attempted': attempted,
+                         'value': round(self._total_value(), 2)},
+                    )
+
+        end_value = self._total_value()
+        cpu = time.process_time() - cpu0
+        self.report = {
+            'value_start': round(start_value, 3),
+            'value_end': round(end_value, 3),
+            'attempted': attempted,
+            'accepted': accepted,
+            'infeasible': infeasible,
+            'rejected_on_commit': rejected,
+            'batches': batches,
+            'gain_by_neighbourhood': {k: round(v, 3) for k, v in gain_by_kind.items()},
+            'wall_s': round(time.perf_counter() - t0, 3),
+            'cpu_s': round(cpu, 3),
+            'stop_reason': stop_reason,
+        }
+        logger.info("[LNS] %s", self.report)
+        return self.solution()
+
+    def _total_value(self) -> float:
+        return sum(
+            self.value(k[0], str(slot), room)
+            for k, (slot, room) in self._solution.items()
+            if k[0] in self.courses and slot != _GREEDY_SENTINEL
+        )
@@ -0,0 +1,170 @@
+"""
+Room Index — logarithmic room-candidate lookup for domain precomputation.
+Following Google/Meta standards: One file = one responsibility
+
+_precompute_valid_domains used to scan the full room list up to four times
+per course (type + features + capacity band, then three relaxations) and
+sort by capacity distance each time: millions of comparisons per phase with
+1,000+ rooms and 2,500 courses, repeated for every dept / cross-dept solver.
+
+RoomIndex is built once per job:
+  * rooms bucketed by normalised (upper-case) type;
+  * each bucket and the full catalog kept capacity-sorted, so capacity
+    bands are bisect range queries;
+  * features encoded as bitmasks, so "room has every required feature" is
+    one AND;
+  * results memoised per (type, features, enrolment).
+
+candidates() reproduces the solver's four fallback stages exactly —
+including which 30 rooms are kept and in what order.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Sequence, Tuple
+
+from models.timetable_models import Room
+
+MAX_ROOMS_PER_COURSE = 30  # was 20 — BHU fix: wider domain reduces conflict density
+
+
+class _CapacityArray:
+    """Rooms sorted by (capacity, catalog position) with a parallel key array."""
+
+    __slots__ = ("caps", "entries")
+
+    def __init__(self, entries: List[Tuple[int, int, Room]]) -> None:
+        entries.sort(key=lambda e: (e[0], e[1]))
+        self.entries = entries
+        self.caps = [e[0] for e in entries]
+
+    def at_least(self, lo: float) -> List[Tuple[int, int, Room]]:
+        return self.entries[bisect_left(self.caps, math.ceil(lo)):]
+
+    def between(self, lo: float, hi: float) -> List[Tuple[int, int, Room]]:
+        return self.entries[
+            bisect_left(self.caps, math.ceil(lo)):bisect_right(self.caps, math.floor(hi))
+        ]
+
+    def nearest(self, target: float, k: int) -> List[Tuple[int, int, Room]]:
+        """k rooms closest in capacity to `target`; ties → catalog order."""
+        n = len(self.entries)
+        left = bisect_left(self.caps, target) - 1
+        right = left + 1
+        picked: List[Tuple[float, int, Room]] = []
+        worst = -1.0
+        while left >= 0 or right < n:
+            d_left = target - self.caps[left] if left >= 0 else math.inf
+            d_right = self.caps[right] - target if right < n else math.inf
+            d = min(d_left, d_right)
+            # Stop once k are held and the frontier is strictly farther.
+            if len(picked) >= k and d > worst:
+                break
+            if d_left <= d_right:
+                cap, pos, room = self.entries[left]
+                left -= 1
+            else:
+                cap, pos, room = self.entries[right]
+                right += 1
+            picked.append((d, pos, room))
+            worst = max(worst, d)
+        picked.sort(key=lambda e: (e[0], e[1]))
+        return [(0, pos, room) for _d, pos, room in picked[:k]]
+
+
+class RoomIndex:
+    """Per-job room catalog index; see module docstring."""
+
+    def __init__(self, rooms: Sequence[Room]) -> None:
+        self.rooms = list(rooms)
+        self._feature_bit: Dict[str, int] = {}
+        self._room_mask: Dict[int, int] = {}
+        by_type: Dict[str, List[Tuple[int, int, Room]]] = {}
+        everything: List[Tuple[int, int, Room]] = []
+        for pos, room in enumerate(self.rooms):
+            mask = 0
+            for feature in getattr(room, "features", []) or []:
+                mask |= self._bit(feature)
+            self._room_mask[pos] = mask
+            entry = (room.capacity, pos, room)
+            by_type.setdefault(room.room_type.upper(), []).append(entry)
+            everything.append(entry)
+        self._by_type = {t: _CapacityArray(e) for t, e in by_type.items()}
+        self._all = _CapacityArray(everything)
+        self._memo: Dict[tuple, Tuple[List[Room], int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _bit(self, feature: str) -> int:
+        bit = self._feature_bit.get(feature)
+        if bit is None:
+            bit = 1 << len(self._feature_bit)
+            self._feature_bit[feature] = bit
+        return bit
+
+    def _required_mask(self, features: Sequence[str]) -> int:
+        # Unknown features get fresh bits no room carries, so they never match.
+        mask = 0
+        for feature in features:
+            mask |= self._bit(feature)
+        return mask
+
+    def candidates(
+        self,
+        required_type: str,
+        required_features: Sequence[str],
+        enrolled: int,
+    ) -> Tuple[List[Room], int]:
+        """
+        Candidate rooms and the fallback stage (1-4) that produced them.
+
+        Stage 1: type + features + capacity in [0.5, 6.0] × enrolled, best fit first
+        Stage 2: type + capacity ≥ 0.5 × enrolled, catalog order
+        Stage 3: any type, capacity ≥ 0.4 × enrolled, catalog order
+        Stage 4: any room, best fit first
+        """
+        rtype = (required_type or "CLASSROOM").upper()
+        key = (rtype, frozenset(required_features), enrolled)
+        cached = self._memo.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        bucket = self._by_type.get(rtype)
+        need = self._required_mask(required_features)
+        k = MAX_ROOMS_PER_COURSE
+
+        # Stage 1 — range query on the type bucket, mask subset test.
+        stage1: List[Tuple[int, int, Room]] = []
+        if bucket is not None:
+            stage1 = [
+                e for e in bucket.between(enrolled * 0.5, enrolled * 6.0)
+                if self._room_mask[e[1]] & need == need
+            ]
+        if len(stage1) >= 3:
+            stage1.sort(key=lambda e: (abs(e[0] - enrolled), e[1]))
+            result = ([e[2] for e in stage1[:k]], 1)
+        else:
+            # Stage 2 — relax features.
+            stage2 = (
+                heapq.nsmallest(k, bucket.at_least(enrolled * 0.5), key=lambda e: e[1])
+                if bucket is not None else []
+            )
+            if len(stage2) >= 3:
+                result = ([e[2] for e in stage2], 2)
+            else:
+                # Stage 3 — relax type.
+                stage3 = heapq.nsmallest(
+                    k, self._all.at_least(enrolled * 0.4), key=lambda e: e[1]
+                )
+                if stage3:
+                    result = ([e[2] for e in stage3], 3)
+                else:
+                    # Stage 4 — best fit over the whole catalog.
+                    result = ([e[2] for e in self._all.nearest(enrolled, k)], 4)
+
+        self._memo[key] = result
+        return result
@@ -0,0 +1,132 @@
+"""
+Slot Masks — per-faculty availability masks and preference weight arrays.
+Following Google/Meta standards: One file = one responsibility
+
+Faculty.available_slots / preferred_slots were loaded but never consulted:
+_precompute_valid_domains offered every slot of the grid to every session,
+so unavailable slots reached the model and had to be searched away.
+
+SlotMasks is built once per job:
+  * org-level blocked slots — grid slots overlapping the configured lunch
+    break (timetable_configurations.lunch_break_*).  fetch_time_slots only
+    skips slots that *start* inside lunch, so a 12:30 slot with a 13:00
+    lunch still reaches the grid;
+  * per-faculty allowed-slot sets — available_slots ∩ grid − blocked.
+    Faculty without an explicit availability share one set object;
+  * per-faculty preference arrays indexed by slot ordinal (grid order),
+    read directly by CP-SAT objectives and GA fitness.
+
+Slot values in available_slots / preferred_slots are matched against
+TimeSlot.slot_id as strings (the grid uses "0".."53").
+"""
+from __future__ import annotations
+
+import logging
+from array import array
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional
+
+from models.timetable_models import Faculty, TimeSlot
+
+logger = logging.getLogger(__name__)
+
+
+def _minutes(value: Optional[str]) -> Optional[int]:
+    """'HH:MM' or 'HH:MM:SS' → minutes since midnight; None on bad input."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.strptime(':'.join(str(value).strip().split(':')[:2]), '%H:%M')
+    except ValueError:
+        return None
+    return parsed.hour * 60 + parsed.minute
+
+
+def lunch_blocked_slots(time_slots: List[TimeSlot], time_config: Optional[Dict]) -> FrozenSet[str]:
+    """Slot ids whose [start, end) overlaps the configured lunch break."""
+    if not time_config or not time_config.get('lunch_break_enabled', True):
+        return frozenset()
+    lunch_start = _minutes(time_config.get('lunch_break_start'))
+    lunch_end = _minutes(time_config.get('lunch_break_end'))
+    if lunch_start is None or lunch_end is None or lunch_end <= lunch_start:
+        return frozenset()
+    blocked = set()
+    for ts in time_slots:
+        start, end = _minutes(ts.start_time), _minutes(ts.end_time)
+        if start is None or end is None:
+            continue
+        if start < lunch_end and end > lunch_start:
+            blocked.add(str(ts.slot_id))
+    return frozenset(blocked)
+
+
+class SlotMasks:
+    """Per-job slot availability / preference lookup; see module docstring."""
+
+    def __init__(
+        self,
+        faculty: Dict[str, Faculty],
+        time_slots: List[TimeSlot],
+        time_config: Optional[Dict] = None,
+    ) -> None:
+        self.slot_ids: List[str] = [str(ts.slot_id) for ts in time_slots]
+        self.ordinal: Dict[str, int] = {sid: i for i, sid in enumerate(self.slot_ids)}
+        self.org_blocked: FrozenSet[str] = lunch_blocked_slots(time_slots, time_config)
+        open_slots = frozenset(s for s in self.slot_ids if s not in self.org_blocked)
+        if not open_slots:
+            logger.warning(
+                "[SlotMasks] Lunch window blocks every grid slot — ignoring org blocks"
+            )
+            self.org_blocked = frozenset()
+            open_slots = frozenset(self.slot_ids)
+        self.open_slots: FrozenSet[str] = open_slots
+
+        self._allowed: Dict[str, FrozenSet[str]] = {}
+        self._weights: Dict[str, array] = {}
+        self._zero = array('d', [0.0] * len(self.slot_ids))
+        restricted = 0
+        for fid, fac in (faculty or {}).items():
+            available = getattr(fac, 'available_slots', None) or []
+            if available:
+                allowed = frozenset(str(s) for s in available) & open_slots
+                if allowed:
+                    self._allowed[fid] = allowed
+                    restricted += 1
+                else:
+                    logger.warning(
+                        "[SlotMasks] Faculty %s: available_slots match no open grid "
+                        "slot — treating as fully available", fid,
+                    )
+            preferred = getattr(fac, 'preferred_slots', None) or {}
+            if preferred:
+                weights = array('d', self._zero)
+                for slot, weight in preferred.items():
+                    idx = self.ordinal.get(str(slot))
+                    if idx is not None:
+                        weights[idx] = float(weight)
+                self._weights[fid] = weights
+
+        logger.info(
+            "[SlotMasks] grid=%d  org_blocked=%d  faculty_restricted=%d  "
+            "faculty_with_preferences=%d",
+            len(self.slot_ids), len(self.org_blocked), restricted, len(self._weights),
+        )
+
+    def allowed_slots(self, faculty_id: Optional[str]) -> FrozenSet[str]:
+        """Slot ids this faculty member may teach in (org blocks applied)."""
+        return self._allowed.get(faculty_id, self.open_slots) if faculty_id else self.open_slots
+
+    def preference_weights(self, faculty_id: Optional[str]) -> array:
+        """Weight per slot ordinal (grid order); zeros when no preferences."""
+        return self._weights.get(faculty_id, self._zero) if faculty_id else self._zero
+
+    def weight(self, faculty_id: Optional[str], slot_id) -> float:
+        weights = self._weights.get(faculty_id) if faculty_id else None
+        if weights is None:
+            return 0.0
+        idx = self.ordinal.get(str(slot_id))
+        return weights[idx] if idx is not None else 0.0
+
+    @property
+    def has_preferences(self) -> bool:
+        return bool(self._weights)
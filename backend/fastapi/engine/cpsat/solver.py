@@ -7,6 +7,7 @@ Wires in: faculty, room, student (BUG 1 FIX), workload (BUG 2 FIX),
 import gc
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Tuple
 from collections import defaultdict
 import psutil
@@ -14,13 +15,20 @@ from ortools.sat.python import cp_model
 
 from models.timetable_models import Course, Room, TimeSlot, Faculty
 from .strategies import STRATEGIES, select_strategy_for_cluster_size
+from .budget import AdaptiveBudgetAllocator, ClusterFeatures
+from .decomposition import find_independent_components, split_conflict_groups
+from .dsatur import dsatur_schedule
+from .room_index import RoomIndex
+from .slot_masks import SlotMasks
 from .progress import log_cluster_start, log_cluster_success
 from .constraints import (
+    MAX_SESSIONS_PER_DAY,
     add_faculty_constraints,
     add_room_constraints,
     add_workload_constraints,
     add_max_sessions_per_day_constraints,
     add_fixed_slot_constraints,
+    add_symmetry_breaking_constraints,
     build_student_course_index,
 )
 
@@ -54,12 +62,25 @@ class AdaptiveCPSATSolver:
         total_clusters: int = None,
         completed_clusters: int = 0,
         global_student_schedule: Dict[str, List[Tuple[int, int]]] = None,
-        max_sessions_per_day: int = 2,
+        max_sessions_per_day: int = MAX_SESSIONS_PER_DAY,
         student_course_index: Dict[str, set] = None,
         num_workers: int = None,
+        budget_allocator: Optional[AdaptiveBudgetAllocator] = None,
+        worker_grant=None,
+        decompose_components: bool = True,
+        diagnose_infeasibility: bool = True,
+        unsat_cores: Optional[List[Dict]] = None,
+        seed_with_dsatur: bool = True,
+        room_index: Optional[RoomIndex] = None,
+        slot_masks: Optional[SlotMasks] = None,
+        symmetry_breaking: bool = True,
     ):
         self.courses = courses
         self.rooms = rooms
+        # Built once per job by the saga and shared by every cluster solver.
+        self.room_index = room_index or RoomIndex(rooms)
+        # Faculty availability / preference masks, also built once per job.
+        self.slot_masks = slot_masks or SlotMasks(faculty, time_slots)
         self.time_slots = time_slots
         self.faculty = faculty
         self.max_cluster_size = max_cluster_size
@@ -73,11 +94,25 @@ class AdaptiveCPSATSolver:
         # OPT2: precomputed global index passed in from saga — avoids per-cluster rebuild.
         # If None, falls back to per-cluster construction below (safe degradation).
         self.student_course_index = student_course_index
+        # Learned per-cluster timeouts / starting rung.  Without an explicit
+        # allocator (no job deadline) history still drives the timeouts.
+        self.budget_allocator = budget_allocator or AdaptiveBudgetAllocator()
+        # (bucket-features, strategy_name, CP-SAT status, seconds) per attempt — process-pool
+        # workers hand these back to the parent so its history learns too.
+        self.strategy_outcomes: List[Tuple[ClusterFeatures, str, str, float]] = []
+        self._last_stage_tally: Dict[int, int] = {1: 0, 2: 0, 3: 0, 4: 0}
 
         # Pre-build slot lookup (str → TimeSlot) used by MISS 6 constraint
         self.slot_by_id: Dict[str, TimeSlot] = {
             str(ts.slot_id): ts for ts in time_slots
         }
+        # Slot ordinal (grid order) for symmetry-breaking slot-index expressions
+        self.slot_ordinal: Dict[str, int] = {
+            str(ts.slot_id): i for i, ts in enumerate(time_slots)
+        }
+        # Order interchangeable sessions / parallel sections by slot ordinal;
+        # a strategy can override with its own 'symmetry_breaking' key.
+        self.symmetry_breaking = symmetry_breaking
 
         # OPT1: accept explicit worker count for parallel execution (saga controls
         # total thread budget: parallel_clusters × workers_per_cluster ≤ physical_cores).
@@ -88,6 +123,18 @@ class AdaptiveCPSATSolver:
         else:
             self.num_workers = min(8, multiprocessing.cpu_count())
         logger.info(f"[CP-SAT] Using {self.num_workers} CPU cores")
+        # Parallel pool: the parent may grant idle cores once its queue drains
+        # (cluster_scheduler.WorkerGrant).  Read before every model solve.
+        self.worker_grant = worker_grant
+        # Solve independent components of a cluster as separate models.
+        self.decompose_components = decompose_components
+        # INFEASIBLE under a strategy → extract an unsat core and relax only
+        # those courses instead of downgrading the whole cluster.  Cores are
+        # appended to `unsat_cores` (job-scoped when the saga passes its list).
+        self.diagnose_infeasibility = diagnose_infeasibility
+        self.unsat_cores: List[Dict] = unsat_cores if unsat_cores is not None else []
+        # Hint every CP-SAT attempt with the DSatur construction.
+        self.seed_with_dsatur = seed_with_dsatur
 
     def solve_cluster(self, cluster: List[Course], timeout: float = None) -> Optional[Dict]:
         """
@@ -187,118 +234,339 @@ class AdaptiveCPSATSolver:
                 len(_overloaded_faculty), _total_slots,
                 ', '.join(f'{fid}:{cnt}' for fid, cnt in _overloaded_faculty.items())
             )
-            return None
+            return self._greedy_fallback(cluster)
 
         # ------------------------------------------------------------------
-        # PRE-FLIGHT: student conflict density check
+        # DECOMPOSITION: independent components solve as separate models.
         #
-        # If >50% of all domain variable slots are contested by student
-        # conflicts, Full/Relaxed strategies will always time-out at BHU scale
-        # (2320 courses, 19072 students).  Skip directly to the starting
-        # strategy chosen by select_strategy_for_cluster_size — which is
-        # already STRATEGIES[0] = Faculty+Room Only after the BHU-scale fix.
-        # This check is a no-op for that config but remains a safety net if
-        # the strategy ladder is ever extended again.
+        # Courses that share no faculty, students or candidate rooms cannot
+        # constrain each other; each component gets its own budget plan and
+        # strategy cascade, so one infeasible component no longer relaxes
+        # constraints for the others.  CP-SAT releases the GIL inside Solve(),
+        # so components run concurrently on a thread pool sharing this
+        # cluster's worker budget.
         # ------------------------------------------------------------------
-        _total_conflict_groups = len(self._student_conflict_groups)
-        _total_vars = sum(len(v) for v in self.valid_domains.values())
+        components = (
+            find_independent_components(
+                cluster, self.faculty_of_course,
+                self.students_of_course, self.valid_domains,
+            )
+            if self.decompose_components and len(cluster) > 1 else [cluster]
+        )
+        if len(components) > 1:
+            solution = self._solve_components(components, _start_idx)
+        else:
+            solution = self._run_strategy_cascade(
+                cluster, _start_idx, self._student_conflict_groups,
+            )
+            if solution is None:
+                logger.warning("[CP-SAT] All strategies failed - using smart greedy fallback")
+                return self._greedy_fallback(cluster)
+
+        elapsed = time.perf_counter() - cluster_start_time
+        log_cluster_success(
+            self.cluster_id if self.cluster_id is not None else 0,
+            elapsed
+        )
+        return solution
+
+    def _solve_components(
+        self,
+        components: List[List[Course]],
+        start_idx: int,
+    ) -> Dict:
+        """
+        Solve independent components concurrently and merge their assignments.
+
+        The cluster's worker budget is split across the components running at
+        once (largest component first).  A component whose cascade fails gets
+        the greedy fallback on its own courses — its resources are disjoint
+        from every other component's, so the merge cannot introduce clashes.
+        """
+        if self.worker_grant is not None:
+            self.num_workers = max(self.num_workers, self.worker_grant.current(self.num_workers))
+        component_of_course = {
+            c.course_id: i for i, comp in enumerate(components) for c in comp
+        }
+        conflict_parts = split_conflict_groups(
+            self._student_conflict_groups, component_of_course, len(components),
+        )
+        concurrent = min(len(components), self.num_workers)
+        workers_each = max(1, self.num_workers // concurrent)
+        logger.info(
+            "[CP-SAT] Cluster %s decomposed into %d independent components "
+            "(sizes=%s) | %d concurrent × %d workers",
+            self.cluster_id, len(components), [len(c) for c in components],
+            concurrent, workers_each,
+        )
+
+        def solve_one(idx: int) -> Tuple[int, Optional[Dict]]:
+            return idx, self._run_strategy_cascade(
+                components[idx], start_idx, conflict_parts[idx],
+                num_workers=workers_each, label=f"{self.cluster_id}.{idx}",
+            )
+
+        merged: Dict = {}
+        with ThreadPoolExecutor(max_workers=concurrent) as pool:
+            for idx, solution in pool.map(solve_one, range(len(components))):
+                if solution is None:
+                    logger.warning(
+                        "[CP-SAT] Component %s.%d (%d courses): all strategies failed "
+                        "- using smart greedy fallback",
+                        self.cluster_id, idx, len(components[idx]),
+                    )
+                    solution = self._greedy_fallback(components[idx])
+                merged.update(solution)
+        return merged
+
+    def _run_strategy_cascade(
+        self,
+        cluster: List[Course],
+        start_idx: int,
+        conflict_groups: Dict[tuple, list],
+        num_workers: Optional[int] = None,
+        label=None,
+    ) -> Optional[Dict]:
+        """
+        Plan budgets for `cluster` (a whole cluster or one component) and walk
+        the relaxation ladder from `start_idx`.  Returns the first solution,
+        or None when every strategy fails.
+        """
+        label = self.cluster_id if label is None else label
+        course_ids = {c.course_id for c in cluster}
+        domains = (
+            self.valid_domains
+            if len(course_ids) == len(self.course_by_id)
+            else {k: v for k, v in self.valid_domains.items() if k[0] in course_ids}
+        )
+
+        # ------------------------------------------------------------------
+        # ADAPTIVE BUDGET: cluster features → learned timeouts + starting rung
+        #
+        # Conflict density no longer only logs: together with the variable
+        # count, faculty load ratio and domain stage tally it feeds the
+        # allocator, which predicts P(success) / time-to-feasible per strategy
+        # from historical outcomes and sizes each rung's timeout accordingly.
+        # Under a job deadline the cluster gets its difficulty-weighted share
+        # of the remaining time, so easy clusters donate time to hard ones.
+        # ------------------------------------------------------------------
+        _faculty_sessions: Dict[str, int] = defaultdict(int)
+        for _c in cluster:
+            _fid = getattr(_c, 'faculty_id', None)
+            if _fid:
+                _faculty_sessions[_fid] += getattr(_c, 'duration', 1) or 1
+        _total_slots = len(self.time_slots)
+        _total_conflict_groups = len(conflict_groups)
+        _total_vars = sum(len(v) for v in domains.values())
+        features = ClusterFeatures(
+            n_courses=len(cluster),
+            n_sessions=len(domains),
+            n_vars=_total_vars,
+            n_conflict_groups=_total_conflict_groups,
+            faculty_load_ratio=(
+                max(_faculty_sessions.values()) / _total_slots
+                if _faculty_sessions and _total_slots else 0.0
+            ),
+            stage_tally=tuple(self._last_stage_tally[k] for k in (1, 2, 3, 4)),
+        )
+        plan = self.budget_allocator.plan(features)
+        if plan.start_idx > start_idx:
+            start_idx = plan.start_idx
         if _total_vars > 0 and _total_conflict_groups > _total_vars * 0.5:
             logger.warning(
                 "[CP-SAT] HIGH STUDENT CONFLICT DENSITY: %d conflict groups / %d vars "
-                "(%.1f%%) — forcing start at strategy %d (%s)",
+                "(%.1f%%) — starting at strategy %d (%s)",
                 _total_conflict_groups, _total_vars,
                 100.0 * _total_conflict_groups / _total_vars,
-                _start_idx + 1,
-                STRATEGIES[_start_idx]['name'],
+                start_idx + 1,
+                STRATEGIES[start_idx]['name'],
             )
+        logger.info(
+            "[CP-SAT] Budget plan | cluster=%s | bucket=%s | start=%d | timeouts=%s"
+            " | p_success=%s | share=%ss",
+            label, features.bucket(), start_idx + 1,
+            plan.timeouts, plan.success_probability, plan.share_seconds,
+        )
 
-        for strategy_idx, strategy in enumerate(STRATEGIES):
-            if strategy_idx < _start_idx:
-                continue
+        hint = self._greedy_fallback(cluster) if self.seed_with_dsatur else None
+
+        for strategy_idx in range(start_idx, len(STRATEGIES)):
+            strategy = plan.strategy_at(strategy_idx)
             logger.info(
                 "[CP-SAT] Strategy %d/%d: %s | cluster=%s | courses=%d | timeout=%ss",
                 strategy_idx + 1, len(STRATEGIES), strategy['name'],
-                self.cluster_id, len(cluster), strategy['timeout'],
+                label, len(cluster), strategy['timeout'],
+            )
+            _attempt_t0 = time.perf_counter()
+            diag: Dict = {}
+            solution = self._solve_with_strategy(
+                cluster, strategy,
+                conflict_groups=conflict_groups, num_workers=num_workers,
+                diagnostics=diag, hint=hint,
             )
-            solution = self._solve_with_strategy(cluster, strategy)
+            _attempt_s = time.perf_counter() - _attempt_t0
+            _status = 'FEASIBLE' if solution else diag.get('status', 'ERROR')
+            self.budget_allocator.record(features, strategy['name'], _status, _attempt_s)
+            self.strategy_outcomes.append((features, strategy['name'], _status, _attempt_s))
 
             if solution:
-                elapsed = time.perf_counter() - cluster_start_time
-                log_cluster_success(
-                    self.cluster_id if self.cluster_id is not None else 0,
-                    elapsed
-                )
                 return solution
 
-        logger.warning("[CP-SAT] All strategies failed - using smart greedy fallback")
-        return self._greedy_fallback(cluster)
+            # Proven INFEASIBLE (not a timeout): relax only the courses in the
+            # unsat core rather than dropping constraints cluster-wide.
+            if (
+                self.diagnose_infeasibility
+                and diag.get('status') == 'INFEASIBLE'
+                and strategy_idx < len(STRATEGIES) - 1
+            ):
+                solution = self._relax_unsat_core(
+                    cluster, strategy, conflict_groups, num_workers, label,
+                )
+                if solution:
+                    return solution
+
+        return None
 
-    def _greedy_fallback(self, cluster: List[Course]) -> Dict:
+    def _relax_unsat_core(
+        self,
+        cluster: List[Course],
+        strategy: Dict,
+        conflict_groups: Dict[tuple, list],
+        num_workers: Optional[int],
+        label,
+    ) -> Optional[Dict]:
         """
-        Smart greedy assignment: iterate courses and assign each session to the
-        first (slot, room) pair that does not double-book the faculty or room.
-        Much better than returning None — guarantees every course gets SOME
-        assignment so downstream stages (GA, RL, merger) always have a base
-        solution to refine, even for mathematically infeasible clusters.
+        Targeted relaxation after an INFEASIBLE strategy attempt.
+
+        1. Diagnosis: same model with each course's placement behind an
+           assumption literal; CP-SAT returns a sufficient infeasible subset.
+        2. One re-solve: courses outside the core keep every constraint of
+           `strategy`; core courses place as many sessions as fit.
+        3. Core sessions still unplaced go to the greedy path around the
+           re-solve's assignments.
+
+        Returns None (caller continues the cascade) if the diagnosis finds no
+        core or the re-solve fails as well.
         """
-        solution: Dict = {}
-        used_faculty_slots: Dict[str, set] = {}  # faculty_id → set of slot_ids
-        used_room_slots: Dict[str, set] = {}      # room_id    → set of slot_ids
+        diag: Dict = {}
+        self._solve_with_strategy(
+            cluster, strategy,
+            conflict_groups=conflict_groups, num_workers=num_workers,
+            assume_courses=True, diagnostics=diag,
+        )
+        core = diag.get('core')
+        if diag.get('status') != 'INFEASIBLE' or not core:
+            logger.info(
+                "[CP-SAT] Unsat-core diagnosis inconclusive | cluster=%s | status=%s",
+                label, diag.get('status'),
+            )
+            return None
 
-        for course in cluster:
-            faculty_id = getattr(course, 'faculty_id', None)
+        core_set = set(core)
+        self.unsat_cores.append({
+            'cluster': str(label),
+            'strategy': strategy['name'],
+            'courses': sorted(core_set),
+            'cluster_courses': len(cluster),
+        })
+        logger.warning(
+            "[CP-SAT] Unsat core | cluster=%s | strategy=%s | %d/%d courses: %s",
+            label, strategy['name'], len(core_set), len(cluster),
+            ', '.join(sorted(core_set)[:10]) + ('...' if len(core_set) > 10 else ''),
+        )
 
-            for session in range(course.duration):
-                domain_key = (course.course_id, session)
-                pairs = self.valid_domains.get(domain_key, [])
-
-                best_pair = None
-                for (slot_id, room_id) in pairs:
-                    s = str(slot_id)
-                    # Skip faculty double-booking
-                    if faculty_id and s in used_faculty_slots.get(faculty_id, set()):
-                        continue
-                    # Skip room double-booking
-                    if s in used_room_slots.get(str(room_id), set()):
-                        continue
-                    best_pair = (slot_id, room_id)
-                    break
-
-                if best_pair is None:
-                    # Conflict unavoidable — take first pair (faculty/room clash
-                    # is better than no assignment; merger will flag it)
-                    if pairs:
-                        best_pair = pairs[0]
-                    else:
-                        # Domain is empty — sentinel so merger skips this entry
-                        best_pair = (
-                            self.time_slots[0].slot_id if self.time_slots else '__UNSCHEDULED__',
-                            self.rooms[0].room_id if self.rooms else None,
-                        )
-                        logger.warning(
-                            "[Greedy] %s session %d: empty domain, using sentinel",
-                            course.course_id, session,
-                        )
-
-                solution[(course.course_id, session)] = best_pair
-
-                # Mark resources as used
-                slot_id, room_id = best_pair
-                s = str(slot_id)
-                if faculty_id:
-                    used_faculty_slots.setdefault(faculty_id, set()).add(s)
-                if room_id:
-                    used_room_slots.setdefault(str(room_id), set()).add(s)
+        solution = self._solve_with_strategy(
+            cluster, {**strategy, 'name': f"{strategy['name']} (core relaxed)"},
+            conflict_groups=conflict_groups, num_workers=num_workers,
+            soft_courses=core_set,
+        )
+        if solution is None:
+            return None
 
+        unplaced = [
+            c for c in cluster
+            if any((c.course_id, s) not in solution for s in range(c.duration))
+        ]
+        if unplaced:
+            logger.info(
+                "[CP-SAT] Core re-solve left %d course(s) partly unplaced → greedy",
+                len(unplaced),
+            )
+            solution = self._greedy_fallback(unplaced, assigned=solution)
         return solution
 
-    def _solve_with_strategy(self, cluster: List[Course], strategy: Dict) -> Optional[Dict]:
-        """Solve cluster using a specific strategy config."""
+    def _greedy_fallback(self, cluster: List[Course], assigned: Optional[Dict] = None) -> Dict:
+        """
+        Constructive fallback: DSatur over the faculty/student conflict graph
+        with best-fit room matching (engine.cpsat.dsatur).  Guarantees every
+        session a real (slot, room) so downstream stages (GA, RL, merger)
+        always have a base solution to refine, even for infeasible clusters;
+        unavoidable clashes go to the least-conflicting slot.
+
+        `assigned` (e.g. a partial CP-SAT solution) is kept as-is and its
+        faculty/student/room usage is respected; only missing sessions are placed.
+        """
+        return dsatur_schedule(
+            cluster,
+            self.valid_domains,
+            self.faculty_of_course,
+            self.students_of_course,
+            self.rooms,
+            self.time_slots,
+            max_sessions_per_day=self.max_sessions_per_day,
+            assigned=assigned,
+        )
+
+    def _solve_with_strategy(
+        self,
+        cluster: List[Course],
+        strategy: Dict,
+        conflict_groups: Optional[Dict[tuple, list]] = None,
+        num_workers: Optional[int] = None,
+        assume_courses: bool = False,
+        soft_courses: Optional[set] = None,
+        diagnostics: Optional[Dict] = None,
+        hint: Optional[Dict] = None,
+    ) -> Optional[Dict]:
+        """
+        Solve cluster using a specific strategy config.
+
+        `conflict_groups` / `num_workers` narrow the HC4 groups and thread
+        budget when `cluster` is one component of a decomposed cluster.
+
+        Unsat-core modes (see _relax_unsat_core):
+          assume_courses — each course's placement is enforced only under its
+                           own assumption literal; on INFEASIBLE the course ids
+                           of a sufficient infeasible subset go to
+                           diagnostics['core'].
+          soft_courses   — these courses may leave sessions unplaced; the
+                           model maximises how many of their sessions fit.
+        `diagnostics`, when given, also receives the CP-SAT status name.
+        `hint` ({(course_id, session): (slot, room)}) seeds the search.
+        Symmetry breaking (strategy['symmetry_breaking'], default from the
+        constructor) is skipped in the unsat-core modes, where sessions may
+        stay unplaced and slot-index expressions would read 0.
+        """
+        if num_workers is None and self.worker_grant is not None:
+            granted = self.worker_grant.current(self.num_workers)
+            if granted > self.num_workers:
+                logger.info(
+                    "[CP-SAT] Cluster %s granted idle cores: workers %d → %d",
+                    self.cluster_id, self.num_workers, granted,
+                )
+                self.num_workers = granted
+        use_symmetry = (
+            strategy.get('symmetry_breaking', self.symmetry_breaking)
+            and not assume_courses and not soft_courses
+        )
+        if use_symmetry and hint:
+            hint = self._session_ordered(hint)
         try:
             model = cp_model.CpModel()
             solver = cp_model.CpSolver()
             solver.parameters.max_time_in_seconds = strategy['timeout']
-            solver.parameters.num_search_workers = self.num_workers
+            workers = num_workers if num_workers is not None else self.num_workers
+            solver.parameters.num_search_workers = workers
 
             # -------------------------------------------------------------
             # Create Boolean variables only for valid (slot, room) pairs
@@ -312,6 +580,10 @@ class AdaptiveCPSATSolver:
                             var_name = f"x_{course.course_id}_s{session}_t{t_slot_id}_r{room_id}"
                             var = model.NewBoolVar(var_name)
                             variables[(course.course_id, session, t_slot_id, room_id)] = var
+                            if hint is not None:
+                                model.AddHint(
+                                    var, hint.get(domain_key) == (t_slot_id, room_id)
+                                )
 
             # OPT3: Build (course_id, session) → [vars] index in one O(N) pass.
             # Previous code did a full variables.items() scan per (course, session)
@@ -321,11 +593,31 @@ class AdaptiveCPSATSolver:
             for (c_id, s_idx, _t, _r), var in variables.items():
                 session_vars_index[(c_id, s_idx)].append(var)
 
-            # Assignment: each session assigned exactly once
+            # Assignment: each session assigned exactly once.  Every other
+            # constraint is satisfiable with a course's variables all at 0, so
+            # gating this one (plus HC6) is enough to switch a course off.
+            assumption_of_course: Dict[str, cp_model.IntVar] = {}
+            session_gates: Dict[tuple, cp_model.IntVar] = {}
+            soft_placed: list = []
             for course in cluster:
+                if assume_courses:
+                    assumption_of_course[course.course_id] = model.NewBoolVar(
+                        f"assume_{course.course_id}"
+                    )
                 for session in range(course.duration):
                     sv = session_vars_index.get((course.course_id, session), [])
-                    if sv:
+                    if not sv:
+                        continue
+                    if assume_courses:
+                        gate = assumption_of_course[course.course_id]
+                        model.Add(sum(sv) == 1).OnlyEnforceIf(gate)
+                        session_gates[(course.course_id, session)] = gate
+                    elif soft_courses and course.course_id in soft_courses:
+                        gate = model.NewBoolVar(f"placed_{course.course_id}_s{session}")
+                        model.Add(sum(sv) == gate)
+                        session_gates[(course.course_id, session)] = gate
+                        soft_placed.append(gate)
+                    else:
                         model.Add(sum(sv) == 1)
 
             # ------------------------------------------------------------------
@@ -358,7 +650,9 @@ class AdaptiveCPSATSolver:
             # instead of rescanning all ~20K variables × enrolled students.
             # ------------------------------------------------------------------
             student_priority = strategy.get('student_priority', 'ALL')
-            self._apply_student_constraints_fast(model, variables, student_priority)
+            self._apply_student_constraints_fast(
+                model, variables, student_priority, conflict_groups,
+            )
 
             # ------------------------------------------------------------------
             # HC5: Max sessions per course per day (MISS 6 FIX)
@@ -374,18 +668,51 @@ class AdaptiveCPSATSolver:
             # HC6: Fixed/special slot constraints (MISS 2 FIX)
             # Always applied — fixed slots are hard requirements
             # ------------------------------------------------------------------
-            add_fixed_slot_constraints(model, variables, cluster)
+            add_fixed_slot_constraints(model, variables, cluster, session_gates)
+
+            # ------------------------------------------------------------------
+            # Symmetry breaking: interchangeable sessions / parallel sections
+            # ordered by slot ordinal (one representative per permutation).
+            # ------------------------------------------------------------------
+            if use_symmetry:
+                add_symmetry_breaking_constraints(
+                    model, variables, cluster,
+                    self.slot_ordinal, self.faculty_of_course, self.students_of_course,
+                    strict=strategy.get('faculty_conflicts', True),
+                    sections=student_priority in ('ALL', 'NONE'),
+                )
+
+            if soft_placed:
+                model.Maximize(sum(soft_placed))
+            elif (
+                strategy.get('faculty_preferences', False)
+                and not assumption_of_course
+                and self.slot_masks.has_preferences
+            ):
+                # Soft objective from the precomputed slot-weight arrays.
+                # Off in the default ladder: an objective makes CP-SAT search
+                # to optimality (i.e. the full timeout) instead of stopping at
+                # the first feasible assignment.
+                pref_terms = []
+                for (c_id, _s, t_slot_id, _r), var in variables.items():
+                    w = self.slot_masks.weight(self.faculty_of_course.get(c_id), t_slot_id)
+                    if w:
+                        pref_terms.append(int(round(100 * w)) * var)
+                if pref_terms:
+                    model.Maximize(sum(pref_terms))
+            if assumption_of_course:
+                model.AddAssumptions(list(assumption_of_course.values()))
 
             # Reduce workers under memory pressure before solving
             mem_percent = psutil.virtual_memory().percent
             if mem_percent > 85:
-                reduced_workers = max(2, self.num_workers // 2)
+                reduced_workers = max(min(2, workers), workers // 2)
                 solver.parameters.num_search_workers = reduced_workers
-                if reduced_workers < self.num_workers:
+                if reduced_workers < workers:
                     # Actually reducing — worth a WARNING so ops can see it
                     logger.warning(
                         f"[MEMORY] RAM {mem_percent:.1f}% — reducing CP-SAT workers "
-                        f"{self.num_workers} → {reduced_workers}"
+                        f"{workers} → {reduced_workers}"
                     )
                 else:
                     # Already at minimum (2→2): log at DEBUG to avoid log spam.
@@ -405,6 +732,21 @@ class AdaptiveCPSATSolver:
             status = solver.Solve(model)
             _wall_time = solver.WallTime()
             _status_name = solver.StatusName(status)
+            _branches, _conflicts = solver.NumBranches(), solver.NumConflicts()
+            if diagnostics is not None:
+                diagnostics['status'] = _status_name
+                diagnostics['branches'] = _branches
+                diagnostics['conflicts'] = _conflicts
+                diagnostics['wall_time'] = _wall_time
+                if assumption_of_course and status == cp_model.INFEASIBLE:
+                    course_of_literal = {
+                        lit.Index(): cid for cid, lit in assumption_of_course.items()
+                    }
+                    diagnostics['core'] = [
+                        course_of_literal[i]
+                        for i in solver.SufficientAssumptionsForInfeasibility()
+                        if i in course_of_literal
+                    ]
 
             if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
                 solution = {}
@@ -424,9 +766,11 @@ class AdaptiveCPSATSolver:
 
                 logger.info(
                     "[CP-SAT] Solution found | cluster=%s | strategy=%s | "
-                    "assignments=%d | status=%s | wall_time=%.2fs",
+                    "assignments=%d | status=%s | wall_time=%.2fs | "
+                    "branches=%d | conflicts=%d",
                     self.cluster_id, strategy['name'],
                     n_assignments, _status_name, _wall_time,
+                    _branches, _conflicts,
                 )
                 return solution
 
@@ -472,6 +816,18 @@ class AdaptiveCPSATSolver:
             gc.collect()
             return None
 
+    def _session_ordered(self, assignment: Dict) -> Dict:
+        """Renumber each course's sessions by slot ordinal (symmetry-consistent hint)."""
+        by_course: Dict[str, list] = defaultdict(list)
+        for (c_id, _s), value in assignment.items():
+            by_course[c_id].append(value)
+        ordered: Dict = {}
+        for c_id, values in by_course.items():
+            values.sort(key=lambda v: self.slot_ordinal.get(str(v[0]), -1))
+            for s_idx, value in enumerate(values):
+                ordered[(c_id, s_idx)] = value
+        return ordered
+
     def _precompute_valid_domains(self, cluster: List[Course]) -> Dict:
         """
         Aggressive domain filtering: reduces variable count dramatically.
@@ -481,7 +837,6 @@ class AdaptiveCPSATSolver:
         This method now correctly uses room.features for feature matching.
         """
         valid_domains = {}
-        MAX_ROOMS_PER_COURSE = 30  # was 20 — BHU fix: wider domain reduces conflict density
 
         # Track how many courses fell to each fallback stage (for summary log)
         _stage_tally = {1: 0, 2: 0, 3: 0, 4: 0}
@@ -501,51 +856,12 @@ class AdaptiveCPSATSolver:
                 f for f in required_features
                 if not (isinstance(f, str) and f.startswith('fixed_slot:'))
             ]
-            dept_id = getattr(course, 'department_id', None)
-
-            # Stage 1: ideal match — type + features + lenient capacity band
-            candidate_rooms = [
-                room for room in self.rooms
-                if (
-                    room.capacity >= enrolled * 0.5   # was 0.6 — BHU: many small courses, large halls
-                    and room.capacity <= enrolled * 6.0  # was 5.0 — allow large lecture halls
-                    and room.room_type.upper() == required_type.upper()
-                    and all(
-                        f in (getattr(room, 'features', []) or [])
-                        for f in non_fixed_features
-                    )
-                )
-            ]
-            candidate_rooms.sort(key=lambda r: abs(r.capacity - enrolled))
-            candidate_rooms = candidate_rooms[:MAX_ROOMS_PER_COURSE]
-            _room_stage = 1
-
-            # Stage 2: relax features, keep type + capacity
-            if len(candidate_rooms) < 3:
-                candidate_rooms = [
-                    room for room in self.rooms
-                    if (
-                        room.capacity >= enrolled * 0.5
-                        and room.room_type.upper() == required_type.upper()
-                    )
-                ][:MAX_ROOMS_PER_COURSE]
-                _room_stage = 2
-
-            # Stage 3: relax type, any room with >=40% capacity
-            if len(candidate_rooms) < 3:
-                candidate_rooms = [
-                    room for room in self.rooms
-                    if room.capacity >= enrolled * 0.4
-                ][:MAX_ROOMS_PER_COURSE]
-                _room_stage = 3
-
-            # Stage 4: absolute last resort — any room, best-fit
-            if not candidate_rooms:
-                candidate_rooms = sorted(
-                    self.rooms,
-                    key=lambda r: abs(r.capacity - enrolled)
-                )[:MAX_ROOMS_PER_COURSE]
-                _room_stage = 4
+            # Stages 1-4 (ideal match → relax features → relax type → any
+            # room, best fit) as bisect range queries on the job's RoomIndex.
+            candidate_rooms, _room_stage = self.room_index.candidates(
+                required_type, non_fixed_features, enrolled,
+            )
+            if _room_stage == 4:
                 logger.warning(
                     "[Domain] Course %s: STAGE-4 fallback (all rooms) | "
                     "enrolled=%d type=%s rooms_total=%d rooms_returned=%d",
@@ -555,11 +871,22 @@ class AdaptiveCPSATSolver:
 
             _stage_tally[_room_stage] += 1
 
-            # Include ALL time slots — lunch slots are handled by constraint
-            # layer, not domain pruning.  Removing them here shrinks the domain
-            # so aggressively that CP-SAT sees too few variables to satisfy
-            # even Faculty+Room constraints.
-            valid_slots = self.time_slots
+            # Faculty availability ∩ org-open slots (SlotMasks, built once per
+            # job).  Faculty without declared availability keep the whole grid
+            # minus lunch-overlapping slots.  A mask leaving fewer slots than
+            # sessions is ignored so the model is not infeasible by construction.
+            allowed = self.slot_masks.allowed_slots(getattr(course, 'faculty_id', None))
+            if len(allowed) == len(self.time_slots):
+                valid_slots = self.time_slots
+            else:
+                valid_slots = [ts for ts in self.time_slots if str(ts.slot_id) in allowed]
+                if len(valid_slots) < course.duration:
+                    logger.warning(
+                        "[Domain] Course %s: faculty availability leaves %d slots for "
+                        "%d sessions — using the full grid",
+                        course.course_id, len(valid_slots), course.duration,
+                    )
+                    valid_slots = self.time_slots
 
             for session in range(course.duration):
                 valid_pairs = [
@@ -576,6 +903,9 @@ class AdaptiveCPSATSolver:
                     )
                 valid_domains[(course.course_id, session)] = valid_pairs
 
+        # Kept for the budget allocator's cluster features
+        self._last_stage_tally = _stage_tally
+
         # Summary log — printed once per cluster, gives a full picture of room matching
         total_pairs = sum(len(v) for v in valid_domains.values())
         logger.info(
@@ -638,6 +968,7 @@ class AdaptiveCPSATSolver:
         model,
         variables: Dict,
         student_priority: str,
+        conflict_groups: Optional[Dict[tuple, list]] = None,
     ) -> None:
         """
         Apply HC4 student no-double-booking constraints using precomputed pairs.
@@ -645,6 +976,7 @@ class AdaptiveCPSATSolver:
         RF-6 fast path: instead of scanning all variables × enrolled students,
         iterate self._student_conflict_groups (computed once in solve_cluster)
         and do O(1) dict lookups into the per-strategy `variables` dict.
+        `conflict_groups` overrides the cluster-wide groups for a component solve.
 
         Args:
             student_priority: "ALL" | "CRITICAL" | "NONE"
@@ -661,7 +993,9 @@ class AdaptiveCPSATSolver:
             )
 
         count = 0
-        for (student_id, t_slot_id), domain_keys in self._student_conflict_groups.items():
+        if conflict_groups is None:
+            conflict_groups = self._student_conflict_groups
+        for (student_id, t_slot_id), domain_keys in conflict_groups.items():
             if critical_set is not None and student_id not in critical_set:
                 continue
             vars_list = [variables[dk] for dk in domain_keys if dk in variables]
@@ -9,11 +9,12 @@ DESIGN FREEZE: Removed GPU, Island Model, Distributed modes
 """
 from .optimizer import GeneticAlgorithmOptimizer
 from .fitness import evaluate_fitness_simple
-from .operators import crossover, mutate, tournament_selection
+from .operators import DomainAwareOperators, crossover, mutate, tournament_selection
 
 __all__ = [
     'GeneticAlgorithmOptimizer',
     'evaluate_fitness_simple',
+    'DomainAwareOperators',
     'crossover',
     'mutate',
     'tournament_selection'
@@ -22,7 +22,8 @@ def evaluate_fitness_simple(
     faculty: Dict[str, Faculty],
     time_slots: List[TimeSlot],
     rooms: List[Room],
-    weights: Dict = None
+    weights: Dict = None,
+    slot_masks=None,
 ) -> float:
     """
     Fitness evaluation with 4 metrics.
@@ -31,6 +32,9 @@ def evaluate_fitness_simple(
     was being used with % (modulo) as if it were an int, causing a
     TypeError at runtime. Now casts to int safely before arithmetic.
 
+    `slot_masks` (engine.cpsat.slot_masks.SlotMasks) adds declared faculty
+    slot preferences to the faculty metric.
+
     Returns:
         float score (higher = better). Returns 0.0 on any crash.
     """
@@ -47,7 +51,7 @@ def evaluate_fitness_simple(
         room_capacity_map: Dict[str, int] = {r.room_id: r.capacity for r in rooms}
 
         # Metric 1: Faculty preferences
-        faculty_score = _evaluate_faculty_preferences(solution, courses, slot_by_id)
+        faculty_score = _evaluate_faculty_preferences(solution, courses, slot_by_id, slot_masks)
         score += _w['faculty'] * faculty_score
 
         # Metric 2: Room utilization
@@ -86,7 +90,8 @@ def _safe_slot_int(t_slot_id) -> int:
 def _evaluate_faculty_preferences(
     solution: Dict,
     courses: List[Course],
-    slot_by_id: Dict[str, "TimeSlot"]
+    slot_by_id: Dict[str, "TimeSlot"],
+    slot_masks=None,
 ) -> float:
     """
     Faculty preference scoring (higher = better).
@@ -98,6 +103,9 @@ def _evaluate_faculty_preferences(
 
     BUG 7 FIX: Previously did `t_slot_id % 10` on a str, which crashes.
     Now looks up the TimeSlot object by ID and uses .period (int).
+
+    With `slot_masks`, each session also earns 2 × the faculty's declared
+    weight for its slot (read from the precomputed per-faculty array).
     """
     score = 100.0
 
@@ -125,6 +133,9 @@ def _evaluate_faculty_preferences(
             elif 1 <= period <= 5:
                 score += 1.0
 
+            if slot_masks is not None:
+                score += 2.0 * slot_masks.weight(course.faculty_id, t_slot_id)
+
     return max(0.0, score)
 
 
@@ -1,13 +1,18 @@
 """
 Genetic Algorithm - Genetic Operators
 Following Google/Meta standards: Crossover and mutation separated
+
+crossover / mutate: catalog-wide operators (legacy).
+DomainAwareOperators: domain-sampled, clash-checked operators (default).
 """
 import random
 import logging
+from collections import Counter, defaultdict
 from typing import Dict, List, Tuple
 import copy
 
 from models.timetable_models import Course, Room, TimeSlot
+from engine.cpsat.constraints import MAX_SESSIONS_PER_DAY
 
 logger = logging.getLogger(__name__)
 
@@ -101,3 +106,223 @@ def tournament_selection(
     tournament_indices = random.sample(range(len(population)), tournament_size)
     best_idx = max(tournament_indices, key=lambda i: fitness_scores[i])
     return copy.deepcopy(population[best_idx])
+
+
+class _Occupancy:
+    """Per-individual usage: (faculty, slot) / (room, slot) counts, slots per course."""
+
+    __slots__ = ("faculty", "room", "course_slots")
+
+    def __init__(self, solution: Dict, faculty_of: Dict[str, str]) -> None:
+        self.faculty: Counter = Counter()
+        self.room: Counter = Counter()
+        self.course_slots: Dict[str, Counter] = defaultdict(Counter)
+        for key, value in solution.items():
+            if not (isinstance(key, tuple) and len(key) == 2):
+                continue
+            self.add(key[0], str(value[0]), value[1], faculty_of.get(key[0]))
+
+    def add(self, course_id: str, slot: str, room_id, fid, delta: int = 1) -> None:
+        if fid:
+            self.faculty[(fid, slot)] += delta
+        if room_id:
+            self.room[(room_id, slot)] += delta
+        self.course_slots[course_id][slot] += delta
+
+
+class DomainAwareOperators:
+    """
+    Feasibility-preserving mutation and crossover.
+
+    `mutate` / `crossover` above draw slots and rooms from the full catalogs,
+    so most offspring carry room-type mismatches or faculty/room/student
+    clashes that fitness must then punish.  These operators:
+
+      * sample each session's new slot / room only from its CP-SAT domain
+        (engine.cpsat.domains: RoomIndex candidates × faculty slot mask);
+      * commit a move only if the occupancy index says it is clash-free —
+        faculty, room, student (via the static course-neighbour list) and
+        the course's own sessions / per-day cap;
+      * in crossover, take a course's genes from the other parent only if
+        they fit around the genes already inherited.
+
+    Occupancy is O(sessions) to build per individual and a move check is
+    O(student-neighbour courses).  `stats` counts proposals, acceptances and
+    rejections by cause.  Randomness comes from the global `random` module,
+    which the saga seeds per variant.
+    """
+
+    def __init__(
+        self,
+        courses: List[Course],
+        rooms: List[Room],
+        time_slots: List[TimeSlot],
+        room_index=None,
+        slot_masks=None,
+        max_sessions_per_day: int = MAX_SESSIONS_PER_DAY,
+        candidates_per_move: int = 8,
+    ) -> None:
+        from engine.cpsat.domains import candidate_rooms, candidate_slots
+        from engine.cpsat.room_index import RoomIndex
+
+        room_index = room_index or RoomIndex(rooms)
+        slot_ids = [str(ts.slot_id) for ts in time_slots]
+        self.slot_value = {str(ts.slot_id): ts.slot_id for ts in time_slots}
+        self.day_of = {str(ts.slot_id): ts.day for ts in time_slots}
+        self.max_sessions_per_day = max_sessions_per_day
+        self.candidates_per_move = candidates_per_move
+        self.faculty_of: Dict[str, str] = {}
+        self.slots: Dict[str, List[str]] = {}
+        self.rooms: Dict[str, List[str]] = {}
+        courses_of_student: Dict[str, List[str]] = defaultdict(list)
+        for course in courses:
+            cid = course.course_id
+            self.faculty_of[cid] = getattr(course, 'faculty_id', None)
+            self.slots[cid] = candidate_slots(course, slot_ids, slot_masks)
+            self.rooms[cid] = [r.room_id for r in candidate_rooms(course, room_index)]
+            for sid in getattr(course, 'student_ids', None) or []:
+                courses_of_student[sid].append(cid)
+        neighbours: Dict[str, set] = defaultdict(set)
+        for members in courses_of_student.values():
+            if len(members) > 1:
+                for cid in members:
+                    neighbours[cid].update(members)
+        self.student_neighbours: Dict[str, Tuple[str, ...]] = {
+            cid: tuple(n for n in nbrs if n != cid) for cid, nbrs in neighbours.items()
+        }
+        self.stats: Counter = Counter()
+
+    # ------------------------------------------------------------------
+    # Feasibility
+    # ------------------------------------------------------------------
+
+    def _slot_free(self, occ: _Occupancy, cid: str, slot: str) -> bool:
+        """Faculty, own-course, per-day and student checks for `cid` at `slot`."""
+        fid = self.faculty_of.get(cid)
+        if fid and occ.faculty[(fid, slot)]:
+            self.stats['rejected_faculty'] += 1
+            return False
+        own = occ.course_slots[cid]
+        if own[slot]:
+            self.stats['rejected_own_course'] += 1
+            return False
+        day = self.day_of.get(slot)
+        if sum(n for s, n in own.items() if n and self.day_of.get(s) == day) >= self.max_sessions_per_day:
+            self.stats['rejected_per_day'] += 1
+            return False
+        for other in self.student_neighbours.get(cid, ()):
+            if occ.course_slots[other][slot]:
+                self.stats['rejected_student'] += 1
+                return False
+        return True
+
+    def _free_room(self, occ: _Occupancy, cid: str, slot: str, prefer=None):
+        if prefer is not None and not occ.room[(prefer, slot)] and prefer in self.rooms.get(cid, ()):
+            return prefer
+        for room_id in self.rooms.get(cid, ()):
+            if not occ.room[(room_id, slot)]:
+                return room_id
+        self.stats['rejected_room'] += 1
+        return None
+
+    def _move(self, occ: _Occupancy, solution: Dict, key: tuple) -> bool:
+        cid = key[0]
+        if cid not in self.slots:
+            return False
+        cur_slot, cur_room = str(solution[key][0]), solution[key][1]
+        fid = self.faculty_of.get(cid)
+        occ.add(cid, cur_slot, cur_room, fid, -1)
+        self.stats['proposed'] += 1
+        if random.random() < 0.5:
+            # Slot move (room kept when it is free there).
+            pool = self.slots[cid]
+            for slot in random.sample(pool, min(self.candidates_per_move, len(pool))):
+                if slot == cur_slot or not self._slot_free(occ, cid, slot):
+                    continue
+                room_id = self._free_room(occ, cid, slot, prefer=cur_room)
+                if room_id is None:
+                    continue
+                occ.add(cid, slot, room_id, fid)
+                solution[key] = (self.slot_value[slot], room_id)
+                self.stats['accepted'] += 1
+                return True
+        else:
+            # Room move within the current slot.
+            pool = [r for r in self.rooms[cid] if r != cur_room]
+            for room_id in random.sample(pool, min(self.candidates_per_move, len(pool))):
+                if not occ.room[(room_id, cur_slot)]:
+                    occ.add(cid, cur_slot, room_id, fid)
+                    solution[key] = (solution[key][0], room_id)
+                    self.stats['accepted'] += 1
+                    return True
+            self.stats['rejected_room'] += 1
+        occ.add(cid, cur_slot, cur_room, fid)
+        self.stats['rejected_move'] += 1
+        return False
+
+    # ------------------------------------------------------------------
+    # Operators
+    # ------------------------------------------------------------------
+
+    def mutate(self, solution: Dict, mutation_rate: float = 0.15) -> Dict:
+        """Copy of `solution` with each placed session moved w.p. `mutation_rate`."""
+        mutated = dict(solution)
+        occ = _Occupancy(mutated, self.faculty_of)
+        for key in list(mutated):
+            if random.random() < mutation_rate and isinstance(key, tuple) and len(key) == 2:
+                if mutated[key][0] == "__UNSCHEDULED__":
+                    continue
+                self._move(occ, mutated, key)
+        return mutated
+
+    def crossover(
+        self, parent1: Dict, parent2: Dict, crossover_rate: float = 0.8,
+    ) -> Tuple[Dict, Dict]:
+        """Course-level single-point crossover keeping each child clash-free."""
+        if random.random() > crossover_rate:
+            return dict(parent1), dict(parent2)
+        sessions: Dict[str, List[tuple]] = defaultdict(list)
+        for key in parent1:
+            if isinstance(key, tuple) and len(key) == 2:
+                sessions[key[0]].append(key)
+        course_ids = list(sessions)
+        if not course_ids:
+            return dict(parent1), dict(parent2)
+        point = random.randint(0, len(course_ids))
+        return (
+            self._child(parent1, parent2, sessions, set(course_ids[point:])),
+            self._child(parent2, parent1, sessions, set(course_ids[:point])),
+        )
+
+    def _child(self, base: Dict, donor: Dict, sessions, donated: set) -> Dict:
+        child = dict(base)
+        occ = _Occupancy(child, self.faculty_of)
+        for cid in donated:
+            keys = [k for k in sessions[cid] if k in donor and donor[k] != child.get(k)]
+            if not keys:
+                continue
+            fid = self.faculty_of.get(cid)
+            old = {k: child[k] for k in keys}
+            for k, (slot, room_id) in old.items():
+                occ.add(cid, str(slot), room_id, fid, -1)
+            ok = True
+            placed = []
+            for k in keys:
+                slot, room_id = str(donor[k][0]), donor[k][1]
+                if donor[k][0] == "__UNSCHEDULED__" or not self._slot_free(occ, cid, slot) \
+                        or (room_id and occ.room[(room_id, slot)]):
+                    ok = False
+                    break
+                occ.add(cid, slot, room_id, fid)
+                placed.append((slot, room_id))
+            if ok:
+                for k in keys:
+                    child[k] = donor[k]
+                self.stats['crossover_genes_taken'] += 1
+                continue
+            for slot, room_id in placed:
+                occ.add(cid, slot, room_id, fid, -1)
+            for k, (slot, room_id) in old.items():
+                occ.add(cid, str(slot), room_id, fid)
+            self.stats['crossover_genes_rejected'] += 1
+        return child
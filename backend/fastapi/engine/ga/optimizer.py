@@ -5,11 +5,12 @@ Removed: GPU, Island Model, Distributed modes (experimental features)
 """
 import logging
 import copy
-from typing import List, Dict
+import time
+from typing import List, Dict, Optional
 
 from models.timetable_models import Course, Room, TimeSlot, Faculty
 from .fitness import evaluate_fitness_simple
-from .operators import crossover, mutate, tournament_selection
+from .operators import DomainAwareOperators, crossover, mutate, tournament_selection
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +39,14 @@ class GeneticAlgorithmOptimizer:
         crossover_rate: float = 0.7,
         elitism_rate: float = 0.2,
         fitness_weights: Dict = None,
-        progress_callback=None
+        progress_callback=None,
+        slot_masks=None,
+        room_index=None,
+        domain_aware: bool = True,
+        no_improvement_limit: Optional[int] = None,
+        quality_threshold: Optional[float] = None,
+        time_budget: Optional[float] = None,
+        min_generations: int = 5,
     ):
         self.courses = courses
         self.rooms = rooms
@@ -56,6 +64,36 @@ class GeneticAlgorithmOptimizer:
         self.fitness_weights = fitness_weights  # None = use evaluate_fitness_simple defaults
         # Optional callable(generation: int, total: int, best_fitness: float) for SSE progress ticks
         self.progress_callback = progress_callback
+        # Per-job faculty preference arrays (engine.cpsat.slot_masks) for fitness
+        self.slot_masks = slot_masks
+        # Domain-sampled, clash-checked operators (legacy catalog-wide
+        # mutate/crossover when domain_aware=False)
+        self.operators = (
+            DomainAwareOperators(
+                courses, rooms, time_slots,
+                room_index=room_index, slot_masks=slot_masks,
+            )
+            if domain_aware else None
+        )
+        # Offspring differing from their parent, per generation
+        self.useful_offspring: List[int] = []
+        # Anytime controls (None = off): stop after this many generations
+        # without a new best, once best fitness beats the seed's (elite #0,
+        # the CP-SAT solution) by the fraction quality_threshold, or after
+        # time_budget seconds.  Fitness metrics start at 100 and add bonuses,
+        # so only improvement over the seed says anything about the search.
+        # Stagnation and quality stops wait for min_generations; the time
+        # budget is a hard wall-clock cap and does not.
+        self.no_improvement_limit = no_improvement_limit
+        self.quality_threshold = quality_threshold
+        self.time_budget = time_budget
+        self.min_generations = max(1, min(min_generations, self.generations))
+        # Best-so-far genome — valid even if optimize() is interrupted
+        self.best_solution: Dict = initial_solution
+        self.best_fitness: float = float('-inf')
+        self.seed_fitness: Optional[float] = None
+        self.generations_run = 0
+        self.stop_reason = 'not_started'
         
         logger.info(f"[GA] CPU-only mode: pop={self.population_size}, gen={self.generations}")
     
@@ -70,6 +108,11 @@ class GeneticAlgorithmOptimizer:
         CPU-only optimization (production implementation)
         """
         logger.info(f"[GA] Starting: {self.population_size} individuals, {self.generations} gens")
+        _deadline = (
+            time.perf_counter() + self.time_budget if self.time_budget is not None else None
+        )
+        _stale = 0
+        self.stop_reason = 'generations'
         
         # Initialize population
         population = self._initialize_population()
@@ -80,15 +123,19 @@ class GeneticAlgorithmOptimizer:
         # Evolution loop (single population, CPU-only)
         # Google/Meta pattern: Check cancellation externally in saga between generations
         for generation in range(self.generations):
+            self.generations_run = generation + 1
             # Evaluate fitness for all individuals
             fitness_scores = [
                 evaluate_fitness_simple(
                     ind, self.courses, self.faculty, self.time_slots, self.rooms,
-                    weights=self.fitness_weights
+                    weights=self.fitness_weights, slot_masks=self.slot_masks,
                 )
                 for ind in population
             ]
             
+            if generation == 0:
+                self.seed_fitness = fitness_scores[0]  # population[0] is the seed
+
             # Track best
             max_idx = max(range(len(fitness_scores)), key=lambda i: fitness_scores[i])
             gen_best = fitness_scores[max_idx]
@@ -96,11 +143,15 @@ class GeneticAlgorithmOptimizer:
             if gen_best > best_fitness:
                 best_fitness = gen_best
                 best_solution = copy.deepcopy(population[max_idx])
+                self.best_solution, self.best_fitness = best_solution, best_fitness
+                _stale = 0
                 logger.info(
                     "[GA] Gen %d/%d  NEW BEST fitness=%.2f  mean=%.2f  pop=%d",
                     generation + 1, self.generations, best_fitness, gen_mean, len(population),
                 )
-            elif (generation + 1) % 5 == 0 or generation == 0:
+            else:
+                _stale += 1
+            if _stale and ((generation + 1) % 5 == 0 or generation == 0):
                 logger.info(
                     "[GA] Gen %d/%d  fitness_best=%.2f  fitness_mean=%.2f  pop=%d",
                     generation + 1, self.generations, best_fitness, gen_mean, len(population),
@@ -122,10 +173,41 @@ class GeneticAlgorithmOptimizer:
                     # All other exceptions: absorb so GA always finishes
                     pass
             
+            # Anytime stop checks (after the progress tick so the SSE stream
+            # and cancellation see every evaluated generation).
+            _past_min = generation + 1 >= self.min_generations
+            if (
+                _past_min
+                and self.quality_threshold is not None
+                and self.seed_fitness > 0
+                and best_fitness >= self.seed_fitness * (1.0 + self.quality_threshold)
+            ):
+                self.stop_reason = 'quality_threshold'
+                break
+            if (
+                _past_min
+                and self.no_improvement_limit is not None
+                and _stale >= self.no_improvement_limit
+            ):
+                self.stop_reason = 'stagnation'
+                break
+            if _deadline is not None and time.perf_counter() >= _deadline:
+                self.stop_reason = 'time_budget'
+                break
+
             # Build next generation
             population = self._evolve_generation(population, fitness_scores)
         
-        logger.info(f"[GA] Complete. Best fitness: {best_fitness:.2f}")
+        logger.info(
+            "[GA] Complete. Best fitness: %.2f  generations=%d/%d  stop=%s",
+            best_fitness, self.generations_run, self.generations, self.stop_reason,
+        )
+        if self.operators is not None:
+            logger.info(
+                "[GA] Operators  useful_offspring/gen=%.1f  stats=%s",
+                sum(self.useful_offspring) / max(len(self.useful_offspring), 1),
+                dict(self.operators.stats),
+            )
         return best_solution
     
     def _initialize_population(self) -> List[Dict]:
@@ -160,8 +242,7 @@ class GeneticAlgorithmOptimizer:
         )
 
         for rate in mutation_schedule:
-            individual = copy.deepcopy(self.initial_solution)
-            individual = mutate(individual, self.courses, self.rooms, self.time_slots, rate)
+            individual = self._mutate(copy.deepcopy(self.initial_solution), rate)
             population.append(individual)
 
         return population
@@ -190,29 +271,43 @@ class GeneticAlgorithmOptimizer:
         next_population = [copy.deepcopy(population[i]) for i in elite_indices]
         
         # Generate offspring
+        useful = 0
         while len(next_population) < len(population):
             # Tournament selection
             parent1 = tournament_selection(population, fitness_scores)
             parent2 = tournament_selection(population, fitness_scores)
             
             # Crossover
-            offspring1, offspring2 = crossover(parent1, parent2, self.courses, self.crossover_rate)
+            if self.operators is not None:
+                offspring1, offspring2 = self.operators.crossover(
+                    parent1, parent2, self.crossover_rate,
+                )
+            else:
+                offspring1, offspring2 = crossover(parent1, parent2, self.courses, self.crossover_rate)
             
             # Mutation (adaptive rate)
-            offspring1 = mutate(offspring1, self.courses, self.rooms, self.time_slots, _effective_rate)
-            offspring2 = mutate(offspring2, self.courses, self.rooms, self.time_slots, _effective_rate)
+            offspring1 = self._mutate(offspring1, _effective_rate)
+            offspring2 = self._mutate(offspring2, _effective_rate)
             
             next_population.append(offspring1)
+            useful += offspring1 != parent1
             if len(next_population) < len(population):
                 next_population.append(offspring2)
+                useful += offspring2 != parent2
+        self.useful_offspring.append(useful)
         
         return next_population
+
+    def _mutate(self, solution: Dict, rate: float) -> Dict:
+        if self.operators is not None:
+            return self.operators.mutate(solution, rate)
+        return mutate(solution, self.courses, self.rooms, self.time_slots, rate)
     
     def fitness(self, solution: Dict) -> float:
         """Evaluate single solution (for external callers)"""
         return evaluate_fitness_simple(
             solution, self.courses, self.faculty, self.time_slots, self.rooms,
-            weights=self.fitness_weights
+            weights=self.fitness_weights, slot_masks=self.slot_masks,
         )
     
     def evolve(self, job_id: str = None) -> Dict:
@@ -18,9 +18,13 @@ NO GPU, NO DQN, NO global repair
 from .qlearning import SimpleTabularQLearning
 from .reward_calculator import calculate_simple_reward
 from .state_manager import StateManager
+from .schedule_state import ScheduleState
+from .q_store import QTableStore
 
 __all__ = [
     'SimpleTabularQLearning',
     'calculate_simple_reward',
-    'StateManager'
+    'StateManager',
+    'ScheduleState',
+    'QTableStore'
 ]
@@ -0,0 +1,326 @@
+"""
+Reinforcement Learning - Array-Backed Q-Table Store
+Following Google/Meta standards: One file = one responsibility
+
+SimpleTabularQLearning kept Q-values in a dict keyed by (state, action)
+tuples, evicted with a min() scan over an access-count dict, and pickled
+each semester's policy.  QTableStore keeps the same mapping interface but:
+
+  * interns states and actions to integer ids; an entry is addressed by
+    the packed id (state_id << 32 | action_id);
+  * stores values and the LRU links in typed arrays (one slot per entry),
+    so lookup, update and eviction of the least recently used entry are
+    all O(1);
+  * persists to a versioned binary file (header, JSON intern tables, then
+    the value / id arrays) that is read through a read-only mmap with bulk
+    array copies — no per-entry unpickling.  Saves are written to a temp
+    file and os.replace()d, so worker processes loading the same semester
+    concurrently never see a torn file.
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'QTBL'
+FORMAT_VERSION = 1
+# magic, format version, reserved, entry count, metadata length
+_HEADER = struct.Struct('<4sHHIQ')
+_NIL = -1
+
+
+def _as_key(items: list) -> Tuple:
+    """A JSON list back to the tuple used as a state / action key."""
+    if list in map(type, items):  # nested keys only; flat ones skip the genexpr
+        return tuple(_as_key(x) if type(x) is list else x for x in items)
+    return tuple(items)
+
+
+class QTableStore(MutableMapping):
+    """
+    Bounded Q-table {(state, action): value} with O(1) LRU eviction.
+
+    Reads through get()/lookup() and writes mark an entry most recently
+    used; iteration and len() behave like the dict it replaces.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._state_ids: Dict[Tuple, int] = {}
+        self._states: List[Tuple] = []
+        self._action_ids: Dict[Tuple, int] = {}
+        self._actions: List[Tuple] = []
+        self._slot: Dict[int, int] = {}  # packed (state_id, action_id) → slot
+        self._value = array('d')
+        self._sid = array('i')
+        self._aid = array('i')
+        # Doubly linked LRU list over slots, head = most recently used
+        self._prev = array('i')
+        self._next = array('i')
+        self._head = _NIL
+        self._tail = _NIL
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Interning
+    # ------------------------------------------------------------------
+
+    def _intern(self, ids: Dict[Tuple, int], table: List[Tuple], key: Tuple) -> int:
+        idx = ids.get(key)
+        if idx is None:
+            idx = ids[key] = len(table)
+            table.append(key)
+        return idx
+
+    def _find(self, key: Tuple) -> Optional[int]:
+        state, action = key
+        sid = self._state_ids.get(state)
+        if sid is None:
+            return None
+        aid = self._action_ids.get(action)
+        if aid is None:
+            return None
+        return self._slot.get(sid << 32 | aid)
+
+    # ------------------------------------------------------------------
+    # LRU list
+    # ------------------------------------------------------------------
+
+    def _unlink(self, slot: int) -> None:
+        prev, nxt = self._prev[slot], self._next[slot]
+        if prev != _NIL:
+            self._next[prev] = nxt
+        else:
+            self._head = nxt
+        if nxt != _NIL:
+            self._prev[nxt] = prev
+        else:
+            self._tail = prev
+
+    def _push_front(self, slot: int) -> None:
+        self._prev[slot] = _NIL
+        self._next[slot] = self._head
+        if self._head != _NIL:
+            self._prev[self._head] = slot
+        self._head = slot
+        if self._tail == _NIL:
+            self._tail = slot
+
+    def _touch(self, slot: int) -> None:
+        if slot != self._head:
+            self._unlink(slot)
+            self._push_front(slot)
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+
+    def lookup(self, state: Tuple, action: Tuple, default: float = 0.0) -> float:
+        """Q(state, action), marking the entry most recently used."""
+        slot = self._find((state, action))
+        if slot is None:
+            return default
+        self._touch(slot)
+        return self._value[slot]
+
+    def get(self, key, default=None):
+        slot = self._find(key)
+        if slot is None:
+            return default
+        self._touch(slot)
+        return self._value[slot]
+
+    def __getitem__(self, key) -> float:
+        slot = self._find(key)
+        if slot is None:
+            raise KeyError(key)
+        self._touch(slot)
+        return self._value[slot]
+
+    def __setitem__(self, key, value: float) -> None:
+        slot = self._find(key)
+        if slot is not None:
+            self._value[slot] = value
+            self._touch(slot)
+            return
+        state, action = key
+        sid = self._intern(self._state_ids, self._states, state)
+        aid = self._intern(self._action_ids, self._actions, action)
+        if len(self._slot) >= self.capacity and self._tail != _NIL:
+            # Reuse the least recently used slot
+            slot = self._tail
+            self._unlink(slot)
+            del self._slot[self._sid[slot] << 32 | self._aid[slot]]
+            self._value[slot], self._sid[slot], self._aid[slot] = value, sid, aid
+            self.evictions += 1
+        else:
+            slot = len(self._value)
+            self._value.append(value)
+            self._sid.append(sid)
+            self._aid.append(aid)
+            self._prev.append(_NIL)
+            self._next.append(_NIL)
+        self._slot[sid << 32 | aid] = slot
+        self._push_front(slot)
+        # Evicted entries leave their action ids interned; drop them once
+        # the intern table dwarfs the live entries.
+        if len(self._actions) > 4 * max(self.capacity, 1):
+            self._compact()
+
+    def __delitem__(self, key) -> None:
+        slot = self._find(key)
+        if slot is None:
+            raise KeyError(key)
+        # Move the last slot into the hole so the arrays stay dense
+        last = len(self._value) - 1
+        self._unlink(slot)
+        del self._slot[self._sid[slot] << 32 | self._aid[slot]]
+        if slot != last:
+            for arr in (self._value, self._sid, self._aid, self._prev, self._next):
+                arr[slot] = arr[last]
+            prev, nxt = self._prev[slot], self._next[slot]
+            if prev != _NIL:
+                self._next[prev] = slot
+            else:
+                self._head = slot
+            if nxt != _NIL:
+                self._prev[nxt] = slot
+            else:
+                self._tail = slot
+            self._slot[self._sid[slot] << 32 | self._aid[slot]] = slot
+        for arr in (self._value, self._sid, self._aid, self._prev, self._next):
+            arr.pop()
+
+    def __contains__(self, key) -> bool:
+        return self._find(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def __iter__(self) -> Iterator[Tuple]:
+        """Keys, most recently used first (a snapshot; lookups may reorder)."""
+        for slot in self._lru_order():
+            yield (self._states[self._sid[slot]], self._actions[self._aid[slot]])
+
+    def items(self):
+        """(key, value) pairs, most recently used first, without touching the LRU."""
+        return [
+            ((self._states[self._sid[s]], self._actions[self._aid[s]]), self._value[s])
+            for s in self._lru_order()
+        ]
+
+    def values(self):
+        return list(self._value)
+
+    def clear(self) -> None:
+        self.__init__(self.capacity)
+
+    def _lru_order(self) -> List[int]:
+        order = []
+        slot = self._head
+        while slot != _NIL:
+            order.append(slot)
+            slot = self._next[slot]
+        return order
+
+    def _compact(self) -> None:
+        """Rebuild the store from live entries only (drops stale interns)."""
+        order = self._lru_order()
+        entries = [
+            (self._states[self._sid[s]], self._actions[self._aid[s]], self._value[s])
+            for s in reversed(order)
+        ]
+        evictions = self.evictions
+        self.clear()
+        for state, action, value in entries:
+            self[(state, action)] = value
+        self.evictions = evictions
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path, metadata: Optional[Dict] = None) -> None:
+        """
+        Write the versioned binary policy file atomically.  Entries go out
+        in LRU order (most recent first) with interns compacted to the live
+        states / actions.
+        """
+        order = self._lru_order()
+        state_ids: Dict[int, int] = {}
+        action_ids: Dict[int, int] = {}
+        sid_out, aid_out, value_out = array('i'), array('i'), array('d')
+        for slot in order:
+            sid_out.append(state_ids.setdefault(self._sid[slot], len(state_ids)))
+            aid_out.append(action_ids.setdefault(self._aid[slot], len(action_ids)))
+            value_out.append(self._value[slot])
+        meta = {
+            'byteorder': sys.byteorder,
+            'states': [self._states[i] for i in state_ids],
+            'actions': [self._actions[i] for i in action_ids],
+            'metadata': metadata or {},
+        }
+        blob = json.dumps(meta).encode('utf-8')
+        blob += b' ' * (-(_HEADER.size + len(blob)) % 8)  # 8-byte align arrays
+
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(order), len(blob)))
+            f.write(blob)
+            f.write(value_out.tobytes())
+            f.write(sid_out.tobytes())
+            f.write(aid_out.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, capacity: int = 10000) -> Tuple['QTableStore', Dict]:
+        """
+        Map a policy file read-only and rebuild the store with bulk array
+        copies.  Returns (store, metadata); raises ValueError on a bad
+        magic or an unsupported format version.
+        """
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, _reserved, n, meta_len = _HEADER.unpack_from(mm, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a Q-table file")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{path}: unsupported Q-table format v{version}")
+            offset = _HEADER.size
+            meta = json.loads(bytes(mm[offset:offset + meta_len]).decode('utf-8'))
+            offset += meta_len
+            values, sids, aids = array('d'), array('i'), array('i')
+            for arr in (values, sids, aids):
+                size = n * arr.itemsize
+                arr.frombytes(mm[offset:offset + size])
+                offset += size
+        if meta.get('byteorder', sys.byteorder) != sys.byteorder:
+            for arr in (values, sids, aids):
+                arr.byteswap()
+
+        store = cls(capacity)
+        store._states = [_as_key(s) for s in meta['states']]
+        store._state_ids = {s: i for i, s in enumerate(store._states)}
+        store._actions = [_as_key(a) for a in meta['actions']]
+        store._action_ids = {a: i for i, a in enumerate(store._actions)}
+        keep = min(n, capacity)  # most recent first on disk
+        store._value = values[:keep]
+        store._sid = sids[:keep]
+        store._aid = aids[:keep]
+        store._slot = {store._sid[i] << 32 | store._aid[i]: i for i in range(keep)}
+        store._prev = array('i', range(-1, keep - 1))
+        store._next = array('i', range(1, keep + 1))
+        if keep:
+            store._next[keep - 1] = _NIL
+            store._head, store._tail = 0, keep - 1
+        return store, meta.get('metadata', {})
@@ -13,21 +13,25 @@ NO DQN, NO GPU, NO global repair, NO threading
 import logging
 import random
 import copy
+import time
 import json
 import pickle
-from typing import List, Dict, Tuple, Optional
-from collections import defaultdict
+from typing import Callable, List, Dict, Tuple, Optional
 from pathlib import Path
 from datetime import datetime
 
 from models.timetable_models import Course, Faculty, Room, TimeSlot
+from .q_store import QTableStore
 from .state_manager import StateManager
-from .reward_calculator import calculate_simple_reward
+from .schedule_state import ScheduleState
+from .reward_calculator import calculate_simple_reward, conflict_reward
 
 logger = logging.getLogger(__name__)
 
 # Fixed-size Q-table with LRU eviction
 MAX_Q_TABLE_SIZE = 10000
+# Binary policy files (QTableStore format); legacy .pkl still loads
+POLICY_SUFFIX = ".qtbl"
 
 
 class SimpleTabularQLearning:
@@ -71,9 +75,9 @@ class SimpleTabularQLearning:
         self.epsilon_decay = epsilon_decay
         self.min_epsilon = min_epsilon
         
-        # Fixed-size Q-table (BOUNDED, not unbounded)
-        self.q_table: Dict[Tuple, float] = {}
-        self.q_table_access_count: Dict[Tuple, int] = defaultdict(int)
+        # Fixed-size Q-table (BOUNDED, not unbounded): interned ids, typed
+        # arrays, O(1) LRU eviction
+        self.q_table = QTableStore(MAX_Q_TABLE_SIZE)
         
         # State manager (discrete 4-6 dimensions)
         self.state_manager = StateManager(courses, faculty)
@@ -86,6 +90,7 @@ class SimpleTabularQLearning:
         
         # Audit logging
         self.decision_log: List[Dict] = []
+        self.refine_report: Dict = {}
         
         logger.info("[RL] Q-learning init: LR=%.3f, gamma=%.3f, epsilon=%.3f, frozen=%s", learning_rate, gamma, epsilon, frozen)
     
@@ -100,7 +105,7 @@ class SimpleTabularQLearning:
         This is the ONLY approved role for RL
         
         Args:
-            schedule: Current schedule
+            schedule: Current schedule (dict, or ScheduleState for O(1) state lookup)
             candidate_swaps: List of 2-5 valid swaps (course_id, session, new_t_slot, new_room)
             conflict_type: Type of conflict being resolved
         
@@ -167,6 +172,10 @@ class SimpleTabularQLearning:
             new_conflicts
         )
         
+        self._td_update(old_state, action, reward)
+    
+    def _td_update(self, old_state: Tuple, action: Tuple, reward: float):
+        """TD(0) update of Q(old_state, action), epsilon decay and audit log entry"""
         # Get current Q-value
         current_q = self._get_q_value(old_state, action)
         
@@ -194,26 +203,83 @@ class SimpleTabularQLearning:
         
         logger.debug(f"[RL-Q] Updated: state={old_state}, action={action[:2]}, reward={reward:.2f}, Q={new_q:.2f}")
     
+    def refine_solution(
+        self,
+        solution: Dict,
+        room_index=None,
+        slot_masks=None,
+        max_decisions: int = 5000,
+        time_budget: float = 5.0,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Dict:
+        """
+        Local swap refinement of a full solution on an indexed ScheduleState.
+        
+        Each conflicting session gets up to 5 improving moves generated from
+        the occupancy indexes (faculty free, room free, fewer student
+        clashes); the policy picks one via choose_best_swap.  Every candidate
+        lowers the session's weighted clash cost, so the search terminates
+        and never worsens hard clashes.  Learning (TD update with the
+        conflict reward) only happens when the policy is not frozen.
+        
+        Returns a new solution dict; sets self.refine_report.
+        """
+        t0 = time.perf_counter()
+        state = ScheduleState(
+            self.courses, solution, self.time_slots,
+            room_index=room_index, slot_masks=slot_masks,
+        )
+        before = state.conflicts
+        queue = state.conflicted_sessions()
+        decisions = 0
+        stop_reason = None
+        while queue:
+            if decisions >= max_decisions:
+                stop_reason = 'max_decisions'
+                break
+            if time.perf_counter() - t0 > time_budget:
+                stop_reason = 'time_budget'
+                break
+            if should_stop is not None and should_stop():
+                stop_reason = 'cancelled'
+                break
+            key = queue.pop()
+            candidates = state.candidate_swaps(key)
+            if not candidates:
+                continue
+            conflict_type = state.conflict_type(key)
+            old_state = state.state(conflict_type)
+            action = self.choose_best_swap(state, candidates, conflict_type)
+            old_conflicts = state.conflicts
+            state.move(key, action[2], action[3])
+            decisions += 1
+            if not self.frozen:
+                self._td_update(old_state, action, conflict_reward(old_conflicts, state.conflicts))
+            if state.clash_cost(key) > 0:
+                queue.append(key)
+        if stop_reason is None:
+            stop_reason = 'resolved' if state.conflicts == 0 else 'no_improving_move'
+        
+        self.refine_report = {
+            'conflicts_before': before,
+            'conflicts_after': state.conflicts,
+            'decisions': decisions,
+            'stop_reason': stop_reason,
+            'elapsed_s': round(time.perf_counter() - t0, 3),
+        }
+        logger.info(
+            "[RL] Refinement  conflicts=%d->%d  decisions=%d  stop=%s  elapsed=%.2fs",
+            before, state.conflicts, decisions, stop_reason, self.refine_report['elapsed_s'],
+        )
+        return state.to_solution()
+    
     def _get_q_value(self, state: Tuple, action: Tuple) -> float:
-        """Get Q-value from table (default 0.0)"""
-        key = (state, action)
-        self.q_table_access_count[key] += 1
-        return self.q_table.get(key, 0.0)
+        """Get Q-value from table (default 0.0), marking it recently used"""
+        return self.q_table.lookup(state, action, 0.0)
     
     def _set_q_value(self, state: Tuple, action: Tuple, value: float):
-        """Set Q-value with LRU eviction if table is full"""
-        key = (state, action)
-        
-        # Check if table is full
-        if len(self.q_table) >= MAX_Q_TABLE_SIZE and key not in self.q_table:
-            # Evict least recently used entry
-            lru_key = min(self.q_table_access_count, key=self.q_table_access_count.get)
-            del self.q_table[lru_key]
-            del self.q_table_access_count[lru_key]
-            logger.debug(f"[RL-Q] Evicted LRU entry, table size: {len(self.q_table)}")
-        
-        self.q_table[key] = value
-        self.q_table_access_count[key] = 0  # Reset access count
+        """Set Q-value; the store evicts its LRU entry in O(1) when full"""
+        self.q_table[(state, action)] = value
     
     def freeze_policy(self):
         """
@@ -243,16 +309,14 @@ class SimpleTabularQLearning:
         
         Pattern: Google OfflinePolicyTrainer, Meta PolicySnapshot
         """
-        policy_file = self.policy_storage_path / f"policy_{semester_id}.pkl"
+        policy_file = self.policy_storage_path / f"policy_{semester_id}{POLICY_SUFFIX}"
         metadata_file = self.policy_storage_path / f"policy_{semester_id}.json"
         
-        # Save Q-table (binary)
-        with open(policy_file, 'wb') as f:
-            pickle.dump({
-                'q_table': dict(self.q_table),
-                'epsilon': self.epsilon,
-                'semester_version': semester_id
-            }, f)
+        # Save Q-table (versioned binary, atomic replace)
+        self.q_table.save(policy_file, {
+            'epsilon': self.epsilon,
+            'semester_version': semester_id
+        })
         
         # Save metadata (JSON for readability)
         metadata = {
@@ -282,23 +346,28 @@ class SimpleTabularQLearning:
             semester_id: Semester to load policy for
             freeze_on_load: If True, policy is frozen after loading (recommended for production)
         """
-        policy_file = self.policy_storage_path / f"policy_{semester_id}.pkl"
+        policy_file = self.policy_storage_path / f"policy_{semester_id}{POLICY_SUFFIX}"
+        legacy_file = self.policy_storage_path / f"policy_{semester_id}.pkl"
         
-        if not policy_file.exists():
+        if not policy_file.exists() and not legacy_file.exists():
             logger.warning(f"[RL-Policy] No policy for semester {semester_id}, starting fresh")
             return
         
         try:
-            with open(policy_file, 'rb') as f:
-                data = pickle.load(f)
+            if policy_file.exists():
+                # Memory-mapped read of the binary store
+                self.q_table, data = QTableStore.load(policy_file, MAX_Q_TABLE_SIZE)
+            else:
+                # Pre-binary policies (pickled dict)
+                with open(legacy_file, 'rb') as f:
+                    data = pickle.load(f)
+                self.q_table = QTableStore(MAX_Q_TABLE_SIZE)
+                for key, value in data['q_table'].items():
+                    self.q_table[key] = value
             
-            self.q_table = defaultdict(float, data['q_table'])
             self.epsilon = data.get('epsilon', self.min_epsilon)
             self.semester_version = data.get('semester_version', semester_id)
             
-            # Reset access counts
-            self.q_table_access_count = defaultdict(int)
-            
             # Freeze policy if requested (GUARDRAIL)
             if freeze_on_load:
                 self.freeze_policy()
@@ -324,9 +393,13 @@ class SimpleTabularQLearning:
         
         GUARDRAIL: Visibility into policy versions
         """
-        policy_files = list(self.policy_storage_path.glob("policy_*.pkl"))
-        semesters = [f.stem.replace('policy_', '') for f in policy_files]
-        semesters.sort(reverse=True)  # Most recent first
+        policy_files = (
+            list(self.policy_storage_path.glob(f"policy_*{POLICY_SUFFIX}"))
+            + list(self.policy_storage_path.glob("policy_*.pkl"))
+        )
+        semesters = sorted(
+            {f.stem.replace('policy_', '') for f in policy_files}, reverse=True
+        )  # Most recent first
         
         logger.debug(f"[RL-Policy] Available policies: {semesters}")
         return semesters
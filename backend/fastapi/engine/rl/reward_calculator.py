@@ -28,16 +28,8 @@ def calculate_simple_reward(
     NO complex multi-metric calculations
     NO deep analysis of feasibility
     """
-    reward = 0.0
-    
     # Primary: Conflict change
-    conflict_delta = old_conflicts - new_conflicts
-    if conflict_delta > 0:
-        # Conflict reduced (good)
-        reward += 1.0 * conflict_delta
-    elif conflict_delta < 0:
-        # Conflict worsened (bad)
-        reward -= 5.0 * abs(conflict_delta)
+    reward = conflict_reward(old_conflicts, new_conflicts)
     
     # Secondary: Load improvement (small bonus)
     load_improved = _check_load_improvement(old_schedule, new_schedule, courses)
@@ -47,6 +39,22 @@ def calculate_simple_reward(
     return reward
 
 
+def conflict_reward(old_conflicts: int, new_conflicts: int) -> float:
+    """
+    Conflict term of the reward: +1 per conflict removed, -5 per conflict added.
+    A session move never changes per-faculty session counts, so this is the
+    whole reward for moves applied on a ScheduleState.
+    """
+    conflict_delta = old_conflicts - new_conflicts
+    if conflict_delta > 0:
+        # Conflict reduced (good)
+        return 1.0 * conflict_delta
+    if conflict_delta < 0:
+        # Conflict worsened (bad)
+        return -5.0 * abs(conflict_delta)
+    return 0.0
+
+
 def _check_load_improvement(
     old_schedule: Dict,
     new_schedule: Dict,
@@ -71,11 +79,11 @@ def _check_load_improvement(
 
 def _calculate_faculty_load(schedule: Dict, courses: List[Course]) -> Dict[str, int]:
     """Calculate faculty workload"""
+    faculty_of = {c.course_id: c.faculty_id for c in courses}
     load = defaultdict(int)
     for (course_id, session) in schedule.keys():
-        course = next((c for c in courses if c.course_id == course_id), None)
-        if course:
-            load[course.faculty_id] += 1
+        if course_id in faculty_of:
+            load[faculty_of[course_id]] += 1
     return dict(load)
 
 
@@ -0,0 +1,288 @@
+"""
+Reinforcement Learning - Indexed Schedule State
+Following Google/Meta standards: One file = one responsibility
+
+StateManager.get_state() used to rescan the whole schedule (with a linear
+course lookup per entry) on every decision.  ScheduleState wraps a
+{(course_id, session): (slot, room)} schedule with indexes that moves keep
+up to date incrementally:
+
+  * course → faculty / students maps (built once);
+  * faculty-load counters with a load histogram, so the max load is O(1);
+  * per-slot session counts (time density);
+  * faculty / room / student occupancy counters keyed (entity, slot), which
+    give the clash cost of a session at any position in O(its students)
+    and drive candidate-swap generation.
+
+The discrete state tuple is identical to StateManager.get_state(), so
+policies learned on plain schedules keep matching.
+"""
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from models.timetable_models import Course, TimeSlot
+from engine.cpsat.domains import candidate_rooms, candidate_slots
+from engine.cpsat.room_index import RoomIndex
+from engine.cpsat.slot_masks import SlotMasks
+
+logger = logging.getLogger(__name__)
+
+_GREEDY_SENTINEL = "__UNSCHEDULED__"
+
+# StateManager assumes a 50-slot week for the time-density dimension
+DENSITY_SLOTS = 50
+HARD_WEIGHT = 10  # faculty / room double-booking vs one student clash
+
+
+class ScheduleState:
+    """
+    Incrementally indexed schedule for RL decisions.
+
+    `schedule` stays a plain dict and is mutated only through move(), which
+    updates every index in O(students of the moved course).
+    """
+
+    def __init__(
+        self,
+        courses: List[Course],
+        schedule: Dict,
+        time_slots: Optional[List[TimeSlot]] = None,
+        room_index: Optional[RoomIndex] = None,
+        slot_masks: Optional[SlotMasks] = None,
+    ):
+        self.course_by_id: Dict[str, Course] = {}
+        self.faculty_of: Dict[str, str] = {}
+        self.students_of: Dict[str, Tuple[str, ...]] = {}
+        for course in courses:
+            if course.course_id in self.course_by_id:
+                continue
+            self.course_by_id[course.course_id] = course
+            self.faculty_of[course.course_id] = getattr(course, 'faculty_id', None)
+            self.students_of[course.course_id] = tuple(
+                dict.fromkeys(getattr(course, 'student_ids', None) or [])
+            )
+        # Indexes key slots / rooms by str(); moves write back the raw ids.
+        self._slot_raw = {str(ts.slot_id): ts.slot_id for ts in time_slots or []}
+        self.slot_ids = list(self._slot_raw)
+        self.room_index = room_index
+        self.slot_masks = slot_masks
+        # course_id → (slot keys, {room key: raw room id} best fit first)
+        self._domains: Dict[str, Tuple[List[str], Dict[str, object]]] = {}
+
+        self.schedule: Dict = {}
+        self.faculty_load: Counter = Counter()
+        self._load_hist: Counter = Counter()
+        self.max_load = 0
+        self.slot_count: Counter = Counter()
+        self.faculty_busy: Counter = Counter()
+        self.room_busy: Counter = Counter()
+        self.student_busy: Counter = Counter()
+        # Pairwise clash count (faculty + room + student pairs)
+        self.conflicts = 0
+
+        for key, (slot, room) in schedule.items():
+            self.schedule[key] = (slot, room)
+            self._bump_load(self.faculty_of.get(key[0]), 1)
+            self._count_slot(slot, 1)
+            if slot != _GREEDY_SENTINEL:
+                self.conflicts += self._clashes(key[0], slot, room)
+                self._occupy(key[0], slot, room, 1)
+
+    # ------------------------------------------------------------------
+    # Discrete RL state
+    # ------------------------------------------------------------------
+
+    def state(self, conflict_type: str = "none") -> Tuple[str, str, str]:
+        """Same (conflict_type, load_bucket, time_bucket) as StateManager.get_state."""
+        if self.max_load < 12:
+            load_bucket = "low"
+        elif self.max_load < 18:
+            load_bucket = "medium"
+        else:
+            load_bucket = "high"
+        density = len(self.slot_count) / float(DENSITY_SLOTS) if self.schedule else 0.0
+        if density < 0.3:
+            time_bucket = "morning"
+        elif density < 0.6:
+            time_bucket = "midday"
+        else:
+            time_bucket = "evening"
+        return (conflict_type, load_bucket, time_bucket)
+
+    # ------------------------------------------------------------------
+    # Clash queries
+    # ------------------------------------------------------------------
+
+    def clash_breakdown(self, key: Tuple, slot=None, room=None) -> Tuple[int, int, int]:
+        """
+        (faculty, room, student) clashes of session `key` at (slot, room),
+        default its current position, against every other session.
+        """
+        cur_slot, cur_room = self.schedule[key]
+        if slot is None:
+            slot, room = cur_slot, cur_room
+        if slot == _GREEDY_SENTINEL:
+            return (0, 0, 0)
+        course_id = key[0]
+        slot, room = str(slot), str(room) if room else None
+        here = slot == str(cur_slot) and cur_slot != _GREEDY_SENTINEL
+        cur_room = str(cur_room) if cur_room else None
+        fid = self.faculty_of.get(course_id)
+        fac = self.faculty_busy[(fid, slot)] - here if fid else 0
+        rm = self.room_busy[(room, slot)] - (here and room == cur_room) if room else 0
+        busy = self.student_busy
+        stu = sum(busy[(sid, slot)] for sid in self.students_of.get(course_id, ()))
+        if here:
+            stu -= len(self.students_of.get(course_id, ()))
+        return (fac, rm, stu)
+
+    def clash_cost(self, key: Tuple, slot=None, room=None) -> int:
+        """Weighted clash cost; faculty / room clashes weigh HARD_WEIGHT."""
+        fac, rm, stu = self.clash_breakdown(key, slot, room)
+        return HARD_WEIGHT * (fac + rm) + stu
+
+    def conflict_type(self, key: Tuple) -> str:
+        """Dominant clash kind of a session: faculty, room, student or none."""
+        fac, rm, stu = self.clash_breakdown(key)
+        if fac:
+            return "faculty"
+        if rm:
+            return "room"
+        if stu:
+            return "student"
+        return "none"
+
+    def conflicted_sessions(self) -> List[Tuple]:
+        """Placed sessions with at least one clash, in schedule order."""
+        return [
+            key for key, (slot, _room) in self.schedule.items()
+            if slot != _GREEDY_SENTINEL and self.clash_cost(key) > 0
+        ]
+
+    # ------------------------------------------------------------------
+    # Candidate swaps
+    # ------------------------------------------------------------------
+
+    def candidate_swaps(self, key: Tuple, limit: int = 5) -> List[Tuple]:
+        """
+        Up to `limit` (course_id, session, slot, room) moves of `key` that
+        lower its clash cost, best first.  Slots come from the course's
+        domain with the faculty free there; per slot the best-fit free room
+        (or the current room if free) is taken from the occupancy index.
+        """
+        if (
+            key not in self.schedule or key[0] not in self.course_by_id
+            or self.room_index is None or not self.slot_ids
+        ):
+            return []
+        course_id, session = key
+        cur_slot, cur_room = self.schedule[key]
+        current = self.clash_cost(key)
+        if current == 0:
+            return []
+        cur_slot, cur_room = str(cur_slot), str(cur_room) if cur_room else None
+        slots, room_raw = self._domain(course_id)
+        fid = self.faculty_of.get(course_id)
+        students = self.students_of.get(course_id, ())
+        busy = self.student_busy
+        scored = []
+        for slot in slots:
+            if slot == cur_slot:
+                continue
+            if fid and self.faculty_busy[(fid, slot)]:
+                continue
+            room = None
+            if cur_room in room_raw and not self.room_busy[(cur_room, slot)]:
+                room = room_raw[cur_room]  # stay in the current room if free
+            else:
+                for rkey, raw in room_raw.items():
+                    if not self.room_busy[(rkey, slot)]:
+                        room = raw
+                        break
+            if room is None:
+                continue
+            cost = sum(busy[(sid, slot)] for sid in students)
+            if cost < current:
+                scored.append((cost, slot, room))
+        scored.sort(key=lambda t: t[0])
+        return [
+            (course_id, session, self._slot_raw[slot], room)
+            for _cost, slot, room in scored[:limit]
+        ]
+
+    def _domain(self, course_id: str) -> Tuple[List[str], Dict[str, object]]:
+        cached = self._domains.get(course_id)
+        if cached is None:
+            course = self.course_by_id[course_id]
+            cached = (
+                candidate_slots(course, self.slot_ids, self.slot_masks),
+                {str(r.room_id): r.room_id for r in candidate_rooms(course, self.room_index)},
+            )
+            self._domains[course_id] = cached
+        return cached
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def move(self, key: Tuple, slot, room) -> Tuple:
+        """Move session `key` to (slot, room); returns its previous position."""
+        course_id = key[0]
+        old_slot, old_room = old = self.schedule[key]
+        self._count_slot(old_slot, -1)
+        self._count_slot(slot, 1)
+        if old_slot != _GREEDY_SENTINEL:
+            self._occupy(course_id, old_slot, old_room, -1)
+            self.conflicts -= self._clashes(course_id, old_slot, old_room)
+        if slot != _GREEDY_SENTINEL:
+            self.conflicts += self._clashes(course_id, slot, room)
+            self._occupy(course_id, slot, room, 1)
+        self.schedule[key] = (slot, room)
+        return old
+
+    def to_solution(self) -> Dict:
+        return dict(self.schedule)
+
+    def _clashes(self, course_id: str, slot, room) -> int:
+        """Pairwise clashes a session of `course_id` would add at (slot, room)."""
+        fid = self.faculty_of.get(course_id)
+        slot, room = str(slot), str(room) if room else None
+        busy = self.student_busy
+        return (
+            (self.faculty_busy[(fid, slot)] if fid else 0)
+            + (self.room_busy[(room, slot)] if room else 0)
+            + sum(busy[(sid, slot)] for sid in self.students_of.get(course_id, ()))
+        )
+
+    def _occupy(self, course_id: str, slot, room, delta: int) -> None:
+        fid = self.faculty_of.get(course_id)
+        slot, room = str(slot), str(room) if room else None
+        if fid:
+            self.faculty_busy[(fid, slot)] += delta
+        if room:
+            self.room_busy[(room, slot)] += delta
+        busy = self.student_busy
+        for sid in self.students_of.get(course_id, ()):
+            busy[(sid, slot)] += delta
+
+    def _count_slot(self, slot, delta: int) -> None:
+        # Raw ids, sentinel included, as StateManager's density counts them
+        self.slot_count[slot] += delta
+        if not self.slot_count[slot]:
+            del self.slot_count[slot]
+
+    def _bump_load(self, fid: Optional[str], delta: int) -> None:
+        if not fid:
+            return
+        old = self.faculty_load[fid]
+        new = old + delta
+        self.faculty_load[fid] = new
+        if old:
+            self._load_hist[old] -= 1
+        if new:
+            self._load_hist[new] += 1
+        if new > self.max_load:
+            self.max_load = new
+        elif old == self.max_load and not self._load_hist[old]:
+            self.max_load = new
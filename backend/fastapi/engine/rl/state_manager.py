@@ -8,6 +8,7 @@ from typing import Tuple, List, Dict
 from collections import defaultdict
 
 from models.timetable_models import Course, Faculty
+from .schedule_state import ScheduleState
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,7 @@ class StateManager:
     def __init__(self, courses: List[Course], faculty: Dict[str, Faculty]):
         self.courses = courses
         self.faculty = faculty
+        self._faculty_of = {c.course_id: c.faculty_id for c in courses}
         logger.info(f"[RL-State] Simple discrete state manager initialized")
     
     def get_state(
@@ -32,7 +34,13 @@ class StateManager:
         """
         Get simple discrete state (4-6 dimensions MAX)
         Returns: (conflict_type, load_bucket, time_bucket)
+
+        `schedule` may be a plain dict (full scan) or a ScheduleState,
+        whose incrementally maintained counters answer in O(1).
         """
+        if isinstance(schedule, ScheduleState):
+            return schedule.state(conflict_type)
+
         # Dimension 1: Conflict type
         # Values: student, faculty, room, none
         
@@ -60,10 +68,10 @@ class StateManager:
     def _calculate_faculty_workload(self, schedule: Dict) -> Dict[str, int]:
         """Calculate faculty workload from schedule"""
         workload = defaultdict(int)
-        for (course_id, session), (t_slot, room) in schedule.items():
-            course = next((c for c in self.courses if c.course_id == course_id), None)
-            if course:
-                workload[course.faculty_id] += 1
+        faculty_of = self._faculty_of
+        for (course_id, session) in schedule:
+            if course_id in faculty_of:
+                workload[faculty_of[course_id]] += 1
         return dict(workload)
     
     def _calculate_time_density(self, schedule: Dict) -> float:
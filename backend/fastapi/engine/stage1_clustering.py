@@ -5,20 +5,60 @@ Graph-based clustering with weighted constraint graph
 import logging
 import networkx as nx
 import random
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from models.timetable_models import Course
+from engine.cpsat.room_index import MAX_ROOMS_PER_COURSE
+from engine.graph_partition import (
+    BalancedBisector,
+    cut_weight,
+    induced_subgraph,
+    recursive_bisection,
+)
 
 logger = logging.getLogger(__name__)
 
+# Model weight of a typical course (3 sessions, ~45 students); cluster budgets
+# are expressed as multiples of it so target_cluster_size keeps its meaning.
+TYPICAL_COURSE_WEIGHT = 3 * (MAX_ROOMS_PER_COURSE + 45)
+
+
+def estimate_model_weight(course: Course) -> float:
+    """
+    Relative CP-SAT model size contributed by one course.
+
+    Each session gets up to MAX_ROOMS_PER_COURSE room variables per slot,
+    and each enrolled student adds one HC4 term per session per slot.
+    """
+    sessions = max(1, getattr(course, 'duration', 1) or 1)
+    enrolled = (
+        len(getattr(course, 'student_ids', None) or [])
+        or getattr(course, 'enrolled_students', 0) or 0
+    )
+    return float(sessions * (MAX_ROOMS_PER_COURSE + enrolled))
+
 
 class LouvainClusterer:
     """
     Louvain community detection for course clustering
-    Optimizes cluster sizes for CP-SAT feasibility
+    Fits communities to a CP-SAT model-size budget by min-cut bisection
     """
     
-    def __init__(self, target_cluster_size: int = 10, edge_threshold: float = None):
+    def __init__(
+        self,
+        target_cluster_size: int = 10,
+        edge_threshold: float = None,
+        max_cluster_weight: Optional[float] = None,
+    ):
         self.target_cluster_size = target_cluster_size
+        # CP-SAT size budgets (estimate_model_weight units).  Defaults match
+        # the old 15 / 5 / 10-course limits for typical courses.
+        self.max_cluster_weight = max_cluster_weight or (
+            1.5 * target_cluster_size * TYPICAL_COURSE_WEIGHT
+        )
+        self.min_cluster_weight = self.max_cluster_weight / 3.0
+        self.merge_cluster_weight = self.max_cluster_weight * 2.0 / 3.0
+        self._bisector = BalancedBisector()
+        self.last_partition_report: Dict = {}
         # Adaptive edge threshold based on RAM
         if edge_threshold is None:
             import psutil
@@ -82,7 +122,7 @@ class LouvainClusterer:
             "[CLUSTER] Optimizing cluster sizes  raw_communities=%d",
             n_raw_communities,
         )
-        final_clusters = self._optimize_cluster_sizes(partition, courses)
+        final_clusters = self._optimize_cluster_sizes(partition, courses, G)
         logger.info(
             "[CLUSTER] Cluster optimization done  final_clusters=%d  elapsed=%.2fs",
             len(final_clusters), _t.perf_counter() - _t0,
@@ -264,63 +304,123 @@ class LouvainClusterer:
         
         return partition
     
-    def _optimize_cluster_sizes(self, partition: Dict, courses: List[Course]) -> Dict[int, List[Course]]:
+    def _optimize_cluster_sizes(
+        self, partition: Dict, courses: List[Course], G: Optional[nx.Graph] = None,
+    ) -> Dict[int, List[Course]]:
         """
-        NEP 2020 FIX: Optimize cluster sizes for interdisciplinary education
-        Target: Larger clusters (15-20 courses) to reduce cross-cluster conflicts
+        Fit Louvain communities to the per-cluster CP-SAT budget.
+
+        Sizes are measured in estimated model weight (estimate_model_weight),
+        not course count: a 6-session, 120-student course costs CP-SAT far
+        more than a 2-session seminar.
+          * over max_cluster_weight  → recursive min-cut bisection
+            (engine.graph_partition) on the induced constraint graph;
+          * under min_cluster_weight → merged into the open bin they share
+            the most edge weight with (bins capped at merge_cluster_weight);
+          * otherwise kept as-is.
+        Cut weight (edge weight between final clusters) is logged and kept
+        in self.last_partition_report.
         """
-        # Group courses by cluster (use course_id lookup dict for speed)
         course_map = {c.course_id: c for c in courses}
-        raw_clusters = {}
-        
+        raw_clusters: Dict[int, List[Course]] = {}
         for course_id, cluster_id in partition.items():
-            if cluster_id not in raw_clusters:
-                raw_clusters[cluster_id] = []
             course = course_map.get(course_id)
             if course:
-                raw_clusters[cluster_id].append(course)
-        
-        # Clear course_map to free memory
+                raw_clusters.setdefault(cluster_id, []).append(course)
         del course_map
-        
-        # Optimize sizes - LARGER clusters for interdisciplinary
-        final_clusters = {}
+
+        adj = (
+            {u: {v: d.get('weight', 1.0) for v, d in G[u].items()} for u in G.nodes}
+            if G is not None else {}
+        )
+        node_weight = {c.course_id: estimate_model_weight(c) for c in courses}
+
+        final_clusters: Dict[int, List[Course]] = {}
         final_id = 0
-        small_clusters = []
-        
-        # Target: 10-15 courses per cluster (Google/Meta standard)
-        MAX_CLUSTER_SIZE = 15  # Reduced from 25
-        MIN_CLUSTER_SIZE = 5   # Reduced from 8
-        MERGE_SIZE = 10        # Reduced from 12
-        
+        small_communities: List[List[Course]] = []
+        bisected = 0
+
         for cluster_courses in raw_clusters.values():
-            if len(cluster_courses) > MAX_CLUSTER_SIZE:
-                # Split very large clusters into 10-15 course chunks
-                for i in range(0, len(cluster_courses), 12):
-                    chunk = cluster_courses[i:i+12]
-                    if len(chunk) >= MIN_CLUSTER_SIZE or i + 12 >= len(cluster_courses):
-                        final_clusters[final_id] = chunk
-                        final_id += 1
-            elif len(cluster_courses) < MIN_CLUSTER_SIZE:
-                # Collect small clusters for merging
-                small_clusters.extend(cluster_courses)
+            weight = sum(node_weight[c.course_id] for c in cluster_courses)
+            if weight > self.max_cluster_weight and len(cluster_courses) > 1:
+                by_id = {c.course_id: c for c in cluster_courses}
+                sub_adj = induced_subgraph(
+                    {cid: adj.get(cid, {}) for cid in by_id}, by_id,
+                )
+                for part in recursive_bisection(
+                    sub_adj, node_weight, self.max_cluster_weight, self._bisector,
+                ):
+                    final_clusters[final_id] = [by_id[cid] for cid in part]
+                    final_id += 1
+                bisected += 1
+            elif weight < self.min_cluster_weight:
+                small_communities.append(cluster_courses)
             else:
-                # Keep medium-sized clusters (5-15 courses)
                 final_clusters[final_id] = cluster_courses
                 final_id += 1
-        
-        # Clear raw_clusters to free memory
         raw_clusters.clear()
-        
-        # Merge small clusters into ~10 course groups
-        if small_clusters:
-            for i in range(0, len(small_clusters), MERGE_SIZE):
-                final_clusters[final_id] = small_clusters[i:i+MERGE_SIZE]
-                final_id += 1
-        
-        # Log cluster size distribution
+
+        # Merge small communities by connectivity, heaviest first.
+        bins: List[List[Course]] = []
+        bin_weight: List[float] = []
+        bin_of: Dict[str, int] = {}
+        small_communities.sort(
+            key=lambda cc: -sum(node_weight[c.course_id] for c in cc)
+        )
+        for community in small_communities:
+            weight = sum(node_weight[c.course_id] for c in community)
+            links: Dict[int, float] = {}
+            for course in community:
+                for nbr, w in adj.get(course.course_id, {}).items():
+                    b = bin_of.get(nbr)
+                    if b is not None:
+                        links[b] = links.get(b, 0.0) + w
+            fits = [
+                b for b in range(len(bins))
+                if bin_weight[b] + weight <= self.merge_cluster_weight
+            ]
+            target = None
+            if fits:
+                target = max(fits, key=lambda b: (links.get(b, 0.0), -bin_weight[b]))
+            if target is None:
+                bins.append([])
+                bin_weight.append(0.0)
+                target = len(bins) - 1
+            bins[target].extend(community)
+            bin_weight[target] += weight
+            for course in community:
+                bin_of[course.course_id] = target
+        for merged in bins:
+            final_clusters[final_id] = merged
+            final_id += 1
+
+        # Quality: weight of constraint edges left between clusters.
+        total_edge_weight = sum(w for nbrs in adj.values() for w in nbrs.values()) / 2.0
+        cut = cut_weight(
+            adj, ([c.course_id for c in cc] for cc in final_clusters.values()),
+        )
         sizes = [len(cluster) for cluster in final_clusters.values()]
-        avg_size = sum(sizes) / len(sizes) if sizes else 0
-        logger.info(f"Cluster sizes: min={min(sizes) if sizes else 0}, max={max(sizes) if sizes else 0}, avg={avg_size:.1f}")
-        
+        weights = [
+            sum(node_weight[c.course_id] for c in cluster)
+            for cluster in final_clusters.values()
+        ]
+        self.last_partition_report = {
+            'clusters': len(final_clusters),
+            'bisected_communities': bisected,
+            'merged_small_communities': len(small_communities),
+            'cut_weight': round(cut, 2),
+            'total_edge_weight': round(total_edge_weight, 2),
+            'cut_ratio': round(cut / total_edge_weight, 4) if total_edge_weight else 0.0,
+            'max_cluster_weight': round(max(weights), 1) if weights else 0.0,
+            'weight_budget': self.max_cluster_weight,
+        }
+        logger.info(
+            "[CLUSTER] Partition  clusters=%d  sizes min=%d max=%d avg=%.1f  "
+            "model_weight max=%.0f budget=%.0f  cut_weight=%.1f (%.1f%% of %.1f)",
+            len(final_clusters),
+            min(sizes) if sizes else 0, max(sizes) if sizes else 0,
+            sum(sizes) / len(sizes) if sizes else 0.0,
+            max(weights) if weights else 0.0, self.max_cluster_weight,
+            cut, 100.0 * self.last_partition_report['cut_ratio'], total_edge_weight,
+        )
         return final_clusters
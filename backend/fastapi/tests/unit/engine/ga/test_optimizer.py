@@ -0,0 +1,108 @@
+"""
+GeneticAlgorithmOptimizer anytime controls.
+
+Fitness metrics start at 100 and only add bonuses, so a clash-free seed
+already scores far above any absolute bar; the quality stop must be
+measured against the seed and no early stop may fire before
+min_generations.
+"""
+import random
+
+from config import settings
+from engine.ga.optimizer import GeneticAlgorithmOptimizer
+from models.timetable_models import Course, Faculty, Room, TimeSlot
+
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+
+
+def _problem(n_courses: int = 40, n_rooms: int = 12, seed: int = 7):
+    """Random catalogue plus a greedy clash-free seed (faculty, room, student)."""
+    rnd = random.Random(seed)
+    slots = [
+        TimeSlot(
+            slot_id=str(day * 9 + period), day_of_week=DAYS[day], day=day, period=period,
+            start_time=f"{8 + period:02d}:00", end_time=f"{9 + period:02d}:00",
+        )
+        for day in range(6) for period in range(9)
+    ]
+    rooms = [
+        Room(room_id=f"r{i}", room_code=f"R{i}", room_name=f"R{i}", capacity=rnd.choice([30, 60, 120]))
+        for i in range(n_rooms)
+    ]
+    faculty = {
+        f"f{i}": Faculty(faculty_id=f"f{i}", faculty_name=f"F{i}", department_id="d")
+        for i in range(15)
+    }
+    students = [f"s{i}" for i in range(200)]
+    courses = [
+        Course(
+            course_id=f"c{i}", course_code=f"C{i}", course_name=f"C{i}", faculty_id=f"f{i % 15}",
+            student_ids=rnd.sample(students, rnd.randint(10, 50)), department_id="d",
+        )
+        for i in range(n_courses)
+    ]
+    busy, solution = set(), {}
+    for course in courses:
+        for session in range(course.duration):
+            for slot in sorted(slots, key=lambda s: (s.period not in range(1, 6), rnd.random())):
+                t = slot.slot_id
+                if (course.faculty_id, t) in busy or any((s, t) in busy for s in course.student_ids):
+                    continue
+                room = next(
+                    (r for r in rooms if (r.room_id, t) not in busy and r.capacity >= len(course.student_ids)),
+                    None,
+                )
+                if room is None:
+                    continue
+                busy.update({(course.faculty_id, t), (room.room_id, t)})
+                busy.update((s, t) for s in course.student_ids)
+                solution[(course.course_id, session)] = (t, room.room_id)
+                break
+    return courses, rooms, slots, faculty, solution
+
+
+def _optimizer(**kwargs) -> GeneticAlgorithmOptimizer:
+    courses, rooms, slots, faculty, solution = _problem()
+    return GeneticAlgorithmOptimizer(
+        courses=courses, rooms=rooms, time_slots=slots, faculty=faculty, students={},
+        initial_solution=solution, **kwargs,
+    )
+
+
+def test_default_settings_run_past_first_generation():
+    optimizer = _optimizer(
+        population_size=settings.GA_POPULATION_SIZE,
+        generations=settings.GA_GENERATIONS,
+        no_improvement_limit=settings.NO_IMPROVEMENT_LIMIT,
+        quality_threshold=settings.QUALITY_THRESHOLD,
+        min_generations=settings.GA_MIN_GENERATIONS,
+    )
+    optimizer.optimize()
+
+    assert optimizer.seed_fitness > settings.QUALITY_THRESHOLD * 100.0
+    assert optimizer.generations_run >= max(settings.GA_MIN_GENERATIONS, 2)
+    assert optimizer.best_fitness >= optimizer.seed_fitness
+
+
+def test_quality_threshold_is_relative_to_seed_and_waits_for_min_generations():
+    # Any best ≥ seed satisfies a zero improvement target
+    optimizer = _optimizer(population_size=8, generations=20, quality_threshold=0.0, min_generations=4)
+    optimizer.optimize()
+
+    assert optimizer.stop_reason == "quality_threshold"
+    assert optimizer.generations_run == 4
+
+
+def test_stagnation_waits_for_min_generations():
+    optimizer = _optimizer(population_size=8, generations=20, no_improvement_limit=1, min_generations=6)
+    optimizer.optimize()
+
+    assert optimizer.generations_run >= 6
+
+
+def test_time_budget_is_a_hard_cap():
+    optimizer = _optimizer(population_size=8, generations=20, time_budget=0.0, min_generations=5)
+    optimizer.optimize()
+
+    assert optimizer.stop_reason == "time_budget"
+    assert optimizer.generations_run == 1
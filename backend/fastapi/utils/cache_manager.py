@@ -27,6 +27,9 @@ _TAG_CHUNKED = b'\x02'   # main key holds chunk manifest; chunks at {key}:{i}
 _MAX_STORE_BYTES = 10 * 1024 * 1024   # 10 MB
 _CHUNK_SIZE      = 512 * 1024          # 512 KB per chunk shard
 
+# Resources whose keys carry a Django-bumped namespace (ttdata:ns:{org}:{res})
+_NAMESPACED_RESOURCES = frozenset({'courses', 'faculty', 'rooms', 'students'})
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,9 +73,28 @@ class CacheManager:
                 "Run: pip install zstandard>=0.23.0"
             )
     
+    def _namespace(self, resource_type: str, org_id: str) -> Optional[str]:
+        """
+        Current namespace of a Django-invalidated resource ("v{n}"), or None.
+
+        Django bumps ttdata:ns:{org_id}:{resource} once per committed
+        transaction (academics/signals.py), so keys built under the old
+        namespace stop matching without any SCAN / DELETE and expire by TTL.
+        """
+        if resource_type not in _NAMESPACED_RESOURCES or not self.redis_client:
+            return None
+        try:
+            raw = self.redis_client.get(f"ttdata:ns:{org_id}:{resource_type}")
+        except Exception as e:
+            logger.warning(f"[CACHE] Namespace read error: {e}")
+            return None
+        return f"v{int(raw) if raw else 0}"
+
     def _generate_cache_key(self, resource_type: str, org_id: str, **kwargs) -> str:
         """Generate unique cache key with hash for complex parameters"""
-        key_parts = [resource_type, org_id]
+        namespace = self._namespace(resource_type, org_id)
+        head = [resource_type, org_id] + ([namespace] if namespace else [])
+        key_parts = list(head)
         
         # Add additional parameters
         for k, v in sorted(kwargs.items()):
@@ -84,7 +106,7 @@ class CacheManager:
         # If key is too long, use hash
         if len(key) > 200:
             key_hash = hashlib.md5(key.encode()).hexdigest()
-            key = f"{resource_type}:{org_id}:{key_hash}"
+            key = ":".join(str(p) for p in (*head, key_hash))
         
         return key
     